@@ -139,6 +139,44 @@ def bench_thread_scaling(fhrs):
                   f"throughput: {throughput:.2f} FHR/s | speedup: {speedup:.1f}x")
 
 
+def bench_message_index(fhrs):
+    """Benchmark the sidecar message index: cold (build) vs warm, serial vs threaded decode.
+
+    Calls _load_core_fields_eccodes directly so mmap cache writes don't skew timings.
+    """
+    from core import grib_index
+    from core.cross_section_interactive import InteractiveCrossSection
+
+    print(f"\n{'='*60}")
+    print("  GRIB Message Index (eccodes seek-and-decode)")
+    print(f"  FHRs: {fhrs}")
+    print(f"{'='*60}")
+
+    xsect = InteractiveCrossSection(cache_dir=str(CACHE_BASE / MODEL), grib_backend='eccodes')
+    noop = lambda *a, **k: None
+
+    for fhr in fhrs:
+        prs = sorted((GRIB_BASE / f"F{fhr:02d}").glob("*wrfprs*.grib2"))
+        if not prs:
+            continue
+        grib_file = str(prs[0])
+        sfc_file = xsect._sfc_resolver(grib_file)
+        for path in {grib_file, sfc_file}:
+            grib_index.index_path(path).unlink(missing_ok=True)
+
+        timings = []
+        for label, threads in (("cold 1t", 1), ("warm 1t", 1), ("warm 4t", 4), ("warm 8t", 8)):
+            os.environ['XSECT_DECODE_THREADS'] = str(threads)
+            if label.startswith('cold'):
+                grib_index._INDEX_MEMO.clear()
+            t0 = time.perf_counter()
+            xsect._load_core_fields_eccodes(grib_file, fhr, noop, 15, {})
+            timings.append((label, time.perf_counter() - t0))
+
+        print(f"  F{fhr:02d}: " + " | ".join(f"{label}: {t:.2f}s" for label, t in timings))
+    os.environ.pop('XSECT_DECODE_THREADS', None)
+
+
 if __name__ == "__main__":
     print("GRIB-to-Mmap Conversion Benchmark (Native Windows)")
     print(f"Time: {time.strftime('%Y-%m-%d %H:%M:%S')}")
@@ -151,6 +189,7 @@ if __name__ == "__main__":
     # Tests: 1w*2 + 2w*2 + 4w*4 + 8w*8 = 16 FHRs
     fhrs = test_fhrs[:16]
     bench_thread_scaling(fhrs)
+    bench_message_index(test_fhrs[:2])
 
     print(f"\n{'='*60}")
     print("DONE")
@@ -23,7 +23,10 @@ Usage:
     )
 """
 
+import os
+import threading
 import numpy as np
+from collections import OrderedDict
 from pathlib import Path
 from typing import Optional, Dict, Any, Tuple, List
 from dataclasses import dataclass, field
@@ -70,9 +73,15 @@ class ForecastHourData:
     # Source GRIB path (for lazy smoke backfill)
     grib_file: str = None
 
+    # core.grid_registry key; lats/lons are then the registry's shared arrays
+    grid_id: str = None
+
     # Mmap cache directory (for lazy surface overlay field loading)
     _cache_dir: str = None
 
+    # Column-major (ny, nx, n_levels) copies opened on demand for point queries
+    _columns: Dict[str, Any] = field(default_factory=dict, repr=False)
+
     def load_surface_field(self, name: str):
         """Load a surface overlay field from mmap cache on demand.
 
@@ -92,6 +101,40 @@ class ForecastHourData:
         setattr(self, name, arr)
         return arr
 
+    def load_column_field(self, name: str):
+        """Column-major (ny, nx, n_levels) copy of a 3D field from the mmap cache, or None.
+
+        Only present when the entry was written with XSECT_COLUMN_CACHE=1
+        (or had columns added by tools/migrate_cache_v2.py --columns).
+        """
+        if name in self._columns:
+            return self._columns[name]
+        cols = None
+        if self._cache_dir:
+            from core.tiled_cache import load_column_field
+            cols = load_column_field(self._cache_dir, name)
+        self._columns[name] = cols
+        return cols
+
+    def read_columns(self, name: str, iy: np.ndarray, ix: np.ndarray) -> Optional[np.ndarray]:
+        """Values of a field at grid points (iy, ix) as float32.
+
+        3D fields return (n_points, n_levels), 2D fields (n_points,). Reads
+        the column-major copy when cached (one contiguous run per point),
+        otherwise gathers the columns from the level-major field.
+        """
+        cols = self.load_column_field(name)
+        if cols is not None:
+            return np.asarray(cols[iy, ix], dtype=np.float32)
+        arr = self.load_surface_field(name)
+        if arr is None:
+            return None
+        if arr.ndim == 2:
+            return np.asarray(arr[iy, ix], dtype=np.float32)
+        if hasattr(arr, 'gather_columns'):
+            return np.asarray(arr.gather_columns(iy * arr.shape[2] + ix), dtype=np.float32).T
+        return np.asarray(arr[:, iy, ix], dtype=np.float32).T
+
     def memory_usage_mb(self) -> float:
         """Estimate memory usage in MB.
 
@@ -100,10 +143,62 @@ class ForecastHourData:
         """
         total = 0
         for name, val in self.__dict__.items():
+            if name in ('lats', 'lons') and self.grid_id:
+                continue  # shared across FHRs via the grid registry
             if isinstance(val, np.ndarray) and not isinstance(val, np.memmap):
                 total += val.nbytes
         return total / 1024 / 1024
 
+    def mmap_usage_mb(self) -> Tuple[float, Optional[float]]:
+        """(mapped_mb, resident_mb) for memory-mapped fields.
+
+        resident_mb counts the mapped file pages currently in the page cache
+        (mincore, sampled); None where the platform can't tell.
+        """
+        from core.resident import resident_bytes
+
+        mapped = 0
+        resident = 0
+        known = True
+        for val in self._mapped_arrays():
+            mapped += val.nbytes
+            rb = resident_bytes(val)
+            if rb is None:
+                known = False
+            else:
+                resident += rb
+        return mapped / 1024 / 1024, (resident / 1024 / 1024 if known else None)
+
+    def release_pages(self) -> int:
+        """Drop all memory-mapped fields' pages from this process and the page cache. Returns fields released."""
+        from core.resident import release_pages
+
+        return sum(1 for val in self._mapped_arrays() if release_pages(val))
+
+    def _mapped_arrays(self):
+        """np.memmap fields, including the tile arrays behind uncompressed v2 cache fields."""
+        fields = [val for name, val in self.__dict__.items()
+                  if not (name in ('lats', 'lons') and self.grid_id)]  # shared via the grid registry
+        for val in fields + list(self._columns.values()):
+            val = getattr(val, '_tiles', val)
+            if isinstance(val, np.memmap):
+                yield val
+
+
+@dataclass(frozen=True)
+class TerrainRef:
+    """Picklable handle to the terrain along one line of one FHR.
+
+    Passed as terrain_data instead of the arrays (e.g. in render_frame jobs);
+    the engine that renders resolves it with resolve_terrain(), reading only
+    surface_pressure from its own mmap cache.
+    """
+    grib_file: str
+    forecast_hour: int  # engine key of the FHR the terrain is locked to
+    start_point: Tuple[float, float]
+    end_point: Tuple[float, float]
+    n_points: int = 0
+
 
 @dataclass
 class ClimatologyData:
@@ -129,12 +224,24 @@ class ClimatologyData:
     years: List[int] = field(default_factory=list)
 
 
-# Styles that support anomaly mode
-ANOMALY_STYLES = {
-    'temp', 'wind_speed', 'rh', 'omega', 'theta_e',
-    'q', 'vorticity', 'shear', 'lapse_rate', 'wetbulb',
-    'vpd', 'dewpoint_dep', 'moisture_transport',
+# Styles that support anomaly mode -> (field or core.derived_fields kernel
+# compared against climatology, display scale applied to the difference)
+ANOMALY_FIELDS = {
+    'temp': ('temp_c', 1.0),
+    'wind_speed': ('wind_speed_kt', 1.0),
+    'rh': ('rh', 1.0),
+    'omega': ('omega', 36.0),  # Pa/s -> hPa/hr
+    'theta_e': ('theta_e', 1.0),
+    'q': ('specific_humidity', 1000.0),  # kg/kg -> g/kg
+    'vorticity': ('vorticity', 1e5),
+    'shear': ('shear', 1.0),
+    'lapse_rate': ('lapse_rate', 1.0),
+    'wetbulb': ('wetbulb', 1.0),
+    'vpd': ('vpd', 1.0),
+    'dewpoint_dep': ('dewpoint_dep', 1.0),
+    'moisture_transport': ('moisture_transport', 1.0),
 }
+ANOMALY_STYLES = set(ANOMALY_FIELDS)
 
 
 # GFS CONUS subset bounds (CONUS_BOUNDS ± 5° padding)
@@ -578,6 +685,11 @@ class InteractiveCrossSection:
     # Cached cartopy feature geometries (class-level, parsed once per process)
     _cartopy_features_cache = None
 
+    # Pre-rasterized inset maps (class-level LRU): key -> (rgba, figure-fraction rect) or None
+    _inset_cache = OrderedDict()
+    _inset_lock = threading.Lock()
+    INSET_CACHE_SIZE = 64
+
     @classmethod
     def _get_cartopy_features(cls):
         """Load and cache cartopy feature geometries once per process.
@@ -617,8 +729,29 @@ class InteractiveCrossSection:
         'grle': 'graupel',
     }
 
+    # Extra 3D fields each style reads along the path, gathered in the same
+    # pass as the base fields (temperature, theta, winds, heights). Inputs of
+    # derived styles are added from their core.derived_fields kernel; 'rh' is
+    # listed for styles that draw the wet-bulb snow-level overlay.
+    _STYLE_EXTRA_FIELDS = {
+        'temp': ('rh',),
+        'rh': ('rh',),
+        'q': ('rh', 'specific_humidity'),
+        'omega': ('omega', 'rh'),
+        'vorticity': ('vorticity',),
+        'cloud': ('cloud',),
+        'cloud_total': ('cloud', 'ice', 'rain', 'snow', 'graupel'),
+        'theta_e': ('rh',),
+        'moisture_transport': ('rh',),
+        'fire_wx': ('rh',),
+    }
+
     CACHE_LIMIT_GB = 1000  # Max cache size on disk
 
+    STREAM_BATCH = 4  # messages decoded per batch (x XSECT_DECODE_THREADS) by the streaming converter
+
+    PATH_GEOMETRY_CACHE_SIZE = 128  # Cached path geometries (weights + distances) per engine
+
     SUPPORTED_GRIB_BACKENDS = {'cfgrib', 'eccodes', 'auto'}
 
     def __init__(self, cache_dir: str = None, min_levels: int = 40,
@@ -635,11 +768,21 @@ class InteractiveCrossSection:
                          'auto' (try eccodes first, then fallback to cfgrib).
         """
         self.forecast_hours: Dict[int, ForecastHourData] = {}
-        self._kdtree_cache = None  # Cached cKDTree for curvilinear grid interpolation
-        self._kdtree_grid_id = None  # id() of the lats array used to build the tree
+        self._geometry_cache = OrderedDict()  # path key -> PathGeometry (LRU)
+        self._geometry_lock = threading.Lock()
+        self._resident_samples = {}  # fhr -> (ForecastHourData, sampled_at, memory info)
+        # Curvilinear path interpolation: 'nearest' (default) or 'idw' (k=4 inverse distance)
+        self.interp_method = os.environ.get('XSECT_INTERP_METHOD', 'nearest').strip().lower()
+        from core.path_weights import INTERP_METHODS
+        if self.interp_method not in INTERP_METHODS:
+            print(f"  Warning: invalid interp method '{self.interp_method}', using nearest")
+            self.interp_method = 'nearest'
         self.cache_dir = Path(cache_dir) if cache_dir else None
         if self.cache_dir:
             self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Shared coordinates + KD-trees for all models under this cache base
+            from core import grid_registry
+            grid_registry.configure(self.cache_dir.parent / '_grids')
         # Metadata for labeling
         self.model = "HRRR"
         self.init_date = None  # YYYYMMDD
@@ -812,7 +955,7 @@ class InteractiveCrossSection:
             print(f"Error loading from legacy cache: {e}")
             return None
 
-    # --- Mmap cache (per-field .npy files in float16) ---
+    # --- Mmap cache (per-field .npy files in float16, or v2 tiles) ---
 
     # Fields saved as float16 (3.3 decimal digits — sufficient for visualization)
     _FLOAT16_FIELDS = {
@@ -834,6 +977,10 @@ class InteractiveCrossSection:
     _FLOAT32_FIELDS = {'geopotential_height'}
     # Coordinate fields kept at float64 (tiny, loaded into RAM)
     _COORD_FIELDS = {'pressure_levels', 'lats', 'lons'}
+    # 3D fields that point/sounding queries read whole columns of; with
+    # XSECT_COLUMN_CACHE=1 these also get a (ny, nx, n_levels) copy
+    _COLUMN_FIELDS = ('temperature', 'dew_point', 'rh', 'u_wind', 'v_wind',
+                      'geopotential_height', 'specific_humidity', 'omega')
 
     def _save_to_mmap_cache(self, fhr_data: ForecastHourData, cache_dir: Path):
         """Save ForecastHourData as per-field .npy files for memory-mapped access.
@@ -841,9 +988,15 @@ class InteractiveCrossSection:
         3D fields saved as float16 (~half disk size vs float64).
         geopotential_height saved as float32 (needed for shear/lapse_rate precision).
         Coordinate arrays saved as float64 (tiny, loaded into RAM).
+        With XSECT_CACHE_FORMAT=v2, 3D fields are written as column tiles
+        (see core.tiled_cache) instead of one .npy each.
         _complete marker written last for atomic cache creation.
         """
         import shutil
+        from core.tiled_cache import (
+            DEFAULT_TILE, cache_codec, cache_format, column_cache_enabled,
+            write_column_field, write_manifest, write_tiled_field,
+        )
 
         # Write to temp directory, rename when done (atomic)
         tmp_dir = Path(str(cache_dir) + '._partial')
@@ -861,22 +1014,40 @@ class InteractiveCrossSection:
                 if arr is not None:
                     np.save(tmp_dir / f'{field_name}.npy', arr)
 
-            # Save float16 fields (cross-section 3D + surface overlay 2D)
-            for field_name in (self._FLOAT16_FIELDS | self._SURFACE_OVERLAY_FIELDS):
-                arr = getattr(fhr_data, field_name, None)
-                if arr is not None:
+            # v2 layout tiles 3D fields; 2D and coordinate fields stay .npy
+            tiled = cache_format() == 'v2'
+            codec = cache_codec() if tiled else None
+            tiled_fields = {}
+
+            # Save float16 fields (cross-section 3D + surface overlay 2D),
+            # then float32 fields
+            for field_names, dtype in (
+                (self._FLOAT16_FIELDS | self._SURFACE_OVERLAY_FIELDS, np.float16),
+                (self._FLOAT32_FIELDS, np.float32),
+            ):
+                for field_name in field_names:
+                    arr = getattr(fhr_data, field_name, None)
+                    if arr is None:
+                        continue
+                    if tiled and arr.ndim == 3:
+                        tiled_fields[field_name] = write_tiled_field(
+                            tmp_dir, field_name, arr, dtype, codec=codec)
+                        continue
                     # Read from mmap if needed before converting
                     if isinstance(arr, np.memmap):
                         arr = np.array(arr)
-                    np.save(tmp_dir / f'{field_name}.npy', arr.astype(np.float16))
+                    np.save(tmp_dir / f'{field_name}.npy', arr.astype(dtype))
 
-            # Save float32 fields
-            for field_name in self._FLOAT32_FIELDS:
-                arr = getattr(fhr_data, field_name, None)
-                if arr is not None:
-                    if isinstance(arr, np.memmap):
-                        arr = np.array(arr)
-                    np.save(tmp_dir / f'{field_name}.npy', arr.astype(np.float32))
+            if tiled:
+                write_manifest(tmp_dir, tiled_fields, DEFAULT_TILE, codec)
+
+            # Optional column-major copies for point/sounding queries
+            if column_cache_enabled():
+                for field_name in self._COLUMN_FIELDS:
+                    arr = getattr(fhr_data, field_name, None)
+                    if arr is not None and arr.ndim == 3:
+                        dtype = np.float32 if field_name in self._FLOAT32_FIELDS else np.float16
+                        write_column_field(tmp_dir, field_name, arr, dtype)
 
             # Write _complete marker last — cache only valid if this exists
             (tmp_dir / '_complete').touch()
@@ -893,13 +1064,102 @@ class InteractiveCrossSection:
                 shutil.rmtree(tmp_dir)
             raise e
 
+    def _stream_convert_enabled(self, cache_dir: Optional[Path]) -> bool:
+        """Whether GRIB loads go through _stream_grib_to_mmap_cache (XSECT_STREAM_CONVERT, default on)."""
+        if not cache_dir or os.environ.get('XSECT_STREAM_CONVERT', '1').strip().lower() in ('0', 'false', 'no'):
+            return False
+        # GFS is read on the global grid and subset to CONUS afterwards
+        if getattr(self, 'model', '').upper() == 'GFS':
+            return False
+        return 'eccodes' in self._grib_backend_order()
+
+    def _stream_grib_to_mmap_cache(self, grib_file: str, forecast_hour: int, cache_dir: Path,
+                                   cb, total_steps: int) -> bool:
+        """Convert a GRIB straight into an mmap cache dir with bounded memory.
+
+        Indexed messages are decoded a batch at a time and written into their
+        level slots by core.stream_cache.MmapCacheBuilder (float16 memmaps,
+        geopotential_height float32, theta/temp_c per temperature level), so
+        only one decode batch is in memory instead of every field in float32
+        plus its float16 copy. Smoke is streamed the same way.
+
+        Produces the same cache layout as _save_to_mmap_cache. Returns False
+        if the GRIB fails validation (too few levels, no surface pressure);
+        raises on decode errors so the caller can fall back.
+        """
+        from core import grib_index
+        from core.stream_cache import MmapCacheBuilder
+
+        target_keys = set(self.FIELDS_TO_LOAD)
+        wanted = grib_index.select(
+            grib_index.get_index(grib_file),
+            lambda e: e['typeOfLevel'] == 'isobaricInhPa' and e['shortName'] in target_keys,
+        )
+        levels = {int(e['level']) for e in wanted if e['shortName'] == 't'}
+        if not levels:
+            raise RuntimeError("streaming converter missing temperature (shortName='t')")
+        wanted = [e for e in wanted if int(e['level']) in levels]
+
+        builder = MmapCacheBuilder(self, grib_file, forecast_hour, levels, cache_dir=cache_dir)
+        try:
+            builder.set_grid(*grib_index.decode_entries(grib_file, wanted[:1], self._grib_latlon, workers=1)[0])
+
+            chunk = self.STREAM_BATCH * grib_index.decode_threads()
+            for i in range(0, len(wanted), chunk):
+                batch = wanted[i:i + chunk]
+                for e, arr2d in zip(batch, grib_index.decode_entries(grib_file, batch, self._grib_msg_to_2d)):
+                    builder.add_isobaric(e['shortName'], e['level'], arr2d)
+                done = min(i + chunk, len(wanted))
+                cb(1 + (9 * done) // len(wanted), total_steps,
+                   f"Converting isobaric fields ({done}/{len(wanted)} msgs)...")
+
+            cb(11, total_steps, "Reading Surface Fields...")
+            sfc_fields, _ = self._read_surface_fields_eccodes(grib_file)
+            for attr_name, arr2d in sfc_fields.items():
+                builder.add_surface(attr_name, arr2d)
+            del sfc_fields
+
+            cb(12, total_steps, "Reading Smoke (PM2.5)...")
+            try:
+                nat_path = self._nat_resolver(grib_file)
+                if nat_path and Path(nat_path).exists():
+                    n_hyb = self._stream_smoke_npy(nat_path, builder.tmp_dir / 'smoke_hyb.npy',
+                                                   builder.tmp_dir / 'smoke_pres_hyb.npy')
+                    if n_hyb:
+                        builder.adopt_file('smoke_hyb')
+                        builder.adopt_file('smoke_pres_hyb')
+                        print(f"  Streamed PM2.5 smoke on {n_hyb} hybrid levels")
+            except Exception as e:
+                for name in ('smoke_hyb', 'smoke_pres_hyb'):
+                    (builder.tmp_dir / f'{name}.npy').unlink(missing_ok=True)
+                print(f"  Warning: Could not load smoke from wrfnat: {e}")
+        except Exception:
+            builder.abort()
+            raise
+
+        return builder.finish(cb, total_steps)
+
+    @staticmethod
+    def _grib_latlon(msg):
+        """(lats, lons) float32 grids of one GRIB message."""
+        import eccodes
+
+        try:
+            ni, nj = int(eccodes.codes_get(msg, 'Ni')), int(eccodes.codes_get(msg, 'Nj'))
+        except Exception:
+            ni, nj = int(eccodes.codes_get(msg, 'Nx')), int(eccodes.codes_get(msg, 'Ny'))
+        return (np.asarray(eccodes.codes_get_array(msg, 'latitudes'), dtype=np.float32).reshape(nj, ni),
+                np.asarray(eccodes.codes_get_array(msg, 'longitudes'), dtype=np.float32).reshape(nj, ni))
+
     def _load_from_mmap_cache(self, cache_dir: Path) -> Optional[ForecastHourData]:
-        """Load ForecastHourData with memory-mapped .npy files.
+        """Load ForecastHourData with memory-mapped .npy files (or v2 tiles).
 
         Coordinate arrays (pressure_levels, lats, lons) are loaded into RAM (~30KB).
         All 3D fields are opened with mmap_mode='r' — just file handles, no data read.
         Actual data is read from NVMe on demand when cross-section slices specific levels.
         """
+        from core.tiled_cache import TiledField, read_manifest
+
         try:
             if not (cache_dir / '_complete').exists():
                 return None
@@ -912,19 +1172,26 @@ class InteractiveCrossSection:
             lats = np.load(cache_dir / 'lats.npy')
             lons = np.load(cache_dir / 'lons.npy')
 
-            fhr_data = ForecastHourData(
+            fhr_data = self._attach_grid(ForecastHourData(
                 forecast_hour=forecast_hour,
                 pressure_levels=pressure_levels,
                 lats=lats,
                 lons=lons,
-            )
+            ))
             # Store cache dir for lazy surface overlay field loading
             fhr_data._cache_dir = str(cache_dir)
 
             # Memory-map cross-section fields only (not surface overlay fields)
             # Surface overlay fields (t2m, refc, etc.) are lazy-loaded via load_surface_field()
+            # v2 caches keep 3D fields as tiles; anything not in the manifest
+            # (2D fields, a smoke backfill) is still a plain .npy
+            manifest = read_manifest(cache_dir)
+            tiled = manifest['fields'] if manifest else {}
             all_fields = self._FLOAT16_FIELDS | self._FLOAT32_FIELDS
             for field_name in all_fields:
+                if field_name in tiled:
+                    setattr(fhr_data, field_name, TiledField(cache_dir, field_name, manifest))
+                    continue
                 npy_path = cache_dir / f'{field_name}.npy'
                 if npy_path.exists():
                     setattr(fhr_data, field_name, np.load(npy_path, mmap_mode='r'))
@@ -937,6 +1204,35 @@ class InteractiveCrossSection:
             print(f"Error loading from mmap cache: {e}")
             return None
 
+    @staticmethod
+    def _is_massden_entry(e) -> bool:
+        return e['discipline'] == 0 and e['parameterCategory'] == 20 and e['parameterNumber'] == 0
+
+    @staticmethod
+    def _is_pres_entry(e) -> bool:
+        return e['discipline'] == 0 and e['parameterCategory'] == 3 and e['parameterNumber'] == 0
+
+    def _smoke_index_entries(self, nat_file: str) -> List[dict]:
+        """Index entries for MASSDEN and hybrid-level pressure in a wrfnat, in file order.
+
+        Only the first pressure message per level is kept, as the full scan did.
+        """
+        from core import grib_index
+
+        hyb = grib_index.select(
+            grib_index.get_index(nat_file),
+            lambda e: e['typeOfLevel'] == 'hybrid' and (self._is_massden_entry(e) or self._is_pres_entry(e)),
+        )
+        wanted = []
+        seen_pres = set()
+        for e in hyb:
+            if self._is_pres_entry(e):
+                if e['level'] in seen_pres:
+                    continue
+                seen_pres.add(e['level'])
+            wanted.append(e)
+        return wanted
+
     def _load_smoke_from_wrfnat(self, nat_file: str) -> Optional[tuple]:
         """Load MASSDEN (smoke PM2.5) from wrfnat GRIB using eccodes.
 
@@ -951,38 +1247,29 @@ class InteractiveCrossSection:
         pres_hyb:  (n_hyb, ny, nx) in hPa (varies per column due to terrain)
         """
         import eccodes
+        from core import grib_index
 
         # Read MASSDEN and pressure on hybrid levels
         smoke_levels = {}  # level -> 2D array (kg/m³)
         pres_levels = {}   # level -> 2D array (Pa)
 
-        f = open(nat_file, 'rb')
-        try:
-            while True:
-                msg = eccodes.codes_grib_new_from_file(f)
-                if msg is None:
-                    break
-                try:
-                    disc = eccodes.codes_get(msg, 'discipline')
-                    cat = eccodes.codes_get(msg, 'parameterCategory')
-                    num = eccodes.codes_get(msg, 'parameterNumber')
-                    ltype = eccodes.codes_get(msg, 'typeOfLevel')
-                    level = eccodes.codes_get(msg, 'level')
-
-                    if ltype == 'hybrid':
-                        Ni = eccodes.codes_get(msg, 'Ni')
-                        Nj = eccodes.codes_get(msg, 'Nj')
-                        if disc == 0 and cat == 20 and num == 0:
-                            # MASSDEN - smoke mass density
-                            smoke_levels[level] = eccodes.codes_get_values(msg).reshape(Nj, Ni)
-                        elif disc == 0 and cat == 3 and num == 0 and level not in pres_levels:
-                            # Pressure on hybrid levels (shortName='pres')
-                            pres_levels[level] = eccodes.codes_get_values(msg).reshape(Nj, Ni)
-                except Exception:
-                    pass
-                eccodes.codes_release(msg)
-        finally:
-            f.close()
+        wanted = self._smoke_index_entries(nat_file)
+
+        def _decode(msg):
+            try:
+                Ni = eccodes.codes_get(msg, 'Ni')
+                Nj = eccodes.codes_get(msg, 'Nj')
+                return eccodes.codes_get_values(msg).reshape(Nj, Ni)
+            except Exception:
+                return None
+
+        for e, arr in zip(wanted, grib_index.decode_entries(nat_file, wanted, _decode)):
+            if arr is None:
+                continue
+            if self._is_massden_entry(e):
+                smoke_levels[e['level']] = arr  # MASSDEN - smoke mass density
+            else:
+                pres_levels[e['level']] = arr   # Pressure on hybrid levels (shortName='pres')
 
         if not smoke_levels or not pres_levels:
             return None
@@ -1002,6 +1289,43 @@ class InteractiveCrossSection:
 
         return smoke_hyb, pres_hyb
 
+    def _stream_smoke_npy(self, nat_file: str, smoke_path: Path, pres_path: Path) -> int:
+        """Decode wrfnat smoke straight into float16 .npy memmaps at the given paths.
+
+        Same result as _load_smoke_from_wrfnat followed by a float16 save, but
+        only a batch of decoded levels is held in memory. Returns the number
+        of hybrid levels written (0 if the file has no smoke or pressure).
+        """
+        from core import grib_index
+
+        wanted = self._smoke_index_entries(nat_file)
+        smoke = {e['level']: e for e in wanted if self._is_massden_entry(e)}
+        pres = {e['level']: e for e in wanted if not self._is_massden_entry(e)}
+        if not smoke or not pres:
+            return 0
+
+        levels_sorted = sorted(smoke)
+        slot = {lev: i for i, lev in enumerate(levels_sorted)}
+        jobs = [smoke[lev] for lev in levels_sorted] + [pres[lev] for lev in levels_sorted if lev in pres]
+        ny, nx = grib_index.decode_entries(nat_file, jobs[:1], self._grib_msg_to_2d, workers=1)[0].shape
+
+        smoke_out = np.lib.format.open_memmap(smoke_path, mode='w+', dtype=np.float16,
+                                              shape=(len(levels_sorted), ny, nx))
+        pres_out = np.lib.format.open_memmap(pres_path, mode='w+', dtype=np.float16,
+                                             shape=(len(levels_sorted), ny, nx))
+        chunk = self.STREAM_BATCH * grib_index.decode_threads()
+        for i in range(0, len(jobs), chunk):
+            batch = jobs[i:i + chunk]
+            for e, arr in zip(batch, grib_index.decode_entries(nat_file, batch, self._grib_msg_to_2d)):
+                if self._is_massden_entry(e):
+                    smoke_out[slot[e['level']]] = arr * 1e9  # kg/m³ → μg/m³
+                else:
+                    pres_out[slot[e['level']]] = arr / 100.0  # Pa → hPa
+        smoke_out.flush()
+        pres_out.flush()
+        del smoke_out, pres_out
+        return len(levels_sorted)
+
     def _validate_fhr_data(self, fhr_data: ForecastHourData) -> Optional[str]:
         """Validate ForecastHourData. Returns error message or None if valid."""
         n_levels = len(fhr_data.pressure_levels)
@@ -1025,10 +1349,88 @@ class InteractiveCrossSection:
         else:
             path.unlink(missing_ok=True)
 
+    @staticmethod
+    def _write_smoke_cache(mmap_cache_dir: Path, smoke_hyb: np.ndarray, smoke_pres_hyb: np.ndarray):
+        """Write the smoke .npy files into an existing mmap cache dir atomically.
+
+        Each file is written under a per-process temp name and os.replace()d
+        into place, so a reader (or another worker augmenting the same hour)
+        never maps a half-written file. smoke_pres_hyb goes first: a cache is
+        treated as having smoke once smoke_hyb.npy exists.
+        """
+        for field_name, arr in (('smoke_pres_hyb', smoke_pres_hyb), ('smoke_hyb', smoke_hyb)):
+            final = mmap_cache_dir / f'{field_name}.npy'
+            tmp = mmap_cache_dir / f'.{field_name}.{os.getpid()}.tmp'
+            try:
+                with open(tmp, 'wb') as f:
+                    np.save(f, np.asarray(arr).astype(np.float16))
+                os.replace(tmp, final)
+            finally:
+                tmp.unlink(missing_ok=True)
+
+    def _attach_cached_smoke(self, fhr_data: ForecastHourData, mmap_cache_dir: Optional[Path]) -> bool:
+        """Map smoke .npy files already in the cache dir onto fhr_data. Returns True if attached."""
+        if fhr_data.smoke_hyb is not None:
+            return True
+        if not mmap_cache_dir or not (mmap_cache_dir / 'smoke_hyb.npy').exists():
+            return False
+        try:
+            fhr_data.smoke_pres_hyb = np.load(mmap_cache_dir / 'smoke_pres_hyb.npy', mmap_mode='r')
+            fhr_data.smoke_hyb = np.load(mmap_cache_dir / 'smoke_hyb.npy', mmap_mode='r')
+            return True
+        except Exception as e:
+            print(f"  Warning: Could not map cached smoke: {e}")
+            fhr_data.smoke_hyb = fhr_data.smoke_pres_hyb = None
+            return False
+
+    def has_cached_smoke(self, grib_file: str) -> bool:
+        """Whether the mmap cache for grib_file already holds smoke fields."""
+        mmap_dir = self._get_mmap_cache_dir(grib_file)
+        return bool(mmap_dir and (mmap_dir / 'smoke_hyb.npy').exists())
+
+    def augment_smoke_cache(self, grib_file: str, nat_file: Optional[str] = None) -> bool:
+        """Add smoke to an existing mmap cache without reconverting the hour.
+
+        Decodes only MASSDEN and hybrid-level pressure from nat_file (default:
+        the nat resolver's file for grib_file; a byte-range subset holding just
+        those two variables works too) and writes them into the cache dir next
+        to the other fields. Any loaded hour for grib_file picks them up in
+        place. Returns True if the cache has smoke afterwards.
+        """
+        mmap_dir = self._get_mmap_cache_dir(grib_file)
+        if not mmap_dir or not (mmap_dir / '_complete').exists():
+            return False
+        if (mmap_dir / 'smoke_hyb.npy').exists():
+            ok = True
+        else:
+            nat_file = nat_file or self._nat_resolver(grib_file)
+            if not nat_file or not Path(nat_file).exists():
+                return False
+            # Stream into temp names, then swap in (pressure first, as _write_smoke_cache does)
+            tmp = {name: mmap_dir / f'.{name}.{os.getpid()}.tmp' for name in ('smoke_hyb', 'smoke_pres_hyb')}
+            try:
+                n_hyb = self._stream_smoke_npy(str(nat_file), tmp['smoke_hyb'], tmp['smoke_pres_hyb'])
+                if not n_hyb:
+                    return False
+                os.replace(tmp['smoke_pres_hyb'], mmap_dir / 'smoke_pres_hyb.npy')
+                os.replace(tmp['smoke_hyb'], mmap_dir / 'smoke_hyb.npy')
+            finally:
+                for path in tmp.values():
+                    path.unlink(missing_ok=True)
+            print(f"  Added PM2.5 smoke on {n_hyb} hybrid levels to {mmap_dir.name}")
+            ok = True
+        for fhr_data in list(self.forecast_hours.values()):
+            if fhr_data.grib_file == grib_file:
+                self._attach_cached_smoke(fhr_data, mmap_dir)
+        return ok
+
     def _backfill_smoke(self, fhr_data: ForecastHourData, grib_file: str, mmap_cache_dir: Optional[Path] = None):
         """Backfill smoke from native file into ForecastHourData and update cache."""
         if fhr_data.smoke_hyb is not None:
             return
+        # Another process (or augment_smoke_cache) may already have added it
+        if self._attach_cached_smoke(fhr_data, mmap_cache_dir):
+            return
         nat_path = self._nat_resolver(grib_file)
         if not nat_path or not Path(nat_path).exists():
             return
@@ -1042,11 +1444,9 @@ class InteractiveCrossSection:
                   f"(max={np.nanmax(smoke_hyb):.1f} μg/m³)")
             # For mmap caches, write smoke .npy files directly into the cache dir
             if mmap_cache_dir and mmap_cache_dir.is_dir():
-                np.save(mmap_cache_dir / 'smoke_hyb.npy', smoke_hyb.astype(np.float16))
-                np.save(mmap_cache_dir / 'smoke_pres_hyb.npy', smoke_pres_hyb.astype(np.float16))
+                self._write_smoke_cache(mmap_cache_dir, smoke_hyb, smoke_pres_hyb)
                 # Re-open as mmap for consistency
-                fhr_data.smoke_hyb = np.load(mmap_cache_dir / 'smoke_hyb.npy', mmap_mode='r')
-                fhr_data.smoke_pres_hyb = np.load(mmap_cache_dir / 'smoke_pres_hyb.npy', mmap_mode='r')
+                self._attach_cached_smoke(fhr_data, mmap_cache_dir)
                 print(f"  Updated mmap cache with smoke data")
             else:
                 fhr_data.smoke_hyb = smoke_hyb
@@ -1077,8 +1477,14 @@ class InteractiveCrossSection:
         total_steps: int,
         field_labels: Dict[str, str],
     ) -> ForecastHourData:
-        """Load isobaric fields + surface pressure using one-pass eccodes scans."""
+        """Load isobaric fields + surface fields via the GRIB message index.
+
+        The sidecar index (core.grib_index) is built on first touch; after that
+        only the wanted messages are read and decoded, optionally across
+        XSECT_DECODE_THREADS threads.
+        """
         import eccodes
+        from core import grib_index
 
         cb(1, total_steps, "Reading Temperature (eccodes)...")
 
@@ -1086,39 +1492,28 @@ class InteractiveCrossSection:
         fields_by_level = {k: {} for k in target_keys}  # shortName -> level -> 2D array
         lats = None
         lons = None
-        scanned = 0
-        matched = 0
 
-        with open(grib_file, 'rb') as f:
-            while True:
-                try:
-                    msg = eccodes.codes_grib_new_from_file(f)
-                except Exception:
-                    break  # Truncated trailing message — treat as EOF
-                if msg is None:
-                    break
-                scanned += 1
-                try:
-                    ltype = eccodes.codes_get(msg, 'typeOfLevel')
-                    if ltype != 'isobaricInhPa':
-                        continue
-
-                    short_name = eccodes.codes_get(msg, 'shortName')
-                    if short_name not in target_keys:
-                        continue
-
-                    level = int(eccodes.codes_get(msg, 'level'))
-                    arr2d = self._grib_msg_to_2d(msg).astype(np.float32, copy=False)
-                    fields_by_level[short_name][level] = arr2d
-                    matched += 1
-
-                    if lats is None or lons is None:
-                        lat_vals = np.asarray(eccodes.codes_get_array(msg, 'latitudes'), dtype=np.float32)
-                        lon_vals = np.asarray(eccodes.codes_get_array(msg, 'longitudes'), dtype=np.float32)
-                        lats = lat_vals.reshape(arr2d.shape)
-                        lons = lon_vals.reshape(arr2d.shape)
-                finally:
-                    eccodes.codes_release(msg)
+        prs_index = grib_index.get_index(grib_file)
+        scanned = len(prs_index)
+        wanted = grib_index.select(
+            prs_index,
+            lambda e: e['typeOfLevel'] == 'isobaricInhPa' and e['shortName'] in target_keys,
+        )
+        decoded = grib_index.decode_entries(
+            grib_file, wanted,
+            lambda msg: self._grib_msg_to_2d(msg).astype(np.float32, copy=False),
+        )
+        for entry, arr2d in zip(wanted, decoded):
+            fields_by_level[entry['shortName']][int(entry['level'])] = arr2d
+        matched = len(wanted)
+
+        if wanted:
+            def _latlon(msg):
+                return (np.asarray(eccodes.codes_get_array(msg, 'latitudes'), dtype=np.float32),
+                        np.asarray(eccodes.codes_get_array(msg, 'longitudes'), dtype=np.float32))
+            lat_vals, lon_vals = grib_index.decode_entries(grib_file, wanted[:1], _latlon, workers=1)[0]
+            lats = lat_vals.reshape(decoded[0].shape)
+            lons = lon_vals.reshape(decoded[0].shape)
 
         temp_by_level = fields_by_level.get('t', {})
         if not temp_by_level:
@@ -1173,61 +1568,69 @@ class InteractiveCrossSection:
             step += 1
 
         cb(11, total_steps, "Reading Surface Fields...")
-        sp_file = self._sfc_resolver(grib_file)
-        sp_scanned = 0
+        sfc_fields, sp_scanned = self._read_surface_fields_eccodes(grib_file)
+        for attr_name, arr2d in sfc_fields.items():
+            setattr(fhr_data, attr_name, arr2d)
 
-        # Map of (shortName, typeOfLevel) -> ForecastHourData attribute
-        _SFC_EXTRACT = {
-            ('sp', 'surface'): 'surface_pressure',
-            ('2t', 'heightAboveGround'): 't2m',
-            ('2d', 'heightAboveGround'): 'd2m',
-            ('10u', 'heightAboveGround'): 'u10m',
-            ('10v', 'heightAboveGround'): 'v10m',
-            ('refc', 'atmosphere'): 'refc',
-            ('refc', 'atmosphereSingleLayer'): 'refc',
-            ('refd', 'atmosphere'): 'refc',
-            ('refd', 'atmosphereSingleLayer'): 'refc',
-            ('cape', 'surface'): 'cape_sfc',
-            ('cin', 'surface'): 'cin_sfc',
-            ('gust', 'surface'): 'gust',
-            ('prate', 'surface'): 'prate',
-            ('vis', 'surface'): 'vis',
-            ('mslet', 'meanSea'): 'mslp',
-            ('prmsl', 'meanSea'): 'mslp',
-            ('mslma', 'meanSea'): 'mslp',
-        }
-        _found_attrs = set()
+        if 'surface_pressure' not in sfc_fields:
+            print("  Warning: Could not load surface pressure via eccodes")
 
-        with open(sp_file, 'rb') as f:
-            while True:
-                try:
-                    msg = eccodes.codes_grib_new_from_file(f)
-                except Exception:
-                    break  # Truncated trailing message — treat as EOF
-                if msg is None:
-                    break
-                sp_scanned += 1
-                try:
-                    short_name = eccodes.codes_get(msg, 'shortName')
-                    ltype = eccodes.codes_get(msg, 'typeOfLevel')
-                    attr_name = _SFC_EXTRACT.get((short_name, ltype))
-                    if attr_name is None or attr_name in _found_attrs:
-                        continue
+        print(f"  eccodes indexed read: prs_msgs={scanned}, matched={matched}, "
+              f"sfc_msgs={sp_scanned}, sfc_matched={len(sfc_fields)}")
+        return fhr_data
 
-                    arr2d = self._grib_msg_to_2d(msg).astype(np.float32, copy=False)
-                    if attr_name == 'surface_pressure':
-                        if np.isfinite(arr2d).any() and np.nanmax(arr2d) > 2000:
-                            arr2d = arr2d / 100.0
-                    setattr(fhr_data, attr_name, arr2d)
-                    _found_attrs.add(attr_name)
-                finally:
-                    eccodes.codes_release(msg)
+    # Map of (shortName, typeOfLevel) -> ForecastHourData attribute for surface fields
+    _SFC_EXTRACT = {
+        ('sp', 'surface'): 'surface_pressure',
+        ('2t', 'heightAboveGround'): 't2m',
+        ('2d', 'heightAboveGround'): 'd2m',
+        ('10u', 'heightAboveGround'): 'u10m',
+        ('10v', 'heightAboveGround'): 'v10m',
+        ('refc', 'atmosphere'): 'refc',
+        ('refc', 'atmosphereSingleLayer'): 'refc',
+        ('refd', 'atmosphere'): 'refc',
+        ('refd', 'atmosphereSingleLayer'): 'refc',
+        ('cape', 'surface'): 'cape_sfc',
+        ('cin', 'surface'): 'cin_sfc',
+        ('gust', 'surface'): 'gust',
+        ('prate', 'surface'): 'prate',
+        ('vis', 'surface'): 'vis',
+        ('mslet', 'meanSea'): 'mslp',
+        ('prmsl', 'meanSea'): 'mslp',
+        ('mslma', 'meanSea'): 'mslp',
+    }
 
-        if 'surface_pressure' not in _found_attrs:
-            print("  Warning: Could not load surface pressure via eccodes")
+    def _read_surface_fields_eccodes(self, grib_file: str) -> Tuple[Dict[str, np.ndarray], int]:
+        """Decode the 2D surface fields for grib_file. Returns ({attr: array}, messages scanned).
 
-        print(f"  eccodes core scan: prs_msgs={scanned}, matched={matched}, sfc_msgs={sp_scanned}")
-        return fhr_data
+        surface_pressure is converted to hPa.
+        """
+        from core import grib_index
+
+        sp_file = self._sfc_resolver(grib_file)
+        found = set()
+
+        # First message in file order wins for each attribute (e.g. refc vs refd)
+        sfc_index = grib_index.get_index(sp_file)
+        sfc_wanted = []
+        for entry in sfc_index:
+            attr_name = self._SFC_EXTRACT.get((entry['shortName'], entry['typeOfLevel']))
+            if attr_name is None or attr_name in found:
+                continue
+            sfc_wanted.append((entry, attr_name))
+            found.add(attr_name)
+
+        sfc_decoded = grib_index.decode_entries(
+            sp_file, [e for e, _ in sfc_wanted],
+            lambda msg: self._grib_msg_to_2d(msg).astype(np.float32, copy=False),
+        )
+        fields = {}
+        for (_, attr_name), arr2d in zip(sfc_wanted, sfc_decoded):
+            if attr_name == 'surface_pressure':
+                if np.isfinite(arr2d).any() and np.nanmax(arr2d) > 2000:
+                    arr2d = arr2d / 100.0
+            fields[attr_name] = arr2d
+        return fields, len(sfc_index)
 
     def _load_core_fields_cfgrib(
         self,
@@ -1399,6 +1802,7 @@ class InteractiveCrossSection:
                             print(f"  Migrated to mmap, removed legacy .npz")
                     except Exception as e:
                         print(f"  Warning: Could not migrate to mmap: {e}")
+                self._attach_grid(fhr_data)
                 fhr_data.grib_file = grib_file
                 self.forecast_hours[forecast_hour] = fhr_data
                 duration = time.perf_counter() - start
@@ -1406,6 +1810,24 @@ class InteractiveCrossSection:
                 cb(2, 2, "Done")
                 return True
 
+        # --- Streaming GRIB → mmap cache (bounded memory) ---
+        if self._stream_convert_enabled(mmap_dir):
+            try:
+                print(f"Converting F{forecast_hour:02d} from {Path(grib_file).name} (streaming)...")
+                start = time.perf_counter()
+                if not self._stream_grib_to_mmap_cache(grib_file, forecast_hour, mmap_dir, cb, total_steps=13):
+                    return False
+                fhr_data = self._load_from_mmap_cache(mmap_dir)
+                if fhr_data is not None:
+                    fhr_data.grib_file = grib_file
+                    self.forecast_hours[forecast_hour] = fhr_data
+                    duration = time.perf_counter() - start
+                    print(f"  Converted F{forecast_hour:02d} in {duration:.1f}s, cached to {mmap_dir.name}/ "
+                          f"(mmap, {fhr_data.memory_usage_mb():.0f} MB heap)")
+                    return True
+            except Exception as e:
+                print(f"  Warning: streaming conversion failed ({e}), loading in memory")
+
         # --- Load from GRIB ---
         field_labels = {
             't': 'Temperature', 'u': 'U-Wind', 'v': 'V-Wind', 'r': 'RH',
@@ -1482,6 +1904,7 @@ class InteractiveCrossSection:
                 return False
 
             # Store
+            self._attach_grid(fhr_data)
             fhr_data.grib_file = grib_file
             self.forecast_hours[forecast_hour] = fhr_data
 
@@ -1587,7 +2010,7 @@ class InteractiveCrossSection:
                     try:
                         result = future.result()
                         if result is not None:
-                            self.forecast_hours[result.forecast_hour] = result
+                            self.forecast_hours[result.forecast_hour] = self._attach_grid(result)
                     except Exception as e:
                         print(f"Error loading F{fhr:02d}: {e}")
 
@@ -1788,16 +2211,11 @@ class InteractiveCrossSection:
 
         Returns dict of field_name -> (n_levels, n_points) arrays.
         """
-        from scipy.interpolate import RegularGridInterpolator
-
-        n_points = len(path_lats)
-        pts = np.column_stack([path_lats, path_lons])
+        from core.path_weights import bilinear_weights
 
         climo_lats = climo.lats if climo.lats.ndim == 1 else climo.lats[:, 0]
         climo_lons = climo.lons if climo.lons.ndim == 1 else climo.lons[0, :]
-
-        # Ensure lats are ascending for RegularGridInterpolator
-        lat_ascending = climo_lats[0] < climo_lats[-1]
+        weights = bilinear_weights(climo_lats, climo_lons, path_lats, path_lons)
 
         result = {}
         for field_name in ('temperature', 'u_wind', 'v_wind', 'rh', 'omega',
@@ -1805,23 +2223,10 @@ class InteractiveCrossSection:
             field_3d = getattr(climo, field_name, None)
             if field_3d is None:
                 continue
-            n_levels = field_3d.shape[0]
-            interp_result = np.full((n_levels, n_points), np.nan)
-            for lev in range(n_levels):
-                lev_data = field_3d[lev]
-                lat_coords = climo_lats
-                if not lat_ascending:
-                    lev_data = lev_data[::-1, :]
-                    lat_coords = climo_lats[::-1]
-                try:
-                    interp = RegularGridInterpolator(
-                        (lat_coords, climo_lons), lev_data,
-                        method='linear', bounds_error=False, fill_value=np.nan
-                    )
-                    interp_result[lev, :] = interp(pts)
-                except Exception:
-                    pass
-            result[field_name] = interp_result
+            try:
+                result[field_name] = weights.apply_3d(field_3d)
+            except Exception:
+                result[field_name] = np.full((field_3d.shape[0], len(path_lats)), np.nan)
 
         return result
 
@@ -1833,115 +2238,15 @@ class InteractiveCrossSection:
         """
         if style not in ANOMALY_STYLES:
             return data
+        from core import derived_fields
 
+        name, scale = ANOMALY_FIELDS[style]
         pressure_levels = data.get('pressure_levels')
-
-        if style == 'temp':
-            if 'temp_c' in data and 'temperature' in climo_path:
-                climo_c = climo_path['temperature'] - 273.15
-                data['anomaly'] = data['temp_c'] - climo_c
-
-        elif style == 'wind_speed':
-            if 'u_wind' in data and 'v_wind' in data:
-                fcst_wspd = np.sqrt(data['u_wind']**2 + data['v_wind']**2) * 1.944
-                if 'u_wind' in climo_path and 'v_wind' in climo_path:
-                    climo_wspd = np.sqrt(climo_path['u_wind']**2 + climo_path['v_wind']**2) * 1.944
-                    data['anomaly'] = fcst_wspd - climo_wspd
-
-        elif style == 'rh':
-            if 'rh' in data and 'rh' in climo_path:
-                data['anomaly'] = data['rh'] - climo_path['rh']
-
-        elif style == 'omega':
-            if 'omega' in data and 'omega' in climo_path:
-                data['anomaly'] = (data['omega'] - climo_path['omega']) * 36.0
-
-        elif style == 'theta_e':
-            if 'theta_e' in data and 'temperature' in climo_path and 'specific_humidity' in climo_path:
-                climo_T = climo_path['temperature']
-                climo_q = climo_path['specific_humidity']
-                if pressure_levels is not None:
-                    climo_theta = np.zeros_like(climo_T)
-                    for lev_idx, p in enumerate(pressure_levels):
-                        if lev_idx < climo_T.shape[0]:
-                            climo_theta[lev_idx] = climo_T[lev_idx] * (1000.0 / p) ** 0.286
-                    Lv, cp = 2.5e6, 1004.0
-                    with np.errstate(invalid='ignore', divide='ignore'):
-                        climo_theta_e = climo_theta * np.exp(Lv * climo_q / (cp * climo_T))
-                    data['anomaly'] = data['theta_e'] - climo_theta_e
-
-        elif style == 'q':
-            if 'specific_humidity' in data and 'specific_humidity' in climo_path:
-                data['anomaly'] = (data['specific_humidity'] - climo_path['specific_humidity']) * 1000
-
-        elif style == 'vorticity':
-            if 'vorticity' in data and 'vorticity' in climo_path:
-                data['anomaly'] = (data['vorticity'] - climo_path['vorticity']) * 1e5
-
-        elif style == 'shear':
-            if 'shear' in data and 'u_wind' in climo_path and 'v_wind' in climo_path and 'geopotential_height' in climo_path:
-                gh_c = climo_path['geopotential_height']
-                u_c, v_c = climo_path['u_wind'], climo_path['v_wind']
-                n_levels = gh_c.shape[0]
-                climo_shear = np.full_like(gh_c, np.nan)
-                for lev in range(n_levels - 1):
-                    dz = gh_c[lev, :] - gh_c[lev + 1, :]
-                    dz = np.where(np.abs(dz) < 10, np.nan, dz)
-                    du = u_c[lev, :] - u_c[lev + 1, :]
-                    dv = v_c[lev, :] - v_c[lev + 1, :]
-                    dwind = np.sqrt(du**2 + dv**2)
-                    climo_shear[lev, :] = (dwind / np.abs(dz)) * 1000
-                climo_shear[-1, :] = climo_shear[-2, :] if n_levels > 1 else 0
-                data['anomaly'] = data['shear'] - climo_shear
-
-        elif style == 'lapse_rate':
-            if 'lapse_rate' in data and 'temperature' in climo_path and 'geopotential_height' in climo_path:
-                T_c = climo_path['temperature']
-                gh_c = climo_path['geopotential_height']
-                n_levels = T_c.shape[0]
-                climo_lapse = np.full_like(T_c, np.nan)
-                for lev in range(n_levels - 1):
-                    dz = (gh_c[lev, :] - gh_c[lev + 1, :]) / 1000.0
-                    dz = np.where(np.abs(dz) < 0.01, np.nan, dz)
-                    dT = T_c[lev, :] - T_c[lev + 1, :]
-                    climo_lapse[lev, :] = -dT / dz
-                climo_lapse[-1, :] = climo_lapse[-2, :] if n_levels > 1 else 0
-                data['anomaly'] = data['lapse_rate'] - climo_lapse
-
-        elif style == 'wetbulb':
-            if 'wetbulb' in data and 'temperature' in climo_path and 'rh' in climo_path:
-                climo_tc = climo_path['temperature'] - 273.15
-                climo_rh = climo_path['rh']
-                climo_tw = (climo_tc * np.arctan(0.151977 * np.sqrt(climo_rh + 8.313659))
-                           + np.arctan(climo_tc + climo_rh)
-                           - np.arctan(climo_rh - 1.676331)
-                           + 0.00391838 * (climo_rh ** 1.5) * np.arctan(0.023101 * climo_rh)
-                           - 4.686035)
-                data['anomaly'] = data['wetbulb'] - climo_tw
-
-        elif style == 'vpd':
-            if 'vpd' in data and 'temperature' in climo_path and 'rh' in climo_path:
-                climo_tc = climo_path['temperature'] - 273.15
-                climo_rh = climo_path['rh']
-                climo_es = 6.1078 * np.exp(17.27 * climo_tc / (climo_tc + 237.3))
-                climo_vpd = climo_es * (1.0 - climo_rh / 100.0)
-                data['anomaly'] = data['vpd'] - climo_vpd
-
-        elif style == 'dewpoint_dep':
-            if 'dewpoint_dep' in data and 'temperature' in climo_path and 'dew_point' in climo_path:
-                climo_tc = climo_path['temperature'] - 273.15
-                climo_td_c = climo_path['dew_point'] - 273.15
-                climo_dd = climo_tc - climo_td_c
-                data['anomaly'] = data['dewpoint_dep'] - climo_dd
-
-        elif style == 'moisture_transport':
-            if 'moisture_transport' in data and 'specific_humidity' in climo_path and 'u_wind' in climo_path and 'v_wind' in climo_path:
-                climo_q = climo_path['specific_humidity']
-                climo_u = climo_path['u_wind']
-                climo_v = climo_path['v_wind']
-                climo_ws = np.sqrt(climo_u**2 + climo_v**2)
-                climo_mt = climo_q * 1000.0 * climo_ws
-                data['anomaly'] = data['moisture_transport'] - climo_mt
+        fcst = derived_fields.compute(name, data, pressure_levels)
+        # climo_path is per-request, so derived results cached into it are throwaway
+        climo = derived_fields.compute(name, climo_path, pressure_levels)
+        if fcst is not None and climo is not None and fcst.shape == climo.shape:
+            data['anomaly'] = (fcst - climo) * scale
 
         return data
 
@@ -1962,6 +2267,10 @@ class InteractiveCrossSection:
         temp_cmap: str = "standard",
         metadata: Dict = None,
         anomaly: bool = False,
+        renderer: str = "mpl",
+        marker: Tuple[float, float] = None,
+        marker_label: str = None,
+        markers: List[Dict] = None,
     ) -> Optional[bytes]:
         """Generate cross-section from pre-loaded data.
 
@@ -1980,9 +2289,15 @@ class InteractiveCrossSection:
             y_top: Top of plot in hPa (100=full atmos, 300=mid, 500=low, 700=boundary layer)
             units: 'km' or 'mi' for distance axis
             terrain_data: Optional dict with 'surface_pressure', 'surface_pressure_hires',
-                         'distances_hires' keys to override terrain (for consistent GIF frames)
+                         'distances_hires' keys to override terrain (for consistent GIF frames),
+                         as returned by get_terrain(), or a TerrainRef to one
             temp_cmap: Temperature colormap choice ('green_purple', 'white_zero', 'nws_ndfd')
             anomaly: If True, subtract climatological mean and use diverging colormap
+            renderer: 'mpl' (matplotlib, default) or 'fast' (core.fast_render raster
+                      renderer for animation frames; styles it can't draw, the
+                      isentropic axis and frames with POI markers use matplotlib)
+            marker, marker_label: Single POI (lat, lon) and its label
+            markers: POIs as [{'lat', 'lon', 'label'}, ...] (takes precedence over marker)
 
         Returns:
             PNG image bytes, or data dict if return_image=False
@@ -1996,18 +2311,7 @@ class InteractiveCrossSection:
         # Get pre-loaded data
         fhr_data = self.forecast_hours[forecast_hour]
 
-        # Adaptive n_points: ~1 point per 3km (HRRR native), clamped to [50, 1000]
-        if n_points <= 0:
-            lat1, lon1 = np.radians(start_point[0]), np.radians(start_point[1])
-            lat2, lon2 = np.radians(end_point[0]), np.radians(end_point[1])
-            dlat, dlon = lat2 - lat1, lon2 - lon1
-            a = np.sin(dlat/2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon/2)**2
-            dist_km = 6371 * 2 * np.arcsin(np.sqrt(a))
-            n_points = int(np.clip(dist_km / 3.0, 50, 1000))
-
-        # Create path
-        path_lats = np.linspace(start_point[0], end_point[0], n_points)
-        path_lons = np.linspace(start_point[1], end_point[1], n_points)
+        path_lats, path_lons = self._path_points(start_point, end_point, n_points)
 
         # Interpolate all needed fields to path
         data = self._interpolate_to_path(fhr_data, path_lats, path_lons, style)
@@ -2019,6 +2323,8 @@ class InteractiveCrossSection:
 
         # Override terrain for consistent GIF frames
         ref_pressure_levels = None
+        if isinstance(terrain_data, TerrainRef):
+            terrain_data = self.resolve_terrain(terrain_data)
         if terrain_data is not None:
             for key in ('surface_pressure', 'surface_pressure_hires', 'distances_hires'):
                 if key in terrain_data:
@@ -2058,14 +2364,92 @@ class InteractiveCrossSection:
                         'years': climo.years,
                     }
 
-        # Render
-        img_bytes = self._render_cross_section(data, style, dpi, metadata, y_axis, vscale, y_top, units=units, temp_cmap=temp_cmap, ref_pressure_levels=ref_pressure_levels, anomaly=anomaly, climo_info=climo_info)
+        if markers:
+            pois = [(float(m['lat']), float(m['lon']), str(m.get('label', ''))) for m in markers]
+        elif marker is not None:
+            pois = [(float(marker[0]), float(marker[1]), marker_label or '')]
+        else:
+            pois = []
+
+        # Render (the raster renderer has no isentropic axis or POI labels)
+        from core import fast_render
+        if renderer == 'fast' and fast_render.supports(style) and y_axis != 'isentropic' and not pois:
+            img_bytes = fast_render.render_frame(data, style, metadata, y_axis, vscale, y_top, units=units, temp_cmap=temp_cmap, ref_pressure_levels=ref_pressure_levels, anomaly=anomaly)
+        else:
+            img_bytes = self._render_cross_section(data, style, dpi, metadata, y_axis, vscale, y_top, units=units, temp_cmap=temp_cmap, ref_pressure_levels=ref_pressure_levels, anomaly=anomaly, climo_info=climo_info, pois=pois)
 
         t_total = time.perf_counter() - start
         print(f"Cross-section generated in {t_total:.3f}s (interp: {t_interp:.3f}s)")
 
         return img_bytes
 
+    @staticmethod
+    def _path_points(start_point: Tuple[float, float], end_point: Tuple[float, float],
+                     n_points: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+        """Straight path between two points; n_points <= 0 picks ~1 point per 3 km."""
+        # Adaptive n_points: ~1 point per 3km (HRRR native), clamped to [50, 1000]
+        if n_points <= 0:
+            lat1, lon1 = np.radians(start_point[0]), np.radians(start_point[1])
+            lat2, lon2 = np.radians(end_point[0]), np.radians(end_point[1])
+            dlat, dlon = lat2 - lat1, lon2 - lon1
+            a = np.sin(dlat/2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon/2)**2
+            dist_km = 6371 * 2 * np.arcsin(np.sqrt(a))
+            n_points = int(np.clip(dist_km / 3.0, 50, 1000))
+
+        path_lats = np.linspace(start_point[0], end_point[0], n_points)
+        path_lons = np.linspace(start_point[1], end_point[1], n_points)
+        return path_lats, path_lons
+
+    def get_terrain(
+        self,
+        start_point: Tuple[float, float],
+        end_point: Tuple[float, float],
+        forecast_hour: int,
+        n_points: int = 0,
+    ) -> Optional[Dict[str, Any]]:
+        """Terrain along a line from one loaded FHR, reading only surface_pressure.
+
+        Returns the terrain_data dict get_cross_section accepts
+        (surface_pressure, surface_pressure_hires, distances_hires,
+        pressure_levels), or None if the hour or its surface pressure is
+        missing. Shares the path-cache entry of the same line and FHR.
+        """
+        from core.path_cache import get_cache as get_path_cache
+
+        fhr_data = self.forecast_hours.get(forecast_hour)
+        if fhr_data is None or fhr_data.surface_pressure is None:
+            return None
+        path_lats, path_lons = self._path_points(start_point, end_point, n_points)
+        geom = self._path_geometry(fhr_data.lats, fhr_data.lons, path_lats, path_lons)
+        path_cache = get_path_cache()
+        cache_key = self._path_cache_key(fhr_data, geom)
+        fields = path_cache.fields(cache_key)
+        self._path_terrain(fhr_data, geom, fields)
+        path_cache.account(cache_key)
+        return {
+            'surface_pressure': fields['surface_pressure'],
+            'surface_pressure_hires': fields['surface_pressure_hires'],
+            'distances_hires': geom.distances_hires,
+            'pressure_levels': fhr_data.pressure_levels,
+        }
+
+    def resolve_terrain(self, ref: TerrainRef) -> Optional[Dict[str, Any]]:
+        """get_terrain() for a TerrainRef, loading its FHR from the mmap cache if needed."""
+        if ref.forecast_hour not in self.forecast_hours:
+            if not ref.grib_file or not self.load_forecast_hour(ref.grib_file, ref.forecast_hour):
+                return None
+        return self.get_terrain(ref.start_point, ref.end_point, ref.forecast_hour, ref.n_points)
+
+    @staticmethod
+    def _path_terrain(fhr_data: ForecastHourData, geom, fields: Dict[str, np.ndarray]) -> bool:
+        """Fill fields with surface pressure on the path and the hi-res terrain path."""
+        if fhr_data.surface_pressure is None:
+            return False
+        if fields.get('surface_pressure') is None:
+            fields['surface_pressure_hires'] = geom.weights_hires.apply_2d(fhr_data.surface_pressure)
+            fields['surface_pressure'] = geom.weights.apply_2d(fhr_data.surface_pressure)
+        return True
+
     def _interpolate_to_path(
         self,
         fhr_data: ForecastHourData,
@@ -2074,155 +2458,78 @@ class InteractiveCrossSection:
         style: str,
     ) -> Dict[str, Any]:
         """Interpolate 3D fields to cross-section path."""
-        from scipy.spatial import cKDTree
-        from scipy.interpolate import RegularGridInterpolator
+        from core import derived_fields
+        from core.path_cache import get_cache as get_path_cache
 
-        n_points = len(path_lats)
         n_levels = len(fhr_data.pressure_levels)
 
         lats_grid = fhr_data.lats
         lons_grid = fhr_data.lons
 
-        def _ensure_float32(arr):
-            """Cast float16/memmap to float32 for scipy interpolation."""
-            if arr.dtype == np.float16:
-                return np.array(arr, dtype=np.float32)
-            if isinstance(arr, np.memmap):
-                return np.array(arr)  # read from disk into RAM
-            return arr
+        # Path geometry (weights, distances, terrain path) is cached per grid + line
+        geom = self._path_geometry(lats_grid, lons_grid, path_lats, path_lons)
+        weights = geom.weights
+
+        def interp_3d(field_3d):
+            # Read only the cross-section columns from mmap — avoids
+            # reading entire 2D levels (3.8 MB each) when we need <1 KB
+            return weights.apply_3d(field_3d, n_levels)
+
+        # Path-interpolated (and derived) fields for this model/cycle/FHR + line,
+        # shared by every style and render setting requested on it
+        path_cache = get_path_cache()
+        cache_key = self._path_cache_key(fhr_data, geom)
+        fields = path_cache.fields(cache_key)
+        p_levels = fhr_data.pressure_levels
+
+        def get_3d(name):
+            if fields.get(name) is None:
+                arr = getattr(fhr_data, name, None)
+                if arr is None:
+                    return None
+                fields[name] = interp_3d(arr)
+            return fields[name]
+
+        def interp_many(field_names):
+            """Batched get_3d: one gather per field for every name that is loaded."""
+            out = {}
+            for name in field_names:
+                arr = get_3d(name)
+                if arr is not None:
+                    out[name] = arr
+            return out
 
-        # Build interpolator (curvilinear vs regular grid)
-        if lats_grid.ndim == 2:
-            # Curvilinear grid - use KDTree (cached per grid)
-            grid_id = id(lats_grid)
-            if self._kdtree_cache is not None and self._kdtree_grid_id == grid_id:
-                tree = self._kdtree_cache
-            else:
-                src_pts = np.column_stack([lats_grid.ravel(), lons_grid.ravel()])
-                tree = cKDTree(src_pts)
-                self._kdtree_cache = tree
-                self._kdtree_grid_id = grid_id
-            tgt_pts = np.column_stack([path_lats, path_lons])
-            _, indices = tree.query(tgt_pts, k=1)
-
-            def interp_3d(field_3d):
-                result = np.full((n_levels, n_points), np.nan, dtype=np.float32)
-                for lev in range(min(field_3d.shape[0], n_levels)):
-                    # Read only the cross-section points from mmap — avoids
-                    # reading entire 2D level (3.8 MB) when we need <1 KB
-                    vals = field_3d[lev].ravel()[indices]
-                    result[lev, :] = vals if vals.dtype == np.float32 else vals.astype(np.float32)
-                return result
-
-            def interp_2d(field_2d):
-                vals = field_2d.ravel()[indices]
-                return vals if vals.dtype == np.float32 else vals.astype(np.float32)
-        else:
-            # Regular grid - use bilinear interpolation
-            lats_1d = lats_grid if lats_grid.ndim == 1 else lats_grid[:, 0]
-            lons_1d = lons_grid if lons_grid.ndim == 1 else lons_grid[0, :]
-
-            # Handle GFS-style 0-360 longitudes: convert to -180..180
-            _lon_shifted = False
-            if np.any(lons_1d > 180):
-                lons_1d = np.where(lons_1d > 180, lons_1d - 360, lons_1d)
-                _lon_shifted = True
-
-            # Ensure monotonically ascending for both axes
-            _lat_flip = False
-            if lats_1d.size > 1 and lats_1d[0] > lats_1d[-1]:
-                lats_1d = lats_1d[::-1]
-                _lat_flip = True
-
-            _lon_sort_idx = None
-            if lons_1d.size > 1 and not np.all(np.diff(lons_1d) > 0):
-                _lon_sort_idx = np.argsort(lons_1d)
-                lons_1d = lons_1d[_lon_sort_idx]
-
-            pts = np.column_stack([path_lats, path_lons])
-
-            def _reorder_field(field):
-                """Flip/sort a 2D field to match the reordered lat/lon axes."""
-                f = field
-                if _lat_flip:
-                    f = f[::-1, :]
-                if _lon_sort_idx is not None:
-                    f = f[:, _lon_sort_idx]
-                return f
-
-            def interp_3d(field_3d):
-                result = np.full((n_levels, n_points), np.nan, dtype=np.float32)
-                for lev in range(min(field_3d.shape[0], n_levels)):
-                    level_data = _reorder_field(_ensure_float32(field_3d[lev]))
-                    interp = RegularGridInterpolator(
-                        (lats_1d, lons_1d), level_data,
-                        method='linear', bounds_error=False, fill_value=np.nan
-                    )
-                    result[lev, :] = interp(pts)
-                return result
-
-            def interp_2d(field_2d):
-                level_data = _reorder_field(_ensure_float32(field_2d))
-                interp = RegularGridInterpolator(
-                    (lats_1d, lons_1d), level_data,
-                    method='linear', bounds_error=False, fill_value=np.nan
-                )
-                return interp(pts)
+        def derived(name):
+            return derived_fields.compute(name, fields, p_levels)
 
         # Build result dict
         result = {
             'lats': path_lats,
             'lons': path_lons,
-            'distances': self._calculate_distances(path_lats, path_lons),
-            'pressure_levels': fhr_data.pressure_levels,
+            'distances': geom.distances,
+            'pressure_levels': p_levels,
         }
 
-        # Always interpolate base fields
-        if fhr_data.temperature is not None:
-            result['temperature'] = interp_3d(fhr_data.temperature)
-            result['temp_c'] = result['temperature'] - 273.15
-
-        if fhr_data.theta is not None:
-            result['theta'] = interp_3d(fhr_data.theta)
-
-        if fhr_data.u_wind is not None:
-            result['u_wind'] = interp_3d(fhr_data.u_wind)
-
-        if fhr_data.v_wind is not None:
-            result['v_wind'] = interp_3d(fhr_data.v_wind)
-
-        if fhr_data.surface_pressure is not None:
-            result['surface_pressure'] = interp_2d(fhr_data.surface_pressure)
-
-            # Extract terrain with enough points for smooth visualization
-            # Use bilinear interpolation between HRRR's 3km grid points
-            total_dist_km = result['distances'][-1]
-            # ~1.5km spacing gives smoother terrain while still following HRRR data
-            terrain_res = max(100, int(total_dist_km / 1.5))
-            path_lats_hires = np.linspace(path_lats[0], path_lats[-1], terrain_res)
-            path_lons_hires = np.linspace(path_lons[0], path_lons[-1], terrain_res)
-
-            if lats_grid.ndim == 2:
-                # Curvilinear - use same tree, read only needed points from mmap
-                tgt_pts_hires = np.column_stack([path_lats_hires, path_lons_hires])
-                _, indices_hires = tree.query(tgt_pts_hires, k=1)
-                sp_hires = fhr_data.surface_pressure.ravel()[indices_hires].astype(np.float32)
-            else:
-                # Regular grid - bilinear interpolation (needs full 2D array, but GFS grid is small)
-                sp_f32 = _ensure_float32(fhr_data.surface_pressure)
-                pts_hires = np.column_stack([path_lats_hires, path_lons_hires])
-                interp_sp = RegularGridInterpolator(
-                    (lats_1d, lons_1d), _reorder_field(sp_f32),
-                    method='linear', bounds_error=False, fill_value=np.nan
-                )
-                sp_hires = interp_sp(pts_hires)
+        # Always interpolate base fields, plus whatever extra 3D fields the
+        # style reads directly or through its derived-field kernel
+        base = interp_many(dict.fromkeys(
+            ('temperature', 'theta', 'u_wind', 'v_wind', 'geopotential_height')
+            + self._STYLE_EXTRA_FIELDS.get(style, ())
+            + derived_fields.base_inputs((style,))))
+        if 'temperature' in base:
+            result['temperature'] = base['temperature']
+            result['temp_c'] = derived('temp_c')
+
+        for name in ('theta', 'u_wind', 'v_wind'):
+            if name in base:
+                result[name] = base[name]
 
-            result['surface_pressure_hires'] = sp_hires
-            result['distances_hires'] = self._calculate_distances(path_lats_hires, path_lons_hires)
+        if self._path_terrain(fhr_data, geom, fields):
+            result['surface_pressure'] = fields['surface_pressure']
 
-        # Style-specific fields
-        if style in ['rh', 'q'] and fhr_data.rh is not None:
-            result['rh'] = interp_3d(fhr_data.rh)
+            # Terrain on a denser (~1.5 km) path for smooth visualization
+            result['surface_pressure_hires'] = fields['surface_pressure_hires']
+            result['distances_hires'] = geom.distances_hires
 
         if style == 'smoke':
             # Lazy smoke backfill: load from wrfnat on first smoke request
@@ -2233,145 +2540,49 @@ class InteractiveCrossSection:
             if fhr_data.smoke_hyb is not None:
                 # Interpolate smoke and its pressure coordinate along path on native hybrid levels
                 # interp_3d works on any (n_levels, ny, nx) array — hybrid levels work the same way
-                result['smoke_hyb'] = interp_3d(fhr_data.smoke_hyb)  # (n_hyb, n_points)
-                result['smoke_pres_hyb'] = interp_3d(fhr_data.smoke_pres_hyb)  # (n_hyb, n_points)
-
-        if style == 'omega' and fhr_data.omega is not None:
-            result['omega'] = interp_3d(fhr_data.omega)
-
-        if style == 'vorticity' and fhr_data.vorticity is not None:
-            result['vorticity'] = interp_3d(fhr_data.vorticity)
-
-        if style in ['cloud', 'cloud_total', 'icing'] and fhr_data.cloud is not None:
-            result['cloud'] = interp_3d(fhr_data.cloud)
-
+                if fields.get('smoke_hyb') is None:
+                    fields['smoke_pres_hyb'] = interp_3d(fhr_data.smoke_pres_hyb)  # (n_hyb, n_points)
+                    fields['smoke_hyb'] = interp_3d(fhr_data.smoke_hyb)  # (n_hyb, n_points)
+                result['smoke_hyb'] = fields['smoke_hyb']
+                result['smoke_pres_hyb'] = fields['smoke_pres_hyb']
+
+        # Raw 3D fields each style exposes alongside its primary field
+        raw_fields = []
+        if style in ('rh', 'q', 'wetbulb', 'vpd', 'fire_wx'):
+            raw_fields.append('rh')
+        if style in ('q', 'theta_e', 'moisture_transport'):
+            raw_fields.append('specific_humidity')
+        if style in ('vorticity', 'pv'):
+            raw_fields.append('vorticity')
+        if style in ('cloud', 'cloud_total', 'icing'):
+            raw_fields.append('cloud')
+        if style == 'omega':
+            raw_fields.append('omega')
         if style == 'cloud_total':
-            for hydro_key in ['ice', 'rain', 'snow', 'graupel']:
-                arr = getattr(fhr_data, hydro_key, None)
-                if arr is not None:
-                    result[hydro_key] = interp_3d(arr)
-
-        if style == 'theta_e' and fhr_data.specific_humidity is not None:
-            q = interp_3d(fhr_data.specific_humidity)
-            result['specific_humidity'] = q
-            # Compute theta_e
-            T = result['temperature']
-            theta = result['theta']
-            Lv = 2.5e6
-            cp = 1004.0
-            theta_e = np.zeros_like(T)
-            for lev in range(len(fhr_data.pressure_levels)):
-                theta_e[lev, :] = theta[lev, :] * np.exp(Lv * q[lev, :] / (cp * T[lev, :]))
-            result['theta_e'] = theta_e
-
-        if style == 'q' and fhr_data.specific_humidity is not None:
-            result['specific_humidity'] = interp_3d(fhr_data.specific_humidity)
-
+            raw_fields.extend(('ice', 'rain', 'snow', 'graupel'))
         # Always extract geopotential_height for height-axis display option
-        if fhr_data.geopotential_height is not None:
-            gh = interp_3d(fhr_data.geopotential_height)
-            result['geopotential_height'] = gh
-
-            if style == 'shear':
-                # Compute shear
-                u = result.get('u_wind')
-                v = result.get('v_wind')
-                if u is not None and v is not None:
-                    shear = np.full((n_levels, n_points), np.nan)
-                    for lev in range(n_levels - 1):
-                        dz = gh[lev, :] - gh[lev + 1, :]
-                        dz = np.where(np.abs(dz) < 10, np.nan, dz)
-                        du = u[lev, :] - u[lev + 1, :]
-                        dv = v[lev, :] - v[lev + 1, :]
-                        dwind = np.sqrt(du**2 + dv**2)
-                        shear[lev, :] = (dwind / np.abs(dz)) * 1000
-                    shear[-1, :] = shear[-2, :]
-                    result['shear'] = shear
-
-            if style == 'lapse_rate':
-                T = result['temperature']
-                lapse = np.full((n_levels, n_points), np.nan)
-                for lev in range(n_levels - 1):
-                    dz = (gh[lev, :] - gh[lev + 1, :]) / 1000.0
-                    dz = np.where(np.abs(dz) < 0.01, np.nan, dz)
-                    dT = T[lev, :] - T[lev + 1, :]
-                    lapse[lev, :] = -dT / dz
-                lapse[-1, :] = lapse[-2, :]
-                result['lapse_rate'] = lapse
-
-        if style == 'wetbulb' and fhr_data.rh is not None:
-            T_c = result['temp_c']
-            RH = interp_3d(fhr_data.rh)
-            result['rh'] = RH
-            Tw = (T_c * np.arctan(0.151977 * np.sqrt(RH + 8.313659))
-                  + np.arctan(T_c + RH)
-                  - np.arctan(RH - 1.676331)
-                  + 0.00391838 * (RH ** 1.5) * np.arctan(0.023101 * RH)
-                  - 4.686035)
-            result['wetbulb'] = Tw
-
-        if style == 'icing' and fhr_data.cloud is not None:
-            T_c = result['temp_c']
-            cloud = result['cloud'] * 1000  # g/kg
-            icing = np.where((T_c >= -20) & (T_c <= 0), cloud, 0)
-            result['icing'] = icing
-
-        if style == 'vpd' and fhr_data.rh is not None:
-            RH = interp_3d(fhr_data.rh)
-            result['rh'] = RH
-            T_c = result['temp_c']
-            # Tetens formula for saturation vapor pressure (hPa)
-            es = 6.1078 * np.exp(17.27 * T_c / (T_c + 237.3))
-            result['vpd'] = es * (1.0 - RH / 100.0)
-
-        if style == 'dewpoint_dep' and fhr_data.dew_point is not None:
-            td = interp_3d(fhr_data.dew_point)
-            td_c = td - 273.15
-            result['dewpoint_dep'] = result['temp_c'] - td_c
-
-        if style == 'moisture_transport' and fhr_data.specific_humidity is not None:
-            q = interp_3d(fhr_data.specific_humidity)
-            result['specific_humidity'] = q
-            u = result.get('u_wind')
-            v = result.get('v_wind')
-            if u is not None and v is not None:
-                wind_speed = np.sqrt(u**2 + v**2)
-                result['moisture_transport'] = q * 1000.0 * wind_speed  # g/kg * m/s
-
-        if style == 'pv' and fhr_data.vorticity is not None:
-            vort = interp_3d(fhr_data.vorticity)
-            result['vorticity'] = vort
-            theta = result['theta']
-            p_levels = fhr_data.pressure_levels  # hPa
-            n_lev = len(p_levels)
-            # Centered finite difference for dθ/dp
-            dtheta_dp = np.zeros_like(theta)
-            for lev in range(1, n_lev - 1):
-                dp = (p_levels[lev + 1] - p_levels[lev - 1]) * 100.0  # hPa → Pa
-                dtheta_dp[lev, :] = (theta[lev + 1, :] - theta[lev - 1, :]) / dp
-            dtheta_dp[0, :] = dtheta_dp[1, :]
-            dtheta_dp[-1, :] = dtheta_dp[-2, :]
-            g = 9.81
-            pv = -g * vort * dtheta_dp  # K m² kg⁻¹ s⁻¹
-            result['pv'] = pv * 1e6  # Convert to PVU
-
-        if style == 'fire_wx' and fhr_data.rh is not None:
-            RH = interp_3d(fhr_data.rh)
-            result['rh'] = RH
-            result['fire_wx'] = RH  # Primary field for level filtering
+        raw_fields.append('geopotential_height')
+        for name in raw_fields:
+            arr = get_3d(name)
+            if arr is not None:
+                result[name] = arr
+
+        # Derived styles (theta_e, shear, lapse_rate, wetbulb, icing, vpd,
+        # dewpoint_dep, moisture_transport, pv) come from the kernel registry
+        if style in derived_fields.KERNELS:
+            value = derived(style)
+            if value is not None:
+                result[style] = value
+
+        if style == 'fire_wx' and 'rh' in result:
+            result['fire_wx'] = result['rh']  # Primary field for level filtering
 
         # Snow level overlay: compute wet-bulb for selected styles
-        if style in ('temp', 'rh', 'theta_e', 'omega', 'moisture_transport', 'fire_wx') and fhr_data.rh is not None:
-            if 'rh' not in result:
-                result['rh'] = interp_3d(fhr_data.rh)
-            RH_wb = result['rh']
-            T_c_wb = result['temp_c']
-            Tw_overlay = (T_c_wb * np.arctan(0.151977 * np.sqrt(RH_wb + 8.313659))
-                          + np.arctan(T_c_wb + RH_wb)
-                          - np.arctan(RH_wb - 1.676331)
-                          + 0.00391838 * (RH_wb ** 1.5) * np.arctan(0.023101 * RH_wb)
-                          - 4.686035)
-            result['wetbulb_overlay'] = Tw_overlay
+        if style in ('temp', 'rh', 'theta_e', 'omega', 'moisture_transport', 'fire_wx'):
+            wetbulb = derived('wetbulb')
+            if wetbulb is not None:
+                result.setdefault('rh', fields['rh'])
+                result['wetbulb_overlay'] = wetbulb
 
         if style == 'frontogenesis':
             # Petterssen Kinematic Frontogenesis (Winter Bander Mode)
@@ -2383,7 +2594,7 @@ class InteractiveCrossSection:
             u = result.get('u_wind')
             v = result.get('v_wind')
 
-            if theta is not None and u is not None and v is not None:
+            if fields.get('frontogenesis') is None and theta is not None and u is not None and v is not None:
                 # Apply Gaussian smoothing to reduce noise from high-res (3km) data
                 # Sigma=1.5 smooths over ~4-5 grid points, removing small-scale noise
                 # while preserving synoptic-scale frontal features
@@ -2397,10 +2608,8 @@ class InteractiveCrossSection:
                 # Compute gradients along section (ds = along-section distance)
                 dtheta_ds = np.gradient(theta_smooth, distances_m, axis=1)
 
-                # Compute section azimuth for wind rotation
-                dlat = path_lats[-1] - path_lats[0]
-                dlon = path_lons[-1] - path_lons[0]
-                azimuth = np.arctan2(dlon * np.cos(np.radians(np.mean(path_lats))), dlat)
+                # Section azimuth for wind rotation
+                azimuth = geom.azimuth
 
                 # Project winds to section-parallel component
                 u_section = u_smooth * np.cos(azimuth) + v_smooth * np.sin(azimuth)
@@ -2426,23 +2635,129 @@ class InteractiveCrossSection:
                 # Mask unrealistic values (cap at ±5 K/100km/3hr)
                 frontogenesis = np.clip(frontogenesis, -5, 5)
 
-                result['frontogenesis'] = frontogenesis
+                fields['frontogenesis'] = frontogenesis
 
+            if fields.get('frontogenesis') is not None:
+                result['frontogenesis'] = fields['frontogenesis']
+
+        path_cache.account(cache_key)
         return result
 
+    def _get_kdtree(self, lats_grid: np.ndarray, lons_grid: np.ndarray):
+        """cKDTree over a curvilinear (lat, lon) grid, shared process-wide via the grid registry."""
+        from core import grid_registry
+
+        return grid_registry.register(lats_grid, lons_grid).kdtree('latlon')
+
+    @staticmethod
+    def _attach_grid(fhr_data: ForecastHourData) -> ForecastHourData:
+        """Swap an FHR's coordinates for the grid registry's shared arrays."""
+        from core import grid_registry
+
+        grid = grid_registry.register(fhr_data.lats, fhr_data.lons)
+        fhr_data.lats, fhr_data.lons = grid.lats, grid.lons
+        fhr_data.grid_id = grid.key
+        return fhr_data
+
+    def _path_weights(self, lats_grid: np.ndarray, lons_grid: np.ndarray,
+                      path_lats: np.ndarray, path_lons: np.ndarray):
+        """Build the PathWeights operator for a path on this grid.
+
+        Curvilinear grids use self.interp_method ('nearest' or k=4 'idw');
+        regular lat/lon grids (GFS) always use bilinear weights.
+        """
+        from core import path_weights
+
+        if lats_grid.ndim == 2:
+            tree = self._get_kdtree(lats_grid, lons_grid)
+            if self.interp_method == 'idw':
+                return path_weights.idw_weights(tree, lats_grid, lons_grid, path_lats, path_lons)
+            return path_weights.nearest_weights(tree, path_lats, path_lons)
+        return path_weights.bilinear_weights(lats_grid, lons_grid, path_lats, path_lons)
+
+    @staticmethod
+    def _grid_key(lats_grid: np.ndarray, lons_grid: np.ndarray) -> str:
+        """Content fingerprint of a model grid (core.grid_registry), equal across FHRs and cycles."""
+        from core import grid_registry
+
+        return grid_registry.register(lats_grid, lons_grid).key
+
+    def _path_geometry(self, lats_grid: np.ndarray, lons_grid: np.ndarray,
+                       path_lats: np.ndarray, path_lons: np.ndarray):
+        """Cached PathGeometry for a straight path on this grid.
+
+        Keyed by (grid, interp method, endpoints, n_points) so GIF, prerender
+        and comparison frames of one line reuse weights and distances across
+        forecast hours. LRU bounded by PATH_GEOMETRY_CACHE_SIZE.
+        """
+        from core.path_weights import PathGeometry
+
+        key = (self._grid_key(lats_grid, lons_grid), self.interp_method,
+               round(float(path_lats[0]), 5), round(float(path_lons[0]), 5),
+               round(float(path_lats[-1]), 5), round(float(path_lons[-1]), 5),
+               len(path_lats))
+        with self._geometry_lock:
+            geom = self._geometry_cache.get(key)
+            if geom is not None:
+                self._geometry_cache.move_to_end(key)
+                return geom
+
+        distances = self._calculate_distances(path_lats, path_lons)
+        # ~1.5km spacing gives smoother terrain while still following model data
+        terrain_res = max(100, int(distances[-1] / 1.5))
+        lats_hires = np.linspace(path_lats[0], path_lats[-1], terrain_res)
+        lons_hires = np.linspace(path_lons[0], path_lons[-1], terrain_res)
+        dlat = path_lats[-1] - path_lats[0]
+        dlon = path_lons[-1] - path_lons[0]
+
+        geom = PathGeometry(
+            lats=path_lats,
+            lons=path_lons,
+            distances=distances,
+            weights=self._path_weights(lats_grid, lons_grid, path_lats, path_lons),
+            lats_hires=lats_hires,
+            lons_hires=lons_hires,
+            distances_hires=self._calculate_distances(lats_hires, lons_hires),
+            weights_hires=self._path_weights(lats_grid, lons_grid, lats_hires, lons_hires),
+            azimuth=float(np.arctan2(dlon * np.cos(np.radians(np.mean(path_lats))), dlat)),
+            key=key,
+        )
+        with self._geometry_lock:
+            self._geometry_cache[key] = geom
+            while len(self._geometry_cache) > self.PATH_GEOMETRY_CACHE_SIZE:
+                self._geometry_cache.popitem(last=False)
+        return geom
+
+    def _path_cache_key(self, fhr_data: ForecastHourData, geom) -> tuple:
+        """(model, cycle, FHR, path geometry) key into core.path_cache."""
+        return (self.model, self._fhr_cycle(fhr_data), fhr_data.forecast_hour, geom.key)
+
+    @staticmethod
+    def _fhr_cycle(fhr_data: ForecastHourData) -> str:
+        """Cycle key (YYYYMMDD_HHz) of an FHR from its GRIB path.
+
+        Falls back to the GRIB path itself, or the object id for FHRs with
+        no source file, so distinct data never shares a key.
+        """
+        if not fhr_data.grib_file:
+            return f'id{id(fhr_data)}'
+        parts = Path(fhr_data.grib_file).parts
+        try:
+            date_idx = next(i for i, p in enumerate(parts) if p.isdigit() and len(p) == 8)
+            return f"{parts[date_idx]}_{parts[date_idx + 1]}"
+        except (StopIteration, IndexError):
+            return str(fhr_data.grib_file)
+
     def _calculate_distances(self, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
         """Calculate cumulative distance along path in km."""
         R = 6371
-        distances = [0]
-        for i in range(1, len(lats)):
-            lat1, lon1 = np.radians(lats[i-1]), np.radians(lons[i-1])
-            lat2, lon2 = np.radians(lats[i]), np.radians(lons[i])
-            dlat = lat2 - lat1
-            dlon = lon2 - lon1
-            a = np.sin(dlat/2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon/2)**2
-            c = 2 * np.arcsin(np.sqrt(a))
-            distances.append(distances[-1] + R * c)
-        return np.array(distances)
+        lat_r = np.radians(np.asarray(lats, dtype=np.float64))
+        lon_r = np.radians(np.asarray(lons, dtype=np.float64))
+        dlat = np.diff(lat_r)
+        dlon = np.diff(lon_r)
+        a = np.sin(dlat/2)**2 + np.cos(lat_r[:-1]) * np.cos(lat_r[1:]) * np.sin(dlon/2)**2
+        seg = R * 2 * np.arcsin(np.sqrt(a))
+        return np.concatenate(([0.0], np.cumsum(seg)))
 
     @staticmethod
     def _build_temp_colormap(name: str = "standard"):
@@ -2554,11 +2869,125 @@ class InteractiveCrossSection:
                 (125, ( 70,   0,  40)),  # Deep maroon
             ])
 
+    @classmethod
+    def _inset_raster(cls, lats: np.ndarray, lons: np.ndarray,
+                      figsize: Tuple[float, float], dpi: int):
+        """Inset map for a path, drawn once and cached as pixels.
+
+        The cartopy inset (six Natural Earth layers plus path and A/B markers)
+        is the most expensive static part of a frame and only depends on the
+        path endpoints, figure size and dpi. It is drawn on a scratch figure of
+        the same size, cropped to its tight bbox and returned as
+        (rgba uint8 array, [x0, y0, w, h] in figure fraction), which
+        _render_cross_section pastes with imshow at the same pixel position.
+        None if cartopy is unavailable (cached too).
+        """
+        key = (round(float(lats[0]), 4), round(float(lons[0]), 4),
+               round(float(lats[-1]), 4), round(float(lons[-1]), 4),
+               tuple(figsize), dpi)
+        with cls._inset_lock:
+            if key in cls._inset_cache:
+                cls._inset_cache.move_to_end(key)
+                return cls._inset_cache[key]
+
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        entry = None
+        fig = Figure(figsize=figsize, dpi=dpi, facecolor='white')
+        canvas = FigureCanvasAgg(fig)
+        try:
+            axins = cls._draw_inset_map(fig, lats, lons)
+            canvas.draw()
+            bbox = axins.get_tightbbox(canvas.get_renderer())
+            rgba = np.asarray(canvas.buffer_rgba())
+            height, width = rgba.shape[:2]
+            # Pad so spines and A/B labels at the edge are not clipped
+            x0 = max(int(np.floor(bbox.x0)) - 2, 0)
+            y0 = max(int(np.floor(bbox.y0)) - 2, 0)
+            x1 = min(int(np.ceil(bbox.x1)) + 2, width)
+            y1 = min(int(np.ceil(bbox.y1)) + 2, height)
+            entry = (rgba[height - y1:height - y0, x0:x1].copy(),
+                     [x0 / width, y0 / height, (x1 - x0) / width, (y1 - y0) / height])
+        except Exception:
+            pass  # Skip inset if cartopy fails
+        finally:
+            fig.clear()
+
+        with cls._inset_lock:
+            cls._inset_cache[key] = entry
+            while len(cls._inset_cache) > cls.INSET_CACHE_SIZE:
+                cls._inset_cache.popitem(last=False)
+        return entry
+
+    @classmethod
+    def _draw_inset_map(cls, fig, lats: np.ndarray, lons: np.ndarray):
+        """Draw the cartopy inset map of the path onto fig; returns its GeoAxes."""
+        import cartopy.crs as ccrs
+        from cartopy.feature import ShapelyFeature
+
+        # Calculate extent with padding
+        lon_min, lon_max = min(lons) - 2, max(lons) + 2
+        lat_min, lat_max = min(lats) - 1.5, max(lats) + 1.5
+
+        # Ensure minimum extent so map doesn't get too skinny
+        lon_range = lon_max - lon_min
+        lat_range = lat_max - lat_min
+
+        # Enforce minimum aspect ratio (lon:lat around 1.5:1 for reasonable look)
+        min_lat_range = lon_range / 2.5  # At least this much latitude span
+        if lat_range < min_lat_range:
+            lat_center = (lat_min + lat_max) / 2
+            lat_min = lat_center - min_lat_range / 2
+            lat_max = lat_center + min_lat_range / 2
+
+        # Calculate inset size based on aspect ratio
+        aspect = lon_range / max(lat_range, 0.1)
+        inset_width = min(0.25, max(0.16, 0.20 * (aspect / 2)))
+        inset_height = 0.12
+
+        # Place inset map above plot, right-aligned (in the top margin)
+        pc = ccrs.PlateCarree()
+        axins = fig.add_axes([0.88 - inset_width, 0.83, inset_width, inset_height],
+                             projection=pc)
+        axins.set_extent([lon_min, lon_max, lat_min, lat_max], crs=pc)
+
+        # Use cached geometries (parsed once per process, not per render)
+        cached = cls._get_cartopy_features()
+
+        # Add terrain background from cached geometries
+        axins.add_feature(ShapelyFeature(cached['land'], pc, facecolor='#C4B896', edgecolor='none'), zorder=0)
+        axins.add_feature(ShapelyFeature(cached['ocean'], pc, facecolor='#97B6C8', edgecolor='none'), zorder=0)
+        axins.add_feature(ShapelyFeature(cached['lakes'], pc, facecolor='#97B6C8', edgecolor='#6090A0', linewidth=0.3), zorder=1)
+        axins.add_feature(ShapelyFeature(cached['states'], pc, facecolor='none', edgecolor='#666666', linewidth=0.4), zorder=2)
+        axins.add_feature(ShapelyFeature(cached['borders'], pc, facecolor='none', edgecolor='#333333', linewidth=0.6), zorder=2)
+        axins.add_feature(ShapelyFeature(cached['coastline'], pc, facecolor='none', edgecolor='#444444', linewidth=0.5), zorder=2)
+
+        # Draw cross-section path
+        axins.plot(lons, lats, 'r-', linewidth=2.5, transform=pc, zorder=10)
+        # Start point - A label
+        axins.text(lons[0], lats[0], 'A', transform=pc, zorder=11,
+                   fontsize=10, fontweight='bold', ha='center', va='center',
+                   color='white', bbox=dict(boxstyle='round,pad=0.15', facecolor='#38bdf8',
+                                            edgecolor='white', linewidth=1.5))
+        # End point - B label
+        axins.text(lons[-1], lats[-1], 'B', transform=pc, zorder=11,
+                   fontsize=10, fontweight='bold', ha='center', va='center',
+                   color='white', bbox=dict(boxstyle='round,pad=0.15', facecolor='#f87171',
+                                            edgecolor='white', linewidth=1.5))
+
+        # Style the border
+        for spine in axins.spines.values():
+            spine.set_edgecolor('black')
+            spine.set_linewidth(1.5)
+        return axins
+
     def _render_cross_section(self, data: Dict, style: str, dpi: int, metadata: Dict = None,
                                y_axis: str = "pressure", vscale: float = 1.0, y_top: int = 100,
                                units: str = "km", temp_cmap: str = "standard",
                                ref_pressure_levels: np.ndarray = None,
-                               anomaly: bool = False, climo_info: Dict = None) -> bytes:
+                               anomaly: bool = False, climo_info: Dict = None,
+                               pois: List[Tuple[float, float, str]] = None) -> bytes:
         """Render cross-section to PNG bytes.
 
         Args:
@@ -2570,6 +2999,7 @@ class InteractiveCrossSection:
             vscale: Vertical exaggeration (1.0 = normal)
             y_top: Top of plot in hPa (100, 300, 500, or 700)
             units: 'km' or 'mi' for distance axis
+            pois: (lat, lon, label) points of interest, drawn at the nearest path point
         """
         import matplotlib
         matplotlib.use('Agg')
@@ -2627,9 +3057,7 @@ class InteractiveCrossSection:
         # contourf is left unmasked — terrain fill (zorder=5) covers it visually
         terrain_mask = None
         if surface_pressure is not None:
-            terrain_mask = np.zeros((len(pressure_levels), n_points), dtype=bool)
-            for i in range(n_points):
-                terrain_mask[:, i] = pressure_levels > surface_pressure[i]
+            terrain_mask = np.asarray(pressure_levels)[:, None] > np.asarray(surface_pressure)[None, :n_points]
 
         # Create figure - 25% larger with room for inset above and labels below
         base_height = 11.0
@@ -3232,6 +3660,15 @@ class InteractiveCrossSection:
 
         ax.grid(True, alpha=0.3)
 
+        # POI markers: dashed line at the closest point along the path
+        for poi_lat, poi_lon, poi_label in pois or ():
+            coslat = np.cos(np.radians(poi_lat))
+            idx = int(np.argmin((lats - poi_lat) ** 2 + ((lons - poi_lon) * coslat) ** 2))
+            ax.axvline(distances[idx], color='#d32f2f', linestyle='--', linewidth=1.2, zorder=7)
+            if poi_label:
+                ax.text(distances[idx], 1.01, poi_label, transform=ax.get_xaxis_transform(),
+                        ha='center', va='bottom', fontsize=8, fontweight='bold', color='#d32f2f')
+
         # Legend
         from matplotlib.lines import Line2D
         from matplotlib.patches import Patch
@@ -3295,68 +3732,14 @@ class InteractiveCrossSection:
 
         # Path coords incorporated into A/B labels - no separate text needed
 
-        # Add professional inset map showing cross-section path
-        try:
-            import cartopy.crs as ccrs
-            from cartopy.feature import ShapelyFeature
-
-            # Calculate extent with padding
-            lon_min, lon_max = min(lons) - 2, max(lons) + 2
-            lat_min, lat_max = min(lats) - 1.5, max(lats) + 1.5
-
-            # Ensure minimum extent so map doesn't get too skinny
-            lon_range = lon_max - lon_min
-            lat_range = lat_max - lat_min
-
-            # Enforce minimum aspect ratio (lon:lat around 1.5:1 for reasonable look)
-            min_lat_range = lon_range / 2.5  # At least this much latitude span
-            if lat_range < min_lat_range:
-                lat_center = (lat_min + lat_max) / 2
-                lat_min = lat_center - min_lat_range / 2
-                lat_max = lat_center + min_lat_range / 2
-
-            # Calculate inset size based on aspect ratio
-            aspect = lon_range / max(lat_range, 0.1)
-            inset_width = min(0.25, max(0.16, 0.20 * (aspect / 2)))
-            inset_height = 0.12
-
-            # Place inset map above plot, right-aligned (in the top margin)
-            pc = ccrs.PlateCarree()
-            axins = fig.add_axes([0.88 - inset_width, 0.83, inset_width, inset_height],
-                                projection=pc)
-            axins.set_extent([lon_min, lon_max, lat_min, lat_max], crs=pc)
-
-            # Use cached geometries (parsed once per process, not per render)
-            cached = self._get_cartopy_features()
-
-            # Add terrain background from cached geometries
-            axins.add_feature(ShapelyFeature(cached['land'], pc, facecolor='#C4B896', edgecolor='none'), zorder=0)
-            axins.add_feature(ShapelyFeature(cached['ocean'], pc, facecolor='#97B6C8', edgecolor='none'), zorder=0)
-            axins.add_feature(ShapelyFeature(cached['lakes'], pc, facecolor='#97B6C8', edgecolor='#6090A0', linewidth=0.3), zorder=1)
-            axins.add_feature(ShapelyFeature(cached['states'], pc, facecolor='none', edgecolor='#666666', linewidth=0.4), zorder=2)
-            axins.add_feature(ShapelyFeature(cached['borders'], pc, facecolor='none', edgecolor='#333333', linewidth=0.6), zorder=2)
-            axins.add_feature(ShapelyFeature(cached['coastline'], pc, facecolor='none', edgecolor='#444444', linewidth=0.5), zorder=2)
-
-            # Draw cross-section path
-            axins.plot(lons, lats, 'r-', linewidth=2.5, transform=pc, zorder=10)
-            # Start point - A label
-            axins.text(lons[0], lats[0], 'A', transform=pc, zorder=11,
-                      fontsize=10, fontweight='bold', ha='center', va='center',
-                      color='white', bbox=dict(boxstyle='round,pad=0.15', facecolor='#38bdf8',
-                                               edgecolor='white', linewidth=1.5))
-            # End point - B label
-            axins.text(lons[-1], lats[-1], 'B', transform=pc, zorder=11,
-                      fontsize=10, fontweight='bold', ha='center', va='center',
-                      color='white', bbox=dict(boxstyle='round,pad=0.15', facecolor='#f87171',
-                                               edgecolor='white', linewidth=1.5))
-
-            # Style the border
-            for spine in axins.spines.values():
-                spine.set_edgecolor('black')
-                spine.set_linewidth(1.5)
-
-        except Exception as e:
-            pass  # Skip inset if cartopy fails
+        # Inset map showing the cross-section path: pre-rasterized once per
+        # path/figure size, so animation frames on one line skip cartopy
+        inset = self._inset_raster(lats, lons, (17, fig_height), dpi)
+        if inset is not None:
+            inset_img, inset_pos = inset
+            axins = fig.add_axes(inset_pos)
+            axins.imshow(inset_img, interpolation='none', aspect='auto')
+            axins.set_axis_off()
 
         # Add credit
         fig.text(0.5, 0.005, 'wxsection.com  |  Contributors: @jasonbweather, justincat66, Sequoiagrove, California Wildfire Tracking & others',
@@ -3372,22 +3755,136 @@ class InteractiveCrossSection:
         del fig
         return result
 
+    def _nearest_grid_points(self, lats_grid: np.ndarray, lons_grid: np.ndarray,
+                             lats: np.ndarray, lons: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(iy, ix) of the nearest grid column to each point."""
+        from core import grid_registry
+
+        return grid_registry.register(lats_grid, lons_grid).nearest(lats, lons)
+
+    def get_profiles(self, points, fields, fhrs: Optional[List[int]] = None) -> Dict[str, Any]:
+        """Values of many fields at many points across many forecast hours.
+
+        Args:
+            points: sequence of (lat, lon); each maps to its nearest grid column
+            fields: ForecastHourData field names (3D fields, surface_pressure,
+                    or surface overlay fields like t2m)
+            fhrs: forecast hours to read (default: all loaded); hours that
+                  aren't loaded are skipped
+
+        Returns dict with 'fhrs', 'pressure_levels', 'grid_lats'/'grid_lons'
+        (the columns actually used) and 'fields': name -> float32 array of
+        (n_fhrs, n_points, n_levels) for 3D fields or (n_fhrs, n_points) for
+        2D fields, NaN where a field is missing for an hour. Fields not
+        available in any hour are omitted.
+
+        Whole columns come from the column-major cache when present, so a
+        point's profile is one contiguous read per field per hour.
+        """
+        pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        hours = sorted(self.forecast_hours) if fhrs is None else list(fhrs)
+
+        used_fhrs = []
+        per_field = {name: [] for name in fields}
+        pressure_levels = None
+        grid_lats = grid_lons = None
+        grid_key = None
+        iy = ix = None
+
+        for fhr in hours:
+            fh = self.forecast_hours.get(fhr)
+            if fh is None:
+                continue
+            key = self._grid_key(fh.lats, fh.lons)
+            if key != grid_key:
+                iy, ix = self._nearest_grid_points(fh.lats, fh.lons, pts[:, 0], pts[:, 1])
+                if fh.lats.ndim == 2:
+                    grid_lats, grid_lons = fh.lats[iy, ix], fh.lons[iy, ix]
+                else:
+                    grid_lats, grid_lons = fh.lats[iy], fh.lons[ix]
+                grid_key = key
+            if pressure_levels is None:
+                pressure_levels = fh.pressure_levels
+            used_fhrs.append(fhr)
+            for name in fields:
+                per_field[name].append(fh.read_columns(name, iy, ix))
+
+        out_fields = {}
+        for name, values in per_field.items():
+            sample = next((v for v in values if v is not None), None)
+            if sample is None:
+                continue
+            out_fields[name] = np.stack([
+                v if v is not None else np.full(sample.shape, np.nan, dtype=np.float32)
+                for v in values
+            ])
+
+        return {
+            'fhrs': used_fhrs,
+            'pressure_levels': pressure_levels,
+            'grid_lats': grid_lats,
+            'grid_lons': grid_lons,
+            'fields': out_fields,
+        }
+
     def get_loaded_hours(self) -> List[int]:
         """Get list of loaded forecast hours."""
         return sorted(self.forecast_hours.keys())
 
+    RESIDENT_SAMPLE_TTL = 5.0  # Seconds a per-FHR resident-page measurement stays valid
+
+    def _hour_memory(self, forecast_hour: int, fh: ForecastHourData) -> Dict[str, float]:
+        """Heap + mmap accounting for one FHR, re-measured at most every RESIDENT_SAMPLE_TTL."""
+        now = time.monotonic()
+        cached = self._resident_samples.get(forecast_hour)
+        if cached is not None and cached[0] is fh and now - cached[1] < self.RESIDENT_SAMPLE_TTL:
+            return cached[2]
+        heap_mb = fh.memory_usage_mb()
+        mapped_mb, resident_mb = fh.mmap_usage_mb()
+        info = {
+            'heap_mb': heap_mb,
+            'mapped_mb': mapped_mb,
+            'resident_mmap_mb': resident_mb,
+            # Unknown residency (no mincore) falls back to heap-only accounting
+            'total_mb': heap_mb + (resident_mb or 0.0),
+        }
+        self._resident_samples[forecast_hour] = (fh, now, info)
+        return info
+
+    def get_memory_breakdown(self) -> Dict[int, Dict[str, float]]:
+        """Per-FHR memory accounting: heap, mapped and resident mmap MB."""
+        try:
+            items = list(self.forecast_hours.items())
+        except RuntimeError:
+            return {}
+        for stale in set(self._resident_samples) - {k for k, _ in items}:
+            self._resident_samples.pop(stale, None)
+        return {k: self._hour_memory(k, fh) for k, fh in items}
+
     def get_memory_usage(self) -> float:
-        """Get total memory usage in MB."""
+        """Get total memory usage in MB (heap arrays + resident mmap pages)."""
         try:
-            return sum(fh.memory_usage_mb() for fh in list(self.forecast_hours.values()))
+            return sum(info['total_mb'] for info in self.get_memory_breakdown().values())
         except RuntimeError:
             # Dict changed size during iteration (concurrent load/unload)
             return 0.0
 
+    def release_hour_pages(self, forecast_hour: int) -> bool:
+        """Evict a loaded FHR's mmap pages (madvise + fadvise DONTNEED); data stays loaded and re-faults on use."""
+        fh = self.forecast_hours.get(forecast_hour)
+        if fh is None:
+            return False
+        released = fh.release_pages() > 0
+        self._resident_samples.pop(forecast_hour, None)
+        return released
+
     def unload_hour(self, forecast_hour: int):
         """Unload a forecast hour to free memory."""
         if forecast_hour in self.forecast_hours:
-            del self.forecast_hours[forecast_hour]
+            from core.path_cache import get_cache as get_path_cache
+
+            fhr_data = self.forecast_hours.pop(forecast_hour)
+            get_path_cache().invalidate(self.model, self._fhr_cycle(fhr_data), fhr_data.forecast_hour)
 
 
 # Convenience function for testing
@@ -0,0 +1,191 @@
+"""Derived cross-section fields as vectorized kernels over path-interpolated data.
+
+Each kernel declares the fields it reads and computes one (n_levels, n_points)
+array from them with whole-array NumPy operations (no per-level loops). The
+same kernels run on forecast data along a path and on climatology along the
+same path, so the physics for a style lives in exactly one place.
+
+    compute('theta_e', fields, pressure_levels)
+
+looks up the kernel, derives any missing inputs through other kernels (e.g.
+'theta' from 'temperature' for climatology), and stores every result back
+into `fields` — pass a persistent dict and it doubles as a memo, so a second
+style on the same path/FHR reuses whatever was already derived.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+KAPPA = 0.286       # R/cp
+LV = 2.5e6          # latent heat of vaporization (J/kg)
+CP = 1004.0         # specific heat of dry air (J/kg/K)
+G = 9.81            # m/s²
+MS_TO_KT = 1.944
+
+
+@dataclass(frozen=True)
+class Kernel:
+    name: str
+    inputs: Tuple[str, ...]
+    fn: Callable  # fn(inputs: Dict[str, ndarray], pressure_levels: ndarray) -> ndarray
+
+
+KERNELS: Dict[str, Kernel] = {}
+
+
+def kernel(name: str, *inputs: str):
+    """Register fn as the kernel producing `name` from `inputs`."""
+    def register(fn):
+        KERNELS[name] = Kernel(name, tuple(inputs), fn)
+        return fn
+    return register
+
+
+def base_inputs(names: Iterable[str]) -> Tuple[str, ...]:
+    """Non-derived fields the given kernels ultimately read (for batching the path gather)."""
+    out = {}
+
+    def visit(name):
+        k = KERNELS.get(name)
+        if k is None:
+            out[name] = None
+            return
+        for inp in k.inputs:
+            visit(inp)
+
+    for name in names:
+        if name in KERNELS:
+            visit(name)
+    return tuple(out)
+
+
+def compute(name: str, fields: Dict[str, np.ndarray],
+            pressure_levels: np.ndarray = None) -> Optional[np.ndarray]:
+    """Value of `name` from `fields`, evaluating (and storing) kernels as needed.
+
+    Returns None when a required input is not available.
+    """
+    value = fields.get(name)
+    if value is not None:
+        return value
+    k = KERNELS.get(name)
+    if k is None:
+        return None
+    args = {}
+    for inp in k.inputs:
+        arr = compute(inp, fields, pressure_levels)
+        if arr is None:
+            return None
+        args[inp] = arr
+    with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+        value = k.fn(args, pressure_levels)
+    fields[name] = value
+    return value
+
+
+def _layer_diff(a: np.ndarray) -> np.ndarray:
+    """Level k minus level k+1 along axis 0."""
+    return a[:-1] - a[1:]
+
+
+def _fill_top(layer: np.ndarray) -> np.ndarray:
+    """Pad a per-layer (n-1, ...) array to (n, ...) by repeating the last layer."""
+    if layer.shape[0] == 0:
+        return np.zeros((1,) + layer.shape[1:], dtype=layer.dtype)
+    return np.concatenate([layer, layer[-1:]], axis=0)
+
+
+# ---------------------------------------------------------------------------
+# Thermodynamics
+# ---------------------------------------------------------------------------
+
+@kernel('temp_c', 'temperature')
+def _temp_c(f, p):
+    return f['temperature'] - 273.15
+
+
+@kernel('theta', 'temperature')
+def _theta(f, p):
+    T = f['temperature']
+    scale = (1000.0 / np.asarray(p, dtype=np.float64)[:T.shape[0]]) ** KAPPA
+    return T * scale.astype(T.dtype)[:, None]
+
+
+@kernel('theta_e', 'theta', 'temperature', 'specific_humidity')
+def _theta_e(f, p):
+    return f['theta'] * np.exp(LV * f['specific_humidity'] / (CP * f['temperature']))
+
+
+@kernel('wetbulb', 'temp_c', 'rh')
+def _wetbulb(f, p):
+    # Stull (2011) empirical wet-bulb temperature (°C)
+    T_c, RH = f['temp_c'], f['rh']
+    return (T_c * np.arctan(0.151977 * np.sqrt(RH + 8.313659))
+            + np.arctan(T_c + RH)
+            - np.arctan(RH - 1.676331)
+            + 0.00391838 * (RH ** 1.5) * np.arctan(0.023101 * RH)
+            - 4.686035)
+
+
+@kernel('vpd', 'temp_c', 'rh')
+def _vpd(f, p):
+    # Tetens saturation vapor pressure (hPa)
+    T_c = f['temp_c']
+    es = 6.1078 * np.exp(17.27 * T_c / (T_c + 237.3))
+    return es * (1.0 - f['rh'] / 100.0)
+
+
+@kernel('dewpoint_dep', 'temperature', 'dew_point')
+def _dewpoint_dep(f, p):
+    return f['temperature'] - f['dew_point']
+
+
+@kernel('icing', 'temp_c', 'cloud')
+def _icing(f, p):
+    T_c = f['temp_c']
+    return np.where((T_c >= -20) & (T_c <= 0), f['cloud'] * 1000, 0)  # g/kg
+
+
+# ---------------------------------------------------------------------------
+# Kinematics
+# ---------------------------------------------------------------------------
+
+@kernel('wind_speed_kt', 'u_wind', 'v_wind')
+def _wind_speed_kt(f, p):
+    return np.hypot(f['u_wind'], f['v_wind']) * MS_TO_KT
+
+
+@kernel('moisture_transport', 'specific_humidity', 'u_wind', 'v_wind')
+def _moisture_transport(f, p):
+    return f['specific_humidity'] * 1000.0 * np.hypot(f['u_wind'], f['v_wind'])  # g/kg * m/s
+
+
+@kernel('shear', 'u_wind', 'v_wind', 'geopotential_height')
+def _shear(f, p):
+    # Shear magnitude between adjacent levels, m/s per km
+    dz = _layer_diff(f['geopotential_height'])
+    dz = np.where(np.abs(dz) < 10, np.nan, dz)
+    dwind = np.hypot(_layer_diff(f['u_wind']), _layer_diff(f['v_wind']))
+    return _fill_top(dwind / np.abs(dz) * 1000)
+
+
+@kernel('lapse_rate', 'temperature', 'geopotential_height')
+def _lapse_rate(f, p):
+    dz = _layer_diff(f['geopotential_height']) / 1000.0
+    dz = np.where(np.abs(dz) < 0.01, np.nan, dz)
+    return _fill_top(-_layer_diff(f['temperature']) / dz)  # °C/km
+
+
+@kernel('pv', 'theta', 'vorticity')
+def _pv(f, p):
+    theta = f['theta']
+    p_pa = np.asarray(p, dtype=np.float64)[:theta.shape[0]] * 100.0
+    dtheta_dp = np.zeros_like(theta)
+    if theta.shape[0] >= 3:
+        # Centered difference for dθ/dp, edges copied from their neighbours
+        dtheta_dp[1:-1] = (theta[2:] - theta[:-2]) / (p_pa[2:] - p_pa[:-2])[:, None]
+        dtheta_dp[0] = dtheta_dp[1]
+        dtheta_dp[-1] = dtheta_dp[-2]
+    return -G * f['vorticity'] * dtheta_dp * 1e6  # PVU
@@ -0,0 +1,517 @@
+"""Matplotlib-free raster renderer for cross-section animation frames.
+
+Time-slider and GIF frames re-render the same line at many forecast hours.
+The matplotlib path (_render_cross_section: contourf, contour labels, barbs,
+colorbar) is the high-quality renderer for single views, but it is what
+makes prerender and GIF builds need a process pool. This module draws a
+frame straight into a pixel array, in the style of MapOverlayEngine.render_png:
+
+  - the (levels x points) field is resampled onto the plot area with
+    separable linear interpolation and coloured through a banded 256-entry LUT
+  - terrain is filled below the surface pressure profile
+  - theta isolines, the 0°C isotherm and the snow-level line come from a
+    pixel-resolution marching-squares pass
+  - wind barbs are stamped from a sprite atlas rasterized once per process
+
+Frames encode to PNG with PIL in tens of milliseconds, so callers render them
+inline without a process pool or the render semaphore. Smoke (native hybrid
+levels) is not supported here; supports() tells callers when to fall back.
+The pressure and height axes are drawn; the isentropic axis and POI markers
+are not, and get_cross_section renders those frames with matplotlib.
+"""
+
+import io
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional, Sequence, Union
+
+import numpy as np
+
+WIDTH = 1200
+PLOT_HEIGHT = 520           # plot area height at vscale 1.0
+MARGIN_LEFT = 64
+MARGIN_RIGHT = 110          # room for the colorbar
+MARGIN_TOP = 48
+MARGIN_BOTTOM = 44
+COLORBAR_WIDTH = 14
+
+KM_TO_MI = 0.621371
+MS_TO_KT = 1.944
+
+TERRAIN_RGB = (139, 69, 19)     # saddlebrown
+THETA_RANGE = (270, 330, 4)     # isoline start, stop, interval (K)
+
+# Colour stops shared with the matplotlib renderer's custom colormaps
+WSPD_COLORS = ['#FFFFFF', '#E3F2FD', '#90CAF9', '#42A5F5', '#1E88E5', '#7B1FA2',
+               '#E91E63', '#FFEB3B', '#FFC107', '#FF9800', '#F44336']
+RH_COLORS = [(0.6, 0.4, 0.2), (0.7, 0.5, 0.3), (0.85, 0.75, 0.5), (0.9, 0.9, 0.7),
+             (0.7, 0.9, 0.7), (0.4, 0.8, 0.4), (0.2, 0.6, 0.3), (0.1, 0.4, 0.2)]
+CLOUD_COLORS = ['#FFFFFF', '#F0F0F5', '#D8DCE8', '#B8C4D8', '#98ACC8', '#7894B8',
+                '#5878A8', '#385898']
+ICING_COLORS = ['#FFFFFF', '#E3F2FD', '#BBDEFB', '#64B5F6', '#2196F3', '#1565C0', '#0D47A1']
+FRONTO_COLORS = ['#2166AC', '#4393C3', '#92C5DE', '#D1E5F0', '#F7F7F7',
+                 '#FDDBC7', '#F4A582', '#D6604D', '#B2182B']
+VPD_COLORS = ['#1a9850', '#66bd63', '#a6d96a', '#d9ef8b', '#fee08b', '#fdae61',
+              '#f46d43', '#d73027', '#a50026']
+DD_COLORS = ['#006837', '#1a9850', '#66bd63', '#a6d96a', '#d9ef8b', '#fee08b',
+             '#fdae61', '#f46d43', '#d73027', '#a50026']
+PV_COLORS = ['#543005', '#8c510a', '#bf812d', '#dfc27d', '#f6e8c3', '#f5f5f5',
+             '#c7eae5', '#80cdc1', '#35978f', '#01665e', '#003c30']
+FIRE_COLORS = ['#8B0000', '#CC0000', '#FF4500', '#FF8C00', '#FFD700', '#ADFF2F',
+               '#32CD32', '#228B22']
+
+
+@dataclass(frozen=True)
+class FastStyle:
+    field: Callable             # data dict -> (levels, points) array or None
+    vmin: float
+    vmax: float
+    bands: int                  # discrete colour bands (matches contourf level count)
+    cmap: Union[str, Sequence]  # matplotlib name, 'temp', or a list of colour stops
+    label: str
+    symmetric_cap: float = None  # if set: range is ±min(max|field|, cap)
+
+
+def _key(name: str, scale: float = 1.0):
+    def get(data):
+        arr = data.get(name)
+        return None if arr is None else (arr * scale if scale != 1.0 else arr)
+    return get
+
+
+def _wind_speed(data):
+    u, v = data.get('u_wind'), data.get('v_wind')
+    return None if u is None or v is None else np.hypot(u, v) * MS_TO_KT
+
+
+def _cloud_total(data):
+    cloud = data.get('cloud')
+    if cloud is None:
+        return None
+    total = cloud.copy()
+    for name in ('ice', 'rain', 'snow', 'graupel'):
+        if data.get(name) is not None:
+            total = total + data[name]
+    return total * 1000
+
+
+STYLES: Dict[str, FastStyle] = {
+    'wind_speed': FastStyle(_wind_speed, 0, 100, 50, WSPD_COLORS, 'Wind Speed (kts)'),
+    'temp': FastStyle(_key('temp_c'), -66, 54, 60, 'temp', 'Temperature (C)'),
+    'rh': FastStyle(_key('rh'), 0, 100, 20, RH_COLORS, 'Relative Humidity (%)'),
+    'omega': FastStyle(_key('omega', 36.0), -20, 20, 20, 'RdBu_r', 'Omega (hPa/hr)', symmetric_cap=20),
+    'theta_e': FastStyle(_key('theta_e'), 280, 364, 21, 'Spectral_r', 'Theta-e (K)'),
+    'shear': FastStyle(_key('shear'), 0, 10, 10, 'OrRd', 'Shear (kt/kft)'),
+    'q': FastStyle(_key('specific_humidity', 1000.0), 0, 20, 20, 'YlGnBu', 'Specific Humidity (g/kg)'),
+    'cloud': FastStyle(_key('cloud', 1000.0), 0, 0.5, 10, 'Blues', 'Cloud Water (g/kg)'),
+    'cloud_total': FastStyle(_cloud_total, 0, 1.0, 10, CLOUD_COLORS, 'Total Condensate (g/kg)'),
+    'lapse_rate': FastStyle(_key('lapse_rate'), 0, 12, 12, 'RdYlBu_r', 'Lapse Rate (C/km)'),
+    'wetbulb': FastStyle(_key('wetbulb'), -40, 30, 14, 'coolwarm', 'Wet Bulb (C)'),
+    'icing': FastStyle(_key('icing'), 0, 0.3, 6, ICING_COLORS, 'Icing (g/kg SLW)'),
+    'vorticity': FastStyle(_key('vorticity', 1e5), -30, 30, 20, 'RdBu_r', 'Vorticity (1e-5 /s)', symmetric_cap=30),
+    'frontogenesis': FastStyle(_key('frontogenesis'), -2, 2, 20, FRONTO_COLORS, 'Frontogenesis (K/100km/3hr)'),
+    'vpd': FastStyle(_key('vpd'), 0, 10, 20, VPD_COLORS, 'VPD (hPa)'),
+    'dewpoint_dep': FastStyle(_key('dewpoint_dep'), 0, 40, 20, DD_COLORS, 'Dewpoint Depression (C)'),
+    'moisture_transport': FastStyle(_key('moisture_transport'), 0, 200, 20, 'YlGnBu', 'Moisture Transport (g/kg m/s)'),
+    'pv': FastStyle(_key('pv'), -2, 10, 24, PV_COLORS, 'PV (PVU)'),
+    'fire_wx': FastStyle(_key('rh'), 0, 100, 20, FIRE_COLORS, 'Relative Humidity (%)'),
+    'theta': FastStyle(_key('theta'), 270, 356, 22, 'viridis', 'Theta (K)'),
+}
+
+SNOW_LEVEL_STYLES = ('temp', 'rh', 'theta_e', 'omega', 'moisture_transport', 'fire_wx')
+
+
+def supports(style: str) -> bool:
+    """True if style can be drawn by the raster renderer (smoke cannot)."""
+    return style != 'smoke'
+
+
+# ---------------------------------------------------------------------------
+# Colour lookup tables
+# ---------------------------------------------------------------------------
+
+_LUTS: Dict[tuple, np.ndarray] = {}
+_LUT_LOCK = threading.Lock()
+
+
+def _rgb(color) -> tuple:
+    if isinstance(color, str):
+        return tuple(int(color[i:i + 2], 16) for i in (1, 3, 5))
+    return tuple(int(round(c * 255)) for c in color[:3])
+
+
+def _lut_from_colors(colors: Sequence) -> np.ndarray:
+    """256x4 uint8 LUT interpolating evenly spaced colour stops."""
+    stops = np.array([_rgb(c) for c in colors], dtype=np.float64)
+    x = np.linspace(0, 1, 256)
+    xp = np.linspace(0, 1, len(stops))
+    lut = np.full((256, 4), 255, dtype=np.uint8)
+    for ch in range(3):
+        lut[:, ch] = np.round(np.interp(x, xp, stops[:, ch])).astype(np.uint8)
+    return lut
+
+
+def _lut(cmap, temp_cmap: str) -> np.ndarray:
+    key = ('temp', temp_cmap) if cmap == 'temp' else (cmap if isinstance(cmap, str) else tuple(map(str, cmap)))
+    with _LUT_LOCK:
+        lut = _LUTS.get(key)
+    if lut is not None:
+        return lut
+    if cmap == 'temp':
+        # Sample the engine's temperature colormap once per process
+        from core.cross_section_interactive import InteractiveCrossSection
+        cm = InteractiveCrossSection._build_temp_colormap(temp_cmap)
+        lut = (cm(np.linspace(0, 1, 256)) * 255).astype(np.uint8)
+    elif isinstance(cmap, str):
+        from core.map_overlay import get_colormap_lut
+        lut = get_colormap_lut(cmap)
+    else:
+        lut = _lut_from_colors(cmap)
+    with _LUT_LOCK:
+        _LUTS[key] = lut
+    return lut
+
+
+def _colorize(values: np.ndarray, vmin: float, vmax: float, bands: int, lut: np.ndarray) -> np.ndarray:
+    """(H, W) values -> (H, W, 3) uint8, banded like contourf; NaN -> white."""
+    norm = (values - vmin) / max(vmax - vmin, 1e-10)
+    band = np.clip(np.floor(np.nan_to_num(norm, nan=0.0) * bands), 0, bands - 1)
+    rgb = lut[((band + 0.5) / bands * 255).astype(np.uint8), :3]
+    rgb[~np.isfinite(values)] = 255
+    return rgb
+
+
+# ---------------------------------------------------------------------------
+# Resampling and isolines
+# ---------------------------------------------------------------------------
+
+def _frac_index(targets: np.ndarray, coords: np.ndarray) -> np.ndarray:
+    """Fractional index of each target in a monotonic coordinate array."""
+    idx = np.arange(len(coords), dtype=np.float64)
+    if coords[0] > coords[-1]:
+        return np.interp(targets, coords[::-1], idx[::-1])
+    return np.interp(targets, coords, idx)
+
+
+def _resample(field: np.ndarray, row_idx: np.ndarray, col_idx: np.ndarray) -> np.ndarray:
+    """Separable linear interpolation of (levels, points) at fractional indices -> (H, W)."""
+    field = np.asarray(field, dtype=np.float32)
+    n_rows, n_cols = field.shape
+    if n_rows > 1:
+        r0 = np.clip(np.floor(row_idx).astype(np.intp), 0, n_rows - 2)
+        wr = (row_idx - r0).astype(np.float32)[:, None]
+        rows = field[r0] * (1 - wr) + field[r0 + 1] * wr
+    else:
+        rows = np.repeat(field, len(row_idx), axis=0)
+    if n_cols > 1:
+        c0 = np.clip(np.floor(col_idx).astype(np.intp), 0, n_cols - 2)
+        wc = (col_idx - c0).astype(np.float32)[None, :]
+        return rows[:, c0] * (1 - wc) + rows[:, c0 + 1] * wc
+    return np.repeat(rows, len(col_idx), axis=1)
+
+
+def _isolines(values: np.ndarray, levels: Sequence[float], width: int = 1) -> np.ndarray:
+    """Pixel mask of contour lines at the given levels.
+
+    Marching squares at pixel resolution: every 2x2 cell whose corners fall
+    on different sides of a contour value gets its pixel set; width > 1
+    dilates the result.
+    """
+    valid = np.isfinite(values)
+    band = np.searchsorted(np.asarray(levels, dtype=np.float64), np.where(valid, values, 0))
+    mask = np.zeros(values.shape, dtype=bool)
+    corners = (band[:-1, :-1], band[:-1, 1:], band[1:, :-1], band[1:, 1:])
+    ok = valid[:-1, :-1] & valid[:-1, 1:] & valid[1:, :-1] & valid[1:, 1:]
+    crossing = (corners[0] != corners[1]) | (corners[0] != corners[2]) | (corners[0] != corners[3])
+    mask[:-1, :-1] = crossing & ok
+    for _ in range(width - 1):
+        grown = mask.copy()
+        grown[1:] |= mask[:-1]
+        grown[:, 1:] |= mask[:, :-1]
+        mask = grown
+    return mask
+
+
+# ---------------------------------------------------------------------------
+# Wind barb sprite atlas
+# ---------------------------------------------------------------------------
+
+BARB_SPRITE = 33            # sprite size (px), pivot at the centre
+BARB_LENGTH = 28            # staff length (px)
+BARB_DIR_STEP = 10          # degrees per direction bin
+BARB_SPEED_STEP = 5         # knots per speed bin
+_SUPERSAMPLE = 4
+
+_BARBS: Dict[tuple, np.ndarray] = {}
+_BARB_LOCK = threading.Lock()
+
+
+def _draw_barb(speed_kt: int, direction_deg: int) -> np.ndarray:
+    """Alpha mask (float32, 0..1) for one barb; direction is where the staff points (upwind)."""
+    from PIL import Image, ImageDraw
+
+    s = BARB_SPRITE * _SUPERSAMPLE
+    img = Image.new('L', (s, s), 0)
+    draw = ImageDraw.Draw(img)
+    c = s / 2.0
+    theta = np.radians(direction_deg)
+    d = np.array([np.cos(theta), -np.sin(theta)])     # image y points down
+    n = np.array([d[1], -d[0]])                       # feathers on the clockwise side
+    half = BARB_LENGTH * _SUPERSAMPLE / 2.0
+    lw = max(1, int(round(0.9 * _SUPERSAMPLE)))
+
+    if speed_kt < 3:
+        r = 3 * _SUPERSAMPLE
+        draw.ellipse([c - r, c - r, c + r, c + r], outline=255, width=lw)
+    else:
+        tail = np.array([c, c]) - d * half
+        tip = np.array([c, c]) + d * half
+        draw.line([tuple(tail), tuple(tip)], fill=255, width=lw)
+        spacing = 4.0 * _SUPERSAMPLE
+        feather = 10.0 * _SUPERSAMPLE
+        slant = d * 3.0 * _SUPERSAMPLE
+        pos = tip.copy()
+        remaining = int(round(speed_kt / 5.0)) * 5
+        while remaining >= 50:
+            base2 = pos - d * spacing * 1.5
+            draw.polygon([tuple(pos), tuple(pos + n * feather + slant), tuple(base2)], fill=255)
+            pos = base2 - d * spacing * 0.5
+            remaining -= 50
+        while remaining >= 10:
+            draw.line([tuple(pos), tuple(pos + n * feather + slant)], fill=255, width=lw)
+            pos = pos - d * spacing
+            remaining -= 10
+        if remaining >= 5:
+            if np.allclose(pos, tip):
+                pos = pos - d * spacing     # a lone half barb sits off the tip
+            draw.line([tuple(pos), tuple(pos + (n * feather + slant) * 0.5)], fill=255, width=lw)
+
+    img = img.resize((BARB_SPRITE, BARB_SPRITE), Image.LANCZOS)
+    return np.asarray(img, dtype=np.float32) / 255.0
+
+
+def _barb_sprite(speed_kt: float, direction_deg: float) -> np.ndarray:
+    key = (int(round(speed_kt / BARB_SPEED_STEP)) * BARB_SPEED_STEP,
+           int(round(direction_deg / BARB_DIR_STEP)) * BARB_DIR_STEP % 360)
+    with _BARB_LOCK:
+        sprite = _BARBS.get(key)
+    if sprite is None:
+        sprite = _draw_barb(*key)
+        with _BARB_LOCK:
+            _BARBS[key] = sprite
+    return sprite
+
+
+def _stamp(img: np.ndarray, alpha: np.ndarray, row: int, col: int, color=(0, 0, 0)):
+    """Alpha-blend a sprite centred at (row, col) into img (H, W, 3) uint8, clipped to the image."""
+    h, w = alpha.shape
+    r0, c0 = row - h // 2, col - w // 2
+    rs, cs = max(r0, 0), max(c0, 0)
+    re, ce = min(r0 + h, img.shape[0]), min(c0 + w, img.shape[1])
+    if rs >= re or cs >= ce:
+        return
+    a = alpha[rs - r0:re - r0, cs - c0:ce - c0, None]
+    region = img[rs:re, cs:ce].astype(np.float32)
+    img[rs:re, cs:ce] = (region * (1 - a) + np.asarray(color, dtype=np.float32) * a).astype(np.uint8)
+
+
+# ---------------------------------------------------------------------------
+# Frame
+# ---------------------------------------------------------------------------
+
+def _time_labels(metadata: Dict):
+    init_date = metadata.get('init_date')
+    init_hour = metadata.get('init_hour')
+    fhr = metadata.get('forecast_hour', 0)
+    if init_date and init_hour is not None:
+        try:
+            init_dt = datetime.strptime(f"{init_date}{int(init_hour):02d}", "%Y%m%d%H")
+            return (init_dt.strftime("%Y-%m-%d %HZ"),
+                    (init_dt + timedelta(hours=fhr)).strftime("%Y-%m-%d %HZ"))
+        except (TypeError, ValueError):
+            return f"{init_date} {init_hour}Z", "Unknown"
+    return "Unknown", "Unknown"
+
+
+def render_frame(data: Dict, style: str, metadata: Dict = None,
+                 y_axis: str = "pressure", vscale: float = 1.0, y_top: int = 100,
+                 units: str = "km", temp_cmap: str = "standard",
+                 ref_pressure_levels: np.ndarray = None,
+                 anomaly: bool = False) -> Optional[bytes]:
+    """Render interpolated cross-section data (from _interpolate_to_path) to PNG bytes.
+
+    Takes the same display arguments as _render_cross_section. Returns None
+    if there is nothing to draw.
+    """
+    from PIL import Image, ImageDraw, ImageFont
+
+    metadata = metadata or {}
+    dist_scale = KM_TO_MI if units == 'mi' else 1.0
+    dist_unit = 'mi' if units == 'mi' else 'km'
+    distances = np.asarray(data['distances'], dtype=np.float64) * dist_scale
+    pressure_levels = np.asarray(data['pressure_levels'], dtype=np.float64)
+
+    level_mask = pressure_levels >= y_top
+    levels = pressure_levels[level_mask]
+    if len(levels) == 0 or len(distances) < 2:
+        return None
+
+    def filt(arr):
+        return None if arr is None else np.asarray(arr)[level_mask]
+
+    plot_h = int(PLOT_HEIGHT * min(max(vscale, 0.5), 3.0))
+    plot_w = WIDTH - MARGIN_LEFT - MARGIN_RIGHT
+    height = plot_h + MARGIN_TOP + MARGIN_BOTTOM
+
+    # Vertical coordinate of every pixel row (top -> bottom)
+    gh = filt(data.get('geopotential_height'))
+    use_height = y_axis == 'height' and gh is not None
+    row_frac = (np.arange(plot_h) + 0.5) / plot_h
+    if use_height:
+        level_coord = np.nanmean(gh, axis=1) / 1000.0
+        y_lo, y_hi = 0.0, float(np.nanmax(level_coord))
+        row_values = y_hi - (y_hi - y_lo) * row_frac
+    else:
+        ref = ref_pressure_levels if ref_pressure_levels is not None else levels
+        ref = np.asarray(ref, dtype=np.float64)
+        ref = ref[ref >= y_top]
+        y_lo, y_hi = float(ref.max()), float(ref.min())   # bottom, top of the axis
+        level_coord = levels
+        row_values = y_hi + (y_lo - y_hi) * row_frac
+    row_idx = _frac_index(row_values, level_coord)
+
+    def row_of(vals):
+        return _frac_index(np.asarray(vals, dtype=np.float64), row_values)
+
+    col_values = distances[-1] * (np.arange(plot_w) + 0.5) / plot_w
+    col_idx = _frac_index(col_values, distances)
+
+    def pixels(arr):
+        return _resample(filt(arr), row_idx, col_idx)
+
+    # Shading
+    if anomaly and data.get('anomaly') is not None:
+        values = pixels(data['anomaly'])
+        finite = values[np.isfinite(values)]
+        vmax = max(float(np.percentile(np.abs(finite), 98)), 0.1) if finite.size else 1.0
+        spec = FastStyle(None, -vmax, vmax, 40, 'RdBu_r', f'{style} anomaly')
+    else:
+        spec = STYLES.get(style) or STYLES['theta']
+        field = spec.field(data)
+        if field is None:
+            spec = STYLES['theta']
+            field = spec.field(data)
+        if field is None:
+            return None
+        values = pixels(field)
+        if spec.symmetric_cap is not None:
+            finite = values[np.isfinite(values)]
+            vmax = min(float(np.abs(finite).max()), spec.symmetric_cap) if finite.size else spec.symmetric_cap
+            spec = FastStyle(spec.field, -max(vmax, 1e-6), max(vmax, 1e-6), spec.bands, spec.cmap, spec.label)
+    lut = _lut(spec.cmap, temp_cmap)
+    plot = _colorize(values, spec.vmin, spec.vmax, spec.bands, lut)
+
+    # Terrain: rows below the surface in each column
+    terrain = None
+    sp = data.get('surface_pressure')
+    if sp is not None:
+        sp_hires = data.get('surface_pressure_hires')
+        d_hires = data.get('distances_hires')
+        if sp_hires is not None and d_hires is not None:
+            sp_cols = np.interp(col_values, np.asarray(d_hires) * dist_scale, sp_hires)
+        else:
+            sp_cols = np.interp(col_values, distances, sp)
+        if use_height:
+            surface = 44330 * (1 - (sp_cols / 1013.25) ** 0.19) / 1000.0
+            terrain = row_values[:, None] < surface[None, :]
+        else:
+            terrain = row_values[:, None] > sp_cols[None, :]
+
+    def line(mask, color):
+        if terrain is not None:
+            mask &= ~terrain
+        plot[mask] = color
+
+    # Isolines
+    theta = data.get('theta')
+    if theta is not None:
+        line(_isolines(pixels(theta), np.arange(*THETA_RANGE)), (0, 0, 0))
+    temperature = data.get('temperature')
+    if temperature is not None:
+        line(_isolines(pixels(temperature) - 273.15, [0.0], width=2), (255, 0, 255))
+    if style in SNOW_LEVEL_STYLES and data.get('wetbulb_overlay') is not None:
+        line(_isolines(pixels(data['wetbulb_overlay']), [0.0], width=2), (0, 255, 0))
+
+    # Terrain fill + surface outline
+    if terrain is not None:
+        plot[terrain] = (0.9 * np.array(TERRAIN_RGB) + 0.1 * plot[terrain]).astype(np.uint8)
+        # Terrain is the lower part of each column on both axes; outline its top
+        plot[terrain & ~np.vstack([terrain[:1], terrain[:-1]])] = 0
+
+    # Wind barbs from the sprite atlas, same subsampling as the matplotlib renderer
+    u, v = filt(data.get('u_wind')), filt(data.get('v_wind'))
+    if u is not None and v is not None:
+        n_lev, n_pts = u.shape
+        x_idx = np.arange(0, n_pts, max(1, n_pts // 25))
+        y_idx = np.arange(0, n_lev, max(1, n_lev // 12))
+        cols = np.clip(np.round(_frac_index(distances[x_idx], col_values)), 0, plot_w - 1).astype(int)
+        rows = np.clip(np.round(row_of(level_coord[y_idx])), 0, plot_h - 1).astype(int)
+        for j, yj in enumerate(y_idx):
+            for i, xi in enumerate(x_idx):
+                if terrain is not None and terrain[rows[j], cols[i]]:
+                    continue
+                uu, vv = u[yj, xi] * MS_TO_KT, v[yj, xi] * MS_TO_KT
+                if not (np.isfinite(uu) and np.isfinite(vv)):
+                    continue
+                # Staff points toward where the wind comes from
+                direction = np.degrees(np.arctan2(-vv, -uu))
+                _stamp(plot, _barb_sprite(np.hypot(uu, vv), direction), rows[j], cols[i])
+
+    # Compose the frame: plot, colorbar, labels
+    frame = np.full((height, WIDTH, 3), 255, dtype=np.uint8)
+    frame[MARGIN_TOP:MARGIN_TOP + plot_h, MARGIN_LEFT:MARGIN_LEFT + plot_w] = plot
+    cb_x = MARGIN_LEFT + plot_w + 16
+    cb_band = spec.bands - 1 - np.floor(np.arange(plot_h) / plot_h * spec.bands)   # top = highest band
+    frame[MARGIN_TOP:MARGIN_TOP + plot_h, cb_x:cb_x + COLORBAR_WIDTH] = \
+        lut[((cb_band + 0.5) / spec.bands * 255).astype(np.uint8), :3][:, None, :]
+
+    img = Image.fromarray(frame, 'RGB')
+    draw = ImageDraw.Draw(img)
+    font = ImageFont.load_default()
+    draw.rectangle([MARGIN_LEFT - 1, MARGIN_TOP - 1, MARGIN_LEFT + plot_w, MARGIN_TOP + plot_h], outline=(0, 0, 0))
+    draw.rectangle([cb_x - 1, MARGIN_TOP - 1, cb_x + COLORBAR_WIDTH, MARGIN_TOP + plot_h], outline=(0, 0, 0))
+
+    init_str, valid_str = _time_labels(metadata)
+    fhr = metadata.get('forecast_hour', 0)
+    draw.text((MARGIN_LEFT, 10), f"{metadata.get('model', 'HRRR')} Cross-Section: {spec.label}",
+              fill=(0, 0, 0), font=font)
+    draw.text((MARGIN_LEFT, 26), f"Init: {init_str}  |  F{fhr:02d}  |  Valid: {valid_str}",
+              fill=(85, 85, 85), font=font)
+
+    # Colorbar ticks: bottom, middle, top
+    for frac, val in ((1.0, spec.vmin), (0.5, (spec.vmin + spec.vmax) / 2), (0.0, spec.vmax)):
+        y = MARGIN_TOP + int(frac * (plot_h - 1))
+        draw.text((cb_x + COLORBAR_WIDTH + 4, y - 5), f"{val:g}", fill=(0, 0, 0), font=font)
+
+    # Y axis ticks
+    step = 2.0 if use_height else 100.0
+    start = np.ceil(min(y_lo, y_hi) / step) * step
+    for val in np.arange(start, max(y_lo, y_hi) + 1e-6, step):
+        y = MARGIN_TOP + int(row_of([val])[0])
+        draw.line([MARGIN_LEFT - 5, y, MARGIN_LEFT - 1, y], fill=(0, 0, 0))
+        draw.text((8, y - 5), f"{val:.0f}", fill=(0, 0, 0), font=font)
+    draw.text((8, MARGIN_TOP - 14), 'km' if use_height else 'hPa', fill=(85, 85, 85), font=font)
+
+    # X axis ticks
+    for d in np.linspace(0, distances[-1], 7):
+        x = MARGIN_LEFT + int(round(d / distances[-1] * (plot_w - 1)))
+        y = MARGIN_TOP + plot_h
+        draw.line([x, y, x, y + 4], fill=(0, 0, 0))
+        draw.text((x - 12, y + 8), f"{d:.0f}", fill=(0, 0, 0), font=font)
+    draw.text((MARGIN_LEFT + plot_w // 2 - 30, height - 16), f"Distance ({dist_unit})",
+              fill=(0, 0, 0), font=font)
+
+    buf = io.BytesIO()
+    img.save(buf, format='PNG', compress_level=1)
+    return buf.getvalue()
@@ -0,0 +1,159 @@
+"""Persistent GRIB message index for seek-and-decode loading.
+
+A full eccodes scan touches every message in a file (wrfprs ~ 700 msgs,
+wrfnat ~ 1,500) even though the cross-section loader only keeps a fraction.
+This module builds a sidecar index of (shortName, typeOfLevel, level,
+discipline/category/number) -> (offset, length) with a headers-only scan the
+first time a GRIB is touched, stores it in a .msgidx/ dir next to the file
+(.msgidx/<name>.json), and lets loaders decode just the messages they need — optionally across a
+thread pool, since eccodes releases the GIL while unpacking.
+
+The index is keyed on file size + mtime, so a re-downloaded GRIB is
+re-indexed automatically. The sidecar lives in a subdirectory so the
+models' GRIB globs (e.g. GFS '*pgrb2.0p25*') can never pick it up as a GRIB.
+"""
+
+import os
+import json
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+
+INDEX_DIR = '.msgidx'
+INDEX_VERSION = 1
+
+# Per-process memo: path -> (size, mtime_ns, entries)
+_INDEX_MEMO: Dict[str, tuple] = {}
+_INDEX_LOCK = threading.Lock()
+
+_HEADER_KEYS = (
+    'shortName', 'typeOfLevel', 'level',
+    'discipline', 'parameterCategory', 'parameterNumber',
+)
+
+
+def decode_threads() -> int:
+    """Thread count for message decodes (XSECT_DECODE_THREADS, default 1)."""
+    try:
+        return max(1, int(os.environ.get('XSECT_DECODE_THREADS', '1')))
+    except ValueError:
+        return 1
+
+
+def index_path(grib_file) -> Path:
+    grib_file = Path(grib_file)
+    return grib_file.parent / INDEX_DIR / f"{grib_file.name}.json"
+
+
+def _scan_headers(grib_file) -> List[dict]:
+    """Headers-only pass over a GRIB file recording each message's key and byte span."""
+    import eccodes
+
+    entries = []
+    with open(grib_file, 'rb') as f:
+        while True:
+            try:
+                try:
+                    msg = eccodes.codes_grib_new_from_file(f, headers_only=True)
+                except TypeError:
+                    msg = eccodes.codes_grib_new_from_file(f)
+            except Exception:
+                break  # Truncated trailing message — treat as EOF
+            if msg is None:
+                break
+            try:
+                entry = {
+                    'offset': int(eccodes.codes_get(msg, 'offset')),
+                    'length': int(eccodes.codes_get(msg, 'totalLength')),
+                }
+                for key in _HEADER_KEYS:
+                    try:
+                        entry[key] = eccodes.codes_get(msg, key)
+                    except Exception:
+                        entry[key] = None
+                if entry['level'] is not None:
+                    entry['level'] = int(entry['level'])
+                entries.append(entry)
+            finally:
+                eccodes.codes_release(msg)
+    return entries
+
+
+def get_index(grib_file) -> List[dict]:
+    """Return the message index for grib_file, building and persisting it on first touch.
+
+    Entries are in file order. If the sidecar can't be written (read-only
+    archive), the index is still memoized in-process.
+    """
+    path = str(grib_file)
+    st = os.stat(path)
+    stamp = (st.st_size, st.st_mtime_ns)
+
+    with _INDEX_LOCK:
+        memo = _INDEX_MEMO.get(path)
+    if memo is not None and memo[:2] == stamp:
+        return memo[2]
+
+    entries = None
+    sidecar = index_path(path)
+    if sidecar.exists():
+        try:
+            with open(sidecar, 'r') as f:
+                doc = json.load(f)
+            if (doc.get('version') == INDEX_VERSION
+                    and doc.get('size') == stamp[0] and doc.get('mtime_ns') == stamp[1]):
+                entries = doc['messages']
+        except (OSError, ValueError, KeyError):
+            entries = None
+
+    if entries is None:
+        entries = _scan_headers(path)
+        doc = {'version': INDEX_VERSION, 'size': stamp[0], 'mtime_ns': stamp[1], 'messages': entries}
+        tmp = Path(str(sidecar) + '.tmp')
+        try:
+            sidecar.parent.mkdir(exist_ok=True)
+            with open(tmp, 'w') as f:
+                json.dump(doc, f, separators=(',', ':'))
+            os.replace(tmp, sidecar)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+
+    with _INDEX_LOCK:
+        _INDEX_MEMO[path] = (stamp[0], stamp[1], entries)
+    return entries
+
+
+def select(entries: List[dict], predicate: Callable[[dict], bool]) -> List[dict]:
+    """Filter index entries, preserving file order."""
+    return [e for e in entries if predicate(e)]
+
+
+def decode_entries(
+    grib_file,
+    entries: List[dict],
+    decode: Callable,
+    workers: Optional[int] = None,
+) -> list:
+    """Seek to each entry, decode it with decode(msg_handle), return results in entry order.
+
+    decode receives an eccodes handle and must not keep it — the handle is
+    released as soon as decode returns.
+    """
+    import eccodes
+
+    def _one(entry):
+        with open(grib_file, 'rb') as f:
+            f.seek(entry['offset'])
+            buf = f.read(entry['length'])
+        msg = eccodes.codes_new_from_message(buf)
+        try:
+            return decode(msg)
+        finally:
+            eccodes.codes_release(msg)
+
+    workers = decode_threads() if workers is None else workers
+    if workers <= 1 or len(entries) <= 1:
+        return [_one(e) for e in entries]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_one, entries))
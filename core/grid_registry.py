@@ -0,0 +1,196 @@
+"""Process-wide registry of model grids, keyed by a content fingerprint.
+
+Every FHR loaded from the mmap cache comes with its own lats/lons arrays,
+but all HRRR hours (and all RRFS / GFS hours) share one grid. The registry
+maps each distinct grid to a single Grid object holding one copy of the
+coordinates plus its KD-trees, so:
+
+  - FHRs reference the registry's coordinate arrays instead of keeping
+    their own float64 copies on the heap
+  - the ~1.9M-point HRRR tree is built once per grid, not per hour/cycle
+  - with a registry directory, coordinates are memory-mapped from disk and
+    trees are pickled there, so render workers and restarts load them
+    (shared page cache) instead of rebuilding
+
+Two trees are available per curvilinear grid:
+    'latlon'  planar (lat, lon) — path interpolation, point lookups
+    'xyz'     unit-sphere Cartesian — map overlay reprojection
+
+Configuration: XSECT_GRID_DIR overrides the directory; otherwise the first
+engine with a cache dir configures <cache base>/_grids. Without either the
+registry is memory-only.
+"""
+
+import os
+import pickle
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+# Elements sampled into the fingerprint (plus the first/last rows)
+FINGERPRINT_SAMPLES = 4096
+
+_grids: Dict[str, 'Grid'] = {}
+_lock = threading.Lock()
+_grid_dir: Optional[Path] = None
+
+
+def configure(grid_dir) -> Optional[Path]:
+    """Set the on-disk registry directory (first caller wins; XSECT_GRID_DIR overrides)."""
+    global _grid_dir
+    with _lock:
+        if _grid_dir is None:
+            env = os.environ.get('XSECT_GRID_DIR', '').strip()
+            if env or grid_dir:
+                _grid_dir = Path(env or grid_dir)
+        return _grid_dir
+
+
+def fingerprint(lats: np.ndarray, lons: np.ndarray) -> str:
+    """Content hash of a grid: shapes plus edge rows and a strided sample of values."""
+    h = hashlib.sha1()
+    for a in (lats, lons):
+        flat = np.asarray(a).reshape(-1)
+        step = max(1, flat.size // FINGERPRINT_SAMPLES)
+        h.update(repr(a.shape).encode())
+        sample = np.concatenate([
+            flat[:a.shape[-1]], flat[-a.shape[-1]:], flat[::step],
+        ]).astype(np.float32)
+        # Round away float32/float64 save noise so the same grid always matches
+        h.update(np.round(sample, 4).tobytes())
+    return h.hexdigest()[:16]
+
+
+class Grid:
+    """One model grid: shared coordinates plus lazily built, persisted KD-trees."""
+
+    def __init__(self, key: str, lats: np.ndarray, lons: np.ndarray):
+        self.key = key
+        self.lats = lats
+        self.lons = lons
+        self.shape = lats.shape if lats.ndim == 2 else (len(lats), len(lons))
+        self.is_regular = lats.ndim == 1
+        self._trees = {}
+        self._tree_lock = threading.Lock()
+
+    def __repr__(self):
+        return f"Grid({self.key}, shape={self.shape})"
+
+    def _tree_path(self, kind: str) -> Optional[Path]:
+        return _grid_dir / f'{self.key}.{kind}.kdtree.pkl' if _grid_dir else None
+
+    def _tree_points(self, kind: str) -> np.ndarray:
+        lat = np.asarray(self.lats, dtype=np.float64).ravel()
+        lon = np.asarray(self.lons, dtype=np.float64).ravel()
+        if kind == 'latlon':
+            return np.column_stack([lat, lon])
+        lat_r, lon_r = np.deg2rad(lat), np.deg2rad(lon)
+        return np.column_stack([np.cos(lat_r) * np.cos(lon_r),
+                                np.cos(lat_r) * np.sin(lon_r),
+                                np.sin(lat_r)])
+
+    def kdtree(self, kind: str = 'latlon'):
+        """cKDTree over the grid points ('latlon' or 'xyz'), loaded from disk or built once."""
+        tree = self._trees.get(kind)
+        if tree is not None:
+            return tree
+        with self._tree_lock:
+            tree = self._trees.get(kind)
+            if tree is not None:
+                return tree
+            path = self._tree_path(kind)
+            if path is not None and path.exists():
+                try:
+                    with open(path, 'rb') as f:
+                        tree = pickle.load(f)
+                except Exception as e:
+                    print(f"  Grid {self.key}: failed to load {kind} tree ({e}), rebuilding")
+                    tree = None
+            if tree is None:
+                import time
+                from scipy.spatial import cKDTree
+
+                t0 = time.time()
+                tree = cKDTree(self._tree_points(kind))
+                print(f"  Grid {self.key}: built {kind} KD-tree over {tree.n} points "
+                      f"in {time.time() - t0:.1f}s")
+                if path is not None:
+                    _atomic_write(path, lambda f: pickle.dump(tree, f, protocol=pickle.HIGHEST_PROTOCOL))
+            self._trees[kind] = tree
+            return tree
+
+    def nearest(self, lats: np.ndarray, lons: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(iy, ix) of the nearest grid point to each (lat, lon)."""
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        if not self.is_regular:
+            _, flat = self.kdtree('latlon').query(np.column_stack([lats, lons]), k=1)
+            return np.divmod(np.asarray(flat, dtype=np.int64), self.shape[1])
+        # Regular lat/lon grid (GFS), possibly 0-360
+        if np.nanmax(self.lons) > 180:
+            lons = np.where(lons < 0, lons + 360, lons)
+        iy = np.abs(self.lats[None, :] - lats[:, None]).argmin(axis=1)
+        ix = np.abs(self.lons[None, :] - lons[:, None]).argmin(axis=1)
+        return iy, ix
+
+
+def _atomic_write(path: Path, write):
+    tmp = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, 'wb') as f:
+            write(f)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"  Grid registry: could not write {path.name}: {e}")
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+
+
+def _shared_coords(key: str, lats: np.ndarray, lons: np.ndarray):
+    """Coordinates memory-mapped from the registry dir (written on first sight), else in-heap copies."""
+    if _grid_dir is not None:
+        paths = (_grid_dir / f'{key}.lats.npy', _grid_dir / f'{key}.lons.npy')
+        for path, arr in zip(paths, (lats, lons)):
+            if not path.exists():
+                _atomic_write(path, lambda f, a=arr: np.save(f, np.asarray(a, dtype=np.float64)))
+        try:
+            return tuple(np.load(p, mmap_mode='r') for p in paths)
+        except (OSError, ValueError):
+            pass
+    return (np.array(lats, dtype=np.float64), np.array(lons, dtype=np.float64))
+
+
+def register(lats: np.ndarray, lons: np.ndarray) -> Grid:
+    """The registry's Grid for these coordinates, creating it on first sight."""
+    # Fast path: arrays already handed out by the registry
+    for grid in list(_grids.values()):
+        if grid.lats is lats and grid.lons is lons:
+            return grid
+    key = fingerprint(lats, lons)
+    grid = _grids.get(key)
+    if grid is not None:
+        return grid
+    with _lock:
+        grid = _grids.get(key)
+        if grid is None:
+            shared_lats, shared_lons = _shared_coords(key, lats, lons)
+            grid = Grid(key, shared_lats, shared_lons)
+            _grids[key] = grid
+    return grid
+
+
+def get(key: str) -> Optional[Grid]:
+    return _grids.get(key)
+
+
+def stats() -> dict:
+    return {
+        'grid_dir': str(_grid_dir) if _grid_dir else None,
+        'grids': {k: {'shape': list(g.shape), 'trees': sorted(g._trees)} for k, g in _grids.items()},
+    }
@@ -409,11 +409,23 @@ class MapOverlayEngine:
 
             self._is_regular_grid = False
 
+            # Shared grid (coordinates + KD-trees) from the process-wide registry;
+            # disk cache files are keyed by its fingerprint so a grid change rebuilds
+            from core import grid_registry
+            grid = grid_registry.register(lats, lons)
+
             # Try to load from disk cache
             proj_path = None
             if self.cache_dir:
-                proj_path = Path(self.cache_dir) / self.model_name / '_projection_map.npy'
-                mask_path = Path(self.cache_dir) / self.model_name / '_projection_mask.npy'
+                model_dir = Path(self.cache_dir) / self.model_name
+                proj_path = model_dir / f'_projection_map_{grid.key}.npy'
+                mask_path = model_dir / f'_projection_mask_{grid.key}.npy'
+                # Pre-registry caches weren't keyed by grid
+                for old in (model_dir / '_projection_map.npy', model_dir / '_projection_mask.npy'):
+                    try:
+                        old.unlink()
+                    except OSError:
+                        pass
                 if proj_path.exists() and mask_path.exists():
                     try:
                         self._proj_indices = np.load(proj_path)
@@ -430,21 +442,11 @@ class MapOverlayEngine:
                     except Exception:
                         pass
 
-            # Build cKDTree from 2D lat/lon
+            # 3D Cartesian cKDTree of the native grid (built once per grid, shared)
             import time
-            from scipy.spatial import cKDTree
 
             t0 = time.time()
-            lat_2d = np.asarray(lats, dtype=np.float64)
-            lon_2d = np.asarray(lons, dtype=np.float64)
-
-            # Convert lat/lon to 3D Cartesian for accurate KDTree queries
-            lat_r = np.deg2rad(lat_2d.ravel())
-            lon_r = np.deg2rad(lon_2d.ravel())
-            x = np.cos(lat_r) * np.cos(lon_r)
-            y = np.cos(lat_r) * np.sin(lon_r)
-            z = np.sin(lat_r)
-            tree = cKDTree(np.column_stack([x, y, z]))
+            tree = grid.kdtree('xyz')
 
             # Query for output grid points
             out_lats = self.grid.lats
@@ -469,7 +471,7 @@ class MapOverlayEngine:
             elapsed = time.time() - t0
             n_masked = int(self._proj_mask.sum())
             print(f"  MapOverlay [{self.model_name}]: built projection map "
-                  f"{lat_2d.shape} -> {self.grid.shape} in {elapsed:.1f}s "
+                  f"{grid.shape} -> {self.grid.shape} in {elapsed:.1f}s "
                   f"({n_masked} out-of-domain pixels masked)")
 
             # Save to disk (indices + mask)
@@ -477,7 +479,6 @@ class MapOverlayEngine:
                 try:
                     proj_path.parent.mkdir(parents=True, exist_ok=True)
                     np.save(proj_path, self._proj_indices)
-                    mask_path = proj_path.parent / '_projection_mask.npy'
                     np.save(mask_path, self._proj_mask)
                 except Exception as e:
                     print(f"  MapOverlay: failed to cache projection map: {e}")
@@ -551,8 +552,8 @@ class MapOverlayEngine:
         arr = self._get_field(fhr_data, field_spec.attr_name)
         if arr is None:
             return None
-        arr = np.asarray(arr, dtype=np.float32)
 
+        # Select the level before converting so only one level is read
         if arr.ndim == 3 and level is not None:
             idx = self._level_index(fhr_data, level)
             if idx is None:
@@ -561,7 +562,7 @@ class MapOverlayEngine:
         elif arr.ndim == 3:
             return None  # 3D field needs a level
 
-        return arr
+        return np.asarray(arr, dtype=np.float32)
 
     def _compute_hdw(self, fhr_data, surface_components, paired: bool = False) -> np.ndarray:
         """Compute HDW in lowest ~50 hPa AGL (Srock et al.).
@@ -923,7 +924,7 @@ class MapOverlayEngine:
         arr = self._get_field(fhr_data, attr_name)
         if arr is None:
             return None
-        arr = np.asarray(arr, dtype=np.float32)
+        # Select the level before converting so only one level is read
         if arr.ndim == 3 and level is not None:
             idx = self._level_index(fhr_data, level)
             if idx is None:
@@ -931,7 +932,7 @@ class MapOverlayEngine:
             arr = arr[idx]
         elif arr.ndim == 3:
             return None
-        return arr
+        return np.asarray(arr, dtype=np.float32)
 
     def render_composite(self, fhr_data, spec: 'CompositeSpec',
                          bbox: dict = None, opacity: float = 0.8) -> Optional[OverlayResult]:
@@ -0,0 +1,121 @@
+"""Byte-budgeted LRU of path-interpolated cross-section data.
+
+Each entry is the fields dict _interpolate_to_path fills for one
+(model, cycle, FHR, path geometry): the interpolated base fields, surface
+pressure, smoke and any derived kernels evaluated so far. Changing style,
+colormap, y_top, vscale or units on a line that is already cached - or a
+/api/v1/data call repeating a recent image request - then renders from the
+cached arrays without reading the mmap cache at all.
+
+Entries grow after insertion (a new style adds its derived field), so the
+engine calls account() once a request has filled its entry; that re-measures
+the entry and evicts least-recently-used entries over budget.
+
+One cache per process, shared by every engine (the model is part of the key).
+
+Configuration (environment):
+    XSECT_PATH_CACHE_MB   memory budget (default 256; 0 disables caching)
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional
+
+import numpy as np
+
+
+def _fields_nbytes(fields: Dict[str, np.ndarray]) -> int:
+    return sum(getattr(v, 'nbytes', 0) for v in list(fields.values()))
+
+
+class PathDataCache:
+    """Thread-safe LRU of field dicts, bounded by the bytes of their arrays."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> fields dict
+        self._sizes = {}  # key -> bytes at last account()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def fields(self, key: Hashable) -> Dict[str, np.ndarray]:
+        """The cached fields dict for key, or a new (registered) empty one."""
+        with self._lock:
+            fields = self._entries.get(key)
+            if fields is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return fields
+            self.misses += 1
+            fields = {}
+            if self.max_bytes > 0:
+                self._entries[key] = fields
+                self._sizes[key] = 0
+            return fields
+
+    def account(self, key: Hashable):
+        """Re-measure an entry after it was filled and evict over budget."""
+        with self._lock:
+            fields = self._entries.get(key)
+            if fields is None:
+                return
+            size = _fields_nbytes(fields)
+            self._bytes += size - self._sizes[key]
+            self._sizes[key] = size
+            if size > self.max_bytes:
+                self._drop(key)
+            while self._bytes > self.max_bytes and self._entries:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _drop(self, key: Hashable):
+        self._entries.pop(key, None)
+        self._bytes -= self._sizes.pop(key, 0)
+
+    def invalidate(self, model: str, cycle: str, forecast_hour: Optional[int] = None) -> int:
+        """Drop entries for a model cycle (optionally one FHR). Returns entries removed."""
+        with self._lock:
+            stale = [k for k in self._entries
+                     if k[0] == model and k[1] == cycle
+                     and (forecast_hour is None or k[2] == forecast_hour)]
+            for key in stale:
+                self._drop(key)
+            return len(stale)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else None,
+            }
+
+
+_cache: Optional[PathDataCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> PathDataCache:
+    """The process-wide cache, sized from XSECT_PATH_CACHE_MB on first use."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                try:
+                    mb = float(os.environ.get('XSECT_PATH_CACHE_MB', 256))
+                except ValueError:
+                    mb = 256
+                _cache = PathDataCache(int(mb * 1024 * 1024))
+    return _cache
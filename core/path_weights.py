@@ -0,0 +1,166 @@
+"""Precomputed interpolation weights for cross-section paths.
+
+Every field along a cross-section path is a linear combination of a small
+set of grid columns. PathWeights stores that combination once per path as a
+sparse (n_points, n_cols) matrix, so interpolating a (levels, ny, nx) field
+is one gather of the needed columns followed by one sparse product — for all
+levels at once, and for every field and forecast hour on the same grid.
+
+Builders:
+    nearest_weights   - k=1 nearest neighbour on curvilinear grids (HRRR/RRFS)
+    idw_weights       - k=4 inverse-distance on curvilinear grids
+    bilinear_weights  - true bilinear on regular lat/lon grids (GFS, climatology)
+
+PathGeometry bundles the weights for a path with everything else that only
+depends on the line and the grid (distances, hi-res terrain weights,
+azimuth), so it can be cached and shared by every forecast hour.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+INTERP_METHODS = ('nearest', 'idw')
+
+
+class PathWeights:
+    """Sparse path-interpolation operator over flat grid indices."""
+
+    def __init__(self, cols: np.ndarray, matrix, valid: np.ndarray = None):
+        self.cols = cols          # (n_cols,) sorted unique flat grid indices
+        self.matrix = matrix      # scipy.sparse.csr_matrix (n_points, n_cols), float32
+        self.valid = valid        # (n_points,) bool, False where the point is off-grid
+        self.n_points = matrix.shape[0]
+
+    @classmethod
+    def from_triplets(cls, rows: np.ndarray, flat_idx: np.ndarray, weights: np.ndarray,
+                      n_points: int, valid: np.ndarray = None) -> 'PathWeights':
+        from scipy.sparse import csr_matrix
+
+        cols, compact = np.unique(flat_idx, return_inverse=True)
+        matrix = csr_matrix(
+            (weights.astype(np.float32), (rows, compact.ravel())),
+            shape=(n_points, len(cols)),
+        )
+        matrix.eliminate_zeros()
+        return cls(cols, matrix, valid)
+
+    def _finish(self, out: np.ndarray) -> np.ndarray:
+        if self.valid is not None and not self.valid.all():
+            out[..., ~self.valid] = np.nan
+        return out
+
+    def apply_3d(self, field_3d: np.ndarray, n_levels: int = None) -> np.ndarray:
+        """Interpolate a (levels, ny, nx) field to (n_levels, n_points) float32.
+
+        Only the needed columns are read (in ascending order, so mmap'd
+        fields are touched front-to-back). Levels beyond the field's depth
+        are NaN-padded.
+        """
+        if n_levels is None:
+            n_levels = field_3d.shape[0]
+        n_lev = min(field_3d.shape[0], n_levels)
+        if hasattr(field_3d, 'gather_columns'):
+            # Tiled v2 cache field: read only the tiles the path crosses
+            vals = np.asarray(field_3d.gather_columns(self.cols, n_lev), dtype=np.float32)
+        else:
+            flat = field_3d.reshape(field_3d.shape[0], -1)
+            vals = np.asarray(flat[:n_lev, self.cols], dtype=np.float32)
+        out = np.asarray(self.matrix @ vals.T, dtype=np.float32).T
+        if n_lev < n_levels:
+            pad = np.full((n_levels - n_lev, self.n_points), np.nan, dtype=np.float32)
+            out = np.vstack([out, pad])
+        else:
+            out = np.ascontiguousarray(out)
+        return self._finish(out)
+
+    def apply_2d(self, field_2d: np.ndarray) -> np.ndarray:
+        """Interpolate a (ny, nx) field to (n_points,) float32."""
+        vals = np.asarray(field_2d.reshape(-1)[self.cols], dtype=np.float32)
+        out = np.asarray(self.matrix @ vals, dtype=np.float32)
+        return self._finish(out)
+
+
+def nearest_weights(tree, path_lats: np.ndarray, path_lons: np.ndarray) -> PathWeights:
+    """k=1 nearest-neighbour weights from a cKDTree built on (lat, lon) grid points."""
+    n = len(path_lats)
+    _, idx = tree.query(np.column_stack([path_lats, path_lons]), k=1)
+    return PathWeights.from_triplets(np.arange(n), idx, np.ones(n), n)
+
+
+def idw_weights(tree, lats_grid: np.ndarray, lons_grid: np.ndarray,
+                path_lats: np.ndarray, path_lons: np.ndarray, k: int = 4) -> PathWeights:
+    """k-neighbour inverse-distance-squared weights on a curvilinear grid.
+
+    Distances use a local equirectangular metric (longitude scaled by
+    cos(lat)), so weights aren't skewed at high latitudes.
+    """
+    n = len(path_lats)
+    _, idx = tree.query(np.column_stack([path_lats, path_lons]), k=k)
+    nb_lat = lats_grid.reshape(-1)[idx].astype(np.float64)
+    nb_lon = lons_grid.reshape(-1)[idx].astype(np.float64)
+    coslat = np.cos(np.radians(path_lats))[:, None]
+    d2 = (nb_lat - path_lats[:, None]) ** 2 + ((nb_lon - path_lons[:, None]) * coslat) ** 2
+
+    exact = d2 < 1e-12
+    with np.errstate(divide='ignore'):
+        w = np.where(exact, 0.0, 1.0 / d2)
+    hit = exact.any(axis=1)
+    w[hit] = exact[hit].astype(np.float64)  # grid point coincides: take it verbatim
+    w /= w.sum(axis=1, keepdims=True)
+
+    rows = np.repeat(np.arange(n), k)
+    return PathWeights.from_triplets(rows, idx.ravel(), w.ravel(), n)
+
+
+def bilinear_weights(lats_1d: np.ndarray, lons_1d: np.ndarray,
+                     path_lats: np.ndarray, path_lons: np.ndarray) -> PathWeights:
+    """Bilinear weights on a regular grid with (ny, nx) = (len(lats_1d), len(lons_1d)).
+
+    Handles descending latitudes and 0-360 longitudes without reordering the
+    field: the axes are sorted here and the corners mapped back to original
+    row/column indices. Points outside the grid come back NaN.
+    """
+    lats_1d = np.asarray(lats_1d, dtype=np.float64)
+    lons_1d = np.asarray(lons_1d, dtype=np.float64)
+    lons_1d = np.where(lons_1d > 180, lons_1d - 360, lons_1d)
+    nx = len(lons_1d)
+    n = len(path_lats)
+
+    lat_order = np.argsort(lats_1d, kind='stable')
+    lon_order = np.argsort(lons_1d, kind='stable')
+    la = lats_1d[lat_order]
+    lo = lons_1d[lon_order]
+
+    def _axis(axis, pts):
+        i = np.clip(np.searchsorted(axis, pts) - 1, 0, len(axis) - 2)
+        span = axis[i + 1] - axis[i]
+        frac = np.where(span > 0, (pts - axis[i]) / np.where(span > 0, span, 1), 0.0)
+        ok = (pts >= axis[0]) & (pts <= axis[-1])
+        return i, np.clip(frac, 0.0, 1.0), ok
+
+    i, fy, ok_y = _axis(la, np.asarray(path_lats, dtype=np.float64))
+    j, fx, ok_x = _axis(lo, np.asarray(path_lons, dtype=np.float64))
+
+    r0, r1 = lat_order[i], lat_order[i + 1]
+    c0, c1 = lon_order[j], lon_order[j + 1]
+    flat = np.stack([r0 * nx + c0, r0 * nx + c1, r1 * nx + c0, r1 * nx + c1], axis=1)
+    w = np.stack([(1 - fy) * (1 - fx), (1 - fy) * fx, fy * (1 - fx), fy * fx], axis=1)
+
+    rows = np.repeat(np.arange(n), 4)
+    return PathWeights.from_triplets(rows, flat.ravel(), w.ravel(), n, valid=ok_y & ok_x)
+
+
+@dataclass
+class PathGeometry:
+    """Grid-dependent geometry for one cross-section line, shared across FHRs."""
+    lats: np.ndarray              # (n_points,)
+    lons: np.ndarray              # (n_points,)
+    distances: np.ndarray         # (n_points,) cumulative km
+    weights: PathWeights
+    lats_hires: np.ndarray        # (terrain_res,) terrain path
+    lons_hires: np.ndarray
+    distances_hires: np.ndarray
+    weights_hires: PathWeights
+    azimuth: float                # section azimuth (radians, from north) for wind rotation
+    key: tuple = None             # engine geometry-cache key (grid, method, endpoints, n_points)
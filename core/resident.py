@@ -0,0 +1,125 @@
+"""Resident-page accounting for memory-mapped cache arrays.
+
+np.memmap fields cost no Python heap, but every page a cross-section touches
+is pulled into the page cache and stays there until the kernel reclaims it.
+This module measures how much of a mapping's file range is in the page cache
+using mincore(2) through ctypes, sampling large mappings so a status poll
+over dozens of FHRs stays in the low milliseconds. That is page-cache
+residency, not this process's RSS: a page counts whether or not this process
+has touched it since it was cached.
+
+release_pages() drops an FHR when it goes cold. madvise(MADV_DONTNEED)
+unmaps the pages from this process, then posix_fadvise(POSIX_FADV_DONTNEED)
+on the backing file asks the kernel to evict the now-unmapped clean pages
+from the page cache, which is what mincore (and the memory limit) sees.
+
+On platforms without mincore (Windows) resident_bytes() returns None and
+callers fall back to the previous heap-only accounting.
+"""
+
+import os
+import sys
+import mmap
+import ctypes
+import ctypes.util
+
+import numpy as np
+
+PAGE_SIZE = mmap.PAGESIZE
+
+# Mappings larger than this many pages are sampled instead of fully probed
+MAX_PROBE_PAGES = 4096
+SAMPLE_WINDOWS = 64
+
+_libc = None
+_mincore = None
+
+
+def _load_libc():
+    global _libc, _mincore
+    if _libc is not None or sys.platform.startswith('win'):
+        return _mincore
+    try:
+        _libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+        _mincore = _libc.mincore
+        _mincore.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.POINTER(ctypes.c_ubyte)]
+        _mincore.restype = ctypes.c_int
+    except (OSError, AttributeError):
+        _libc = False
+        _mincore = None
+    return _mincore
+
+
+def mincore_available() -> bool:
+    return _load_libc() is not None
+
+
+def _page_span(arr: np.ndarray):
+    """Page-aligned (start_address, n_pages) covering an array's data."""
+    addr = arr.ctypes.data
+    start = addr - (addr % PAGE_SIZE)
+    end = addr + arr.nbytes
+    return start, (end - start + PAGE_SIZE - 1) // PAGE_SIZE
+
+
+def _resident_pages(start: int, n_pages: int) -> int:
+    vec = (ctypes.c_ubyte * n_pages)()
+    if _mincore(ctypes.c_void_p(start), ctypes.c_size_t(n_pages * PAGE_SIZE), vec) != 0:
+        raise OSError(ctypes.get_errno(), 'mincore failed')
+    return int(np.count_nonzero(np.frombuffer(vec, np.uint8) & 1))
+
+
+def resident_bytes(arr: np.ndarray) -> int:
+    """Estimated resident bytes of a memory-mapped array, or None if unsupported.
+
+    Mappings up to MAX_PROBE_PAGES are probed exactly; larger ones are
+    estimated from SAMPLE_WINDOWS evenly spaced windows.
+    """
+    if _load_libc() is None or arr.nbytes == 0:
+        return None
+    start, n_pages = _page_span(arr)
+    try:
+        if n_pages <= MAX_PROBE_PAGES:
+            return min(arr.nbytes, _resident_pages(start, n_pages) * PAGE_SIZE)
+        window = MAX_PROBE_PAGES // SAMPLE_WINDOWS
+        stride = n_pages // SAMPLE_WINDOWS
+        hit = 0
+        for w in range(SAMPLE_WINDOWS):
+            hit += _resident_pages(start + w * stride * PAGE_SIZE, window)
+        frac = hit / (window * SAMPLE_WINDOWS)
+        return int(arr.nbytes * frac)
+    except OSError:
+        return None
+
+
+def release_pages(arr: np.ndarray) -> bool:
+    """Drop a memory-mapped array's pages from this process and the page cache.
+
+    madvise(MADV_DONTNEED) unmaps them here; posix_fadvise(POSIX_FADV_DONTNEED)
+    then evicts the clean file pages no other process still maps. The data is
+    re-read from disk on next access. Returns True if either step ran.
+    """
+    released = False
+    mm = getattr(arr, '_mmap', None)
+    advice = getattr(mmap, 'MADV_DONTNEED', None)
+    if mm is not None and advice is not None:
+        try:
+            mm.madvise(advice)
+            released = True
+        except (OSError, ValueError, AttributeError):
+            pass
+    filename = getattr(arr, 'filename', None)
+    if filename and hasattr(os, 'posix_fadvise'):
+        try:
+            fd = os.open(filename, os.O_RDONLY)
+        except OSError:
+            return released
+        try:
+            os.posix_fadvise(fd, int(getattr(arr, 'offset', 0) or 0), arr.nbytes,
+                             os.POSIX_FADV_DONTNEED)
+            released = True
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+    return released
@@ -0,0 +1,279 @@
+"""Incremental mmap cache writer: fill one FHR's cache dir as GRIB messages arrive.
+
+InteractiveCrossSection used to build a whole ForecastHourData in memory
+and then save it. MmapCacheBuilder instead preallocates one .npy memmap per
+field in the entry's partial dir and writes every decoded message straight
+into its level slot, so a conversion only ever holds the message being
+decoded. It is fed either from a GRIB already on disk (the engine's
+streaming converter) or from raw message bytes split off an HTTP stream
+(smart_hrrr.orchestrator.ingest_forecast_hour), in any message order.
+
+    builder = MmapCacheBuilder(engine, grib_file, fhr, levels=[1000, 975, ...])
+    for msg in messages:
+        builder.add_message(msg, kind='pressure')
+    builder.finish()    # NaN-fill gaps, validate, write coords/tiles, rename into place
+
+The finished entry has the same layout as _save_to_mmap_cache output
+(v1 .npy files, or v2 tiles / column copies per XSECT_CACHE_FORMAT and
+XSECT_COLUMN_CACHE).
+"""
+
+import shutil
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+KELVIN = 273.15
+THETA_KAPPA = 0.286
+
+
+class MmapCacheBuilder:
+    """One FHR's mmap cache entry, written level by level."""
+
+    def __init__(self, engine, grib_file: str, forecast_hour: int, levels: Iterable[float],
+                 cache_dir: Optional[Path] = None, tmp_suffix: str = '._partial',
+                 surface_kinds=('surface',)):
+        """
+        Args:
+            engine: InteractiveCrossSection supplying the cache dir and field tables.
+            grib_file: wrfprs path the entry is keyed on (need not exist yet).
+            levels: Isobaric levels in hPa; messages on other levels are ignored.
+            cache_dir: Entry dir (default: engine._get_mmap_cache_dir(grib_file)).
+            tmp_suffix: Suffix of the work dir next to cache_dir.
+            surface_kinds: Message kinds (see add_message) surface fields are taken from.
+        """
+        self.engine = engine
+        self.grib_file = grib_file
+        self.forecast_hour = forecast_hour
+        self.levels = sorted({int(lev) for lev in levels}, reverse=True)
+        self._slot = {lev: i for i, lev in enumerate(self.levels)}
+        self._scale = (1000.0 / np.asarray(self.levels, dtype=np.float32)) ** THETA_KAPPA
+        self.cache_dir = Path(cache_dir) if cache_dir else engine._get_mmap_cache_dir(grib_file)
+        if self.cache_dir is None:
+            raise ValueError("engine has no cache_dir")
+        self.tmp_dir = Path(str(self.cache_dir) + tmp_suffix)
+        self.surface_kinds = tuple(surface_kinds)
+        self.shape = None
+        self.lats = None
+        self.lons = None
+        self._out: Dict[str, np.ndarray] = {}
+        self._filled: Dict[str, set] = {}
+        self._surface = set()
+        self._smoke_slot: Dict[int, int] = {}
+        self.messages = 0
+
+        if self.tmp_dir.exists():
+            shutil.rmtree(self.tmp_dir)
+        self.tmp_dir.mkdir(parents=True)
+
+    # --- slots ---
+
+    def _field(self, name: str, n_levels: int, dtype) -> np.ndarray:
+        arr = self._out.get(name)
+        if arr is None:
+            arr = self._out[name] = np.lib.format.open_memmap(
+                self.tmp_dir / f'{name}.npy', mode='w+', dtype=dtype,
+                shape=(n_levels, *self.shape),
+            )
+            self._filled[name] = set()
+        return arr
+
+    def _check_shape(self, arr2d: np.ndarray):
+        if self.shape is None:
+            self.shape = arr2d.shape
+        elif arr2d.shape != self.shape:
+            raise ValueError(f"message grid {arr2d.shape} != {self.shape}")
+
+    def set_grid(self, lats: np.ndarray, lons: np.ndarray):
+        if np.isfinite(lons).any() and np.nanmax(lons) > 180:
+            lons = np.where(lons > 180, lons - 360, lons)
+        self._check_shape(lats)
+        self.lats, self.lons = lats, lons
+
+    def add_isobaric(self, short_name: str, level: float, arr2d: np.ndarray) -> bool:
+        """Write one isobaric level of a FIELDS_TO_LOAD field. Returns False if not wanted."""
+        name = self.engine.FIELDS_TO_LOAD.get(short_name)
+        idx = self._slot.get(int(level))
+        if name is None or idx is None:
+            return False
+        self._check_shape(arr2d)
+        dtype = np.float32 if name in self.engine._FLOAT32_FIELDS else np.float16
+        self._field(name, len(self.levels), dtype)[idx] = arr2d
+        self._filled[name].add(idx)
+        if name == 'temperature':
+            self._field('theta', len(self.levels), np.float16)[idx] = arr2d * self._scale[idx]
+            self._field('temp_c', len(self.levels), np.float16)[idx] = arr2d - KELVIN
+            self._filled['theta'].add(idx)
+            self._filled['temp_c'].add(idx)
+        return True
+
+    def add_surface(self, attr_name: str, arr2d: np.ndarray) -> bool:
+        """Write a 2D surface field; the first message for each attribute wins."""
+        if attr_name in self._surface:
+            return False
+        self._check_shape(arr2d)
+        if attr_name == 'surface_pressure' and np.isfinite(arr2d).any() and np.nanmax(arr2d) > 2000:
+            arr2d = arr2d / 100.0
+        np.save(self.tmp_dir / f'{attr_name}.npy', np.asarray(arr2d).astype(np.float16))
+        self._surface.add(attr_name)
+        return True
+
+    def set_smoke_levels(self, levels: Iterable[int]):
+        """Hybrid levels MASSDEN is expected on (must precede add_smoke/add_hybrid_pressure)."""
+        self._smoke_slot = {int(lev): i for i, lev in enumerate(sorted({int(lev) for lev in levels}))}
+
+    def add_smoke(self, level: int, arr2d: np.ndarray) -> bool:
+        idx = self._smoke_slot.get(int(level))
+        if idx is None:
+            return False
+        self._check_shape(arr2d)
+        self._field('smoke_hyb', len(self._smoke_slot), np.float16)[idx] = arr2d * 1e9  # kg/m³ → μg/m³
+        self._filled['smoke_hyb'].add(idx)
+        return True
+
+    def add_hybrid_pressure(self, level: int, arr2d: np.ndarray) -> bool:
+        idx = self._smoke_slot.get(int(level))
+        if idx is None or idx in self._filled.get('smoke_pres_hyb', ()):
+            return False  # first pressure message per level, as the indexed reader does
+        self._check_shape(arr2d)
+        self._field('smoke_pres_hyb', len(self._smoke_slot), np.float16)[idx] = arr2d / 100.0  # Pa → hPa
+        self._filled['smoke_pres_hyb'].add(idx)
+        return True
+
+    def adopt_file(self, name: str):
+        """Register a 3D .npy already written into tmp_dir (e.g. by _stream_smoke_npy)."""
+        self._filled.setdefault(name, None)
+
+    # --- raw messages ---
+
+    def add_message(self, message: bytes, kind: str = 'pressure') -> bool:
+        """Decode one GRIB message (raw bytes) and route it to its slot.
+
+        kind is the file it came from ('pressure', 'surface', 'native').
+        Returns True if the message was used.
+        """
+        import eccodes
+
+        msg = eccodes.codes_new_from_message(message)
+        try:
+            short_name = eccodes.codes_get(msg, 'shortName')
+            type_of_level = eccodes.codes_get(msg, 'typeOfLevel')
+            used = False
+            if type_of_level == 'isobaricInhPa' and short_name in self.engine.FIELDS_TO_LOAD:
+                level = eccodes.codes_get(msg, 'level')
+                if int(level) in self._slot:
+                    if self.lats is None:
+                        self._grid_from_msg(msg)
+                    used = self.add_isobaric(short_name, level, self.engine._grib_msg_to_2d(msg))
+            elif type_of_level == 'hybrid' and self._smoke_slot:
+                entry = {key: eccodes.codes_get(msg, key)
+                         for key in ('discipline', 'parameterCategory', 'parameterNumber')}
+                level = int(eccodes.codes_get(msg, 'level'))
+                if self.engine._is_massden_entry(entry):
+                    used = self.add_smoke(level, self.engine._grib_msg_to_2d(msg))
+                elif self.engine._is_pres_entry(entry):
+                    used = self.add_hybrid_pressure(level, self.engine._grib_msg_to_2d(msg))
+            elif kind in self.surface_kinds:
+                attr_name = self.engine._SFC_EXTRACT.get((short_name, type_of_level))
+                if attr_name is not None and attr_name not in self._surface:
+                    used = self.add_surface(attr_name, self.engine._grib_msg_to_2d(msg).astype(np.float32))
+        finally:
+            eccodes.codes_release(msg)
+        if used:
+            self.messages += 1
+        return used
+
+    def _grid_from_msg(self, msg):
+        self.set_grid(*self.engine._grib_latlon(msg))
+
+    # --- completion ---
+
+    def finish(self, cb=None, total_steps: int = 13) -> bool:
+        """Fill gaps, validate, write coords/layout and move the entry into place.
+
+        Returns False (and discards the work dir) if the data fails the
+        engine's validation (too few levels, no surface pressure); raises on
+        a temperature field with missing levels.
+        """
+        from core.tiled_cache import (
+            DEFAULT_TILE, cache_codec, cache_format, column_cache_enabled,
+            write_column_field, write_manifest, write_tiled_field,
+        )
+        cb = cb or (lambda s, t, d: None)
+        engine = self.engine
+        try:
+            if 'temperature' not in self._out:
+                raise RuntimeError("no temperature messages (shortName='t')")
+            if len(self.levels) < engine.min_levels:
+                print(f"  WARNING: only {len(self.levels)} levels (expected {engine.min_levels}) "
+                      f"— GRIB may be incomplete, skipping")
+                self.abort()
+                return False
+            if 'surface_pressure' not in self._surface:
+                print("  WARNING: missing surface_pressure (needed for terrain) — GRIB may be incomplete, skipping")
+                self.abort()
+                return False
+
+            if 'smoke_hyb' in self._out and 'smoke_pres_hyb' not in self._out:
+                print("  Warning: smoke without hybrid pressure, dropping it")
+                del self._out['smoke_hyb']
+                (self.tmp_dir / 'smoke_hyb.npy').unlink(missing_ok=True)
+
+            for name, arr in self._out.items():
+                n_slots = arr.shape[0]
+                missing = sorted(set(range(n_slots)) - self._filled[name])
+                if name == 'temperature' and missing:
+                    raise RuntimeError(f"temperature missing {len(missing)}/{n_slots} pressure levels")
+                if missing and name not in ('theta', 'temp_c', 'smoke_pres_hyb'):
+                    print(f"  Warning: missing {name} on {len(missing)}/{n_slots} levels")
+                if name != 'smoke_pres_hyb':  # absent hybrid pressure stays 0, as in the indexed reader
+                    for idx in missing:
+                        arr[idx] = np.nan
+                arr.flush()
+            fields_3d = list(self._out) + [name for name, filled in self._filled.items()
+                                           if filled is None]
+            self._out.clear()
+
+            np.save(self.tmp_dir / 'meta.npy', np.array([self.forecast_hour]))
+            np.save(self.tmp_dir / 'pressure_levels.npy', np.asarray(self.levels, dtype=np.float32))
+            np.save(self.tmp_dir / 'lats.npy', self.lats)
+            np.save(self.tmp_dir / 'lons.npy', self.lons)
+
+            # v2 tiles / column copies, built from the memmaps a block at a time
+            cb(13, total_steps, "Writing cache layout...")
+            tiled = cache_format() == 'v2'
+            columns = column_cache_enabled()
+            if tiled or columns:
+                codec = cache_codec() if tiled else None
+                tiled_fields = {}
+                for name in fields_3d:
+                    npy_path = self.tmp_dir / f'{name}.npy'
+                    arr = np.load(npy_path, mmap_mode='r')
+                    if columns and name in engine._COLUMN_FIELDS:
+                        write_column_field(self.tmp_dir, name, arr, arr.dtype)
+                    if tiled:
+                        tiled_fields[name] = write_tiled_field(self.tmp_dir, name, arr, arr.dtype, codec=codec)
+                    del arr
+                    if tiled:
+                        npy_path.unlink()
+                if tiled:
+                    write_manifest(self.tmp_dir, tiled_fields, DEFAULT_TILE, codec)
+
+            # Write _complete marker last — cache only valid if this exists
+            (self.tmp_dir / '_complete').touch()
+            if self.cache_dir.exists():
+                shutil.rmtree(self.cache_dir)
+            self.tmp_dir.rename(self.cache_dir)
+        except Exception:
+            self.abort()
+            raise
+
+        engine._cleanup_cache()
+        return True
+
+    def abort(self):
+        """Drop the work dir (the existing entry, if any, is left alone)."""
+        self._out.clear()
+        if self.tmp_dir.exists():
+            shutil.rmtree(self.tmp_dir, ignore_errors=True)
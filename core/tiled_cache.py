@@ -0,0 +1,369 @@
+"""v2 mmap cache format: spatially tiled, level-major fields with optional compression.
+
+The v1 cache stores every field as one (n_levels, ny, nx) .npy, so a
+cross-section column touches one page per level per field and a whole FHR
+is ~2.8 GB on NVMe. v2 splits 3D fields into TILE x TILE column blocks with
+all levels kept together, so a path only reads the tiles it crosses:
+
+    <field>.tiles.npy   uncompressed: (n_ty, n_tx, n_levels, TILE, TILE), mmap'd
+    <field>.tiles.bin   compressed: concatenated tile blobs ...
+    <field>.tidx.npy    ... with a (n_ty, n_tx, 2) int64 (offset, length) index
+    _v2.json            manifest: tile size, codec, per-field shape/dtype
+
+Edge tiles are NaN-padded. 2D and coordinate fields stay as v1 .npy files,
+so tools that look for t2m.npy / refc.npy keep working.
+
+Codecs: 'none' (default), 'zlib' (stdlib), 'zstd' (needs the zstandard
+package; falls back to zlib when it isn't installed).
+
+Column-major variant: point and sounding queries read every level of a
+few columns, which in either layout above is one page fault per level. For
+the fields those queries use, an entry can also carry <field>.cols.npy, a
+(ny, nx, n_levels) copy in which each profile is contiguous. It is an extra
+file next to whichever layout holds the field, not a replacement.
+
+Configuration (environment, read when a cache entry is written):
+    XSECT_CACHE_FORMAT   'v1' (default) or 'v2'
+    XSECT_CACHE_CODEC    'none' (default), 'zlib' or 'zstd' — v2 only
+    XSECT_COLUMN_CACHE   '1' to also write column-major copies of profile fields
+
+Existing entries are converted with tools/migrate_cache_v2.py.
+
+TiledField behaves like a read-only ndarray for the access patterns the
+engine and overlay renderer use: basic int/slice indexing, np.asarray(),
+shape/dtype/ndim, plus gather_columns() for path interpolation and
+read_level() (what arr[k] uses) for map overlays.
+"""
+
+import os
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+FORMAT_VERSION = 2
+MANIFEST = '_v2.json'
+DEFAULT_TILE = 64
+DECODED_TILE_CACHE = 16  # decoded tiles kept per compressed field
+
+
+def cache_format() -> str:
+    """Cache layout new entries are written in: 'v1' or 'v2'."""
+    fmt = os.environ.get('XSECT_CACHE_FORMAT', 'v1').strip().lower()
+    return fmt if fmt in ('v1', 'v2') else 'v1'
+
+
+def cache_codec() -> str:
+    return resolve_codec(os.environ.get('XSECT_CACHE_CODEC', 'none'))
+
+
+def column_cache_enabled() -> bool:
+    return os.environ.get('XSECT_COLUMN_CACHE', '').strip().lower() in ('1', 'true', 'yes')
+
+
+# --- Codecs ---
+
+def resolve_codec(codec: str) -> str:
+    codec = (codec or 'none').strip().lower()
+    if codec == 'zstd':
+        try:
+            import zstandard  # noqa: F401
+        except ImportError:
+            print("  Warning: zstandard not installed, using zlib for v2 cache tiles")
+            return 'zlib'
+    if codec not in ('none', 'zlib', 'zstd'):
+        print(f"  Warning: unknown cache codec '{codec}', storing tiles uncompressed")
+        return 'none'
+    return codec
+
+
+def _compress(codec: str, raw: bytes) -> bytes:
+    if codec == 'zstd':
+        import zstandard
+        return zstandard.ZstdCompressor(level=1).compress(raw)
+    import zlib
+    return zlib.compress(raw, 1)
+
+
+def _decompress(codec: str, blob: bytes, max_bytes: int = 0) -> bytes:
+    """Decompress a tile blob; with max_bytes, stop once that many bytes are out."""
+    if codec == 'zstd':
+        import zstandard
+        if max_bytes:
+            return zstandard.ZstdDecompressor().stream_reader(blob).read(max_bytes)
+        return zstandard.ZstdDecompressor().decompress(blob)
+    import zlib
+    if max_bytes:
+        return zlib.decompressobj().decompress(blob, max_bytes)
+    return zlib.decompress(blob)
+
+
+# --- Writing ---
+
+def write_tiled_field(directory: Path, name: str, arr: np.ndarray, dtype,
+                      tile: int = DEFAULT_TILE, codec: str = 'none') -> dict:
+    """Write a (n_levels, ny, nx) field as tiles. Returns its manifest entry."""
+    n_lev, ny, nx = arr.shape
+    n_ty = (ny + tile - 1) // tile
+    n_tx = (nx + tile - 1) // tile
+    dtype = np.dtype(dtype)
+
+    def tile_block(ty, tx):
+        block = np.full((n_lev, tile, tile), np.nan, dtype=dtype)
+        y0, x0 = ty * tile, tx * tile
+        src = np.asarray(arr[:, y0:y0 + tile, x0:x0 + tile])
+        block[:, :src.shape[1], :src.shape[2]] = src
+        return block
+
+    if codec == 'none':
+        out = np.lib.format.open_memmap(
+            directory / f'{name}.tiles.npy', mode='w+', dtype=dtype,
+            shape=(n_ty, n_tx, n_lev, tile, tile),
+        )
+        for ty in range(n_ty):
+            for tx in range(n_tx):
+                out[ty, tx] = tile_block(ty, tx)
+        out.flush()
+        del out
+    else:
+        index = np.zeros((n_ty, n_tx, 2), dtype=np.int64)
+        offset = 0
+        with open(directory / f'{name}.tiles.bin', 'wb') as f:
+            for ty in range(n_ty):
+                for tx in range(n_tx):
+                    blob = _compress(codec, tile_block(ty, tx).tobytes())
+                    f.write(blob)
+                    index[ty, tx] = (offset, len(blob))
+                    offset += len(blob)
+        np.save(directory / f'{name}.tidx.npy', index)
+
+    return {'shape': [n_lev, ny, nx], 'dtype': dtype.name}
+
+
+def write_manifest(directory: Path, fields: Dict[str, dict], tile: int, codec: str):
+    """Write the manifest atomically — readers treat an entry as v2 only once it exists."""
+    tmp = Path(directory) / (MANIFEST + '.tmp')
+    with open(tmp, 'w') as f:
+        json.dump({'format': FORMAT_VERSION, 'tile': tile, 'codec': codec, 'fields': fields}, f)
+    os.replace(tmp, Path(directory) / MANIFEST)
+
+
+def tiled_files(name: str):
+    """File names that may back a tiled field."""
+    return (f'{name}.tiles.npy', f'{name}.tiles.bin', f'{name}.tidx.npy')
+
+
+def read_manifest(directory: Path) -> Optional[dict]:
+    path = Path(directory) / MANIFEST
+    if not path.exists():
+        return None
+    with open(path) as f:
+        manifest = json.load(f)
+    if manifest.get('format') != FORMAT_VERSION:
+        return None
+    return manifest
+
+
+# --- Reading ---
+
+class TiledField:
+    """Read-only ndarray-like view over a tiled (n_levels, ny, nx) cache field."""
+
+    def __init__(self, directory: Path, name: str, manifest: dict):
+        entry = manifest['fields'][name]
+        self.name = name
+        self.shape = tuple(entry['shape'])
+        self.dtype = np.dtype(entry['dtype'])
+        self.ndim = 3
+        self.size = int(np.prod(self.shape))
+        self.nbytes = self.size * self.dtype.itemsize
+        self.tile = int(manifest['tile'])
+        self.codec = manifest['codec']
+        directory = Path(directory)
+        if self.codec == 'none':
+            self._tiles = np.load(directory / f'{name}.tiles.npy', mmap_mode='r')
+        else:
+            self._tiles = None
+            self._index = np.load(directory / f'{name}.tidx.npy')
+            self._blob_path = directory / f'{name}.tiles.bin'
+            self._decoded = OrderedDict()
+            self._lock = threading.Lock()
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __repr__(self):
+        return f"TiledField({self.name}, shape={self.shape}, dtype={self.dtype}, codec={self.codec})"
+
+    def _tile(self, ty: int, tx: int) -> np.ndarray:
+        """(n_levels, TILE, TILE) block for one tile."""
+        if self._tiles is not None:
+            return self._tiles[ty, tx]
+        key = (ty, tx)
+        with self._lock:
+            block = self._decoded.get(key)
+            if block is not None:
+                self._decoded.move_to_end(key)
+                return block
+        offset, length = self._index[ty, tx]
+        with open(self._blob_path, 'rb') as f:
+            f.seek(int(offset))
+            raw = _decompress(self.codec, f.read(int(length)))
+        block = np.frombuffer(raw, dtype=self.dtype).reshape(self.shape[0], self.tile, self.tile)
+        with self._lock:
+            self._decoded[key] = block
+            while len(self._decoded) > DECODED_TILE_CACHE:
+                self._decoded.popitem(last=False)
+        return block
+
+    def gather_columns(self, flat_idx: np.ndarray, n_levels: int = None) -> np.ndarray:
+        """Values at flat (y*nx + x) grid indices for the first n_levels: (n_levels, len(flat_idx))."""
+        n_lev = self.shape[0] if n_levels is None else min(n_levels, self.shape[0])
+        nx = self.shape[2]
+        flat_idx = np.asarray(flat_idx)
+        yy, xx = np.divmod(flat_idx, nx)
+        ty, tx = yy // self.tile, xx // self.tile
+        out = np.empty((n_lev, len(flat_idx)), dtype=self.dtype)
+        tile_ids = ty * (nx // self.tile + 1) + tx
+        for tid in np.unique(tile_ids):
+            sel = np.nonzero(tile_ids == tid)[0]
+            block = self._tile(int(ty[sel[0]]), int(tx[sel[0]]))
+            out[:, sel] = block[:n_lev, yy[sel] % self.tile, xx[sel] % self.tile]
+        return out
+
+    def read_level(self, k: int) -> np.ndarray:
+        """One full (ny, nx) level.
+
+        Uncompressed fields gather the level from every tile in one copy.
+        Compressed tiles are decoded only up to level k (levels are stored
+        in order within a tile) and bypass the decoded-tile cache, so a map
+        overlay reading a level does not decode whole columns or evict the
+        tiles a cross-section path is using.
+        """
+        n_lev, ny, nx = self.shape
+        k = int(k) + n_lev if k < 0 else int(k)
+        if not 0 <= k < n_lev:
+            raise IndexError(f"index {k} out of bounds for axis with size {n_lev}")
+        T = self.tile
+        if self._tiles is not None:
+            n_ty, n_tx = self._tiles.shape[:2]
+            plane = self._tiles[:, :, k].transpose(0, 2, 1, 3).reshape(n_ty * T, n_tx * T)
+            return np.ascontiguousarray(plane[:ny, :nx])
+        n_ty, n_tx = self._index.shape[:2]
+        level_bytes = T * T * self.dtype.itemsize
+        out = np.empty((n_ty * T, n_tx * T), dtype=self.dtype)
+        with open(self._blob_path, 'rb') as f:
+            for ty in range(n_ty):
+                for tx in range(n_tx):
+                    with self._lock:
+                        block = self._decoded.get((ty, tx))
+                    if block is not None:
+                        level = block[k]
+                    else:
+                        offset, length = self._index[ty, tx]
+                        f.seek(int(offset))
+                        raw = _decompress(self.codec, f.read(int(length)), (k + 1) * level_bytes)
+                        level = np.frombuffer(raw[k * level_bytes:], dtype=self.dtype).reshape(T, T)
+                    out[ty * T:(ty + 1) * T, tx * T:(tx + 1) * T] = level
+        return out[:ny, :nx]
+
+    def _read_box(self, lev_key, y0: int, y1: int, x0: int, x1: int) -> np.ndarray:
+        """Assemble [lev_key, y0:y1, x0:x1] from the tiles covering the box."""
+        levels = np.arange(self.shape[0])[lev_key]
+        out = np.empty((np.size(levels), y1 - y0, x1 - x0), dtype=self.dtype)
+        T = self.tile
+        for ty in range(y0 // T, (max(y1, y0 + 1) - 1) // T + 1):
+            for tx in range(x0 // T, (max(x1, x0 + 1) - 1) // T + 1):
+                ya, yb = max(y0, ty * T), min(y1, (ty + 1) * T)
+                xa, xb = max(x0, tx * T), min(x1, (tx + 1) * T)
+                if ya >= yb or xa >= xb:
+                    continue
+                block = self._tile(ty, tx)
+                out[:, ya - y0:yb - y0, xa - x0:xb - x0] = \
+                    block[levels.reshape(-1), ya - ty * T:yb - ty * T, xa - tx * T:xb - tx * T]
+        return out[0] if np.ndim(levels) == 0 else out
+
+    @staticmethod
+    def _axis_box(key, n):
+        """(start, stop, local_key) for an int/positive-step slice along one axis, else None."""
+        if isinstance(key, (int, np.integer)):
+            k = int(key) + n if key < 0 else int(key)
+            if not 0 <= k < n:
+                raise IndexError(f"index {key} out of bounds for axis with size {n}")
+            return k, k + 1, 0
+        if isinstance(key, slice):
+            start, stop, step = key.indices(n)
+            if step < 1:
+                return None
+            stop = max(start, stop)
+            return start, stop, slice(0, stop - start, step)
+        return None
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            key = (key,)
+        if len(key) > 3 or any(k is Ellipsis or k is None for k in key):
+            return np.asarray(self)[key]
+        key = key + (slice(None),) * (3 - len(key))
+        lev_key, ykey, xkey = key
+        if not isinstance(lev_key, (int, np.integer, slice)):
+            return np.asarray(self)[key]
+        full = slice(None)
+        if isinstance(lev_key, (int, np.integer)) and all(isinstance(k, slice) and k == full for k in (ykey, xkey)):
+            return self.read_level(lev_key)  # arr[k]: overlay level reads
+        ybox = self._axis_box(ykey, self.shape[1])
+        xbox = self._axis_box(xkey, self.shape[2])
+        if ybox is None or xbox is None:
+            return np.asarray(self)[key]
+        region = self._read_box(lev_key, ybox[0], ybox[1], xbox[0], xbox[1])
+        return region[..., ybox[2], xbox[2]]
+
+    def __array__(self, dtype=None, copy=None):
+        arr = self._read_box(slice(None), 0, self.shape[1], 0, self.shape[2])
+        return arr if dtype is None else arr.astype(dtype, copy=False)
+
+    def astype(self, dtype, copy=True):
+        return np.asarray(self).astype(dtype, copy=False)
+
+    def reshape(self, *shape):
+        return np.asarray(self).reshape(*shape)
+
+
+def load_tiled_fields(directory: Path, manifest: dict) -> Dict[str, TiledField]:
+    return {name: TiledField(directory, name, manifest) for name in manifest.get('fields', {})}
+
+
+# --- Column-major variant ---
+
+COLUMN_SUFFIX = '.cols.npy'
+COLUMN_BLOCK_ROWS = 64  # grid rows transposed per write
+
+
+def column_path(directory: Path, name: str) -> Path:
+    return Path(directory) / f'{name}{COLUMN_SUFFIX}'
+
+
+def write_column_field(directory: Path, name: str, arr, dtype) -> Path:
+    """Write a (n_levels, ny, nx) field as a (ny, nx, n_levels) .npy, a block of rows at a time."""
+    n_lev, ny, nx = arr.shape
+    path = column_path(directory, name)
+    tmp = path.with_name(path.name + '.tmp')
+    out = np.lib.format.open_memmap(tmp, mode='w+', dtype=np.dtype(dtype), shape=(ny, nx, n_lev))
+    for y0 in range(0, ny, COLUMN_BLOCK_ROWS):
+        block = np.asarray(arr[:, y0:y0 + COLUMN_BLOCK_ROWS, :])
+        out[y0:y0 + block.shape[1]] = np.moveaxis(block, 0, -1)
+    out.flush()
+    del out
+    os.replace(tmp, path)
+    return path
+
+
+def load_column_field(directory: Path, name: str) -> Optional[np.ndarray]:
+    """Memory-mapped (ny, nx, n_levels) column copy of a field, or None if not cached."""
+    path = column_path(directory, name)
+    if not path.exists():
+        return None
+    return np.load(path, mmap_mode='r')
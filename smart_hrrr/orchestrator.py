@@ -4,14 +4,18 @@ Simplified GRIB Download Orchestrator
 Handles parallel downloading of HRRR GRIB files for cross-section processing.
 """
 
+import os
+import re
+import threading
 import time
 import logging
 import urllib.request
 import urllib.error
 import socket
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional, Tuple
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from queue import Queue
 
 import requests
 from requests.adapters import HTTPAdapter
@@ -25,6 +29,47 @@ MIN_GRIB_SIZE = 500_000  # 500KB
 
 logger = logging.getLogger(__name__)
 
+# Byte-range subsetting: .idx inventory selectors per file type.
+# Each selector is (idx variable name, regex matched against the idx level string).
+# Isobaric names mirror InteractiveCrossSection.FIELDS_TO_LOAD (t,u,v,r,w,q,gh,absv,
+# clwmr,dpt,icmr,rwmr,snmr,grle); surface names mirror the wrfsfc extract table;
+# native covers the smoke loader (MASSDEN + PRES on hybrid levels).
+_ISOBARIC = r'^\d+(\.\d+)? mb$'
+_IDX_SURFACE = [
+    ('PRES', r'^surface$'),
+    ('TMP', r'^2 m above ground$'),
+    ('DPT', r'^2 m above ground$'),
+    ('UGRD', r'^10 m above ground$'),
+    ('VGRD', r'^10 m above ground$'),
+    ('REFC', r'^entire atmosphere'),
+    ('CAPE', r'^surface$'),
+    ('CIN', r'^surface$'),
+    ('GUST', r'^surface$'),
+    ('PRATE', r'^surface$'),
+    ('VIS', r'^surface$'),
+    ('MSLMA', r'^mean sea level$'),
+    ('MSLET', r'^mean sea level$'),
+    ('PRMSL', r'^mean sea level$'),
+]
+IDX_SUBSETS = {
+    'pressure': [(var, _ISOBARIC) for var in (
+        'TMP', 'UGRD', 'VGRD', 'RH', 'VVEL', 'SPFH', 'HGT', 'ABSV',
+        'CLMR', 'DPT', 'CIMIXR', 'ICMR', 'RWMR', 'SNMR', 'GRLE',
+    )] + _IDX_SURFACE,  # single-file models (GFS) read surface fields from here too
+    'surface': _IDX_SURFACE,
+    'native': [
+        ('MASSDEN', r'^\d+ hybrid level$'),
+        ('PRES', r'^\d+ hybrid level$'),
+    ],
+}
+
+
+def _subset_enabled(subset: Optional[bool]) -> bool:
+    """Resolve the subset flag; None defers to XSECT_GRIB_SUBSET=1 in the environment."""
+    if subset is not None:
+        return subset
+    return os.environ.get('XSECT_GRIB_SUBSET', '0') == '1'
+
 
 def _detect_source(url: str) -> str:
     """Classify URL source for logging and source-priority ordering."""
@@ -70,13 +115,15 @@ def _apply_source_preference(urls: List[str], source_preference: Optional[List[s
     return [url for _, _, url in ranked]
 
 
-def download_grib_file(url: str, output_path: Path, timeout: int = 600) -> bool:
+def download_grib_file(url: str, output_path: Path, timeout: int = 600,
+                       on_chunk: Optional[Callable[[bytes], None]] = None) -> bool:
     """Download a single GRIB file from URL.
 
     Downloads to a .partial temp file first, validates the response (HTTP status,
     content type, file size), then atomically renames to the final path.
     Returns False and cleans up on any validation failure — never writes
     HTML error pages or truncated files to the final path.
+    on_chunk, if given, sees every chunk as it is written (pipelined ingest).
     """
     partial_path = Path(str(output_path) + '.partial')
     try:
@@ -99,6 +146,8 @@ def download_grib_file(url: str, output_path: Path, timeout: int = 600) -> bool:
             for chunk in resp.iter_content(chunk_size=256 * 1024):
                 f.write(chunk)
                 written += len(chunk)
+                if on_chunk:
+                    on_chunk(chunk)
 
         # Reject tiny files (HTML error bodies, truncated downloads)
         if written < MIN_GRIB_SIZE:
@@ -126,6 +175,205 @@ def download_grib_file(url: str, output_path: Path, timeout: int = 600) -> bool:
         return False
 
 
+def parse_idx(text: str) -> List[dict]:
+    """Parse a wgrib2-style .idx inventory.
+
+    Lines look like ``12:3456789:d=2026010112:TMP:500 mb:anl:``. Returns one dict
+    per message with num, start, end (inclusive, None for the last message),
+    var and level.
+    """
+    entries = []
+    for line in text.splitlines():
+        parts = line.strip().split(':')
+        if len(parts) < 5:
+            continue
+        try:
+            num = int(parts[0].split('.')[0])
+            start = int(parts[1])
+        except ValueError:
+            continue
+        entries.append({'num': num, 'start': start, 'end': None,
+                        'var': parts[3], 'level': parts[4]})
+    # Submessages (12.1, 12.2) share an offset; keep only distinct starts
+    for i in range(len(entries) - 1):
+        nxt = next((e['start'] for e in entries[i + 1:] if e['start'] > entries[i]['start']), None)
+        entries[i]['end'] = nxt - 1 if nxt is not None else None
+    return entries
+
+
+def select_idx_ranges(entries: List[dict], selectors) -> List[Tuple[int, Optional[int]]]:
+    """Return (start, end) byte ranges for idx entries matching any (var, level_regex)."""
+    compiled = [(var, re.compile(pat)) for var, pat in selectors]
+    ranges = []
+    seen = set()
+    for e in entries:
+        if e['start'] in seen:
+            continue
+        if any(e['var'] == var and rx.search(e['level']) for var, rx in compiled):
+            ranges.append((e['start'], e['end']))
+            seen.add(e['start'])
+    return ranges
+
+
+def merge_byte_ranges(ranges: List[Tuple[int, Optional[int]]], max_gap: int = 0) -> List[Tuple[int, Optional[int]]]:
+    """Merge sorted byte ranges that touch (or sit within max_gap bytes of each other).
+
+    An end of None means "to end of file" and absorbs anything after it.
+    """
+    merged = []
+    for start, end in sorted(ranges, key=lambda r: r[0]):
+        if merged:
+            prev_start, prev_end = merged[-1]
+            if prev_end is None:
+                continue
+            if start <= prev_end + 1 + max_gap:
+                merged[-1] = (prev_start, None if end is None else max(prev_end, end))
+                continue
+        merged.append((start, end))
+    return merged
+
+
+def download_grib_subset(
+    url: str,
+    output_path: Path,
+    selectors,
+    timeout: int = 600,
+    idx_url: Optional[str] = None,
+    session: Optional[requests.Session] = None,
+    max_gap: int = 0,
+    on_chunk: Optional[Callable[[bytes], None]] = None,
+) -> bool:
+    """Download only the GRIB messages matching selectors using HTTP Range requests.
+
+    Fetches the .idx inventory (idx_url, default url + '.idx'), merges the selected
+    message ranges, and writes the concatenated messages to a .partial file that is
+    renamed on success. Returns False (leaving nothing behind) if the inventory is
+    missing, the server ignores Range, or any chunk fails validation — callers
+    fall back to a full download. on_chunk sees every chunk as it is written.
+    """
+    partial_path = Path(str(output_path) + '.partial')
+    sess = session or requests.Session()
+    idx_url = idx_url or url + '.idx'
+    try:
+        resp = sess.get(idx_url, timeout=60)
+        if resp.status_code != 200:
+            logger.debug(f"No idx inventory ({resp.status_code}) at {idx_url}")
+            return False
+        ranges = merge_byte_ranges(select_idx_ranges(parse_idx(resp.text), selectors), max_gap)
+        if not ranges:
+            logger.warning(f"No matching messages in {idx_url}")
+            return False
+
+        written = 0
+        with open(partial_path, 'wb') as f:
+            for start, end in ranges:
+                rng = f"bytes={start}-" if end is None else f"bytes={start}-{end}"
+                r = sess.get(url, headers={'Range': rng}, timeout=timeout, stream=True)
+                if r.status_code != 206:
+                    # 200 means the server ignored Range and is sending the whole file
+                    logger.warning(f"HTTP {r.status_code} for range request to {url}")
+                    r.close()
+                    raise OSError("range request not honoured")
+                head = b''
+                got = 0
+                for chunk in r.iter_content(chunk_size=256 * 1024):
+                    if len(head) < 4:
+                        head += chunk[:4 - len(head)]
+                    f.write(chunk)
+                    got += len(chunk)
+                    if on_chunk:
+                        on_chunk(chunk)
+                if head != b'GRIB':
+                    raise OSError(f"range {rng} does not start with GRIB magic (got {head!r})")
+                if end is not None and got != end - start + 1:
+                    raise OSError(f"short range {rng}: got {got} bytes")
+                written += got
+
+        if written < MIN_GRIB_SIZE:
+            logger.warning(f"Subset too small ({written} bytes) from {url}")
+            partial_path.unlink(missing_ok=True)
+            return False
+
+        partial_path.rename(output_path)
+        logger.debug(f"Subset {output_path.name}: {len(ranges)} ranges, {written / 1e6:.1f} MB")
+        return True
+    except (requests.exceptions.RequestException, OSError) as e:
+        logger.debug(f"Subset download failed for {url}: {e}")
+        partial_path.unlink(missing_ok=True)
+        return False
+    finally:
+        if session is None:
+            sess.close()
+
+
+class GribMessageSplitter:
+    """Split a GRIB byte stream into whole messages as chunks arrive.
+
+    GRIB messages are self-delimiting: 'GRIB', the total message length
+    (GRIB2: 8 bytes big-endian at offset 8; GRIB1: 3 bytes at offset 4),
+    and '7777' as the last four bytes. Each complete message is passed to
+    on_message(bytes) as soon as its last byte is fed; bytes that are not
+    part of a valid message are skipped.
+    """
+
+    def __init__(self, on_message: Callable[[bytes], None]):
+        self.on_message = on_message
+        self._buf = bytearray()
+        self.messages = 0
+        self.skipped = 0
+
+    def feed(self, chunk: bytes):
+        buf = self._buf
+        buf += chunk
+        while True:
+            start = buf.find(b'GRIB')
+            if start < 0:
+                # Keep a possible partial 'GRIB' at the end
+                drop = max(0, len(buf) - 3)
+                self.skipped += drop
+                del buf[:drop]
+                return
+            if start:
+                self.skipped += start
+                del buf[:start]
+            if len(buf) < 16:
+                return
+            edition = buf[7]
+            if edition == 2:
+                length = int.from_bytes(buf[8:16], 'big')
+            elif edition == 1:
+                length = int.from_bytes(buf[4:7], 'big')
+            else:
+                length = 0
+            if length < 16:
+                self.skipped += 4
+                del buf[:4]
+                continue
+            if len(buf) < length:
+                return
+            if buf[length - 4:length] != b'7777':
+                self.skipped += 4
+                del buf[:4]
+                continue
+            message = bytes(buf[:length])
+            del buf[:length]
+            self.messages += 1
+            self.on_message(message)
+
+    def feed_file(self, path: Path, chunk_size: int = 4 * 1024 * 1024):
+        """Feed a GRIB already on disk (e.g. left by an earlier run)."""
+        with open(path, 'rb') as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                self.feed(chunk)
+
+    def pending(self) -> int:
+        """Bytes of an incomplete trailing message."""
+        return len(self._buf)
+
+
 def download_forecast_hour(
     model: str,
     date_str: str,
@@ -134,8 +382,20 @@ def download_forecast_hour(
     output_dir: Path,
     file_types: List[str] = None,
     source_preference: Optional[List[str]] = None,
+    subset: Optional[bool] = None,
+    on_message: Optional[Callable[[str, bytes], None]] = None,
 ) -> bool:
-    """Download GRIB files for a single forecast hour."""
+    """Download GRIB files for a single forecast hour.
+
+    With subset enabled (or XSECT_GRIB_SUBSET=1), only the messages listed in
+    IDX_SUBSETS are fetched via .idx byte ranges; sources without an inventory
+    or Range support fall back to the full file.
+
+    on_message(file_type, message_bytes), if given, is called for every GRIB
+    message as soon as its last byte has arrived (files already on disk are
+    replayed). A retried source replays its messages again, so consumers
+    must treat repeats as overwrites.
+    """
 
     if file_types is None:
         file_types = ['pressure', 'surface', 'native']  # wrfprs, wrfsfc, wrfnat
@@ -149,6 +409,7 @@ def download_forecast_hour(
 
     output_dir.mkdir(parents=True, exist_ok=True)
     all_file_types_ok = True
+    use_subset = _subset_enabled(subset)
 
     for file_type in file_types:
         filename = model_config.get_filename(cycle_hour, file_type, forecast_hour)
@@ -163,6 +424,8 @@ def download_forecast_hour(
                 output_path.unlink()
             else:
                 logger.debug(f"File exists: {filename}")
+                if on_message:
+                    GribMessageSplitter(lambda m, ft=file_type: on_message(ft, m)).feed_file(output_path)
                 file_ok = True
                 continue
 
@@ -173,7 +436,19 @@ def download_forecast_hour(
             source = _source_display_name(_detect_source(url))
             logger.info(f"Downloading {filename} from {source}...")
 
-            if download_grib_file(url, output_path):
+            def _chunk_sink():
+                # Fresh splitter per attempt: a failed attempt's partial message is dropped
+                if on_message is None:
+                    return None
+                return GribMessageSplitter(lambda m, ft=file_type: on_message(ft, m)).feed
+
+            selectors = IDX_SUBSETS.get(file_type) if use_subset else None
+            if selectors and download_grib_subset(url, output_path, selectors, on_chunk=_chunk_sink()):
+                logger.info(f"Downloaded {filename} (idx subset)")
+                file_ok = True
+                break
+
+            if download_grib_file(url, output_path, on_chunk=_chunk_sink()):
                 logger.info(f"Downloaded {filename}")
                 file_ok = True
                 break
@@ -189,6 +464,152 @@ def download_forecast_hour(
     return all_file_types_ok
 
 
+# Pipelined ingest: marker file present in an FHR dir while its cache is being built
+INGEST_MARKER = '.ingesting'
+PIPELINE_QUEUE_MESSAGES = 32  # decoded-message backlog before the download waits (~1-2 MB each)
+_HYBRID = r'^\d+ hybrid level$'
+
+
+def _default_cache_dir(model: str) -> Path:
+    """Mmap cache dir the dashboard reads for model (XSECT_CACHE_DIR or <repo>/cache/xsect)."""
+    base = os.environ.get('XSECT_CACHE_DIR', str(Path(__file__).resolve().parent.parent / 'cache' / 'xsect'))
+    return Path(base) / model
+
+
+def _idx_levels(urls: List[str], var: str, level_regex: str) -> List[float]:
+    """Levels (leading number of the level string) of var in the first reachable .idx inventory."""
+    rx = re.compile(level_regex)
+    for url in urls:
+        try:
+            resp = requests.get(url + '.idx', timeout=30)
+        except requests.exceptions.RequestException:
+            continue
+        if resp.status_code != 200:
+            continue
+        levels = set()
+        for e in parse_idx(resp.text):
+            m = rx.search(e['level']) if e['var'] == var else None
+            if m:
+                levels.add(float(e['level'].split()[0]))
+        return sorted(levels)
+    return []
+
+
+def ingest_forecast_hour(
+    model: str,
+    date_str: str,
+    cycle_hour: int,
+    forecast_hour: int,
+    output_dir: Path,
+    file_types: List[str] = None,
+    source_preference: Optional[List[str]] = None,
+    subset: Optional[bool] = None,
+    cache_dir: Optional[Path] = None,
+    min_levels: int = 40,
+) -> bool:
+    """Download a forecast hour and build its mmap cache while the bytes arrive.
+
+    Every GRIB message is split off the HTTP stream as soon as it is complete
+    and handed to a decoder thread that writes it into its level slot of the
+    FHR's cache entry (core.stream_cache.MmapCacheBuilder), so the cache is
+    complete moments after the last byte instead of after a later rescan and
+    full conversion. The GRIB files are still written to output_dir as usual.
+
+    Needs eccodes and a .idx inventory (for the level list up front); without
+    them, or for GFS (subset to CONUS after decoding), this is a plain
+    download_forecast_hour and the dashboard converts the files later.
+    While the cache is being built, output_dir holds INGEST_MARKER so the
+    dashboard doesn't start a conversion of its own.
+    Returns the download result.
+    """
+    if file_types is None:
+        file_types = ['pressure', 'surface', 'native']
+
+    def _plain():
+        return download_forecast_hour(model, date_str, cycle_hour, forecast_hour, output_dir,
+                                      file_types=file_types, source_preference=source_preference,
+                                      subset=subset)
+
+    model_config = get_model_registry().get_model(model)
+    if not model_config or model.lower() == 'gfs' or 'pressure' not in file_types:
+        return _plain()
+    try:
+        import eccodes  # noqa: F401
+        from core.cross_section_interactive import InteractiveCrossSection
+        from core.stream_cache import MmapCacheBuilder
+    except ImportError as e:
+        logger.debug(f"Pipelined ingest unavailable ({e}), downloading only")
+        return _plain()
+
+    def _urls(file_type):
+        return _apply_source_preference(
+            model_config.get_download_urls(date_str, cycle_hour, file_type, forecast_hour), source_preference)
+
+    levels = _idx_levels(_urls('pressure'), 'TMP', _ISOBARIC)
+    if not levels:
+        logger.debug(f"No .idx levels for {model} {date_str}/{cycle_hour:02d}z F{forecast_hour:02d}, downloading only")
+        return _plain()
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    grib_file = output_dir / model_config.get_filename(cycle_hour, 'pressure', forecast_hour)
+    engine = InteractiveCrossSection(cache_dir=str(cache_dir or _default_cache_dir(model)),
+                                     min_levels=min_levels, grib_backend='eccodes')
+    engine.model = model.upper()
+    builder = MmapCacheBuilder(engine, str(grib_file), forecast_hour, levels, tmp_suffix='._ingest',
+                               surface_kinds=('surface',) if 'surface' in file_types else ('pressure',))
+    if 'native' in file_types:
+        builder.set_smoke_levels(_idx_levels(_urls('native'), 'MASSDEN', _HYBRID))
+
+    marker = output_dir / INGEST_MARKER
+    marker.touch()
+    queue: Queue = Queue(maxsize=PIPELINE_QUEUE_MESSAGES)
+    errors = []
+
+    def _decode():
+        while True:
+            item = queue.get()
+            if item is None:
+                return
+            if errors:
+                continue  # keep draining so the download never blocks
+            try:
+                builder.add_message(item[1], item[0])
+            except Exception as e:
+                errors.append(e)
+
+    decoder = threading.Thread(target=_decode, daemon=True,
+                               name=f"ingest-{model}-{date_str}-{cycle_hour:02d}z-F{forecast_hour:02d}")
+    decoder.start()
+    start = time.time()
+    try:
+        try:
+            ok = download_forecast_hour(
+                model, date_str, cycle_hour, forecast_hour, output_dir,
+                file_types=file_types, source_preference=source_preference, subset=subset,
+                on_message=lambda file_type, message: queue.put((file_type, message)),
+            )
+        finally:
+            last_byte = time.time()
+            queue.put(None)
+            decoder.join()
+
+        if not ok:
+            builder.abort()
+        elif errors:
+            builder.abort()
+            logger.warning(f"Pipelined ingest decode failed for F{forecast_hour:02d}: {errors[0]}")
+        else:
+            try:
+                if builder.finish():
+                    logger.info(f"  F{forecast_hour:02d} cache ready {time.time() - last_byte:.1f}s after last byte "
+                                f"({builder.messages} msgs, {last_byte - start:.1f}s download)")
+            except Exception as e:
+                logger.warning(f"Pipelined ingest could not finish F{forecast_hour:02d} cache: {e}")
+        return ok
+    finally:
+        marker.unlink(missing_ok=True)
+
+
 def download_gribs_parallel(
     model: str,
     date_str: str,
@@ -201,6 +622,7 @@ def download_gribs_parallel(
     on_start=None,
     should_cancel=None,
     source_preference: Optional[List[str]] = None,
+    subset: Optional[bool] = None,
 ) -> Dict[int, bool]:
     """Download GRIB files for multiple forecast hours in parallel.
 
@@ -208,6 +630,7 @@ def download_gribs_parallel(
         on_complete: Optional callback(fhr, success) called as each FHR finishes.
         on_start: Optional callback(fhr) called when each FHR starts downloading.
         should_cancel: Optional callable() returning True to abort remaining downloads.
+        subset: Fetch only the needed messages via .idx byte ranges (None = env default).
     Returns dict mapping forecast_hour -> success status.
     """
 
@@ -231,6 +654,7 @@ def download_gribs_parallel(
             fhr_dir,
             file_types=file_types,
             source_preference=source_preference,
+            subset=subset,
         )
         dur = time.time() - start
         if ok:
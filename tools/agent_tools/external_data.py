@@ -745,29 +745,6 @@ def _compute_vpd(temp_c: float, rh_pct: float) -> float:
     return round(es - ea, 2)
 
 
-def _find_surface_value(data_2d: list, pressure_levels: list,
-                        surface_pressure: float, col: int = 0) -> tuple:
-    """Extract value at the lowest valid pressure level for a column.
-
-    Finds the pressure level closest to (but not exceeding by >5 hPa) the
-    surface pressure. This gives the model's near-surface value, NOT a
-    column average.
-
-    Returns (value, pressure_hpa) or (None, None) if no valid level found.
-    """
-    import math
-    best_i = None
-    for i, p in enumerate(pressure_levels):
-        if p <= surface_pressure + 5:
-            if best_i is None or pressure_levels[i] > pressure_levels[best_i]:
-                best_i = i
-    if best_i is not None:
-        val = data_2d[best_i][col]
-        if val is not None and not math.isnan(val):
-            return val, pressure_levels[best_i]
-    return None, None
-
-
 def get_point_surface_conditions(
     lat: float,
     lon: float,
@@ -778,9 +755,9 @@ def get_point_surface_conditions(
 ) -> dict:
     """Extract HRRR/GFS/RRFS model surface-level data for a specific lat/lon point.
 
-    Uses the /api/v1/data endpoint with a minimal-length transect to extract
-    the model's surface prediction at a single point. Returns the LOWEST
-    PRESSURE LEVEL values (closest to ground), NOT column averages.
+    Uses the /api/v1/timeseries endpoint, which reads the nearest grid column
+    directly. Returns the LOWEST PRESSURE LEVEL values (closest to ground),
+    NOT column averages.
 
     This is critical for fire weather: column-averaged RH may be 40-50% while
     the actual surface RH can be 10-15%. Always use this for surface conditions.
@@ -801,88 +778,49 @@ def get_point_surface_conditions(
     """
     import math
 
-    # Use a tiny transect (0.01 deg ~ 1km) centered on the point
-    offset = 0.005
-    start_lat = lat - offset
-    start_lon = lon
-    end_lat = lat + offset
-    end_lon = lon
-
-    base = base_url.rstrip("/")
-
-    # Fetch three products: temperature, RH, and wind speed
-    # Each gives us the 2D field + pressure levels + surface pressure
-    results = {}
-    products = {
-        "temperature": "temperature_c",
-        "rh": "rh_pct",
-        "wind_speed": None,  # wind has u/v components
-    }
+    params = urllib.parse.urlencode({
+        "lat": lat, "lon": lon,
+        "fields": "temperature,rh,u_wind,v_wind,surface_pressure",
+        "level": "surface",
+        "fhr": fhr,
+        "model": model, "cycle": cycle,
+    })
+    url = f"{base_url.rstrip('/')}/api/v1/timeseries?{params}"
+    try:
+        data = _fetch_json(url, timeout=60)
+    except Exception as e:
+        return {
+            "error": f"Failed to fetch point data: {e}",
+            "url": url,
+        }
 
-    for product, field_key in products.items():
-        params = (
-            f"start_lat={start_lat}&start_lon={start_lon}"
-            f"&end_lat={end_lat}&end_lon={end_lon}"
-            f"&product={product}&model={model}&cycle={cycle}&fhr={fhr}"
-        )
-        url = f"{base}/api/v1/data?{params}"
-        try:
-            data = _fetch_json(url, timeout=60)
-        except Exception as e:
-            return {
-                "error": f"Failed to fetch {product} data: {e}",
-                "url": url,
-            }
-        results[product] = data
+    fields = data.get("fields", {})
 
-    # Extract pressure info from the first successful response
-    temp_data = results.get("temperature", {})
-    pressure_levels = temp_data.get("pressure_levels_hpa", [])
-    surface_pressures = temp_data.get("surface_pressure_hpa", [])
+    def _value(name):
+        values = fields.get(name, {}).get("values") or [[None]]
+        return values[0][0]
 
-    if not pressure_levels or not surface_pressures:
+    sfc_pressure = _value("surface_pressure")
+    if sfc_pressure is None:
         return {
-            "error": "No pressure level data returned from API",
+            "error": "No surface pressure returned from API",
             "hint": "Check that the dashboard is running and data is loaded",
-            "raw_keys": list(temp_data.keys()),
+            "raw_keys": list(fields.keys()),
         }
 
-    # Use the center column (middle point of our tiny transect)
-    n_pts = len(surface_pressures)
-    center = n_pts // 2
-    sfc_pressure = surface_pressures[center]
-
-    # Extract surface temperature
-    temp_2d = temp_data.get("temperature_c")
-    temp_c = None
-    temp_level = None
-    if temp_2d:
-        temp_c, temp_level = _find_surface_value(
-            temp_2d, pressure_levels, sfc_pressure, center
-        )
-
-    # Extract surface RH
-    rh_data = results.get("rh", {})
-    rh_2d = rh_data.get("rh_pct")
-    rh_pct = None
-    if rh_2d:
-        rh_pct, _ = _find_surface_value(
-            rh_2d, pressure_levels, sfc_pressure, center
-        )
+    temp_k = _value("temperature")
+    temp_c = temp_k - 273.15 if temp_k is not None else None
+    temp_level = _value("level_hpa")
+    rh_pct = _value("rh")
 
-    # Extract surface wind speed from u/v components
-    wind_data = results.get("wind_speed", {})
-    u_2d = wind_data.get("u_wind_ms")
-    v_2d = wind_data.get("v_wind_ms")
+    # Surface wind speed from u/v components
+    u_val, v_val = _value("u_wind"), _value("v_wind")
     wind_speed_ms = None
     wind_speed_kt = None
-    if u_2d and v_2d:
-        u_val, _ = _find_surface_value(u_2d, pressure_levels, sfc_pressure, center)
-        v_val, _ = _find_surface_value(v_2d, pressure_levels, sfc_pressure, center)
-        if u_val is not None and v_val is not None:
-            wind_speed_ms = math.sqrt(u_val**2 + v_val**2)
-            wind_speed_kt = round(wind_speed_ms * 1.94384, 1)
-            wind_speed_ms = round(wind_speed_ms, 1)
+    if u_val is not None and v_val is not None:
+        wind_speed_ms = math.sqrt(u_val**2 + v_val**2)
+        wind_speed_kt = round(wind_speed_ms * 1.94384, 1)
+        wind_speed_ms = round(wind_speed_ms, 1)
 
     # Compute derived quantities
     dewpoint_c = None
@@ -897,16 +835,15 @@ def get_point_surface_conditions(
     if rh_pct is not None:
         rh_pct = round(rh_pct, 1)
 
-    # Extract metadata from response
-    meta = temp_data.get("metadata", {})
+    valid_times = data.get("valid_times") or [None]
 
     return {
         "lat": lat,
         "lon": lon,
-        "model": meta.get("model", model),
-        "cycle": meta.get("cycle", cycle),
-        "fhr": meta.get("fhr", fhr),
-        "valid_time": meta.get("valid_time"),
+        "model": data.get("model", model),
+        "cycle": data.get("cycle", cycle),
+        "fhr": (data.get("fhrs") or [fhr])[0],
+        "valid_time": valid_times[0],
         "temperature_c": temp_c,
         "rh_pct": rh_pct,
         "wind_speed_ms": wind_speed_ms,
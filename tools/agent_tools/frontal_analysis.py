@@ -37,7 +37,10 @@ import urllib.parse
 from datetime import datetime, timedelta
 from typing import Optional
 
-from tools.agent_tools.external_data import _fetch_json, _find_surface_value
+from tools.agent_tools.external_data import _fetch_json
+
+# /api/v1/timeseries rejects longer FHR lists (POINT_QUERY_MAX_FHRS in the dashboard)
+POINT_SERIES_MAX_FHRS = 49
 
 
 # =============================================================================
@@ -258,93 +261,100 @@ def _fire_impact_text(
 # Core data fetching
 # =============================================================================
 
-def _get_point_wind_and_rh(
+def _get_point_wind_and_rh_series(
     lat: float,
     lon: float,
     model: str,
     cycle: str,
-    fhr: int,
+    fhrs: list,
     base_url: str,
-) -> dict:
-    """Fetch surface wind U/V components AND RH at a point for a single FHR.
+) -> list:
+    """Fetch surface wind U/V components AND RH at a point for many FHRs.
 
-    Returns dict with wind_dir, wind_speed_kt, wind_gust_kt (estimated),
-    rh_pct, u_wind_ms, v_wind_ms, valid_time, and metadata.
-    """
-    offset = 0.005
-    start_lat = lat - offset
-    start_lon = lon
-    end_lat = lat + offset
-    end_lon = lon
-    base = base_url.rstrip("/")
+    One /api/v1/timeseries call per POINT_SERIES_MAX_FHRS forecast hours
+    (level=surface picks the lowest pressure level above ground).
 
-    # Fetch wind_speed (returns u_wind_ms, v_wind_ms) and rh
-    result = {
-        "fhr": fhr,
-        "wind_dir": None,
-        "wind_speed_kt": None,
-        "wind_speed_ms": None,
-        "wind_gust_kt": None,
-        "rh_pct": None,
-        "u_wind_ms": None,
-        "v_wind_ms": None,
-        "valid_time": None,
-        "error": None,
+    Returns a list of dicts (one per requested FHR, in order) with wind_dir,
+    wind_speed_kt, wind_gust_kt (estimated), rh_pct, u_wind_ms, v_wind_ms,
+    valid_time, and metadata.
+    """
+    results = {
+        fhr: {
+            "fhr": fhr,
+            "wind_dir": None,
+            "wind_speed_kt": None,
+            "wind_speed_ms": None,
+            "wind_gust_kt": None,
+            "rh_pct": None,
+            "u_wind_ms": None,
+            "v_wind_ms": None,
+            "valid_time": None,
+            "error": None,
+        }
+        for fhr in fhrs
     }
-
-    for product in ("wind_speed", "rh"):
-        params = (
-            f"start_lat={start_lat}&start_lon={start_lon}"
-            f"&end_lat={end_lat}&end_lon={end_lon}"
-            f"&product={product}&model={model}&cycle={cycle}&fhr={fhr}"
-        )
-        url = f"{base}/api/v1/data?{params}"
+    if not fhrs:
+        return []
+
+    returned = set()
+    for start in range(0, len(fhrs), POINT_SERIES_MAX_FHRS):
+        chunk = fhrs[start:start + POINT_SERIES_MAX_FHRS]
+        params = urllib.parse.urlencode({
+            "lat": lat, "lon": lon,
+            "fields": "u_wind,v_wind,rh",
+            "level": "surface",
+            "fhrs": ",".join(str(f) for f in chunk),
+            "model": model, "cycle": cycle,
+        })
+        url = f"{base_url.rstrip('/')}/api/v1/timeseries?{params}"
         try:
-            data = _fetch_json(url, timeout=60)
+            data = _fetch_json(url, timeout=120)
         except Exception as e:
-            result["error"] = f"Failed to fetch {product} for fhr={fhr}: {e}"
+            for fhr in chunk:
+                results[fhr]["error"] = f"Failed to fetch point series: {e}"
+                returned.add(fhr)
             continue
-
-        pressure_levels = data.get("pressure_levels_hpa", [])
-        surface_pressures = data.get("surface_pressure_hpa", [])
-        if not pressure_levels or not surface_pressures:
-            result["error"] = f"No pressure data for {product} fhr={fhr}"
+        returned.update(_apply_point_series(results, data, cycle))
+        if cycle == "latest" and data.get("cycle"):
+            cycle = data["cycle"]  # keep later chunks on the same cycle
+
+    for fhr, result in results.items():
+        if fhr not in returned:
+            result["error"] = f"No data for fhr={fhr}"
+    return [results[f] for f in fhrs]
+
+
+def _apply_point_series(results: dict, data: dict, cycle: str) -> list:
+    """Fill results (fhr -> dict) from one /api/v1/timeseries response; returns its FHRs."""
+    fields = data.get("fields", {})
+    u_series = fields.get("u_wind", {}).get("values", [])
+    v_series = fields.get("v_wind", {}).get("values", [])
+    rh_series = fields.get("rh", {}).get("values", [])
+    valid_times = data.get("valid_times", [])
+    returned = data.get("fhrs", [])
+
+    for i, fhr in enumerate(returned):
+        result = results.get(fhr)
+        if result is None:
             continue
-
-        n_pts = len(surface_pressures)
-        center = n_pts // 2
-        sfc_pressure = surface_pressures[center]
-
-        if product == "wind_speed":
-            u_2d = data.get("u_wind_ms")
-            v_2d = data.get("v_wind_ms")
-            if u_2d and v_2d:
-                u_val, _ = _find_surface_value(u_2d, pressure_levels, sfc_pressure, center)
-                v_val, _ = _find_surface_value(v_2d, pressure_levels, sfc_pressure, center)
-                if u_val is not None and v_val is not None:
-                    speed_ms = math.sqrt(u_val**2 + v_val**2)
-                    result["u_wind_ms"] = round(u_val, 2)
-                    result["v_wind_ms"] = round(v_val, 2)
-                    result["wind_speed_ms"] = round(speed_ms, 2)
-                    result["wind_speed_kt"] = round(speed_ms * 1.94384, 1)
-                    result["wind_dir"] = _wind_dir_from_uv(u_val, v_val)
-                    # Estimate gusts as ~1.4x sustained (common approximation
-                    # when actual gust data isn't available from the model)
-                    result["wind_gust_kt"] = round(speed_ms * 1.94384 * 1.4, 0)
-
-            # Extract valid_time from metadata
-            meta = data.get("metadata", {})
-            result["valid_time"] = meta.get("valid_time")
-            result["cycle"] = meta.get("cycle", cycle)
-
-        elif product == "rh":
-            rh_2d = data.get("rh_pct")
-            if rh_2d:
-                rh_val, _ = _find_surface_value(rh_2d, pressure_levels, sfc_pressure, center)
-                if rh_val is not None:
-                    result["rh_pct"] = round(rh_val, 1)
-
-    return result
+        result["cycle"] = data.get("cycle", cycle)
+        result["valid_time"] = valid_times[i] if i < len(valid_times) else None
+        u_val = u_series[i][0] if i < len(u_series) else None
+        v_val = v_series[i][0] if i < len(v_series) else None
+        if u_val is not None and v_val is not None:
+            speed_ms = math.sqrt(u_val**2 + v_val**2)
+            result["u_wind_ms"] = round(u_val, 2)
+            result["v_wind_ms"] = round(v_val, 2)
+            result["wind_speed_ms"] = round(speed_ms, 2)
+            result["wind_speed_kt"] = round(speed_ms * 1.94384, 1)
+            result["wind_dir"] = _wind_dir_from_uv(u_val, v_val)
+            # Estimate gusts as ~1.4x sustained (common approximation
+            # when actual gust data isn't available from the model)
+            result["wind_gust_kt"] = round(speed_ms * 1.94384 * 1.4, 0)
+        rh_val = rh_series[i][0] if i < len(rh_series) else None
+        if rh_val is not None:
+            result["rh_pct"] = round(rh_val, 1)
+    return returned
 
 
 def _get_available_fhrs(model: str, cycle: str, base_url: str) -> list:
@@ -427,9 +437,9 @@ def detect_wind_shifts(
     resolved_cycle = cycle
     init_dt = None
 
-    for fhr in sorted(fhrs):
-        point_data = _get_point_wind_and_rh(lat, lon, model, cycle, fhr, base_url)
-
+    fhrs = sorted(fhrs)
+    series = _get_point_wind_and_rh_series(lat, lon, model, cycle, fhrs, base_url)
+    for fhr, point_data in zip(fhrs, series):
         if point_data.get("error") and not point_data.get("wind_dir"):
             continue
 
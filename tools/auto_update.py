@@ -14,6 +14,7 @@ Usage:
     python tools/auto_update.py --interval 3                  # Check every 3 minutes
     python tools/auto_update.py --once                        # Run once and exit
     python tools/auto_update.py --max-hours 18                # Download up to F18 (HRRR)
+    python tools/auto_update.py --pipeline                    # Build mmap caches while downloading
 """
 
 import argparse
@@ -32,6 +33,7 @@ from datetime import datetime, timedelta, timezone
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from model_config import get_model_registry
+from tools.ingest_events import journal_path, publish
 
 logging.basicConfig(
     level=logging.INFO,
@@ -64,6 +66,18 @@ MODEL_FILE_TYPES = {
     'rrfs': ['pressure'],             # prslev (has surface data in it)
 }
 
+# Pipelined ingest (--pipeline or XSECT_PIPELINED_INGEST=1): build each FHR's
+# mmap cache from the GRIB messages while they download, so the dashboard
+# loads it from cache instead of converting after its next rescan
+PIPELINED_INGEST = os.environ.get('XSECT_PIPELINED_INGEST', '0') == '1'
+
+# Per-model: minimum pressure levels for a valid cache (matches the dashboard)
+MODEL_MIN_LEVELS = {
+    'hrrr': 40,
+    'gfs':  20,
+    'rrfs': 40,
+}
+
 # Per-model: which FHRs to download
 MODEL_FORECAST_HOURS = {
     'hrrr': list(range(19)),                          # F00-F18 every hour (synoptic extends to F48)
@@ -227,6 +241,10 @@ def download_missing_fhrs(model, date_str, hour, max_hours=18):
         file_types=file_types,
     )
 
+    for fhr, ok in results.items():
+        if ok:
+            publish_fhr_event(model, date_str, hour, fhr)
+
     new_count = sum(1 for ok in results.values() if ok)
     if new_count > 0:
         logger.info(f"  [{model.upper()}] Downloaded {new_count}/{len(needed)} new hours for {date_str}/{hour:02d}z")
@@ -305,12 +323,22 @@ def download_single_fhr(model, date_str, hour, fhr):
 
     Returns True if successfully downloaded, False otherwise.
     """
-    from smart_hrrr.orchestrator import download_forecast_hour
+    from smart_hrrr.orchestrator import download_forecast_hour, ingest_forecast_hour
     from smart_hrrr.io import create_output_structure, get_forecast_hour_dir
 
     run_dir = create_output_structure(model, date_str, hour)['run']
     fhr_dir = get_forecast_hour_dir(run_dir, fhr)
     file_types = MODEL_FILE_TYPES.get(model, ['pressure'])
+    if PIPELINED_INGEST:
+        return ingest_forecast_hour(
+            model=model,
+            date_str=date_str,
+            cycle_hour=hour,
+            forecast_hour=fhr,
+            output_dir=fhr_dir,
+            file_types=file_types,
+            min_levels=MODEL_MIN_LEVELS.get(model, 40),
+        )
     return download_forecast_hour(
         model=model,
         date_str=date_str,
@@ -321,6 +349,18 @@ def download_single_fhr(model, date_str, hour, fhr):
     )
 
 
+def publish_fhr_event(model, date_str, hour, fhr):
+    """Announce a completed FHR to the dashboard via the ingest event journal.
+
+    The dashboard tails the journal (tools.ingest_events) and loads the FHR
+    right away instead of finding it on its next full directory scan.
+    """
+    fhr_dir = get_base_dir(model) / date_str / f"{hour:02d}z" / f"F{fhr:02d}"
+    paths = sorted({str(p.resolve()) for pattern in MODEL_REQUIRED_PATTERNS.get(model, ['*.grib2'])
+                    for p in fhr_dir.glob(pattern)})
+    publish(model, f"{date_str}_{hour:02d}z", fhr, paths)
+
+
 DISK_LIMIT_GB = int(os.environ.get('XSECT_DISK_LIMIT_GB', '500'))
 DISK_META_FILE = Path(__file__).parent.parent / 'data' / 'disk_meta.json'
 # Max date folders to keep per model (e.g. 2 means keep today + yesterday)
@@ -703,6 +743,7 @@ def run_download_pass_concurrent(work_queues, slot_limits, hrrr_max_fhr=None, re
 
                 if ok:
                     total_new += 1
+                    publish_fhr_event(model_name, date_str, hour, fhr)
                     model_consecutive_fails[model_name] = 0  # Reset backoff on success
                     logger.info(f"[{model_name.upper()}] F{fhr:02d} complete ({dur:.1f}s)")
                     if model_name in model_status:
@@ -753,7 +794,7 @@ def run_download_pass_concurrent(work_queues, slot_limits, hrrr_max_fhr=None, re
 
 
 def main():
-    global running
+    global running, PIPELINED_INGEST
 
     parser = argparse.ArgumentParser(description="Multi-Model Auto-Update - Progressive Download")
     parser.add_argument("--models", type=str, default="hrrr",
@@ -764,6 +805,8 @@ def main():
     parser.add_argument("--max-hours", type=int, default=None,
                         help="Max forecast hours for HRRR (default: per-model)")
     parser.add_argument("--no-cleanup", action="store_true", help="Don't clean up old data")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="Build mmap caches while GRIBs download (env XSECT_PIPELINED_INGEST=1)")
     parser.add_argument("--hrrr-slots", type=int, default=4,
                         help="Concurrent HRRR FHR downloads (default: 4)")
     parser.add_argument("--gfs-slots", type=int, default=2,
@@ -782,6 +825,8 @@ def main():
                         help="In-pass queue refresh interval for RRFS (default: 2)")
 
     args = parser.parse_args()
+    if args.pipeline:
+        PIPELINED_INGEST = True
     models = [m.strip().lower() for m in args.models.split(',')]
     slot_limits = {
         'hrrr': max(0, args.hrrr_slots),
@@ -797,6 +842,10 @@ def main():
     logger.info(f"Models: {', '.join(m.upper() for m in models)}")
     logger.info(f"Legacy check interval: {args.interval} min (compat)")
     logger.info(f"Idle sleep: {args.idle_sleep_seconds}s | Between-pass sleep: {args.between_pass_seconds}s")
+    if PIPELINED_INGEST:
+        logger.info("Pipelined ingest: mmap caches built while downloading")
+    if journal_path():
+        logger.info(f"Ingest events: {journal_path()}")
     logger.info(
         "Queue refresh: "
         f"HRRR={args.hrrr_refresh_seconds}s, "
@@ -0,0 +1,273 @@
+"""Persistent cycle catalog (SQLite) behind CrossSectionManager.scan_available_cycles.
+
+A full scan used to list every date and hour dir and glob the prs/sfc
+patterns in every expected FHR dir, for the outputs tree and for every
+XSECT_ARCHIVE_DIR (GRIB trees and flat mmap cache dirs). On a large archive
+that is tens of thousands of directory reads per rescan, almost all of them
+for directories that have not changed since the last one.
+
+The catalog remembers, per directory, its mtime and what was found there:
+
+    dirs   path -> (mtime_ns, state)    subdir listing (JSON), FHR readiness
+                                        ('1'/'0'), or cache-entry completeness
+    fhrs   (model, source, root, cycle_key, fhr) -> path
+                                        available FHRs, one row per tree
+
+A refresh stats each directory and only lists or checks it again when its
+mtime moved. Downloads and cache builds both land by rename (.partial ->
+final, ._partial -> entry), which bumps the parent dir's mtime. So an
+unchanged mtime means an unchanged answer, with two exceptions:
+
+  - racy mtimes: a dir modified within RACY_S of the check is stored as
+    unverified (mtime -1), because a second change in the same timestamp tick
+    would be invisible. It is checked again next time.
+  - volatile answers: the check callback returns None (e.g. an ingest marker
+    that goes stale by age, not by a dir change). This is also rechecked.
+
+    catalog = CycleCatalog(path)
+    catalog.refresh_grib_tree('hrrr', 'grib', root, expected_fhrs, check)
+    catalog.refresh_cache_tree('hrrr', 'cache', cache_root, require_complete=True)
+    for source, root, cycle_key, fhr, path in catalog.rows('hrrr'): ...
+
+The catalog survives restarts, so the startup scan is mostly stats too. If
+the database can't be opened it falls back to an in-memory one.
+"""
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+RACY_S = 2.0
+_CACHE_ENTRY = re.compile(r'(\d{8})_(\d{2})z_F(\d+)_')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dirs (
+    path     TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    state    TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS fhrs (
+    model     TEXT NOT NULL,
+    source    TEXT NOT NULL,
+    root      TEXT NOT NULL,
+    cycle_key TEXT NOT NULL,
+    fhr       INTEGER NOT NULL,
+    path      TEXT NOT NULL,
+    PRIMARY KEY (model, source, root, cycle_key, fhr)
+);
+"""
+
+
+class CycleCatalog:
+    """Directory state and available FHRs, refreshed by mtime and persisted in SQLite."""
+
+    def __init__(self, db_path: str):
+        self.db_path = str(db_path)
+        try:
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.executescript(_SCHEMA)
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Cycle catalog {self.db_path} unavailable ({e}), using an in-memory catalog")
+            self.db_path = ':memory:'
+            self._db = sqlite3.connect(':memory:', check_same_thread=False, isolation_level=None)
+            self._db.executescript(_SCHEMA)
+        self._lock = threading.RLock()
+        self._dirs: Dict[str, Tuple[int, str]] = {
+            path: (mtime_ns, state)
+            for path, mtime_ns, state in self._db.execute('SELECT path, mtime_ns, state FROM dirs')
+        }
+        self._dirty: Dict[str, Optional[Tuple[int, str]]] = {}  # pending writes; None = delete
+        self.listed = 0     # directories read
+        self.checked = 0    # FHR dirs / cache entries checked
+        self.reused = 0     # directories answered from the catalog
+
+    # -- directory state --------------------------------------------------
+
+    def _put(self, path: str, st: os.stat_result, state: str, volatile: bool = False):
+        racy = time.time() - st.st_mtime < RACY_S
+        entry = (-1 if racy or volatile else st.st_mtime_ns, state)
+        self._dirs[path] = entry
+        self._dirty[path] = entry
+
+    def _forget(self, path: str):
+        """Drop a vanished directory and everything cached below it."""
+        prefix = path + os.sep
+        for p in [p for p in self._dirs if p == path or p.startswith(prefix)]:
+            del self._dirs[p]
+            self._dirty[p] = None
+
+    def _cached(self, path: str) -> Tuple[Optional[os.stat_result], Optional[str]]:
+        """(stat, cached state if the mtime still matches). stat is None if path is gone."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            if path in self._dirs:
+                self._forget(path)
+            return None, None
+        hit = self._dirs.get(path)
+        if hit is not None and hit[0] == st.st_mtime_ns:
+            self.reused += 1
+            return st, hit[1]
+        return st, None
+
+    def _subdirs(self, path: str) -> List[str]:
+        st, state = self._cached(path)
+        if st is None:
+            return []
+        if state is not None:
+            return json.loads(state)
+        try:
+            with os.scandir(path) as it:
+                names = sorted((e.name for e in it if e.is_dir()), reverse=True)
+        except OSError:
+            return []
+        self.listed += 1
+        hit = self._dirs.get(path)
+        if hit is not None:
+            for gone in set(json.loads(hit[1])) - set(names):
+                self._forget(os.path.join(path, gone))
+        self._put(path, st, json.dumps(names))
+        return names
+
+    def _fhr_ready(self, path: str, check: Callable[[Path], Optional[bool]]) -> bool:
+        st, state = self._cached(path)
+        if st is None:
+            return False
+        if state is not None:
+            return state == '1'
+        self.checked += 1
+        ready = check(Path(path))
+        self._put(path, st, '1' if ready else '0', volatile=ready is None)
+        return bool(ready)
+
+    # -- refresh ----------------------------------------------------------
+
+    def refresh_grib_tree(self, model: str, source: str, root,
+                          expected_fhrs: Callable[[int], List[int]],
+                          check: Callable[[Path], Optional[bool]]):
+        """Refresh a YYYYMMDD/HHz/Fxx GRIB tree.
+
+        check(fhr_dir) says whether an FHR dir is complete: True/False, or
+        None for "not now, ask again next refresh".
+        """
+        root = str(root)
+        with self._lock:
+            rows = []
+            for date in self._subdirs(root):
+                if not date.isdigit() or len(date) != 8:
+                    continue
+                date_dir = os.path.join(root, date)
+                for hour_name in self._subdirs(date_dir):
+                    hour = hour_name[:-1]
+                    if not hour_name.endswith('z') or not hour.isdigit():
+                        continue
+                    hour_dir = os.path.join(date_dir, hour_name)
+                    present = set(self._subdirs(hour_dir))
+                    for fhr in expected_fhrs(int(hour)):
+                        name = f"F{fhr:02d}"
+                        if name in present and self._fhr_ready(os.path.join(hour_dir, name), check):
+                            rows.append((f"{date}_{hour}z", fhr, hour_dir))
+            self._commit(model, source, root, rows)
+
+    def refresh_cache_tree(self, model: str, source: str, root, require_complete: bool = True):
+        """Refresh a flat mmap cache dir of YYYYMMDD_HHz_Fxx_<stem> entries.
+
+        With require_complete, entries without a _complete marker are left
+        out; those are rechecked every refresh because the marker can appear
+        without the root's mtime changing.
+        """
+        root = str(root)
+        with self._lock:
+            st, state = self._cached(root)
+            if st is None:
+                self._commit(model, source, root, [])
+                return
+            if state is not None:
+                entries = json.loads(state)
+            else:
+                try:
+                    with os.scandir(root) as it:
+                        names = [e.name for e in it if e.is_dir() and _CACHE_ENTRY.match(e.name)]
+                except OSError:
+                    names = []
+                self.listed += 1
+                entries = {name: False for name in names}
+            changed = state is None
+            for name, complete in entries.items():
+                if require_complete and not complete:
+                    self.checked += 1
+                    if os.path.exists(os.path.join(root, name, '_complete')):
+                        entries[name] = changed = True
+            if changed:
+                self._put(root, st, json.dumps(entries))
+
+            rows = []
+            for name, complete in entries.items():
+                if complete or not require_complete:
+                    m = _CACHE_ENTRY.match(name)
+                    rows.append((f"{m.group(1)}_{m.group(2)}z", int(m.group(3)), root))
+            self._commit(model, source, root, rows)
+
+    def _flush(self):
+        if not self._dirty:
+            return
+        dirty, self._dirty = self._dirty, {}
+        self._db.executemany('INSERT OR REPLACE INTO dirs VALUES (?, ?, ?)',
+                             [(p, e[0], e[1]) for p, e in dirty.items() if e is not None])
+        self._db.executemany('DELETE FROM dirs WHERE path = ?',
+                             [(p,) for p, e in dirty.items() if e is None])
+
+    def _commit(self, model: str, source: str, root: str, rows: list):
+        try:
+            self._db.execute('BEGIN')
+            self._db.execute('DELETE FROM fhrs WHERE model = ? AND source = ? AND root = ?',
+                             (model, source, root))
+            self._db.executemany('INSERT OR IGNORE INTO fhrs VALUES (?, ?, ?, ?, ?, ?)',
+                                 [(model, source, root, ck, fhr, path) for ck, fhr, path in rows])
+            self._flush()
+            self._db.execute('COMMIT')
+        except sqlite3.Error as e:
+            logger.warning(f"Cycle catalog write failed: {e}")
+            try:
+                self._db.execute('ROLLBACK')
+            except sqlite3.Error:
+                pass
+
+    def drop_tree(self, model: str, source: str, root):
+        """Forget a tree that is no longer configured (e.g. an archive dir removed from the env)."""
+        with self._lock:
+            self._commit(model, source, str(root), [])
+
+    # -- queries ----------------------------------------------------------
+
+    def rows(self, model: str) -> List[Tuple[str, str, str, int, str]]:
+        """All (source, root, cycle_key, fhr, path) rows for a model."""
+        with self._lock:
+            return self._db.execute(
+                'SELECT source, root, cycle_key, fhr, path FROM fhrs WHERE model = ? '
+                'ORDER BY cycle_key DESC, fhr', (model,)).fetchall()
+
+    def roots(self, model: str) -> List[Tuple[str, str]]:
+        """(source, root) pairs with rows for a model."""
+        with self._lock:
+            return self._db.execute('SELECT DISTINCT source, root FROM fhrs WHERE model = ?',
+                                    (model,)).fetchall()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'db': self.db_path,
+                'dirs': len(self._dirs),
+                'listed': self.listed,
+                'checked': self.checked,
+                'reused': self.reused,
+            }
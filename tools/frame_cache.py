@@ -0,0 +1,264 @@
+"""Byte-budgeted LRU cache for rendered frames, with an optional disk tier.
+
+Used by the dashboard for cross-section frames and map overlays. The memory
+tier is an LRU bounded by total bytes (frames range from ~40 KB to >1 MB,
+so an entry count is a poor proxy). The disk tier stores one file per key
+under a directory on fast local storage; it survives dashboard restarts and
+can be read by render_worker processes without going through Flask.
+
+render_worker processes also write frames to the disk tier directly, which
+the dashboard's FrameCache never sees. Its running disk total is therefore
+re-measured every DISK_REMEASURE_S, so worker-written frames still count
+toward FRAME_DISK_CACHE_GB. Reads touch a file's mtime, so the trim (oldest
+mtime first) evicts least-recently-used frames.
+
+Configuration (environment):
+    FRAME_CACHE_MB          memory budget for cross-section frames (default 256)
+    OVERLAY_CACHE_MB        memory budget for overlay frames (default 256)
+    XSECT_FRAME_CACHE_DIR   disk tier root; unset = memory only
+    FRAME_DISK_CACHE_GB     disk tier budget per namespace (default 20)
+    XSECT_RENDER_VERSION    extra disk tier version tag (e.g. a deploy id)
+
+Disk tier files live under a v<RENDER_VERSION>[-<XSECT_RENDER_VERSION>]
+directory, so frames rendered by an older renderer are never served after
+an upgrade; they age out through the normal mtime trim.
+
+Separate module so worker processes can import it without Flask.
+"""
+import os
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+# Bump when rendered output changes (styles, colormaps, layout, renderers)
+RENDER_VERSION = 1
+
+DISK_REMEASURE_S = 300.0  # re-walk the disk tier this often to count worker writes
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def disk_tier_dir(namespace: str) -> Optional[Path]:
+    """Disk tier directory for a namespace ('frames', 'overlays'), or None if disabled."""
+    root = os.environ.get('XSECT_FRAME_CACHE_DIR', '').strip()
+    if not root:
+        return None
+    return Path(root) / namespace
+
+
+def _disk_version() -> str:
+    extra = os.environ.get('XSECT_RENDER_VERSION', '').strip()
+    return f"v{RENDER_VERSION}-{extra}" if extra else f"v{RENDER_VERSION}"
+
+
+def _disk_path(directory: Path, key: str) -> Path:
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+    return directory / _disk_version() / digest[:2] / f"{digest}.bin"
+
+
+def disk_get(namespace: str, key: str) -> Optional[bytes]:
+    """Read a frame from the disk tier without a cache instance (for worker processes)."""
+    directory = disk_tier_dir(namespace)
+    if directory is None:
+        return None
+    path = _disk_path(directory, key)
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return None
+    try:
+        os.utime(path)  # mtime = last use, so the trim is LRU
+    except OSError:
+        pass
+    return data
+
+
+def disk_put(namespace: str, key: str, data: bytes) -> bool:
+    """Atomically write a frame to the disk tier. Returns True if written."""
+    directory = disk_tier_dir(namespace)
+    if directory is None:
+        return False
+    path = _disk_path(directory, key)
+    if path.exists():
+        return False
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        return True
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        return False
+
+
+def _disk_usage(directory: Path) -> int:
+    total = 0
+    for f in directory.rglob('*.bin'):
+        try:
+            total += f.stat().st_size
+        except OSError:
+            continue
+    return total
+
+
+def _trim_disk(directory: Path, target: int):
+    """Delete oldest files (by mtime) until the tier is under target. Returns (bytes left, files removed)."""
+    files = []
+    for f in directory.rglob('*.bin'):
+        try:
+            st = f.stat()
+            files.append((st.st_mtime, st.st_size, f))
+        except OSError:
+            continue
+    files.sort()
+    total = sum(size for _, size, _ in files)
+    removed = 0
+    for _, size, f in files:
+        if total <= target:
+            break
+        try:
+            f.unlink()
+            total -= size
+            removed += 1
+        except OSError:
+            continue
+    return total, removed
+
+
+class FrameCache:
+    """Thread-safe byte-budgeted LRU (memory) with write-through disk tier."""
+
+    def __init__(self, namespace: str, max_bytes: int, disk_max_bytes: int = 0):
+        self.namespace = namespace
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_tier_dir(namespace)
+        self.disk_max_bytes = disk_max_bytes
+        self._entries = OrderedDict()  # key -> bytes
+        self._bytes = 0
+        self._disk_bytes = None  # lazily measured on first disk write
+        self._disk_measured_at = 0.0  # monotonic time of the last full measurement
+        self._trimming = False  # a disk trim is running (one at a time)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def _insert(self, key: str, data: bytes):
+        """Insert under lock, evicting least-recently-used entries over budget."""
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= len(old)
+        if len(data) > self.max_bytes:
+            return
+        self._entries[key] = data
+        self._bytes += len(data)
+        while self._bytes > self.max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+            self.evictions += 1
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return data
+        if self.disk_dir is not None:
+            data = disk_get(self.namespace, key)
+            if data is not None:
+                with self._lock:
+                    self.disk_hits += 1
+                    self._insert(key, data)
+                return data
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, data: bytes):
+        with self._lock:
+            self._insert(key, data)
+        if self.disk_dir is not None:
+            # A frame a worker already wrote adds nothing here; the periodic
+            # re-measure in _account_disk picks those up
+            self._account_disk(len(data) if disk_put(self.namespace, key, data) else 0)
+
+    def _account_disk(self, added: int):
+        """Track disk tier size; trim oldest files (by mtime) when over budget.
+
+        Directory walks run outside self._lock (the tier can hold hundreds of
+        thousands of files); only the resulting totals are swapped in under it.
+        """
+        if not self.disk_max_bytes:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if self._disk_bytes is not None:
+                self._disk_bytes += added
+            measure = self._disk_bytes is None or now - self._disk_measured_at > DISK_REMEASURE_S
+            if measure:
+                self._disk_measured_at = now  # one walk at a time
+        if measure:
+            total = _disk_usage(self.disk_dir)
+            with self._lock:
+                self._disk_bytes = total
+        with self._lock:
+            if self._disk_bytes <= self.disk_max_bytes or self._trimming:
+                return
+            self._trimming = True
+        try:
+            total, removed = _trim_disk(self.disk_dir, int(self.disk_max_bytes * 0.9))
+        finally:
+            with self._lock:
+                self._trimming = False
+        with self._lock:
+            self._disk_bytes = total
+            self._disk_measured_at = time.monotonic()
+            self.disk_evictions += removed
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'disk_enabled': self.disk_dir is not None,
+                'disk_bytes': self._disk_bytes,
+                'disk_evictions': self.disk_evictions,
+                'hit_rate': round((self.hits + self.disk_hits) / lookups, 3) if lookups else None,
+            }
+
+
+def cache_from_env(namespace: str, mem_env: str, default_mb: float = 256) -> FrameCache:
+    """Build a FrameCache from the environment variables documented above."""
+    return FrameCache(
+        namespace,
+        max_bytes=int(_env_float(mem_env, default_mb) * 1024 * 1024),
+        disk_max_bytes=int(_env_float('FRAME_DISK_CACHE_GB', 20) * 1024 ** 3),
+    )
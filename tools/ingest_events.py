@@ -0,0 +1,206 @@
+"""Ingest event journal: auto_update -> dashboard handoff for new forecast hours.
+
+auto_update used to leave new data for the dashboard to find: every couple
+of seconds background_rescan re-walked every date/hour/FHR directory and
+globbed for GRIB patterns. Now each completed FHR download appends one JSON
+line to an append-only journal:
+
+    {"ts": 1760668800.1, "model": "hrrr", "cycle": "20261017_12z", "fhr": 3,
+     "paths": ["outputs/hrrr/20261017/12z/F03/hrrr.t12z.wrfprsf03.grib2", ...]}
+
+and the dashboard tails it (IngestEventTail.poll), adds the FHR to its cycle
+list and schedules the load right away (a cache open if pipelined ingest
+already built the mmap cache, a GRIB conversion otherwise).
+
+    publish('hrrr', '20261017_12z', 3, paths)                  # writer
+    tail = IngestEventTail()                                    # reader
+    for event in tail.poll(): ...
+
+Each event is written with a single O_APPEND write, so concurrent download
+slots (and several auto_update processes) never interleave lines. When the
+journal passes JOURNAL_MAX_BYTES the writer rotates it (<name>.1 -> .2 ...,
+<name> -> <name>.1, keeping ROTATE_KEEP generations). Rotation happens under
+an O_EXCL lock file and re-checks the size once it holds it, so two writers
+never both rotate the same journal; a writer that finds the lock taken just
+appends. The reader notices the inode change, drains every rotated file
+newer than the one it was following, and follows the new one. Polling is
+one os.stat() per tick (no inotify dependency, works on Windows too).
+
+A new reader starts at the end of the journal: whatever happened before
+the dashboard started is picked up by its startup scan.
+
+The journal lives in the outputs tree both processes already share (not in
+the world-writable temp dir, where another local user could create it first
+and feed the dashboard forged events), and the dashboard only accepts events
+whose paths lie inside its own outputs dir.
+
+Configuration (environment):
+    XSECT_INGEST_EVENTS    journal path (default <XSECT_OUTPUTS_DIR>/.ingest_events.jsonl,
+                           XSECT_OUTPUTS_DIR defaulting to ./outputs as for
+                           auto_update and the dashboard); '0' disables the channel
+"""
+import json
+import os
+import time
+from typing import List, Optional
+
+JOURNAL_MAX_BYTES = 4 * 1024 * 1024
+ROTATE_KEEP = 3
+ROTATE_LOCK_STALE_S = 30.0
+
+
+def journal_path() -> Optional[str]:
+    """The journal path from XSECT_INGEST_EVENTS, or None if the channel is disabled."""
+    raw = os.environ.get('XSECT_INGEST_EVENTS', '').strip()
+    if raw == '0':
+        return None
+    if raw:
+        return raw
+    outputs = os.environ.get('XSECT_OUTPUTS_DIR', 'outputs')
+    return os.path.join(os.path.abspath(outputs), '.ingest_events.jsonl')
+
+
+def publish(model: str, cycle_key: str, fhr: int, paths: List[str],
+            path: Optional[str] = None) -> bool:
+    """Append one ingest event. Best-effort: returns False instead of raising."""
+    path = path or journal_path()
+    if not path:
+        return False
+    line = json.dumps({
+        'ts': round(time.time(), 3),
+        'model': model,
+        'cycle': cycle_key,
+        'fhr': int(fhr),
+        'paths': [str(p) for p in paths],
+    }, separators=(',', ':')) + '\n'
+    try:
+        try:
+            if os.path.getsize(path) > JOURNAL_MAX_BYTES:
+                _rotate(path)
+        except OSError:
+            pass
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line.encode('utf-8'))
+        finally:
+            os.close(fd)
+        return True
+    except OSError:
+        return False
+
+
+def _rotate(path: str):
+    """Shift <path>.N generations and move <path> to <path>.1, under an exclusive lock file."""
+    lock = path + '.lock'
+    try:
+        fd = os.open(lock, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+    except FileExistsError:
+        try:
+            if time.time() - os.path.getmtime(lock) > ROTATE_LOCK_STALE_S:
+                os.unlink(lock)  # left behind by a writer that died mid-rotation
+        except OSError:
+            pass
+        return
+    os.close(fd)
+    try:
+        # Another writer may have rotated between our size check and the lock
+        if os.path.getsize(path) <= JOURNAL_MAX_BYTES:
+            return
+        for n in range(ROTATE_KEEP - 1, 0, -1):
+            try:
+                os.replace(f"{path}.{n}", f"{path}.{n + 1}")
+            except FileNotFoundError:
+                pass
+        os.replace(path, path + '.1')
+    finally:
+        try:
+            os.unlink(lock)
+        except OSError:
+            pass
+
+
+class IngestEventTail:
+    """Follows the journal from its current end; poll() returns new events."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or journal_path()
+        self._inode = None
+        self._offset = 0
+        self._partial = b''
+        self.events = 0
+        self.bad_lines = 0
+        self.rotations = 0
+        try:
+            st = os.stat(self.path)
+            self._inode, self._offset = st.st_ino, st.st_size
+        except (OSError, TypeError):
+            pass
+
+    def _read(self, path: str) -> List[dict]:
+        try:
+            with open(path, 'rb') as f:
+                f.seek(self._offset)
+                data = f.read()
+        except OSError:
+            return []
+        self._offset += len(data)
+        lines = (self._partial + data).split(b'\n')
+        self._partial = lines.pop()  # incomplete last line, if any
+        events = []
+        for raw in lines:
+            if not raw.strip():
+                continue
+            try:
+                event = json.loads(raw)
+                if not isinstance(event, dict):
+                    raise ValueError(raw)
+                events.append(event)
+            except ValueError:
+                self.bad_lines += 1
+        self.events += len(events)
+        return events
+
+    def poll(self) -> List[dict]:
+        """Events appended since the last poll (empty if nothing changed)."""
+        if not self.path:
+            return []
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return []
+        events = []
+        if self._inode is not None and st.st_ino != self._inode:
+            # Rotated (maybe more than once): find the file we were following,
+            # finish it, then read every newer generation before the live one
+            rotated, found = [], False
+            for n in range(1, ROTATE_KEEP + 1):
+                try:
+                    ino = os.stat(f"{self.path}.{n}").st_ino
+                except OSError:
+                    break
+                rotated.append(f"{self.path}.{n}")
+                if ino == self._inode:
+                    found = True
+                    break
+            if not found:
+                self._offset, self._partial = 0, b''  # ours is gone; newer ones from the start
+            for old in reversed(rotated):
+                events += self._read(old)
+                self._offset, self._partial = 0, b''
+                self.rotations += 1
+            self._offset, self._partial = 0, b''
+        elif st.st_size < self._offset:
+            self._offset, self._partial = 0, b''  # truncated in place
+        self._inode = st.st_ino
+        if st.st_size > self._offset:
+            events += self._read(self.path)
+        return events
+
+    def stats(self) -> dict:
+        return {
+            'path': self.path,
+            'offset': self._offset,
+            'events': self.events,
+            'bad_lines': self.bad_lines,
+            'rotations': self.rotations,
+        }
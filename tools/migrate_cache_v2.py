@@ -0,0 +1,210 @@
+#!/usr/bin/env python
+"""
+Migrate mmap cache entries between the v1 (one .npy per field) and v2
+(tiled, optionally compressed) layouts. See core/tiled_cache.py.
+
+Each entry is converted in place and stays readable throughout: tiles are
+written next to the old .npy files, the _v2.json manifest is written
+atomically, and only then are the old 3D .npy files removed. An interrupted
+run leaves a valid v1 entry (plus stray tiles that the next run overwrites).
+Going back to v1 works the same way in reverse.
+
+Files a running dashboard still has memory-mapped can't be deleted on
+Windows. Those are left in place (the entry already reads in the new
+layout) and removed by the next run.
+
+Set XSECT_CACHE_FORMAT=v2 on the dashboard/workers so new entries are
+written in the same layout.
+
+--columns adds column-major (ny, nx, n_levels) copies of the profile fields
+to each entry (the same files XSECT_COLUMN_CACHE=1 writes for new entries),
+in either layout, skipping fields that already have one.
+
+Usage:
+    python tools/migrate_cache_v2.py                          # XSECT_CACHE_DIR, uncompressed tiles
+    python tools/migrate_cache_v2.py --codec zstd             # compressed tiles
+    python tools/migrate_cache_v2.py /mnt/archive/cache/xsect # specific roots
+    python tools/migrate_cache_v2.py --to v1                  # convert back
+    python tools/migrate_cache_v2.py --columns                # also add column-major copies
+    python tools/migrate_cache_v2.py --dry-run                # list entries only
+"""
+
+import os
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from core.cross_section_interactive import InteractiveCrossSection
+from core.tiled_cache import (
+    COLUMN_SUFFIX, DEFAULT_TILE, TiledField, column_path, read_manifest, tiled_files,
+    write_column_field, write_manifest, write_tiled_field, resolve_codec,
+)
+
+DEFAULT_CACHE_DIR = os.environ.get('XSECT_CACHE_DIR', str(PROJECT_ROOT / 'cache' / 'xsect'))
+
+
+def find_entries(root: Path):
+    """Complete mmap cache entries (directories with a _complete marker) under root."""
+    for marker in sorted(root.rglob('_complete')):
+        if not marker.parent.name.endswith('._partial'):
+            yield marker.parent
+
+
+def _dir_bytes(d: Path) -> int:
+    return sum(f.stat().st_size for f in d.iterdir() if f.is_file())
+
+
+def _unlink_or_defer(path: Path) -> bool:
+    """Remove a superseded file; False if it is still mapped by a reader (Windows)."""
+    try:
+        path.unlink()
+        return True
+    except FileNotFoundError:
+        return True
+    except PermissionError:
+        print(f"  {path}: in use, left for the next run")
+        return False
+
+
+def remove_leftovers(entry: Path) -> int:
+    """Delete files of the layout an entry is no longer in (deferred by an earlier run). Returns files removed."""
+    manifest = read_manifest(entry)
+    if manifest is not None:
+        stale = [entry / f'{name}.npy' for name in manifest['fields']]
+    else:
+        stale = [entry / fname for npy in entry.glob('*.npy') if not npy.name.endswith(
+            ('.tiles.npy', '.tidx.npy', COLUMN_SUFFIX)) for fname in tiled_files(npy.stem)]
+    return sum(1 for path in stale if path.exists() and _unlink_or_defer(path))
+
+
+def to_v2(entry: Path, codec: str, tile: int) -> bool:
+    if read_manifest(entry) is not None:
+        return False
+    fields = {}
+    for npy in sorted(entry.glob('*.npy')):
+        if npy.name.endswith(('.tiles.npy', '.tidx.npy', COLUMN_SUFFIX)):
+            continue
+        arr = np.load(npy, mmap_mode='r')
+        if arr.ndim != 3:
+            continue
+        fields[npy.stem] = write_tiled_field(entry, npy.stem, arr, arr.dtype, tile=tile, codec=codec)
+        del arr
+    if not fields:
+        return False
+    write_manifest(entry, fields, tile, codec)
+    for name in fields:
+        _unlink_or_defer(entry / f'{name}.npy')
+    return True
+
+
+def to_v1(entry: Path) -> bool:
+    manifest = read_manifest(entry)
+    if manifest is None:
+        return False
+    names = list(manifest['fields'])
+    for name in names:
+        field = TiledField(entry, name, manifest)
+        tmp = entry / f'{name}.npy.tmp'
+        with open(tmp, 'wb') as f:
+            np.save(f, np.asarray(field))
+        os.replace(tmp, entry / f'{name}.npy')
+    (entry / '_v2.json').unlink()
+    for name in names:
+        for fname in tiled_files(name):
+            _unlink_or_defer(entry / fname)
+    return True
+
+
+def add_columns(entry: Path) -> int:
+    """Write missing column-major copies of profile fields. Returns files written."""
+    manifest = read_manifest(entry)
+    tiled = manifest['fields'] if manifest else {}
+    written = 0
+    for name in InteractiveCrossSection._COLUMN_FIELDS:
+        if column_path(entry, name).exists():
+            continue
+        if name in tiled:
+            arr = TiledField(entry, name, manifest)
+        elif (entry / f'{name}.npy').exists():
+            arr = np.load(entry / f'{name}.npy', mmap_mode='r')
+        else:
+            continue
+        if arr.ndim == 3:
+            write_column_field(entry, name, arr, arr.dtype)
+            written += 1
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Migrate mmap cache entries between v1 and v2 layouts')
+    parser.add_argument('roots', nargs='*', default=[DEFAULT_CACHE_DIR],
+                        help=f'Cache roots to scan (default: {DEFAULT_CACHE_DIR})')
+    parser.add_argument('--to', choices=('v1', 'v2'), default='v2')
+    parser.add_argument('--codec', default='none', help='Tile codec for v2: none, zlib, zstd')
+    parser.add_argument('--tile', type=int, default=DEFAULT_TILE, help='Tile edge in grid points')
+    parser.add_argument('--columns', action='store_true',
+                        help='Also add column-major copies of profile fields')
+    parser.add_argument('--dry-run', action='store_true', help='List entries without converting')
+    args = parser.parse_args()
+
+    codec = resolve_codec(args.codec)
+    converted = skipped = failed = 0
+    bytes_before = bytes_after = 0
+    t0 = time.time()
+
+    for root in args.roots:
+        root = Path(root)
+        if not root.is_dir():
+            print(f"Skipping {root}: not a directory")
+            continue
+        for entry in find_entries(root):
+            if args.columns and not args.dry_run:
+                try:
+                    n = add_columns(entry)
+                    if n:
+                        print(f"  {entry}: {n} column fields added")
+                except Exception as e:
+                    print(f"  FAILED columns {entry}: {e}")
+            is_v2 = read_manifest(entry) is not None
+            if is_v2 == (args.to == 'v2'):
+                if not args.dry_run:
+                    n = remove_leftovers(entry)
+                    if n:
+                        print(f"  {entry}: removed {n} files left by an earlier run")
+                skipped += 1
+                continue
+            if args.dry_run:
+                print(f"  would convert {entry}")
+                converted += 1
+                continue
+            before = _dir_bytes(entry)
+            t1 = time.time()
+            try:
+                ok = to_v2(entry, codec, args.tile) if args.to == 'v2' else to_v1(entry)
+            except Exception as e:
+                print(f"  FAILED {entry}: {e}")
+                failed += 1
+                continue
+            if not ok:
+                skipped += 1
+                continue
+            after = _dir_bytes(entry)
+            bytes_before += before
+            bytes_after += after
+            converted += 1
+            print(f"  {entry}: {before / 1e9:.2f} GB -> {after / 1e9:.2f} GB ({time.time() - t1:.1f}s)")
+
+    print(f"\n{converted} converted, {skipped} skipped, {failed} failed in {time.time() - t0:.0f}s")
+    if bytes_before:
+        print(f"Size: {bytes_before / 1e9:.1f} GB -> {bytes_after / 1e9:.1f} GB")
+
+
+if __name__ == '__main__':
+    main()
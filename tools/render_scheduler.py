@@ -0,0 +1,300 @@
+"""Priority-aware render scheduler (replaces the fixed 12-slot render semaphore).
+
+A plain Semaphore(12) treats a live click, a background prerender and an
+overlay auto-prerender the same, so under load interactive requests get
+503s while batch work holds the slots. RenderScheduler hands out the same
+render slots by priority class:
+
+    INTERACTIVE  /api/xsect, /api/frame, /api/v1/cross-section
+    COMPARISON   comparison panels and GIF frames
+    PRERENDER    /api/prerender batches
+    OVERLAY      overlay auto-prerender after a cycle load
+
+and on top of that:
+
+  - reserved slots: `reserve` slots are only ever used by INTERACTIVE, so
+    batch work can saturate the render pool without locking out clicks
+  - fair share: among waiters of one class, the client (IP) with the fewest
+    running renders goes first, so one user's 48-frame batch doesn't queue
+    ahead of another user's single frame
+  - deadline shedding: a waiter whose estimated queue time (from the
+    measured hold time of its class) already exceeds its timeout is
+    rejected at once instead of timing out later; waiters whose deadline
+    passes are dropped from the queue
+  - start-ready grants: a submit() job whose executor offers claim() (the
+    lanes of tools.worker_pool.AffinityPool) is granted a slot only when
+    claim() reserves a lane that can start it at once. A granted job never
+    waits behind a busy worker holding a slot, and hold times measure real
+    render time. A waiter held back only by its lane does not block lower
+    classes from idle lanes.
+  - cancellation: jobs queued through submit() return a Future; cancelling
+    it (e.g. a cancelled prerender session) removes the job before it
+    reaches the process pool. Jobs already running in a worker process are
+    not interrupted - they release their slot when they finish.
+
+Two ways to take a slot:
+
+    with RENDER_SCHEDULER.slot(INTERACTIVE, client=ip, timeout=10):
+        render in this thread
+
+    future = RENDER_SCHEDULER.submit(pool, PRERENDER, fn, arg, client=ip)
+        queued; submitted to the executor when a slot is granted (and, for
+        an executor with claim(), when it can start the job)
+
+Configuration (environment):
+    XSECT_RENDER_SLOTS     total render slots (default 12)
+    XSECT_RENDER_RESERVE   slots reserved for interactive renders (default 4)
+"""
+import itertools
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Callable, Optional
+
+INTERACTIVE = 0
+COMPARISON = 1
+PRERENDER = 2
+OVERLAY = 3
+
+PRIORITY_NAMES = {INTERACTIVE: 'interactive', COMPARISON: 'comparison',
+                  PRERENDER: 'prerender', OVERLAY: 'overlay'}
+
+
+class RenderBusy(Exception):
+    """No render slot could be granted before the request's deadline."""
+
+
+class _Waiter:
+    __slots__ = ('priority', 'client', 'seq', 'deadline', 'event', 'job', 'granted')
+
+    def __init__(self, priority, client, seq, deadline, event=None, job=None):
+        self.priority = priority
+        self.client = client
+        self.seq = seq
+        self.deadline = deadline
+        self.event = event      # threading.Event for slot() waiters
+        self.job = job          # (executor, fn, args, outer Future) for submit() waiters
+        self.granted = False
+
+
+class RenderScheduler:
+    """Render slots handed out by priority class, fair share and deadline."""
+
+    def __init__(self, slots: int = 12, reserve: int = 4):
+        self.slots = max(1, slots)
+        self.reserve = min(max(0, reserve), self.slots - 1)
+        self._lock = threading.Lock()
+        self._waiters = []
+        self._seq = itertools.count()
+        self._running = Counter()           # priority -> running renders
+        self._by_client = Counter()         # client -> running renders
+        self._hold = {}                     # priority -> EMA of slot hold time (s)
+        self.granted = Counter()
+        self.shed = Counter()
+        self.expired = Counter()
+        self.cancelled = Counter()
+
+    # -- slot accounting (under lock) -------------------------------------
+
+    def _can_run(self, priority: int) -> bool:
+        total = sum(self._running.values())
+        if total >= self.slots:
+            return False
+        if priority == INTERACTIVE:
+            return True
+        return total - self._running[INTERACTIVE] < self.slots - self.reserve
+
+    def _take(self, w: _Waiter):
+        w.granted = True
+        self._running[w.priority] += 1
+        self._by_client[w.client] += 1
+        self.granted[w.priority] += 1
+
+    def _dispatch_locked(self) -> list:
+        """Grant slots to the best eligible waiters; returns submit() jobs to start."""
+        start = []
+        now = time.monotonic()
+        while self._waiters:
+            live = []
+            for w in self._waiters:
+                if w.job is not None and w.job[3].cancelled():
+                    self.cancelled[w.priority] += 1
+                elif w.deadline is not None and now > w.deadline:
+                    self.expired[w.priority] += 1
+                    if w.event is not None:
+                        w.event.set()   # wakes the waiter to report RenderBusy
+                    else:
+                        w.job[3].set_exception(RenderBusy())
+                else:
+                    live.append(w)
+            self._waiters = live
+            eligible = [w for w in live if self._can_run(w.priority)]
+            if not eligible:
+                break
+            eligible.sort(key=lambda w: (w.priority, self._by_client[w.client], w.seq))
+            best = claimed = None
+            lane_blocked = set()
+            for w in eligible:
+                claim = getattr(w.job[0], 'claim', None) if w.job is not None else None
+                if claim is None:
+                    best = w
+                    break
+                claimed = claim()
+                if claimed is not None:
+                    best = w
+                    break
+                lane_blocked.add(w.seq)
+            if best is None:
+                break
+            # Strict priority: a lower class never overtakes a waiting higher one
+            # (unless that one is only waiting for its lane)
+            if any(w.priority < best.priority and w.seq not in lane_blocked for w in live):
+                if claimed is not None:
+                    claimed.unclaim()
+                break
+            self._waiters.remove(best)
+            if claimed is not None:
+                best.job = (claimed,) + best.job[1:]
+            self._take(best)
+            if best.event is not None:
+                best.event.set()
+            else:
+                start.append(best)
+        return start
+
+    def _estimated_wait(self, priority: int) -> float:
+        hold = self._hold.get(priority, 0.5)
+        ahead = sum(1 for w in self._waiters if w.priority <= priority)
+        capacity = self.slots if priority == INTERACTIVE else self.slots - self.reserve
+        return (ahead + 1) * hold / max(capacity, 1)
+
+    def _release(self, priority: int, client, held: Optional[float]):
+        """Free a slot; held (seconds) feeds the class's hold-time estimate if given."""
+        with self._lock:
+            self._running[priority] -= 1
+            self._by_client[client] -= 1
+            if self._by_client[client] <= 0:
+                del self._by_client[client]
+            if held is not None:
+                prev = self._hold.get(priority)
+                self._hold[priority] = held if prev is None else 0.8 * prev + 0.2 * held
+            start = self._dispatch_locked()
+        self._start(start)
+
+    # -- public API -------------------------------------------------------
+
+    @contextmanager
+    def slot(self, priority: int = INTERACTIVE, client: Any = None, timeout: Optional[float] = 10):
+        """Hold a render slot for the body of the with-block; raises RenderBusy."""
+        event = threading.Event()
+        with self._lock:
+            w = _Waiter(priority, client, next(self._seq),
+                        time.monotonic() + timeout if timeout is not None else None, event=event)
+            if self._can_run(priority) and not any(x.priority <= priority for x in self._waiters):
+                self._take(w)
+            elif timeout is not None and self._estimated_wait(priority) > timeout:
+                self.shed[priority] += 1
+                raise RenderBusy()
+            else:
+                self._waiters.append(w)
+        if not w.granted:
+            event.wait(timeout)
+            with self._lock:
+                if not w.granted:
+                    if w in self._waiters:
+                        self._waiters.remove(w)
+                        self.expired[priority] += 1
+                    raise RenderBusy()
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self._release(priority, client, time.monotonic() - started)
+
+    def submit(self, executor, priority: int, fn: Callable, *args,
+               client: Any = None, timeout: Optional[float] = None) -> Future:
+        """Queue fn(*args) for executor; it is submitted once a slot is granted.
+
+        Cancelling the returned Future while queued drops the job. A job
+        still queued after `timeout` seconds fails with RenderBusy.
+        """
+        outer = Future()
+        with self._lock:
+            w = _Waiter(priority, client, next(self._seq),
+                        time.monotonic() + timeout if timeout is not None else None,
+                        job=(executor, fn, args, outer))
+            self._waiters.append(w)
+            start = self._dispatch_locked()
+        self._start(start)
+        return outer
+
+    def _start(self, waiters: list):
+        for w in waiters:
+            executor, fn, args, outer = w.job
+            if not outer.set_running_or_notify_cancel():
+                with self._lock:
+                    self.cancelled[w.priority] += 1
+                if hasattr(executor, 'unclaim'):
+                    executor.unclaim()
+                self._release(w.priority, w.client, None)
+                continue
+            started = time.monotonic()
+            try:
+                inner = executor.submit(fn, *args)
+            except Exception as e:
+                outer.set_exception(e)
+                self._release(w.priority, w.client, None)
+                continue
+
+            def done(f, w=w, outer=outer, started=started):
+                try:
+                    outer.set_result(f.result())
+                except BaseException as e:
+                    outer.set_exception(e)
+                self._release(w.priority, w.client, time.monotonic() - started)
+
+            inner.add_done_callback(done)
+
+    def cancel(self, client: Any = None, priority: Optional[int] = None) -> int:
+        """Cancel queued submit() jobs for a client and/or class. Returns jobs cancelled."""
+        with self._lock:
+            jobs = [w.job[3] for w in self._waiters if w.job is not None
+                    and (client is None or w.client == client)
+                    and (priority is None or w.priority == priority)]
+        return sum(1 for f in jobs if f.cancel())
+
+    def stats(self) -> dict:
+        with self._lock:
+            queued = Counter(w.priority for w in self._waiters)
+            return {
+                'slots': self.slots,
+                'reserved_interactive': self.reserve,
+                'running': sum(self._running.values()),
+                'classes': {
+                    name: {
+                        'running': self._running[p],
+                        'queued': queued[p],
+                        'granted': self.granted[p],
+                        'shed': self.shed[p],
+                        'expired': self.expired[p],
+                        'cancelled': self.cancelled[p],
+                        'avg_hold_s': round(self._hold[p], 3) if p in self._hold else None,
+                    }
+                    for p, name in PRIORITY_NAMES.items()
+                },
+            }
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def scheduler_from_env() -> RenderScheduler:
+    """Build a RenderScheduler from the environment variables documented above."""
+    return RenderScheduler(_env_int('XSECT_RENDER_SLOTS', 12), _env_int('XSECT_RENDER_RESERVE', 4))
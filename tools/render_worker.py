@@ -1,21 +1,27 @@
 """Render worker for multiprocess cross-section rendering and GRIB conversion.
 
 Separate module to avoid Windows spawn importing Flask/dashboard code.
-Each worker process creates its own InteractiveCrossSection engine
-and renders independently with its own GIL.
+Each worker process renders independently with its own GIL. Workers are
+model-agnostic: every job carries the engine config from
+CrossSectionManager.get_render_pool_config(), and the worker keeps one
+InteractiveCrossSection per model, created on first use. The dashboard
+routes jobs by (model, engine_key) (tools.worker_pool), so a worker sees
+the same forecast hours again and keeps them loaded. Grid coordinates and
+KD-trees come from the on-disk grid registry (core.grid_registry), so
+workers map the same files instead of each rebuilding the trees.
 """
 import sys
 import os
 import numpy as np
 from pathlib import Path
 
-_engine = None
+_engines = {}  # engine config key -> InteractiveCrossSection
 
+MAX_LOADED_HOURS = 48  # per engine; oldest-loaded hours are unloaded beyond this
 
-def init_worker(project_dir, cache_dir, extra_cache_dirs, model_name, min_levels, grib_backend):
-    """Initialize engine in worker process. Called once per process."""
-    global _engine
 
+def init_worker(project_dir):
+    """Prepare a worker process. Called once per process; engines are created per job config."""
     if project_dir not in sys.path:
         sys.path.insert(0, project_dir)
 
@@ -23,36 +29,82 @@ def init_worker(project_dir, cache_dir, extra_cache_dirs, model_name, min_levels
     import matplotlib
     matplotlib.use('Agg')
 
+
+def _engine_for(config):
+    """This worker's engine for a pool config (model, cache dirs, backend), created on first use."""
+    key = (config['model_name'], config['cache_dir'], tuple(config['extra_cache_dirs']),
+           config['min_levels'], config['grib_backend'])
+    engine = _engines.get(key)
+    if engine is not None:
+        return engine
+
     from core.cross_section_interactive import InteractiveCrossSection
 
-    _engine = InteractiveCrossSection(
-        cache_dir=cache_dir,
-        min_levels=min_levels,
-        grib_backend=grib_backend,
+    engine = InteractiveCrossSection(
+        cache_dir=config['cache_dir'],
+        min_levels=config['min_levels'],
+        grib_backend=config['grib_backend'],
     )
-    _engine.model = model_name.upper()
+    engine.model = config['model_name'].upper()
 
-    for d in extra_cache_dirs:
+    for d in config['extra_cache_dirs']:
         p = Path(d)
         if p.is_dir():
-            _engine.extra_cache_dirs.append(p)
+            engine.extra_cache_dirs.append(p)
+    _engines[key] = engine
+    return engine
 
 
-def render_frame(args):
-    """Render a single cross-section frame. Called per job in worker process."""
-    global _engine
+def _ensure_hour(engine, grib_file, engine_key, keep=()):
+    """Load engine_key from mmap unless this worker already holds it for grib_file.
 
+    Oldest-loaded hours other than those in keep are unloaded to stay under
+    MAX_LOADED_HOURS.
+    """
+    fhr_data = engine.forecast_hours.get(engine_key)
+    if fhr_data is not None and fhr_data.grib_file != grib_file:
+        engine.unload_hour(engine_key)  # key reused for another cycle
+        fhr_data = None
+    if fhr_data is None:
+        for old in [k for k in engine.forecast_hours if k not in keep]:
+            if len(engine.forecast_hours) < MAX_LOADED_HOURS:
+                break
+            engine.unload_hour(old)
+        engine.load_forecast_hour(grib_file, engine_key)
+
+
+def render_frame(config, args):
+    """Render a single cross-section frame. Called per job in worker process.
+
+    An optional 17th element is the dashboard's frame_cache_key: if the frame
+    is already in the shared disk tier it is returned without rendering, and
+    freshly rendered frames are written there for other workers/restarts.
+
+    terrain_data is normally a TerrainRef; the engine resolves it locally
+    (surface pressure only), loading the referenced FHR from mmap if needed.
+    """
     (grib_file, engine_key, start, end, style, y_axis, vscale, y_top,
      units, temp_cmap, anomaly, marker, marker_label, markers,
-     metadata, terrain_data) = args
+     metadata, terrain_data) = args[:16]
+    cache_key = args[16] if len(args) > 16 else None
 
-    # Load FHR from mmap if not already loaded in this worker
-    if engine_key not in _engine.forecast_hours:
-        _engine.load_forecast_hour(grib_file, engine_key)
+    if cache_key:
+        from tools.frame_cache import disk_get
+        cached = disk_get('frames', cache_key)
+        if cached is not None:
+            return engine_key, cached
 
     # Render
     try:
-        png = _engine.get_cross_section(
+        engine = _engine_for(config)
+        # Load FHR from mmap if not already loaded in this worker
+        _ensure_hour(engine, grib_file, engine_key)
+        # Same for the FHR a TerrainRef locks the frame to, so resolve_terrain
+        # never loads it behind the MAX_LOADED_HOURS cap
+        ref_file = getattr(terrain_data, 'grib_file', None)
+        if ref_file:
+            _ensure_hour(engine, ref_file, terrain_data.forecast_hour, keep=(engine_key,))
+        png = engine.get_cross_section(
             start_point=start,
             end_point=end,
             style=style,
@@ -71,42 +123,57 @@ def render_frame(args):
             marker_label=marker_label,
             markers=markers,
         )
+        if cache_key and png:
+            from tools.frame_cache import disk_put
+            disk_put('frames', cache_key, png)
         return engine_key, png
     except Exception as e:
         return engine_key, None
 
 
-def convert_grib(args):
+def convert_grib(config, args):
     """Convert a GRIB file to mmap cache. Returns (engine_key, success).
 
     The heavy work (eccodes decode + numpy conversion + mmap write) happens
     in the worker process with its own GIL. After conversion, the mmap cache
     files exist on disk for the main process to load cheaply.
     """
-    global _engine
     grib_file, engine_key = args
     try:
-        ok = _engine.load_forecast_hour(grib_file, engine_key)
+        engine = _engine_for(config)
+        ok = engine.load_forecast_hour(grib_file, engine_key)
         # Free worker memory — we only needed the side effect of writing mmap cache.
         # The mmap-backed arrays are lightweight but we free them to avoid accumulation
         # across many conversions in the same worker.
-        _engine.forecast_hours.pop(engine_key, None)
+        engine.forecast_hours.pop(engine_key, None)
         return engine_key, ok
     except Exception as e:
         return engine_key, False
 
 
-def render_multi_panel(args):
+def augment_smoke(config, args):
+    """Add smoke from a wrfnat (or wrfnat subset) to an existing mmap cache.
+
+    Only MASSDEN and hybrid pressure are decoded; the rest of the cache is
+    left as is. Returns (engine_key, success).
+    """
+    grib_file, nat_file, engine_key = args
+    try:
+        return engine_key, _engine_for(config).augment_smoke_cache(grib_file, nat_file)
+    except Exception as e:
+        return engine_key, False
+
+
+def render_multi_panel(config, args):
     """Render a multi-panel composite frame. Returns PNG bytes or None.
 
     Panel data (pre-computed cross-section data dicts) is gathered in the main
     process and pickled to the worker. The worker only does the matplotlib
     rendering which is the CPU-bound part.
     """
-    global _engine
     panels, render_kwargs = args
     try:
-        png = _engine.render_multi_panel(panels, **render_kwargs)
+        png = _engine_for(config).render_multi_panel(panels, **render_kwargs)
         return png
     except Exception as e:
         return None
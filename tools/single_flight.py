@@ -0,0 +1,93 @@
+"""Single-flight coalescing of identical in-flight renders.
+
+When a shared favorite or event link is opened by several users at once,
+every request misses the frame/overlay cache at the same moment and would
+render the same image independently, each holding a render slot. A
+SingleFlight group lets the first request (the leader) do the work while
+concurrent requests for the same key wait for it and share its result.
+
+    png = RENDER_FLIGHTS.do(key, render)
+
+Keys are the dashboard's frame_cache_key / overlay_cache_key strings. The
+leader's exception, if any, is re-raised in every waiter. A waiter that
+times out renders on its own rather than failing the request.
+
+Only concurrent requests are coalesced; completed results are not kept
+here (that is what FrameCache is for).
+"""
+import threading
+from typing import Any, Callable, Dict, Optional
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Thread-safe single-flight group with coalescing metrics."""
+
+    def __init__(self, name: str, wait_timeout: Optional[float] = 120.0):
+        self.name = name
+        self.wait_timeout = wait_timeout
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.coalesced = 0
+        self.wait_timeouts = 0
+        self.errors = 0
+        self.max_waiters = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Return fn() for key, sharing one in-flight call among concurrent callers."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+                leader = True
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+                self.max_waiters = max(self.max_waiters, call.waiters)
+                leader = False
+
+        if not leader:
+            if not call.done.wait(self.wait_timeout):
+                with self._lock:
+                    self.wait_timeouts += 1
+                return fn()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            requests = self.leaders + self.coalesced
+            return {
+                'in_flight': len(self._calls),
+                'renders': self.leaders,
+                'coalesced': self.coalesced,
+                'coalesce_rate': round(self.coalesced / requests, 3) if requests else None,
+                'max_waiters': self.max_waiters,
+                'wait_timeouts': self.wait_timeouts,
+                'errors': self.errors,
+            }
@@ -22,7 +22,7 @@ import threading
 from pathlib import Path
 from datetime import datetime
 from functools import wraps
-from collections import defaultdict
+from collections import defaultdict, deque
 from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 
 import imageio.v2 as imageio
@@ -33,6 +33,10 @@ from flask import Flask, jsonify, request, send_file, abort, Response
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from core.map_overlay import MapOverlayEngine, OVERLAY_FIELDS, get_colormap_lut, PRODUCT_PRESETS, ContourSpec, BarbSpec, CompositeSpec
+from tools.frame_cache import cache_from_env
+from tools.single_flight import SingleFlight
+from tools.render_scheduler import scheduler_from_env, RenderBusy, INTERACTIVE, COMPARISON, PRERENDER, OVERLAY
+from tools.ingest_events import IngestEventTail, journal_path
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s | %(levelname)s | %(message)s')
 logger = logging.getLogger(__name__)
@@ -474,58 +478,31 @@ class RateLimiter:
 
 rate_limiter = RateLimiter()
 
-# Limit concurrent matplotlib renders to prevent CPU/memory thrash under load
-# 12 = up to 8 prerender workers + 4 live user requests
-RENDER_SEMAPHORE = threading.Semaphore(12)
+# Limit concurrent matplotlib renders to prevent CPU/memory thrash under load.
+# 12 slots = up to 8 batch renders (prerender workers) + 4 reserved for live
+# user requests; slots go to interactive > comparison/GIF > prerender > overlay,
+# fair-shared per client IP (XSECT_RENDER_SLOTS / XSECT_RENDER_RESERVE)
+RENDER_SCHEDULER = scheduler_from_env()
 PRERENDER_WORKERS = 8  # Parallel processes for batch prerender (true parallelism, separate GILs)
 
 # =============================================================================
 # PERSISTENT RENDER POOL — stays alive between prerender calls
 # =============================================================================
-_RENDER_POOL = None          # ProcessPoolExecutor instance
+# Model-agnostic: jobs carry get_render_pool_config() and each worker keeps one
+# engine per model, so switching HRRR/GFS/RRFS no longer respawns the pool.
+# Jobs are routed by (model, engine_key) so a worker keeps its hours warm.
+_RENDER_POOL = None          # AffinityPool instance
 _RENDER_POOL_LOCK = threading.Lock()
-_RENDER_POOL_CONFIG = None   # config dict used to init current pool
 
 
-def _get_render_pool(pool_config, project_dir):
-    """Get or create persistent render pool. Recreates if config changes."""
-    global _RENDER_POOL, _RENDER_POOL_CONFIG
-    config_key = (project_dir, pool_config['cache_dir'], tuple(pool_config['extra_cache_dirs']),
-                  pool_config['model_name'], pool_config['min_levels'], pool_config['grib_backend'])
-
+def _get_render_pool(project_dir):
+    """Get or create the persistent render pool."""
+    global _RENDER_POOL
     with _RENDER_POOL_LOCK:
-        if _RENDER_POOL is not None and _RENDER_POOL_CONFIG == config_key:
-            # Check pool is still alive by submitting a no-op
-            try:
-                _RENDER_POOL.submit(int, 0).result(timeout=5)
-                return _RENDER_POOL
-            except Exception:
-                logger.warning("Render pool dead, recreating")
-                try:
-                    _RENDER_POOL.shutdown(wait=False)
-                except Exception:
-                    pass
-                _RENDER_POOL = None
-
-        # Shutdown old pool if config changed
-        if _RENDER_POOL is not None:
-            logger.info("Render pool config changed, recreating")
-            try:
-                _RENDER_POOL.shutdown(wait=False)
-            except Exception:
-                pass
-            _RENDER_POOL = None
-
-        from tools.render_worker import init_worker
-        logger.info(f"Creating persistent render pool ({PRERENDER_WORKERS} workers, model={pool_config['model_name']})")
-        _RENDER_POOL = ProcessPoolExecutor(
-            max_workers=PRERENDER_WORKERS,
-            initializer=init_worker,
-            initargs=(project_dir, pool_config['cache_dir'],
-                      pool_config['extra_cache_dirs'], pool_config['model_name'],
-                      pool_config['min_levels'], pool_config['grib_backend']),
-        )
-        _RENDER_POOL_CONFIG = config_key
+        if _RENDER_POOL is None:
+            from tools.worker_pool import AffinityPool
+            logger.info(f"Creating persistent render pool ({PRERENDER_WORKERS} workers)")
+            _RENDER_POOL = AffinityPool('render', PRERENDER_WORKERS, project_dir)
         return _RENDER_POOL
 
 
@@ -535,59 +512,31 @@ def shutdown_render_pool():
     with _RENDER_POOL_LOCK:
         if _RENDER_POOL is not None:
             logger.info("Shutting down render pool")
-            try:
-                _RENDER_POOL.shutdown(wait=False)
-            except Exception:
-                pass
+            _RENDER_POOL.shutdown()
             _RENDER_POOL = None
 
 
 # =============================================================================
 # PERSISTENT GRIB POOL — separate pool for GRIB→mmap conversion
 # =============================================================================
+# A plain shared-queue pool, not an AffinityPool: convert_grib drops the hour
+# right after writing the cache, so there is nothing to keep warm, and hashing
+# keys onto lanes would serialize conversions that collide while other workers
+# sit idle. Still model-agnostic (jobs carry get_render_pool_config()).
 _GRIB_POOL = None
 _GRIB_POOL_LOCK = threading.Lock()
-_GRIB_POOL_CONFIG = None
 GRIB_POOL_WORKERS = 6  # Overridden by --grib-workers at startup
 
 
-def _get_grib_pool(pool_config, project_dir):
-    """Get or create persistent GRIB conversion pool. Recreates if config changes."""
-    global _GRIB_POOL, _GRIB_POOL_CONFIG
-    config_key = (project_dir, pool_config['cache_dir'], tuple(pool_config['extra_cache_dirs']),
-                  pool_config['model_name'], pool_config['min_levels'], pool_config['grib_backend'])
-
+def _get_grib_pool(project_dir):
+    """Get or create the persistent GRIB conversion pool (model-agnostic, like the render pool)."""
+    global _GRIB_POOL
     with _GRIB_POOL_LOCK:
-        if _GRIB_POOL is not None and _GRIB_POOL_CONFIG == config_key:
-            try:
-                _GRIB_POOL.submit(int, 0).result(timeout=5)
-                return _GRIB_POOL
-            except Exception:
-                logger.warning("GRIB pool dead, recreating")
-                try:
-                    _GRIB_POOL.shutdown(wait=False)
-                except Exception:
-                    pass
-                _GRIB_POOL = None
-
-        if _GRIB_POOL is not None:
-            logger.info("GRIB pool config changed, recreating")
-            try:
-                _GRIB_POOL.shutdown(wait=False)
-            except Exception:
-                pass
-            _GRIB_POOL = None
-
-        from tools.render_worker import init_worker
-        logger.info(f"Creating persistent GRIB pool ({GRIB_POOL_WORKERS} workers, model={pool_config['model_name']})")
-        _GRIB_POOL = ProcessPoolExecutor(
-            max_workers=GRIB_POOL_WORKERS,
-            initializer=init_worker,
-            initargs=(project_dir, pool_config['cache_dir'],
-                      pool_config['extra_cache_dirs'], pool_config['model_name'],
-                      pool_config['min_levels'], pool_config['grib_backend']),
-        )
-        _GRIB_POOL_CONFIG = config_key
+        if _GRIB_POOL is None:
+            from tools.render_worker import init_worker
+            logger.info(f"Creating persistent GRIB pool ({GRIB_POOL_WORKERS} workers)")
+            _GRIB_POOL = ProcessPoolExecutor(max_workers=GRIB_POOL_WORKERS, initializer=init_worker,
+                                             initargs=(project_dir,))
         return _GRIB_POOL
 
 
@@ -607,50 +556,98 @@ def shutdown_grib_pool():
 # =============================================================================
 # FRAME PRERENDER CACHE — stores rendered PNG bytes for slider/comparison
 # =============================================================================
-FRAME_CACHE = {}            # cache_key -> PNG bytes
-FRAME_CACHE_LOCK = threading.Lock()
-MAX_FRAME_CACHE = 500       # ~500 * 150KB = ~75MB max
+# Byte-budgeted LRU (FRAME_CACHE_MB) with optional NVMe disk tier (XSECT_FRAME_CACHE_DIR)
+FRAME_CACHE = cache_from_env('frames', 'FRAME_CACHE_MB')
+
+# Renderer for slider/GIF frames: 'mpl' (matplotlib, process pool) or 'fast'
+# (core.fast_render raster frames, rendered inline). Overridable per request.
+ANIMATION_RENDERER = os.environ.get('XSECT_ANIMATION_RENDERER', 'mpl').strip().lower()
+
+def _parse_renderer(args_or_data, style, y_axis='pressure', has_markers=False):
+    """Frame renderer from a ?renderer= param or POST field, defaulting to ANIMATION_RENDERER.
 
-def frame_cache_key(model, cycle_key, fhr, style, start, end, y_axis, vscale, y_top, units, temp_cmap, anomaly):
+    Styles the raster renderer can't draw (smoke), the isentropic axis and
+    frames with POI markers always use matplotlib.
+    """
+    renderer = str(args_or_data.get('renderer') or ANIMATION_RENDERER).lower()
+    if renderer == 'fast' and y_axis != 'isentropic' and not has_markers:
+        from core.fast_render import supports
+        if supports(style):
+            return 'fast'
+    return 'mpl'
+
+def frame_cache_key(model, cycle_key, fhr, style, start, end, y_axis, vscale, y_top, units, temp_cmap, anomaly, renderer='mpl'):
     """Deterministic cache key for a rendered frame."""
-    return f"{model}:{cycle_key}:F{fhr:02d}:{style}:{start[0]:.4f},{start[1]:.4f}:{end[0]:.4f},{end[1]:.4f}:{y_axis}:{vscale}:{y_top}:{units}:{temp_cmap}:{anomaly}"
+    key = f"{model}:{cycle_key}:F{fhr:02d}:{style}:{start[0]:.4f},{start[1]:.4f}:{end[0]:.4f},{end[1]:.4f}:{y_axis}:{vscale}:{y_top}:{units}:{temp_cmap}:{anomaly}"
+    return key if renderer == 'mpl' else f"{key}:{renderer}"
+
+def frame_key_with_markers(key, markers=None, marker=None, marker_label=None):
+    """Extend a frame_cache_key with POI markers, which change the rendered image."""
+    if markers:
+        return key + ':m=' + ';'.join(f"{m['lat']:.4f},{m['lon']:.4f},{m['label']}" for m in markers)
+    if marker:
+        return key + f":m={marker[0]:.4f},{marker[1]:.4f},{marker_label or ''}"
+    return key
 
 def frame_cache_put(key, png_bytes):
-    """Store a rendered frame, evicting oldest if full."""
-    with FRAME_CACHE_LOCK:
-        FRAME_CACHE[key] = png_bytes
-        while len(FRAME_CACHE) > MAX_FRAME_CACHE:
-            oldest = next(iter(FRAME_CACHE))
-            del FRAME_CACHE[oldest]
+    """Store a rendered frame (LRU eviction by byte budget, write-through to disk tier)."""
+    FRAME_CACHE.put(key, png_bytes)
 
 def frame_cache_get(key):
-    """Retrieve cached frame or None."""
-    with FRAME_CACHE_LOCK:
-        return FRAME_CACHE.get(key)
+    """Retrieve cached frame (memory, then disk tier) or None."""
+    return FRAME_CACHE.get(key)
+
+# =============================================================================
+# SINGLE-FLIGHT RENDERS — concurrent identical requests share one render
+# =============================================================================
+RENDER_FLIGHTS = SingleFlight('frames')      # keyed by frame_cache_key
+OVERLAY_FLIGHTS = SingleFlight('overlays')   # keyed by overlay_cache_key
+
+
+def render_frame_coalesced(key, render, timeout=10, scheduled=True):
+    """PNG bytes for a frame: FRAME_CACHE, else one shared render per key.
+
+    render() returns a BytesIO or None. It runs in an interactive
+    RENDER_SCHEDULER slot (scheduled=False skips that, for raster frames);
+    raises RenderBusy in the leader and every waiter if no slot frees up
+    within timeout seconds.
+    """
+    cached = frame_cache_get(key)
+    if cached:
+        return cached
+    client = request.remote_addr
+
+    def leader():
+        if scheduled:
+            with RENDER_SCHEDULER.slot(INTERACTIVE, client=client, timeout=timeout):
+                buf = render()
+        else:
+            buf = render()
+        if buf is None:
+            return None
+        png = buf.getvalue()
+        frame_cache_put(key, png)
+        return png
+
+    return RENDER_FLIGHTS.do(key, leader)
+
 
 # =============================================================================
 # OVERLAY PRERENDER CACHE — stores rendered overlay PNG bytes per FHR/product
 # =============================================================================
-OVERLAY_CACHE = {}              # cache_key -> PNG bytes
-OVERLAY_CACHE_LOCK = threading.Lock()
-MAX_OVERLAY_CACHE = 500         # ~500 * 150KB = ~75MB max (multiple products)
+OVERLAY_CACHE = cache_from_env('overlays', 'OVERLAY_CACHE_MB')
 
 def overlay_cache_key(model, cycle_key, fhr, product_or_field, level=None):
     """Deterministic cache key for an overlay frame."""
     return f"overlay:{model}:{cycle_key}:F{fhr:02d}:{product_or_field}:{level or 'sfc'}"
 
 def overlay_cache_put(key, png_bytes):
-    """Store a rendered overlay frame, evicting oldest if full."""
-    with OVERLAY_CACHE_LOCK:
-        OVERLAY_CACHE[key] = png_bytes
-        while len(OVERLAY_CACHE) > MAX_OVERLAY_CACHE:
-            oldest = next(iter(OVERLAY_CACHE))
-            del OVERLAY_CACHE[oldest]
+    """Store a rendered overlay frame (LRU eviction by byte budget, write-through to disk tier)."""
+    OVERLAY_CACHE.put(key, png_bytes)
 
 def overlay_cache_get(key):
-    """Retrieve cached overlay frame or None."""
-    with OVERLAY_CACHE_LOCK:
-        return OVERLAY_CACHE.get(key)
+    """Retrieve cached overlay frame (memory, then disk tier) or None."""
+    return OVERLAY_CACHE.get(key)
 
 AUTO_PRERENDER_PRODUCTS = ['surface_analysis', 'fire_weather']  # products to prerender on cycle load
 
@@ -682,7 +679,9 @@ def auto_prerender_overlay(mgr, model_name: str, cycle_key: str, product: str =
             if fhr_data is None:
                 continue
             try:
-                result = engine.render_composite(fhr_data, spec, opacity=1.0)
+                # Lowest render priority: yields to every user-driven render
+                with RENDER_SCHEDULER.slot(OVERLAY, client='auto-prerender', timeout=None):
+                    result = engine.render_composite(fhr_data, spec, opacity=1.0)
                 webp_data = _png_to_webp(result.data)
                 key = overlay_cache_key(model_name, cycle_key, fhr, product)
                 overlay_cache_put(key, webp_data)
@@ -875,98 +874,199 @@ MODEL_EXCLUDED_STYLES = {
     'hrrr': set(),          # HRRR supports all styles
 }
 
-# ── Lazy wrfnat download for smoke style ──
-# wrfnat files (~663MB) are no longer downloaded by auto_update (saves 56% bandwidth).
-# When a smoke cross-section is first requested, this triggers a background download.
-_wrfnat_download_pending = set()  # Set of (cycle_key, fhr) currently downloading
-_wrfnat_download_lock = threading.Lock()
+# ── Pipelined ingest ──
+# auto_update --pipeline builds an FHR's mmap cache while its GRIBs download and
+# keeps a marker (smart_hrrr.orchestrator.INGEST_MARKER) in the FHR dir until the
+# cache is in place; the FHR isn't offered until then, so it loads from cache
+# instead of being converted a second time. Markers left by a crash go stale.
+INGEST_MARKER = '.ingesting'
+# Files a model GRIB glob can match that aren't GRIBs: in-flight downloads and
+# message-index sidecars written next to the GRIB before they moved to .msgidx/
+_NOT_GRIB_SUFFIXES = ('.partial', '.msgidx')
+INGEST_MARKER_STALE_S = 1800
 
-def _trigger_lazy_wrfnat_download(model_name: str, cycle_key: str, fhr: int):
-    """Trigger background download of wrfnat file for smoke data.
 
-    Returns True if download was triggered or already in progress,
-    False if not applicable (non-HRRR or wrfnat already exists).
-    """
-    if model_name != 'hrrr':
+def _ingest_in_progress(fhr_dir: Path) -> bool:
+    try:
+        return time.time() - (fhr_dir / INGEST_MARKER).stat().st_mtime < INGEST_MARKER_STALE_S
+    except OSError:
         return False
 
-    key = (cycle_key, fhr)
-    with _wrfnat_download_lock:
-        if key in _wrfnat_download_pending:
-            return True  # Already downloading
 
-    # Parse cycle_key to find the wrfprs file and derive wrfnat path
-    # cycle_key format: "YYYYMMDD/HHz"
-    try:
-        parts = cycle_key.split('/')
-        date_str = parts[0]
-        hour = int(parts[1].replace('z', ''))
-    except (IndexError, ValueError):
-        return False
+# ── Ingest events ──
+# auto_update appends a (model, cycle, fhr, paths) event to a journal for each
+# completed FHR (tools.ingest_events). background_rescan tails it, adds the FHR
+# to the manager's cycle list and starts loading it at once; the full directory
+# scan drops to a safety net every XSECT_RESCAN_FULL_SECONDS once events flow.
+INGEST_TAIL = None  # IngestEventTail, set in main() unless XSECT_INGEST_EVENTS=0
+INGEST_POLL_SECONDS = 0.25
 
-    outputs_dir = Path('outputs') / 'hrrr' / date_str / f"{hour:02d}z" / f"F{fhr:02d}"
-    if not outputs_dir.exists():
-        return False
+# ── Cycle catalog ──
+# scan_available_cycles keeps directory state in a SQLite catalog
+# (tools.cycle_catalog) and only re-lists directories whose mtime moved.
+# Shared by all model managers; XSECT_CATALOG_DB overrides the location.
+_CYCLE_CATALOG = None
+_CYCLE_CATALOG_LOCK = threading.Lock()
 
-    # Check if wrfnat already exists
-    nat_files = list(outputs_dir.glob('*wrfnat*.grib2'))
-    if nat_files:
-        return False  # Already have it
 
-    # Check if wrfprs exists (need it to derive the nat filename)
-    prs_files = list(outputs_dir.glob('*wrfprs*.grib2'))
-    if not prs_files:
-        return False
+def _get_cycle_catalog():
+    """Get or create the shared cycle catalog."""
+    global _CYCLE_CATALOG
+    with _CYCLE_CATALOG_LOCK:
+        if _CYCLE_CATALOG is None:
+            from tools.cycle_catalog import CycleCatalog
+            default = Path(CrossSectionManager.CACHE_BASE) / 'cycle_catalog.sqlite'
+            _CYCLE_CATALOG = CycleCatalog(os.environ.get('XSECT_CATALOG_DB', str(default)))
+            logger.info(f"Cycle catalog: {_CYCLE_CATALOG.db_path}")
+        return _CYCLE_CATALOG
 
-    nat_filename = prs_files[0].name.replace('wrfprs', 'wrfnat')
-    nat_path = outputs_dir / nat_filename
 
-    with _wrfnat_download_lock:
-        if key in _wrfnat_download_pending:
-            return True
-        _wrfnat_download_pending.add(key)
+# ── Lazy smoke jobs ──
+# wrfnat files (~663MB) are not downloaded by auto_update. When a smoke
+# cross-section is first requested for an HRRR hour, a background job fetches
+# just MASSDEN + hybrid PRES via .idx byte ranges (IDX_SUBSETS['native']),
+# decodes them in the GRIB pool and adds smoke_hyb/smoke_pres_hyb to the
+# hour's existing mmap cache — the hour stays loaded and nothing is
+# reconverted. Clients get 202 with a job id and poll/await
+# /api/v1/jobs/<job_id>.
+SMOKE_JOBS = {}  # job_id -> job dict (see _start_smoke_job)
+_smoke_jobs_lock = threading.Lock()
+SMOKE_JOB_TTL = 3600  # finished jobs are forgotten after this many seconds
+
+
+def _smoke_job_id(model_name: str, cycle_key: str, fhr: int) -> str:
+    return f"smoke-{model_name}-{cycle_key}-F{fhr:02d}"
+
+
+def _job_public(job: dict) -> dict:
+    """JSON view of a job (drops internal fields)."""
+    return {k: v for k, v in job.items() if not k.startswith('_')}
+
+
+def _smoke_grib_file(mgr, cycle_key: str, fhr: int):
+    """The wrfprs path the hour's mmap cache is keyed on (the file itself may be gone)."""
+    engine_key = mgr._engine_key_map.get((cycle_key, fhr))
+    if mgr.xsect and engine_key is not None:
+        fhr_data = mgr.xsect.forecast_hours.get(engine_key)
+        if fhr_data is not None and fhr_data.grib_file:
+            return fhr_data.grib_file
+    cycle = mgr.get_cycle(cycle_key)
+    if not cycle:
+        return None
+    prs_files = sorted((Path(cycle['path']) / f"F{fhr:02d}").glob(mgr._prs_pattern))
+    if prs_files:
+        return str(prs_files[0])
+    return mgr._find_cache_grib_path(cycle, fhr)
+
+
+def _start_smoke_job(mgr, cycle_key: str, fhr: int):
+    """Start (or join) the smoke job for an HRRR hour.
+
+    Returns the job dict, or None if no job is needed (not HRRR, smoke
+    already cached, or the hour can't be located).
+    """
+    if mgr.model_name != 'hrrr':
+        return None
+    job_id = _smoke_job_id(mgr.model_name, cycle_key, fhr)
+    now = time.time()
+    with _smoke_jobs_lock:
+        for jid in [j for j, v in SMOKE_JOBS.items()
+                    if v['finished'] and now - v['finished'] > SMOKE_JOB_TTL]:
+            del SMOKE_JOBS[jid]
+        job = SMOKE_JOBS.get(job_id)
+        if job is not None and job['status'] != 'failed':
+            return job if job['status'] != 'done' else None
+
+    grib_file = _smoke_grib_file(mgr, cycle_key, fhr)
+    if not grib_file:
+        return None
+    if mgr.xsect and mgr.xsect.has_cached_smoke(grib_file):
+        return None
+    # cycle_key format: "YYYYMMDD_HHz"
+    try:
+        date_str, hour_str = cycle_key.split('_')
+        hour = int(hour_str.replace('z', ''))
+    except ValueError:
+        return None
 
-    def _download():
+    with _smoke_jobs_lock:
+        job = SMOKE_JOBS.get(job_id)
+        if job is not None and job['status'] not in ('failed', 'done'):
+            return job
+        job = SMOKE_JOBS[job_id] = {
+            'job_id': job_id,
+            'kind': 'smoke',
+            'model': mgr.model_name,
+            'cycle': cycle_key,
+            'fhr': fhr,
+            'status': 'queued',
+            'error': None,
+            'created': now,
+            'finished': None,
+            'status_url': f'/api/v1/jobs/{job_id}',
+            '_event': threading.Event(),
+        }
+
+    def _set(status, error=None):
+        with _smoke_jobs_lock:
+            job['status'] = status
+            job['error'] = error
+            if status in ('done', 'failed'):
+                job['finished'] = time.time()
+        if status in ('done', 'failed'):
+            job['_event'].set()
+
+    def _run():
+        op_id = f"smoke:{cycle_key}:F{fhr:02d}"
+        progress_update(op_id, 0, 2, "Fetching MASSDEN + PRES (wrfnat subset)",
+                        label=f"Smoke {cycle_key} F{fhr:02d}")
         try:
             from smart_hrrr.orchestrator import download_forecast_hour
-            logger.info(f"[LAZY-WRFNAT] Downloading wrfnat for {cycle_key} F{fhr:02d}...")
+            fhr_dir = Path(grib_file).parent
+            nat_path = fhr_dir / Path(grib_file).name.replace('wrfprs', 'wrfnat')
+            _set('downloading')
+            logger.info(f"[SMOKE] Fetching wrfnat subset for {cycle_key} F{fhr:02d}...")
             ok = download_forecast_hour(
                 model='hrrr',
                 date_str=date_str,
                 cycle_hour=hour,
                 forecast_hour=fhr,
-                output_dir=outputs_dir,
-                file_types=['native'],  # Only wrfnat
+                output_dir=fhr_dir,
+                file_types=['native'],
+                subset=True,  # falls back to the full file without .idx/Range support
             )
-            if ok:
-                logger.info(f"[LAZY-WRFNAT] Downloaded wrfnat for {cycle_key} F{fhr:02d} — reload to pick up smoke data")
-                # Force reload: unload + reload so mmap cache picks up wrfnat smoke fields
-                for mgr in model_registry.managers.values():
-                    if mgr.model_name == 'hrrr' and (cycle_key, fhr) in mgr.loaded_items:
-                        try:
-                            mgr._unload_item(cycle_key, fhr)
-                            with mgr._lock:
-                                if (cycle_key, fhr) in mgr.loaded_items:
-                                    mgr.loaded_items.remove((cycle_key, fhr))
-                            # Delete mmap cache for this FHR so it reconverts with smoke
-                            cache_dir = Path(mgr.CACHE_BASE) / 'hrrr'
-                            fhr_cache = cache_dir / date_str / f"{hour:02d}z" / f"F{fhr:02d}"
-                            if fhr_cache.exists():
-                                import shutil
-                                shutil.rmtree(fhr_cache, ignore_errors=True)
-                                logger.info(f"[LAZY-WRFNAT] Cleared mmap cache {fhr_cache}")
-                            mgr.load_forecast_hour(cycle_key, fhr)
-                        except Exception as e:
-                            logger.warning(f"[LAZY-WRFNAT] Reload failed: {e}")
-                        break
+            if not ok or not nat_path.exists():
+                _set('failed', 'wrfnat download failed')
+                progress_remove(op_id)
+                return
+
+            _set('decoding')
+            progress_update(op_id, 1, 2, "Adding smoke to mmap cache")
+            engine_key = mgr._engine_key_map.get((cycle_key, fhr), 0)
+            project_dir = str(Path(__file__).resolve().parent.parent)
+            from tools.render_worker import augment_smoke
+            _, added = _get_grib_pool(project_dir).submit(
+                augment_smoke, mgr.get_render_pool_config(), (grib_file, str(nat_path), engine_key),
+            ).result(timeout=600)
+            if added:
+                # Cache now has smoke: map it onto the loaded hour and drop the wrfnat
+                if mgr.xsect:
+                    mgr.xsect.augment_smoke_cache(grib_file)
+                nat_path.unlink(missing_ok=True)
+                logger.info(f"[SMOKE] Added smoke to cache for {cycle_key} F{fhr:02d}")
             else:
-                logger.warning(f"[LAZY-WRFNAT] Failed to download wrfnat for {cycle_key} F{fhr:02d}")
-        finally:
-            with _wrfnat_download_lock:
-                _wrfnat_download_pending.discard(key)
+                # No mmap cache yet: keep the wrfnat so the GRIB conversion picks it up
+                logger.info(f"[SMOKE] No mmap cache for {cycle_key} F{fhr:02d} yet; "
+                            f"smoke will be read from {nat_path.name} on load")
+            _set('done')
+            progress_done(op_id)
+        except Exception as e:
+            logger.warning(f"[SMOKE] Job {job_id} failed: {e}")
+            _set('failed', str(e))
+            progress_remove(op_id)
 
-    threading.Thread(target=_download, daemon=True, name=f"wrfnat-{cycle_key}-F{fhr:02d}").start()
-    return True
+    threading.Thread(target=_run, daemon=True, name=job_id).start()
+    return job
 
 def _env_int(name: str, default: int) -> int:
     """Parse integer env var with fallback."""
@@ -1005,6 +1105,10 @@ class CrossSectionManager:
         self._loading = threading.Lock()  # Prevents overlapping bulk loads (preload vs load_cycle)
         self._engine_key_map = {}  # (cycle_key, fhr) -> unique engine int key
         self._next_engine_key = 0  # Counter for unique keys
+        self._auto_load_thread = None  # background auto_load_latest runner (request_auto_load)
+        self._ingest_seq = 0  # Bumped per FHR applied from the ingest journal
+        self._ingested = deque(maxlen=256)  # (seq, date_str, hour, hour_dir, fhr), replayed by scans
+        self._auto_load_pending = False
         # Model-specific config
         self._prs_pattern = MODEL_PRS_PATTERNS.get(model_name, '*.grib2')
         self._sfc_pattern = MODEL_SFC_PATTERNS.get(model_name, '*.grib2')
@@ -1024,6 +1128,24 @@ class CrossSectionManager:
         except Exception:
             self.model_config = None
 
+    @property
+    def available_cycles(self) -> list:
+        """Available cycles (metadata only), newest init first."""
+        return self._available[0]
+
+    @available_cycles.setter
+    def available_cycles(self, cycles: list):
+        # Swapped in one assignment with its lookup indexes (get_cycle, resolve_cycle)
+        newest_by_fhr = {}
+        for c in cycles:
+            for fhr in c['available_fhrs']:
+                newest_by_fhr.setdefault(fhr, c['cycle_key'])
+        self._available = (cycles, {c['cycle_key']: c for c in cycles}, newest_by_fhr)
+
+    def get_cycle(self, cycle_key: str) -> 'Optional[dict]':
+        """The available_cycles entry for cycle_key, or None."""
+        return self._available[1].get(cycle_key)
+
     def _sfc_file_from_prs(self, prs_file: str) -> str:
         """Derive the surface GRIB path from a pressure GRIB path."""
         if self.model_name == 'hrrr':
@@ -1156,7 +1278,20 @@ class CrossSectionManager:
                     evict_idx = i
                     break
             if evict_idx is None:
-                logger.warning(f"Memory {mem_mb:.0f}MB > limit but only protected cycles loaded, cannot evict")
+                # Only protected cycles left: drop resident pages of the coldest
+                # FHRs instead (they stay loaded and re-fault from the mmap cache)
+                released = 0
+                for ck, fhr in self.loaded_items:
+                    engine_key = self._engine_key_map.get((ck, fhr))
+                    if engine_key is not None and self.xsect.release_hour_pages(engine_key):
+                        released += 1
+                        mem_mb = self.xsect.get_memory_usage()
+                        if mem_mb <= self.MEM_EVICT_MB:
+                            break
+                if released:
+                    logger.info(f"Released resident pages of {released} protected FHRs (now {mem_mb:.0f}MB)")
+                else:
+                    logger.warning(f"Memory {mem_mb:.0f}MB > limit but only protected cycles loaded, cannot evict")
                 break
             old_key, old_fhr = self.loaded_items.pop(evict_idx)
             logger.info(f"Memory {mem_mb:.0f}MB > {self.MEM_EVICT_MB}MB, evicting {old_key} F{old_fhr:02d}")
@@ -1200,205 +1335,162 @@ class CrossSectionManager:
                         logger.info(f"Archive cache fallback: {archive_cache}")
             logger.info(f"Cross-section GRIB backend: {self.xsect.grib_backend}")
 
-    def scan_available_cycles(self):
-        """Scan for all available cycles on disk WITHOUT loading data."""
-        from datetime import datetime
-
-        cycles = []
-
-        if not self.base_dir.exists():
-            self.available_cycles = cycles
-            return self.available_cycles
-
-        # Scan for date directories
-        for date_dir in sorted(self.base_dir.iterdir(), reverse=True):
-            if not date_dir.is_dir() or not date_dir.name.isdigit():
-                continue
-            if len(date_dir.name) != 8:
-                continue
-
-            # Scan for hour directories within date
-            for hour_dir in sorted(date_dir.iterdir(), reverse=True):
-                if not hour_dir.is_dir() or not hour_dir.name.endswith('z'):
-                    continue
+    def _cycle_entry(self, date_str: str, hour: str, path: str, fhrs: list) -> dict:
+        """One available_cycles entry (metadata only) for init date_str/hour ('HH')."""
+        cycle_hour_int = int(hour)
+        init_dt = datetime.strptime(f"{date_str}{hour}", "%Y%m%d%H")
+        return {
+            'cycle_key': f"{date_str}_{hour}z",
+            'date': date_str,
+            'hour': hour,
+            'path': path,
+            'available_fhrs': fhrs,
+            'init_dt': init_dt,
+            'display': f"{self._display_prefix} - {init_dt.strftime('%b %d %HZ')}",
+            'max_fhr': get_max_fhr_for_cycle(self.model_name, cycle_hour_int),
+            'is_synoptic': cycle_hour_int in SYNOPTIC_HOURS,
+            'expected_fhrs': get_model_fhr_list(self.model_name, cycle_hour_int),
+        }
+
+    def _fhr_dir_ready(self, fhr_dir: Path) -> bool:
+        """True if an FHR dir holds complete GRIBs (prs, plus sfc where separate) and isn't mid-ingest."""
+        if not fhr_dir.exists() or _ingest_in_progress(fhr_dir):
+            return False
+        has_prs = [f for f in fhr_dir.glob(self._prs_pattern) if not f.name.endswith(_NOT_GRIB_SUFFIXES)]
+        if not self._needs_separate_sfc:
+            return bool(has_prs)  # GFS/RRFS: surface data is in the pressure file
+        has_sfc = [f for f in fhr_dir.glob(self._sfc_pattern) if not f.name.endswith(_NOT_GRIB_SUFFIXES)]
+        return bool(has_prs and has_sfc)
+
+    def _catalog_check(self, fhr_dir: Path):
+        """Cycle catalog check for an outputs FHR dir; None (ask again) while an ingest is running."""
+        if _ingest_in_progress(fhr_dir):
+            return None
+        return self._fhr_dir_ready(fhr_dir)
 
-                hour = hour_dir.name.replace('z', '')
-                if not hour.isdigit():
-                    continue
+    def _archive_grib_check(self, fhr_dir: Path) -> bool:
+        """Cycle catalog check for an archive FHR dir: a complete prs file is enough."""
+        return any(not f.name.endswith(_NOT_GRIB_SUFFIXES) for f in fhr_dir.glob(self._prs_pattern))
 
-                # Check what forecast hours are available on disk
-                available_fhrs = []
-                cycle_hour_int = int(hour)
-                max_fhr = get_max_fhr_for_cycle(self.model_name, cycle_hour_int)
-                expected_fhrs = get_model_fhr_list(self.model_name, cycle_hour_int)
-                for fhr in expected_fhrs:
-                    fhr_dir = hour_dir / f"F{fhr:02d}"
-                    if fhr_dir.exists():
-                        has_prs = [f for f in fhr_dir.glob(self._prs_pattern)
-                                   if not f.name.endswith('.partial')]
-                        if self._needs_separate_sfc:
-                            has_sfc = [f for f in fhr_dir.glob(self._sfc_pattern)
-                                       if not f.name.endswith('.partial')]
-                            if has_prs and has_sfc:
-                                available_fhrs.append(fhr)
-                        else:
-                            # GFS/RRFS: surface data is in the pressure file
-                            if has_prs:
-                                available_fhrs.append(fhr)
-
-                if available_fhrs:
-                    cycle_key = f"{date_dir.name}_{hour}z"
-                    init_dt = datetime.strptime(f"{date_dir.name}{hour}", "%Y%m%d%H")
-
-                    cycles.append({
-                        'cycle_key': cycle_key,
-                        'date': date_dir.name,
-                        'hour': hour,
-                        'path': str(hour_dir),
-                        'available_fhrs': available_fhrs,
-                        'init_dt': init_dt,
-                        'display': f"{self._display_prefix} - {init_dt.strftime('%b %d %HZ')}",
-                        'max_fhr': max_fhr,
-                        'is_synoptic': cycle_hour_int in SYNOPTIC_HOURS,
-                        'expected_fhrs': expected_fhrs,
-                    })
-
-        # Also scan archive GRIB dirs (XSECT_ARCHIVE_DIR, comma-separated) for archive event cycles
-        archive_env = os.environ.get('XSECT_ARCHIVE_DIR', '')
-        for archive_base in [p.strip() for p in archive_env.split(',') if p.strip()]:
-            archive_model_dir = Path(archive_base) / self.model_name
-            if archive_model_dir.is_dir():
-                existing_keys = {c['cycle_key'] for c in cycles}
-                for date_dir in sorted(archive_model_dir.iterdir(), reverse=True):
-                    if not date_dir.is_dir() or not date_dir.name.isdigit() or len(date_dir.name) != 8:
-                        continue
-                    for hour_dir in sorted(date_dir.iterdir(), reverse=True):
-                        if not hour_dir.is_dir() or not hour_dir.name.endswith('z'):
-                            continue
-                        hour = hour_dir.name.replace('z', '')
-                        if not hour.isdigit():
-                            continue
-                        cycle_key = f"{date_dir.name}_{hour}z"
-                        if cycle_key in existing_keys:
-                            continue
-                        available_fhrs = []
-                        cycle_hour_int = int(hour)
-                        max_fhr = get_max_fhr_for_cycle(self.model_name, cycle_hour_int)
-                        expected_fhrs = get_model_fhr_list(self.model_name, cycle_hour_int)
-                        for fhr in expected_fhrs:
-                            fhr_dir = hour_dir / f"F{fhr:02d}"
-                            if fhr_dir.exists():
-                                has_prs = [f for f in fhr_dir.glob(self._prs_pattern)
-                                           if not f.name.endswith('.partial')]
-                                if has_prs:
-                                    available_fhrs.append(fhr)
-                        if available_fhrs:
-                            init_dt = datetime.strptime(f"{date_dir.name}{hour}", "%Y%m%d%H")
-                            cycles.append({
-                                'cycle_key': cycle_key,
-                                'date': date_dir.name,
-                                'hour': hour,
-                                'path': str(hour_dir),
-                                'available_fhrs': available_fhrs,
-                                'init_dt': init_dt,
-                                'display': f"{self._display_prefix} - {init_dt.strftime('%b %d %HZ')}",
-                                'max_fhr': max_fhr,
-                                'is_synoptic': cycle_hour_int in SYNOPTIC_HOURS,
-                                'expected_fhrs': expected_fhrs,
-                            })
-
-        # Also scan archive mmap cache dirs for events that have no GRIBs left (already converted)
-        archive_env = os.environ.get('XSECT_ARCHIVE_DIR', '')
-        for archive_base in [p.strip() for p in archive_env.split(',') if p.strip()]:
-            archive_cache_dir = Path(archive_base) / 'cache' / 'xsect' / self.model_name
-            if not archive_cache_dir.is_dir():
-                continue
-            existing_keys = {c['cycle_key'] for c in cycles}
-            # Group FHR dirs by cycle key
-            import re
-            cache_cycle_fhrs = {}
-            for entry in archive_cache_dir.iterdir():
-                if not entry.is_dir():
-                    continue
-                m = re.match(r'(\d{8})_(\d{2})z_F(\d+)_', entry.name)
-                if m:
-                    ck = f"{m.group(1)}_{m.group(2)}z"
-                    fhr = int(m.group(3))
-                    cache_cycle_fhrs.setdefault(ck, []).append(fhr)
-            for ck, fhrs in cache_cycle_fhrs.items():
-                if ck in existing_keys:
-                    continue
+    def scan_available_cycles(self):
+        """Refresh available cycles from disk WITHOUT loading data.
+
+        Directory state lives in the cycle catalog (tools.cycle_catalog), so
+        only directories whose mtime moved since the last scan are listed or
+        globbed again. Sources, in order of precedence for a cycle key: the
+        outputs GRIB tree, archive GRIB trees and archive mmap caches
+        (XSECT_ARCHIVE_DIR, comma-separated), then the local NVMe mmap cache,
+        whose FHRs are merged into existing cycles (operational cycles whose
+        GRIBs were cleaned up after conversion).
+        """
+        catalog = _get_cycle_catalog()
+        model = self.model_name
+        with self._lock:
+            scan_seq = self._ingest_seq
+
+        def expected(hour):
+            return get_model_fhr_list(model, hour)
+
+        archive_bases = [p.strip() for p in os.environ.get('XSECT_ARCHIVE_DIR', '').split(',') if p.strip()]
+        primary = [('grib', str(self.base_dir))]
+        primary += [('archive_grib', str(Path(b) / model)) for b in archive_bases]
+        primary += [('archive_cache', str(Path(b) / 'cache' / 'xsect' / model)) for b in archive_bases]
+        local_cache = ('cache', str(Path(self.CACHE_BASE) / model))
+
+        for source, root in primary + [local_cache]:
+            if source == 'grib':
+                catalog.refresh_grib_tree(model, source, root, expected, self._catalog_check)
+            elif source == 'archive_grib':
+                catalog.refresh_grib_tree(model, source, root, expected, self._archive_grib_check)
+            else:
+                catalog.refresh_cache_tree(model, source, root, require_complete=(source == 'cache'))
+        configured = set(primary) | {local_cache}
+        for source, root in catalog.roots(model):
+            if (source, root) not in configured:
+                catalog.drop_tree(model, source, root)
+
+        grouped = {}  # (source, root) -> {cycle_key: (path, [fhrs])}
+        for source, root, ck, fhr, path in catalog.rows(model):
+            grouped.setdefault((source, root), {}).setdefault(ck, (path, []))[1].append(fhr)
+
+        cycles = {}
+        for tree in primary:
+            for ck, (path, fhrs) in grouped.get(tree, {}).items():
+                if ck not in cycles:
+                    date_str, hour_str = ck.split('_')
+                    cycles[ck] = self._cycle_entry(date_str, hour_str.replace('z', ''), path, sorted(fhrs))
+        for ck, (_, fhrs) in grouped.get(local_cache, {}).items():
+            if ck in cycles:
+                c = cycles[ck]
+                c['available_fhrs'] = sorted(set(c['available_fhrs']) | set(fhrs))
+            else:
                 date_str, hour_str = ck.split('_')
                 hour = hour_str.replace('z', '')
-                cycle_hour_int = int(hour)
-                max_fhr = get_max_fhr_for_cycle(self.model_name, cycle_hour_int)
-                expected_fhrs = get_model_fhr_list(self.model_name, cycle_hour_int)
-                init_dt = datetime.strptime(f"{date_str}{hour}", "%Y%m%d%H")
-                cycles.append({
-                    'cycle_key': ck,
-                    'date': date_str,
-                    'hour': hour,
-                    'path': str(archive_cache_dir),
-                    'available_fhrs': sorted(fhrs),
-                    'init_dt': init_dt,
-                    'display': f"{self._display_prefix} - {init_dt.strftime('%b %d %HZ')}",
-                    'max_fhr': max_fhr,
-                    'is_synoptic': cycle_hour_int in SYNOPTIC_HOURS,
-                    'expected_fhrs': expected_fhrs,
-                })
-                existing_keys.add(ck)
-
-        # Also scan local NVMe mmap cache for operational cycles with cleaned-up GRIBs
-        local_cache_dir = Path(self.CACHE_BASE) / self.model_name
-        if local_cache_dir.is_dir():
-            import re
-            cache_cycle_fhrs = {}
-            for entry in local_cache_dir.iterdir():
-                if not entry.is_dir():
-                    continue
-                m = re.match(r'(\d{8})_(\d{2})z_F(\d+)_', entry.name)
-                if m and (entry / '_complete').exists():
-                    ck = f"{m.group(1)}_{m.group(2)}z"
-                    fhr = int(m.group(3))
-                    cache_cycle_fhrs.setdefault(ck, []).append(fhr)
-            existing_keys = {c['cycle_key'] for c in cycles}
-            for ck, fhrs in cache_cycle_fhrs.items():
-                if ck in existing_keys:
-                    # Merge mmap-cached FHRs into existing cycle entry
-                    for c in cycles:
-                        if c['cycle_key'] == ck:
-                            c['available_fhrs'] = sorted(set(c['available_fhrs']) | set(fhrs))
-                            break
-                else:
-                    # New cycle only in local mmap cache
-                    date_str, hour_str = ck.split('_')
-                    hour = hour_str.replace('z', '')
-                    cycle_hour_int = int(hour)
-                    max_fhr = get_max_fhr_for_cycle(self.model_name, cycle_hour_int)
-                    expected_fhrs = get_model_fhr_list(self.model_name, cycle_hour_int)
-                    init_dt = datetime.strptime(f"{date_str}{hour}", "%Y%m%d%H")
-                    cycles.append({
-                        'cycle_key': ck,
-                        'date': date_str,
-                        'hour': hour,
-                        'path': str(self.base_dir / date_str / f"{hour}z"),
-                        'available_fhrs': sorted(fhrs),
-                        'init_dt': init_dt,
-                        'display': f"{self._display_prefix} - {init_dt.strftime('%b %d %HZ')}",
-                        'max_fhr': max_fhr,
-                        'is_synoptic': cycle_hour_int in SYNOPTIC_HOURS,
-                        'expected_fhrs': expected_fhrs,
-                    })
-                    existing_keys.add(ck)
+                cycles[ck] = self._cycle_entry(date_str, hour, str(self.base_dir / date_str / f"{hour}z"),
+                                               sorted(fhrs))
 
         # Sort by init_dt descending so newest cycles are always first,
         # regardless of whether they came from GRIB scan, archive, or NVMe mmap scan.
         # This ensures _get_hrrr_target_cycles picks the actual newest init and
         # recent synoptic cycles instead of old archive events.
-        cycles.sort(key=lambda c: c['init_dt'], reverse=True)
+        result = sorted(cycles.values(), key=lambda c: c['init_dt'], reverse=True)
+        with self._lock:
+            # FHRs applied from the ingest journal while this scan ran may be
+            # missing from what the catalog saw; replay them before swapping in
+            for seq, date_str, hour, hour_dir, fhr in self._ingested:
+                if seq > scan_seq:
+                    result = self._with_fhr(result, date_str, hour, hour_dir, fhr) or result
+            self.available_cycles = result
+        return result
+
+    def _with_fhr(self, cycles: list, date_str: str, hour: str, hour_dir: str, fhr: int):
+        """Copy of a cycles list with fhr added to its cycle (created if new), or None if already there."""
+        existing = next((c for c in cycles if c['cycle_key'] == f"{date_str}_{hour}z"), None)
+        if existing is None:
+            cycles = cycles + [self._cycle_entry(date_str, hour, hour_dir, [fhr])]
+            cycles.sort(key=lambda c: c['init_dt'], reverse=True)
+            return cycles
+        if fhr in existing['available_fhrs']:
+            return None
+        updated = dict(existing, available_fhrs=sorted(set(existing['available_fhrs']) | {fhr}))
+        return [updated if c is existing else c for c in cycles]
+
+    def apply_ingest_event(self, event: dict) -> bool:
+        """Add an FHR announced on the ingest event journal to available_cycles.
 
-        self.available_cycles = cycles  # Atomic swap — no empty window
-        return self.available_cycles
+        Checks just that FHR dir (same rules as scan_available_cycles) instead
+        of rescanning the tree. Returns True if the FHR is new to the list.
+        """
+        try:
+            date_str, hour_str = event['cycle'].split('_')
+            hour = hour_str.replace('z', '')
+            fhr = int(event['fhr'])
+            datetime.strptime(f"{date_str}{hour}", "%Y%m%d%H")
+        except (KeyError, TypeError, ValueError, AttributeError):
+            return False
+
+        # Only this manager's own outputs tree: the journal is a file other
+        # processes can write, so its paths are checked, never followed
+        hour_dir = self.base_dir / date_str / f"{hour}z"
+        fhr_dir = (hour_dir / f"F{fhr:02d}").resolve()
+        try:
+            paths = [Path(p).resolve() for p in event.get('paths') or []]
+        except (TypeError, ValueError, OSError):
+            return False
+        if any(fhr_dir not in p.parents for p in paths):
+            logger.warning(f"Ignoring ingest event for {event['cycle']} F{fhr:02d}: paths outside {hour_dir}")
+            return False
+        if not self._fhr_dir_ready(hour_dir / f"F{fhr:02d}"):
+            return False
+
+        with self._lock:
+            cycles = self._with_fhr(self.available_cycles, date_str, hour, str(hour_dir), fhr)
+            if cycles is None:
+                return False
+            self._ingest_seq += 1
+            self._ingested.append((self._ingest_seq, date_str, hour, str(hour_dir), fhr))
+            self.available_cycles = cycles  # Copy-on-write, like the scan's swap
+        return True
 
     def get_cycles_for_ui(self):
         """Return cycles formatted for UI dropdown.
@@ -1608,10 +1700,10 @@ class CrossSectionManager:
                 project_dir = str(Path(__file__).resolve().parent.parent)
                 from tools.render_worker import convert_grib
                 try:
-                    grib_pool = _get_grib_pool(pool_config, project_dir)
+                    grib_pool = _get_grib_pool(project_dir)
                     futures = {}
                     for grib_file, engine_key, cycle, fhr in grib_tasks:
-                        future = grib_pool.submit(convert_grib, (grib_file, engine_key))
+                        future = grib_pool.submit(convert_grib, pool_config, (grib_file, engine_key))
                         futures[future] = (cycle, fhr)
 
                     for future in as_completed(futures):
@@ -1680,15 +1772,48 @@ class CrossSectionManager:
                 daemon=True,
             ).start()
 
-    def auto_load_latest(self):
-        """Load new FHRs from disk, newest cycle first (priority)."""
-        if not self._loading.acquire(blocking=False):
+    def auto_load_latest(self, wait: float = 0) -> bool:
+        """Load new FHRs from disk, newest cycle first (priority).
+
+        Waits up to `wait` seconds for another bulk load to finish; returns
+        False if it had to skip.
+        """
+        acquired = self._loading.acquire(timeout=wait) if wait > 0 else self._loading.acquire(blocking=False)
+        if not acquired:
             logger.info("Skipping auto-load — another load operation in progress")
-            return
+            return False
         try:
             self._auto_load_latest_inner()
         finally:
             self._loading.release()
+        return True
+
+    def request_auto_load(self):
+        """Run auto_load_latest in a background thread now.
+
+        Requests made while a run is in progress are coalesced into one more
+        run after it, so FHRs announced mid-load are picked up right after.
+        """
+        with self._lock:
+            self._auto_load_pending = True
+            if self._auto_load_thread is not None:
+                return
+            self._auto_load_thread = threading.Thread(target=self._auto_load_runner, daemon=True)
+            self._auto_load_thread.start()
+
+    def _auto_load_runner(self):
+        while True:
+            with self._lock:
+                if not self._auto_load_pending:
+                    self._auto_load_thread = None
+                    return
+                self._auto_load_pending = False
+            try:
+                if not self.auto_load_latest(wait=600):
+                    with self._lock:
+                        self._auto_load_pending = True
+            except Exception as e:
+                logger.warning(f"Auto-load failed for {self.model_name}: {e}")
 
     def _auto_load_latest_inner(self):
         if not self.xsect or not self.available_cycles:
@@ -1827,10 +1952,10 @@ class CrossSectionManager:
                 project_dir = str(Path(__file__).resolve().parent.parent)
                 from tools.render_worker import convert_grib
                 try:
-                    grib_pool = _get_grib_pool(pool_config, project_dir)
+                    grib_pool = _get_grib_pool(project_dir)
                     futures = {}
                     for grib_file, engine_key, c, ck, fhr in grib_tasks:
-                        fut = grib_pool.submit(convert_grib, (grib_file, engine_key))
+                        fut = grib_pool.submit(convert_grib, pool_config, (grib_file, engine_key))
                         futures[fut] = (c, ck, fhr)
 
                     for future in as_completed(futures):
@@ -1871,12 +1996,27 @@ class CrossSectionManager:
             ).start()
 
     def get_loaded_status(self):
-        """Return current memory status."""
-        mem_mb = self.xsect.get_memory_usage() if self.xsect else 0
+        """Return current memory status (heap + resident mmap pages, per cycle)."""
+        breakdown = self.xsect.get_memory_breakdown() if self.xsect else {}
+        key_to_item = {v: k for k, v in self._engine_key_map.items()}
+        cycle_mb = {}
+        heap_mb = mapped_mb = resident_mb = 0.0
+        for engine_key, info in breakdown.items():
+            heap_mb += info['heap_mb']
+            mapped_mb += info['mapped_mb']
+            resident_mb += info['resident_mmap_mb'] or 0.0
+            item = key_to_item.get(engine_key)
+            if item is not None:
+                cycle_mb[item[0]] = cycle_mb.get(item[0], 0.0) + info['total_mb']
         return {
             'loaded': self.loaded_items.copy(),
             'loaded_cycles': list(self.loaded_cycles),
-            'memory_mb': round(mem_mb, 0),
+            'memory_mb': round(heap_mb + resident_mb, 0),
+            'heap_mb': round(heap_mb, 0),
+            'resident_mmap_mb': round(resident_mb, 0),
+            'mapped_mb': round(mapped_mb, 0),
+            'cycle_memory_mb': {ck: round(mb, 0) for ck, mb in cycle_mb.items()},
+            'mem_limit_mb': self.MEM_LIMIT_MB,
             'loading': self._lock.locked(),
         }
 
@@ -1890,10 +2030,7 @@ class CrossSectionManager:
                 if f == fhr:
                     return ck
             # Fall back to newest available cycle on disk
-            for c in self.available_cycles:
-                if fhr in c['available_fhrs']:
-                    return c['cycle_key']
-        return None
+            return self._available[2].get(fhr)
 
     def ensure_loaded(self, cycle_key: str, fhr: int) -> bool:
         """Ensure a forecast hour is loaded (auto-loads from mmap/GRIB). Returns True if ready."""
@@ -1924,7 +2061,7 @@ class CrossSectionManager:
 
     def _load_cycle_inner(self, cycle_key: str) -> dict:
         with self._lock:
-            cycle = next((c for c in self.available_cycles if c['cycle_key'] == cycle_key), None)
+            cycle = self.get_cycle(cycle_key)
             if not cycle:
                 return {'success': False, 'error': f'Cycle {cycle_key} not found'}
 
@@ -2061,9 +2198,13 @@ class CrossSectionManager:
         if not fhr_dir or not fhr_dir.is_dir():
             return
         try:
+            import shutil
+            from core.grib_index import INDEX_DIR
             for f in fhr_dir.iterdir():
-                if f.is_file() and f.suffix == '.grib2':
+                if f.is_file() and f.suffix in ('.grib2', '.msgidx'):  # .msgidx: pre-INDEX_DIR sidecars
                     f.unlink()
+                elif f.is_dir() and f.name == INDEX_DIR:
+                    shutil.rmtree(f, ignore_errors=True)
             # Remove empty FHR dir, then empty parent dirs
             if fhr_dir.exists() and not any(fhr_dir.iterdir()):
                 fhr_dir.rmdir()
@@ -2085,7 +2226,7 @@ class CrossSectionManager:
             if (cycle_key, fhr) in self.loaded_items:
                 return {'success': True, 'already_loaded': True}
 
-            cycle = next((c for c in self.available_cycles if c['cycle_key'] == cycle_key), None)
+            cycle = self.get_cycle(cycle_key)
             if not cycle:
                 return {'success': False, 'error': f'Cycle {cycle_key} not found'}
 
@@ -2166,7 +2307,7 @@ class CrossSectionManager:
             'memory_mb': round(mem_mb, 0),
         }
 
-    def generate_cross_section(self, start, end, cycle_key, fhr, style, y_axis='pressure', vscale=1.0, y_top=100, units='km', terrain_data=None, temp_cmap='standard', anomaly=False, marker=None, marker_label=None, markers=None):
+    def generate_cross_section(self, start, end, cycle_key, fhr, style, y_axis='pressure', vscale=1.0, y_top=100, units='km', terrain_data=None, temp_cmap='standard', anomaly=False, marker=None, marker_label=None, markers=None, renderer='mpl'):
         """Generate a cross-section for a loaded forecast hour."""
         if not self.xsect:
             return None
@@ -2174,7 +2315,7 @@ class CrossSectionManager:
         if (cycle_key, fhr) not in self.loaded_items:
             return None
 
-        cycle = next((c for c in self.available_cycles if c['cycle_key'] == cycle_key), None)
+        cycle = self.get_cycle(cycle_key)
         engine_key = self._engine_key_map.get((cycle_key, fhr))
         if engine_key is None:
             return None
@@ -2203,6 +2344,10 @@ class CrossSectionManager:
                 temp_cmap=temp_cmap,
                 metadata=meta,
                 anomaly=anomaly,
+                renderer=renderer,
+                marker=marker,
+                marker_label=marker_label,
+                markers=markers,
             )
             if png_bytes is None:
                 return None
@@ -2220,7 +2365,7 @@ class CrossSectionManager:
         fhr_data = self.xsect.forecast_hours.get(engine_key) if self.xsect else None
         if fhr_data is None:
             return None
-        cycle = next((c for c in self.available_cycles if c['cycle_key'] == cycle_key), None)
+        cycle = self.get_cycle(cycle_key)
         return {
             'grib_file': fhr_data.grib_file,
             'engine_key': engine_key,
@@ -2267,33 +2412,42 @@ class CrossSectionManager:
             logger.error(f"Cross-section data error: {e}\n{traceback.format_exc()}")
             return None
 
-    def get_terrain_data(self, start, end, cycle_key, fhr, style):
-        """Extract terrain data from a forecast hour for consistent GIF frames."""
-        if not self.xsect:
+    def get_profiles(self, points, fields, cycle_key, fhrs):
+        """Point profiles for many FHRs of one cycle, read directly from grid columns.
+
+        Loads missing FHRs first. Returns the engine's get_profiles() dict with
+        'fhrs' translated from engine keys back to forecast hours, or None.
+        """
+        hours = []
+        for fhr in fhrs:
+            if not self.ensure_loaded(cycle_key, fhr):
+                continue
+            engine_key = self._engine_key_map.get((cycle_key, fhr))
+            if engine_key is not None:
+                hours.append((engine_key, fhr))
+        if not hours or not self.xsect:
             return None
-        engine_key = self._engine_key_map.get((cycle_key, fhr))
-        if engine_key is None:
+        fhr_for_key = dict(hours)
+        try:
+            data = self.xsect.get_profiles(points, fields, [k for k, _ in hours])
+        except Exception as e:
+            import traceback
+            logger.error(f"Profile query error: {e}\n{traceback.format_exc()}")
             return None
-        fhr_data = self.xsect.forecast_hours.get(engine_key)
-        if fhr_data is None:
+        data['fhrs'] = [fhr_for_key[k] for k in data['fhrs']]
+        return data
+
+    def get_terrain_ref(self, start, end, cycle_key, fhr):
+        """Picklable TerrainRef locking frames to one FHR's terrain, for render_frame jobs.
+
+        Workers resolve it from their own mmap-backed engine, so jobs carry a
+        few fields instead of the terrain arrays.
+        """
+        from core.cross_section_interactive import TerrainRef
+        info = self.get_render_info(cycle_key, fhr)
+        if info is None:
             return None
-        import numpy as np
-        # Adaptive n_points: ~1 per 3km, clamped [50, 1000]
-        lat1, lon1 = np.radians(start[0]), np.radians(start[1])
-        lat2, lon2 = np.radians(end[0]), np.radians(end[1])
-        dlat, dlon = lat2 - lat1, lon2 - lon1
-        a = np.sin(dlat/2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon/2)**2
-        dist_km = 6371 * 2 * np.arcsin(np.sqrt(a))
-        n_points = int(np.clip(dist_km / 3.0, 50, 1000))
-        path_lats = np.linspace(start[0], end[0], n_points)
-        path_lons = np.linspace(start[1], end[1], n_points)
-        data = self.xsect._interpolate_to_path(fhr_data, path_lats, path_lons, style)
-        return {
-            'surface_pressure': data.get('surface_pressure'),
-            'surface_pressure_hires': data.get('surface_pressure_hires'),
-            'distances_hires': data.get('distances_hires'),
-            'pressure_levels': fhr_data.pressure_levels,
-        }
+        return TerrainRef(info['grib_file'], info['engine_key'], tuple(start), tuple(end))
 
     def get_panel_data(self, start, end, cycle_key, fhr, style):
         """Get data + metadata for one comparison panel.
@@ -2307,7 +2461,7 @@ class CrossSectionManager:
         engine_key = self._engine_key_map.get((cycle_key, fhr))
         if engine_key is None:
             return None
-        cycle = next((c for c in self.available_cycles if c['cycle_key'] == cycle_key), None)
+        cycle = self.get_cycle(cycle_key)
         try:
             data = self.xsect.get_cross_section(
                 start_point=start, end_point=end,
@@ -2335,7 +2489,7 @@ class CrossSectionManager:
         from datetime import timedelta
         times = []
         for cycle_key, fhr in self.loaded_items:
-            cycle = next((c for c in self.available_cycles if c['cycle_key'] == cycle_key), None)
+            cycle = self.get_cycle(cycle_key)
             if cycle:
                 valid_dt = cycle['init_dt'] + timedelta(hours=fhr)
                 times.append({
@@ -5867,7 +6021,7 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
 
                             for (const fhr of sorted) {
                                 try {
-                                    const fRes = await fetch(`/api/frame?cycle=${currentCycle}&fhr=${fhr}&${baseParams}`);
+                                    const fRes = await fetch(`/api/frame?cycle=${currentCycle}&fhr=${fhr}&${baseParams}` + buildMarkersParam());
                                     if (fRes.ok) {
                                         const blob = await fRes.blob();
                                         prerenderedFrames[fhr] = URL.createObjectURL(blob);
@@ -6067,7 +6221,7 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
             const url = `/api/frame?start_lat=${start.lat}&start_lon=${start.lng}` +
                 `&end_lat=${end.lat}&end_lon=${end.lng}&cycle=${compareCycle}&fhr=${cFhr}&style=${style}` +
                 `&y_axis=${currentYAxis}&vscale=${vscale}&y_top=${ytop}&units=${units}&temp_cmap=${tempCmap}` +
-                `&anomaly=${anomalyMode ? 1 : 0}&model=${currentModel}`;
+                `&anomaly=${anomalyMode ? 1 : 0}&model=${currentModel}` + buildMarkersParam();
 
             try {
                 const res = await fetch(url);
@@ -6535,8 +6689,21 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
                 `&anomaly=${anomalyMode ? 1 : 0}${modelParam()}${poiParams}`;
 
             try {
-                const res = await fetch(url, { signal: xsectAbortController.signal });
-                if (!res.ok) throw new Error('Failed to generate');
+                const signal = xsectAbortController.signal;
+                let res = await fetch(url, { signal });
+                if (res.status === 202) {
+                    // Smoke is being fetched in the background: await the job, then retry
+                    const job = await res.json();
+                    container.innerHTML = '<div class="loading-text">Fetching smoke data...</div>';
+                    while (true) {
+                        const jobRes = await fetch(`${job.status_url}?wait=30`, { signal });
+                        const state = await jobRes.json();
+                        if (state.status === 'done') break;
+                        if (!jobRes.ok || state.status === 'failed') throw new Error(state.error || 'Smoke data unavailable');
+                    }
+                    res = await fetch(url, { signal });
+                }
+                if (!res.ok || res.status === 202) throw new Error('Failed to generate');
                 const blob = await res.blob();
                 const oldImg = document.getElementById('xsect-img');
                 if (oldImg && oldImg.src && oldImg.src.startsWith('blob:')) URL.revokeObjectURL(oldImg.src);
@@ -6774,7 +6941,7 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
                     modelIds.map(async m => {
                         const r = await fetch(`/api/status?model=${m}`);
                         const d = await r.json();
-                        return { model: m, loaded: d.loaded || [], memory_mb: d.memory_mb || 0 };
+                        return { model: m, loaded: d.loaded || [], memory_mb: d.memory_mb || 0, cycle_mb: d.cycle_memory_mb || {} };
                     })
                 );
 
@@ -6785,7 +6952,7 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
                     ramModalBody.innerHTML = '<p style="color:var(--muted);text-align:center;padding:20px;">Nothing loaded in RAM</p>';
                 } else {
                     let html = '';
-                    for (const { model, loaded, memory_mb } of allResults) {
+                    for (const { model, loaded, memory_mb, cycle_mb } of allResults) {
                         if (loaded.length === 0) continue;
 
                         // Group by cycle
@@ -6803,7 +6970,7 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
 
                         Object.keys(groups).sort().reverse().forEach(cycle => {
                             const fhrs = groups[cycle].sort((a,b) => a - b);
-                            const cycleMb = fhrs.length * perFhr;
+                            const cycleMb = cycle in cycle_mb ? cycle_mb[cycle] : fhrs.length * perFhr;
                             const fhrStr = fhrs.map(f => 'F' + String(f).padStart(2,'0')).join(', ');
                             html += `<tr>
                                 <td class="cycle-group">${cycle}</td>
@@ -7990,7 +8157,8 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
                         const frameRes = await fetch(`/api/frame?cycle=${cycleKey}&fhr=${fhr}&style=${product}` +
                             `&y_axis=${currentYAxis}&vscale=${vscale}&y_top=${ytop}&units=${units}` +
                             `&temp_cmap=${tempCmap}&anomaly=${anomaly ? 1 : 0}&model=hrrr` +
-                            `&start_lat=${start.lat}&start_lon=${start.lng}&end_lat=${end.lat}&end_lon=${end.lng}`);
+                            `&start_lat=${start.lat}&start_lon=${start.lng}&end_lat=${end.lat}&end_lon=${end.lng}` +
+                            buildMarkersParam());
                         if (frameRes.ok) {
                             const blob = await frameRes.blob();
                             prerenderedFrames[fhr] = URL.createObjectURL(blob);
@@ -8396,28 +8564,31 @@ def api_xsect():
     anomaly_param = request.args.get('anomaly', '0') == '1'
     markers, marker, marker_label = _parse_markers(request.args)
 
-    # Lazy wrfnat download for smoke style — trigger background download if needed
+    # Lazy smoke for HRRR — start (or join) the background smoke job if needed
     mgr = get_manager_from_request() or data_manager
-    if style == 'smoke' and mgr.model_name == 'hrrr':
-        downloading = _trigger_lazy_wrfnat_download('hrrr', cycle_key, fhr)
-        if downloading:
+    if style == 'smoke':
+        job = _start_smoke_job(mgr, cycle_key, fhr)
+        if job is not None:
             return jsonify({
-                'error': 'Smoke data (wrfnat) is downloading in the background. This is a ~663MB file and may take 1-2 minutes. Please try again shortly.',
+                'error': 'Smoke data is being fetched in the background. Await the job, then retry.',
                 'smoke_downloading': True,
+                **_job_public(job),
             }), 202
 
-    acquired = RENDER_SEMAPHORE.acquire(timeout=10)
-    if not acquired:
-        return jsonify({'error': 'Server busy, try again in a moment'}), 503
+    key = frame_key_with_markers(
+        frame_cache_key(mgr.model_name, cycle_key, fhr, style, start, end, y_axis, vscale, y_top, dist_units, temp_cmap_param, anomaly_param),
+        markers, marker, marker_label)
     try:
-        buf = mgr.generate_cross_section(start, end, cycle_key, fhr, style, y_axis, vscale, y_top, units=dist_units, temp_cmap=temp_cmap_param, anomaly=anomaly_param, marker=marker, marker_label=marker_label, markers=markers)
-    finally:
-        RENDER_SEMAPHORE.release()
-    if buf is None:
+        png = render_frame_coalesced(key, lambda: mgr.generate_cross_section(
+            start, end, cycle_key, fhr, style, y_axis, vscale, y_top, units=dist_units, temp_cmap=temp_cmap_param,
+            anomaly=anomaly_param, marker=marker, marker_label=marker_label, markers=markers))
+    except RenderBusy:
+        return jsonify({'error': 'Server busy, try again in a moment'}), 503
+    if png is None:
         return jsonify({'error': 'Failed to generate cross-section. Data may not be loaded.'}), 500
 
     touch_cycle_access(cycle_key)
-    return send_file(buf, mimetype='image/png')
+    return send_file(io.BytesIO(png), mimetype='image/png')
 
 @app.route('/api/xsect_gif')
 @rate_limit
@@ -8448,6 +8619,7 @@ def api_xsect_gif():
     if gif_temp_cmap not in ('standard', 'green_purple', 'white_zero', 'nws_ndfd'):
         gif_temp_cmap = 'standard'
     gif_anomaly = request.args.get('anomaly', '0') == '1'
+    gif_renderer = _parse_renderer(request.args, style, y_axis)
     fhr_min = request.args.get('fhr_min')
     fhr_max = request.args.get('fhr_max')
 
@@ -8477,7 +8649,7 @@ def api_xsect_gif():
     cached_frames = []
     uncached_fhrs = []
     for fhr in loaded_fhrs:
-        ck = frame_cache_key(model_name, cycle_key, fhr, style, start, end, y_axis, vscale, y_top, dist_units, gif_temp_cmap, gif_anomaly)
+        ck = frame_cache_key(model_name, cycle_key, fhr, style, start, end, y_axis, vscale, y_top, dist_units, gif_temp_cmap, gif_anomaly, gif_renderer)
         png = frame_cache_get(ck)
         if png:
             cached_frames.append((fhr, png))
@@ -8491,51 +8663,60 @@ def api_xsect_gif():
             frames.append(imageio.imread(io.BytesIO(png)))
     else:
         # Lock terrain to first FHR so elevation doesn't jitter between frames
-        terrain_data = mgr.get_terrain_data(start, end, cycle_key, loaded_fhrs[0], style)
+        terrain_data = mgr.get_terrain_ref(start, end, cycle_key, loaded_fhrs[0])
 
-        # Render uncached frames in parallel via persistent process pool
-        pool_config = mgr.get_render_pool_config()
-        project_dir = str(Path(__file__).resolve().parent.parent)
-        from tools.render_worker import render_frame
         rendered_pngs = {}  # fhr -> png bytes
 
-        try:
-            pool = _get_render_pool(pool_config, project_dir)
-            futures = {}
+        if gif_renderer == 'fast':
+            # Raster frames take tens of ms: render inline, no pool or semaphore
             for fhr in uncached_fhrs:
-                info = mgr.get_render_info(cycle_key, fhr)
-                if info is None:
-                    continue
-                cache_k = frame_cache_key(model_name, cycle_key, fhr, style, start, end, y_axis, vscale, y_top, dist_units, gif_temp_cmap, gif_anomaly)
-                worker_args = (
-                    info['grib_file'], info['engine_key'], start, end, style,
-                    y_axis, vscale, y_top, dist_units, gif_temp_cmap, gif_anomaly,
-                    None, None, None, info['metadata'], terrain_data,
-                )
-                futures[pool.submit(render_frame, worker_args)] = (fhr, cache_k)
+                buf = mgr.generate_cross_section(start, end, cycle_key, fhr, style, y_axis, vscale, y_top, units=dist_units, terrain_data=terrain_data, temp_cmap=gif_temp_cmap, anomaly=gif_anomaly, renderer='fast')
+                if buf is not None:
+                    rendered_pngs[fhr] = buf.getvalue()
+                    frame_cache_put(frame_cache_key(model_name, cycle_key, fhr, style, start, end, y_axis, vscale, y_top, dist_units, gif_temp_cmap, gif_anomaly, 'fast'), rendered_pngs[fhr])
+        else:
+            # Render uncached frames in parallel via persistent process pool
+            pool_config = mgr.get_render_pool_config()
+            project_dir = str(Path(__file__).resolve().parent.parent)
+            from tools.render_worker import render_frame
 
-            for future in as_completed(futures):
-                fhr, cache_k = futures[future]
-                try:
-                    engine_key, png_bytes = future.result(timeout=60)
-                    if png_bytes:
-                        rendered_pngs[fhr] = png_bytes
-                        frame_cache_put(cache_k, png_bytes)
-                except Exception:
-                    pass
-        except Exception as e:
-            logger.error(f"GIF render pool error: {e}, falling back to sequential")
-            # Fallback: sequential rendering in main process
-            acquired = RENDER_SEMAPHORE.acquire(timeout=90)
-            if not acquired:
-                return jsonify({'error': 'Server busy, try again in a moment'}), 503
             try:
+                pool = _get_render_pool(project_dir)
+                futures = {}
                 for fhr in uncached_fhrs:
-                    buf = mgr.generate_cross_section(start, end, cycle_key, fhr, style, y_axis, vscale, y_top, units=dist_units, terrain_data=terrain_data, temp_cmap=gif_temp_cmap, anomaly=gif_anomaly)
-                    if buf is not None:
-                        rendered_pngs[fhr] = buf.getvalue()
-            finally:
-                RENDER_SEMAPHORE.release()
+                    info = mgr.get_render_info(cycle_key, fhr)
+                    if info is None:
+                        continue
+                    cache_k = frame_cache_key(model_name, cycle_key, fhr, style, start, end, y_axis, vscale, y_top, dist_units, gif_temp_cmap, gif_anomaly)
+                    worker_args = (
+                        info['grib_file'], info['engine_key'], start, end, style,
+                        y_axis, vscale, y_top, dist_units, gif_temp_cmap, gif_anomaly,
+                        None, None, None, info['metadata'], terrain_data,
+                    )
+                    lane = pool.lane(pool_config['model_name'], info['engine_key'])
+                    futures[RENDER_SCHEDULER.submit(lane, COMPARISON, render_frame, pool_config, worker_args,
+                                                    client=request.remote_addr)] = (fhr, cache_k)
+
+                for future in as_completed(futures):
+                    fhr, cache_k = futures[future]
+                    try:
+                        engine_key, png_bytes = future.result(timeout=60)
+                        if png_bytes:
+                            rendered_pngs[fhr] = png_bytes
+                            frame_cache_put(cache_k, png_bytes)
+                    except Exception:
+                        pass
+            except Exception as e:
+                logger.error(f"GIF render pool error: {e}, falling back to sequential")
+                # Fallback: sequential rendering in main process
+                try:
+                    with RENDER_SCHEDULER.slot(COMPARISON, client=request.remote_addr, timeout=90):
+                        for fhr in uncached_fhrs:
+                            buf = mgr.generate_cross_section(start, end, cycle_key, fhr, style, y_axis, vscale, y_top, units=dist_units, terrain_data=terrain_data, temp_cmap=gif_temp_cmap, anomaly=gif_anomaly)
+                            if buf is not None:
+                                rendered_pngs[fhr] = buf.getvalue()
+                except RenderBusy:
+                    return jsonify({'error': 'Server busy, try again in a moment'}), 503
 
         # Assemble all frames (cached + freshly rendered) sorted by FHR
         all_pngs = {fhr: png for fhr, png in cached_frames}
@@ -8707,7 +8888,7 @@ def api_v1_comparison():
 
                 # Check if this model has the exact requested cycle
                 with mgr._lock:
-                    has_exact = any(c['cycle_key'] == primary_cycle for c in mgr.available_cycles)
+                    has_exact = mgr.get_cycle(primary_cycle) is not None
                 if has_exact:
                     m_cycle = primary_cycle
                     m_fhr = fhr
@@ -8823,8 +9004,8 @@ def api_v1_comparison():
                 if cycle_match == 'valid_time' and i > 0:
                     # Match valid time: compute equivalent FHR
                     try:
-                        base_cycle = next(c for c in mgr.available_cycles if c['cycle_key'] == cycle_list[0])
-                        this_cycle = next(c for c in mgr.available_cycles if c['cycle_key'] == ck)
+                        base_cycle = mgr.get_cycle(cycle_list[0])
+                        this_cycle = mgr.get_cycle(ck)
                         base_init = base_cycle['init_dt']
                         this_init = this_cycle['init_dt']
                         hour_diff = int((base_init - this_init).total_seconds() / 3600)
@@ -8839,7 +9020,7 @@ def api_v1_comparison():
                     return jsonify({'error': f'Failed to get data for {ck}'}), 500
                 # Label: show cycle init time
                 try:
-                    cycle_info = next(c for c in mgr.available_cycles if c['cycle_key'] == ck)
+                    cycle_info = mgr.get_cycle(ck)
                     pd['label'] = f'{cycle_info["init_dt"].strftime("%HZ %b %d")} Init'
                 except:
                     pd['label'] = ck
@@ -8871,16 +9052,14 @@ def api_v1_comparison():
     if engine is None:
         return jsonify({'error': 'Render engine not initialized'}), 500
 
-    acquired = RENDER_SEMAPHORE.acquire(timeout=90)
-    if not acquired:
-        return jsonify({'error': 'Server busy rendering, try again'}), 503
     try:
-        png_bytes = engine.render_multi_panel(
-            panels, layout=layout, shared_colorbar=shared_colorbar,
-            dpi=100, y_axis=y_axis, y_top=y_top, units=units,
-            temp_cmap=temp_cmap, marker=marker, marker_label=marker_label, markers=markers)
-    finally:
-        RENDER_SEMAPHORE.release()
+        with RENDER_SCHEDULER.slot(COMPARISON, client=request.remote_addr, timeout=90):
+            png_bytes = engine.render_multi_panel(
+                panels, layout=layout, shared_colorbar=shared_colorbar,
+                dpi=100, y_axis=y_axis, y_top=y_top, units=units,
+                temp_cmap=temp_cmap, marker=marker, marker_label=marker_label, markers=markers)
+    except RenderBusy:
+        return jsonify({'error': 'Server busy rendering, try again'}), 503
 
     if png_bytes is None:
         return jsonify({'error': 'Render failed'}), 500
@@ -8985,13 +9164,15 @@ def api_v1_comparison_gif():
 
         rendered = {}  # fhr -> png bytes
         try:
-            pool = _get_render_pool(pool_config, project_dir)
+            pool = _get_render_pool(project_dir)
             futures = {}
             for fhr, (panels, layout, shared_cb) in per_fhr_panels.items():
                 render_kwargs = dict(layout=layout, shared_colorbar=shared_cb,
                                      dpi=100, y_axis=y_axis, y_top=y_top,
                                      units=units, temp_cmap=temp_cmap)
-                fut = pool.submit(render_mp, (panels, render_kwargs))
+                # Panels carry their own data: no hour to keep warm, so any idle lane
+                fut = RENDER_SCHEDULER.submit(pool.any_lane(), COMPARISON, render_mp, pool_config, (panels, render_kwargs),
+                                              client=request.remote_addr)
                 futures[fut] = fhr
 
             for future in as_completed(futures):
@@ -9005,23 +9186,21 @@ def api_v1_comparison_gif():
         except Exception as e:
             logger.error(f"Comparison GIF pool error: {e}, falling back to sequential")
             # Fallback: sequential rendering in main process
-            acquired = RENDER_SEMAPHORE.acquire(timeout=90)
-            if not acquired:
-                return jsonify({'error': 'Server busy'}), 503
             try:
-                for fhr, (panels, layout, shared_cb) in per_fhr_panels.items():
-                    try:
-                        eng = model_registry.get(panels[0]['metadata']['model'].lower()).xsect
-                    except Exception:
-                        eng = data_manager.xsect
-                    png = eng.render_multi_panel(
-                        panels, layout=layout, shared_colorbar=shared_cb,
-                        dpi=100, y_axis=y_axis, y_top=y_top,
-                        units=units, temp_cmap=temp_cmap)
-                    if png:
-                        rendered[fhr] = png
-            finally:
-                RENDER_SEMAPHORE.release()
+                with RENDER_SCHEDULER.slot(COMPARISON, client=request.remote_addr, timeout=90):
+                    for fhr, (panels, layout, shared_cb) in per_fhr_panels.items():
+                        try:
+                            eng = model_registry.get(panels[0]['metadata']['model'].lower()).xsect
+                        except Exception:
+                            eng = data_manager.xsect
+                        png = eng.render_multi_panel(
+                            panels, layout=layout, shared_colorbar=shared_cb,
+                            dpi=100, y_axis=y_axis, y_top=y_top,
+                            units=units, temp_cmap=temp_cmap)
+                        if png:
+                            rendered[fhr] = png
+            except RenderBusy:
+                return jsonify({'error': 'Server busy'}), 503
 
         # Assemble frames sorted by FHR
         for fhr in available_fhrs:
@@ -9057,7 +9236,7 @@ def api_prerender():
     """Batch prerender frames for slider/comparison. Returns session_id for progress polling.
 
     POST JSON: {frames: [{cycle, fhr}, ...], start: [lat, lon], end: [lat, lon],
-                style, y_axis, vscale, y_top, units, temp_cmap, anomaly, model}
+                style, y_axis, vscale, y_top, units, temp_cmap, anomaly, model, renderer}
     """
     data = request.get_json()
     if not data:
@@ -9079,6 +9258,8 @@ def api_prerender():
     anomaly = bool(data.get('anomaly', False))
     model = data.get('model', 'hrrr')
     markers, marker, marker_label = _parse_markers(data)
+    renderer = _parse_renderer(data, style, y_axis, bool(markers or marker))
+    client = request.remote_addr
 
     session_id = f"prerender:{int(time.time() * 1000)}"
 
@@ -9095,7 +9276,7 @@ def api_prerender():
         # Lock terrain to first frame for consistency
         first = frames[0]
         try:
-            terrain_data = mgr.get_terrain_data(start, end, first['cycle'], first['fhr'], style)
+            terrain_data = mgr.get_terrain_ref(start, end, first['cycle'], first['fhr'])
         except Exception:
             terrain_data = None
 
@@ -9105,7 +9286,9 @@ def api_prerender():
         for frame in frames:
             ck = frame['cycle']
             fhr = int(frame['fhr'])
-            cache_key = frame_cache_key(model, ck, fhr, style, start, end, y_axis, vscale, y_top, units, temp_cmap, anomaly)
+            cache_key = frame_key_with_markers(
+                frame_cache_key(model, ck, fhr, style, start, end, y_axis, vscale, y_top, units, temp_cmap, anomaly, renderer),
+                markers, marker, marker_label)
 
             if frame_cache_get(cache_key) is not None:
                 rendered[0] += 1
@@ -9123,6 +9306,32 @@ def api_prerender():
             progress_done(session_id)
             return
 
+        if renderer == 'fast':
+            # Raster frames render inline in this thread; no pool round-trip
+            for ck, fhr, cache_key in render_frames:
+                if is_cancelled(session_id):
+                    logger.info(f"Pre-render CANCELLED at {rendered[0]}/{total}")
+                    PROGRESS[session_id]['detail'] = 'Cancelled'
+                    break
+                try:
+                    buf = mgr.generate_cross_section(
+                        start, end, ck, fhr, style, y_axis, vscale, y_top,
+                        units=units, terrain_data=terrain_data,
+                        temp_cmap=temp_cmap, anomaly=anomaly, renderer='fast',
+                        marker=marker, marker_label=marker_label, markers=markers
+                    )
+                except Exception:
+                    buf = None
+                rendered[0] += 1
+                if buf:
+                    frame_cache_put(cache_key, buf.getvalue())
+                    progress_update(session_id, rendered[0], total, f"F{fhr:02d} rendered")
+                else:
+                    progress_update(session_id, rendered[0], total, f"F{fhr:02d} failed")
+            progress_done(session_id)
+            CANCEL_FLAGS.pop(session_id, None)
+            return
+
         # Build args for multiprocess rendering — each worker gets everything it needs
         pool_config = mgr.get_render_pool_config()
         project_dir = str(Path(__file__).resolve().parent.parent)
@@ -9139,17 +9348,22 @@ def api_prerender():
                 info['grib_file'], info['engine_key'], start, end, style,
                 y_axis, vscale, y_top, units, temp_cmap, anomaly,
                 marker, marker_label, markers, info['metadata'], terrain_data,
+                cache_key,
             ))
 
         if not worker_args:
             progress_done(session_id)
             return
 
-        # Multiprocess render — persistent pool, each worker has its own GIL
+        # Multiprocess render — persistent pool, each worker has its own GIL.
+        # Jobs queue in the scheduler at prerender priority, so live requests
+        # keep their slots; cancelling the session drops still-queued jobs.
         from tools.render_worker import render_frame
         try:
-            pool = _get_render_pool(pool_config, project_dir)
-            futures = {pool.submit(render_frame, args): args for args in worker_args}
+            pool = _get_render_pool(project_dir)
+            futures = {RENDER_SCHEDULER.submit(pool.lane(pool_config['model_name'], args[1]), PRERENDER,
+                                               render_frame, pool_config, args, client=client): args
+                       for args in worker_args}
             for future in as_completed(futures):
                 try:
                     engine_key, png_bytes = future.result(timeout=60)
@@ -9182,12 +9396,13 @@ def api_prerender():
                 if is_cancelled(session_id):
                     break
                 try:
-                    buf = mgr.generate_cross_section(
-                        start, end, ck, fhr, style, y_axis, vscale, y_top,
-                        units=units, terrain_data=terrain_data,
-                        temp_cmap=temp_cmap, anomaly=anomaly,
-                        marker=marker, marker_label=marker_label, markers=markers
-                    )
+                    with RENDER_SCHEDULER.slot(PRERENDER, client=client, timeout=None):
+                        buf = mgr.generate_cross_section(
+                            start, end, ck, fhr, style, y_axis, vscale, y_top,
+                            units=units, terrain_data=terrain_data,
+                            temp_cmap=temp_cmap, anomaly=anomaly,
+                            marker=marker, marker_label=marker_label, markers=markers
+                        )
                     if buf:
                         frame_cache_put(cache_key, buf.getvalue())
                 except Exception:
@@ -9230,8 +9445,13 @@ def api_frame():
     if not cycle_key:
         return jsonify({'error': 'Missing cycle parameter'}), 400
 
-    # Check cache first
-    cache_key = frame_cache_key(model, cycle_key, fhr, style, start, end, y_axis, vscale, y_top, dist_units, temp_cmap, anomaly)
+    markers, marker, marker_label = _parse_markers(request.args)
+    renderer = _parse_renderer(request.args, style, y_axis, bool(markers or marker))
+
+    # Check cache first (prerender keys frames by their POI markers too)
+    cache_key = frame_key_with_markers(
+        frame_cache_key(model, cycle_key, fhr, style, start, end, y_axis, vscale, y_top, dist_units, temp_cmap, anomaly, renderer),
+        markers, marker, marker_label)
     cached = frame_cache_get(cache_key)
     if cached:
         return send_file(io.BytesIO(cached), mimetype='image/png')
@@ -9247,21 +9467,19 @@ def api_frame():
     if temp_cmap not in ('standard', 'green_purple', 'white_zero', 'nws_ndfd'):
         temp_cmap = 'standard'
 
-    acquired = RENDER_SEMAPHORE.acquire(timeout=10)
-    if not acquired:
-        return jsonify({'error': 'Server busy, try again in a moment'}), 503
     mgr = model_registry.get(model) or data_manager
+    # Raster frames are cheap enough to skip the matplotlib render semaphore;
+    # the coalesced render caches its result for future requests
     try:
-        buf = mgr.generate_cross_section(start, end, cycle_key, fhr, style, y_axis, vscale, y_top, units=dist_units, temp_cmap=temp_cmap, anomaly=anomaly)
-    finally:
-        RENDER_SEMAPHORE.release()
-    if buf is None:
+        png = render_frame_coalesced(cache_key, lambda: mgr.generate_cross_section(
+            start, end, cycle_key, fhr, style, y_axis, vscale, y_top, units=dist_units, temp_cmap=temp_cmap,
+            anomaly=anomaly, renderer=renderer, marker=marker, marker_label=marker_label, markers=markers),
+            scheduled=renderer != 'fast')
+    except RenderBusy:
+        return jsonify({'error': 'Server busy, try again in a moment'}), 503
+    if png is None:
         return jsonify({'error': 'Failed to generate frame. Data may not be loaded.'}), 500
-
-    # Cache the result for future requests
-    frame_cache_put(cache_key, buf.getvalue())
-    buf.seek(0)
-    return send_file(buf, mimetype='image/png')
+    return send_file(io.BytesIO(png), mimetype='image/png')
 
 
 # =============================================================================
@@ -9327,21 +9545,30 @@ def api_v1_cross_section():
     if not mgr.ensure_loaded(cycle_key, fhr):
         return jsonify({'error': f'Failed to load {cycle_key} F{fhr:02d}'}), 500
 
+    if style == 'smoke':
+        job = _start_smoke_job(mgr, cycle_key, fhr)
+        if job is not None:
+            return jsonify({
+                'error': 'Smoke data is being fetched in the background. Await the job, then retry.',
+                **_job_public(job),
+            }), 202
+
     markers, marker, marker_label = _parse_markers(request.args)
-    acquired = RENDER_SEMAPHORE.acquire(timeout=90)
-    if not acquired:
-        return jsonify({'error': 'Server busy rendering other requests, try again in a moment'}), 503
+    key = frame_key_with_markers(
+        frame_cache_key(mgr.model_name, cycle_key, fhr, style, start, end, y_axis, 1.0, y_top, units, 'standard', False),
+        markers, marker, marker_label)
     try:
-        buf = mgr.generate_cross_section(
-            start, end, cycle_key, fhr, style, y_axis, 1.0, y_top, units=units, marker=marker, marker_label=marker_label, markers=markers)
-    finally:
-        RENDER_SEMAPHORE.release()
+        png = render_frame_coalesced(key, lambda: mgr.generate_cross_section(
+            start, end, cycle_key, fhr, style, y_axis, 1.0, y_top, units=units, marker=marker, marker_label=marker_label, markers=markers),
+            timeout=90)
+    except RenderBusy:
+        return jsonify({'error': 'Server busy rendering other requests, try again in a moment'}), 503
 
-    if buf is None:
+    if png is None:
         return jsonify({'error': 'Render failed'}), 500
 
     touch_cycle_access(cycle_key)
-    return send_file(buf, mimetype='image/png')
+    return send_file(io.BytesIO(png), mimetype='image/png')
 
 
 @app.route('/api/v1/products')
@@ -9374,10 +9601,30 @@ def api_v1_cycles():
     return jsonify({'cycles': cycles_out, 'latest': latest, 'model': mgr.model_name})
 
 
+@app.route('/api/v1/jobs/<job_id>')
+@rate_limit
+def api_v1_job(job_id):
+    """Status of a background job (lazy smoke fetch). ?wait=N blocks up to N s (max 60) for it to finish."""
+    with _smoke_jobs_lock:
+        job = SMOKE_JOBS.get(job_id)
+    if job is None:
+        return jsonify({'error': f'Unknown job: {job_id}'}), 404
+    try:
+        wait = max(0.0, min(60.0, float(request.args.get('wait', 0))))
+    except ValueError:
+        wait = 0.0
+    if wait:
+        job['_event'].wait(wait)
+    with _smoke_jobs_lock:
+        return jsonify(_job_public(job))
+
+
 @app.route('/api/v1/status')
 @rate_limit
 def api_v1_status():
     """Server health and status."""
+    from core import grid_registry
+    from core.path_cache import get_cache as get_path_cache
     mgr = get_manager_from_request() or data_manager
     mem_mb = mgr.xsect.get_memory_usage() if mgr.xsect else 0
     latest = mgr.available_cycles[0]['cycle_key'] if mgr.available_cycles else None
@@ -9387,6 +9634,18 @@ def api_v1_status():
         'loaded_count': len(mgr.loaded_items),
         'memory_mb': round(mem_mb, 0),
         'latest_cycle': latest,
+        'frame_cache': FRAME_CACHE.stats(),
+        'overlay_cache': OVERLAY_CACHE.stats(),
+        'render_coalescing': {'frames': RENDER_FLIGHTS.stats(), 'overlays': OVERLAY_FLIGHTS.stats()},
+        'render_scheduler': RENDER_SCHEDULER.stats(),
+        'worker_pools': {
+            'render': _RENDER_POOL.stats() if _RENDER_POOL else None,
+            'grib': {'workers': GRIB_POOL_WORKERS} if _GRIB_POOL else None,
+        },
+        'path_cache': get_path_cache().stats(),
+        'grids': grid_registry.stats(),
+        'ingest_events': INGEST_TAIL.stats() if INGEST_TAIL is not None else None,
+        'cycle_catalog': _CYCLE_CATALOG.stats() if _CYCLE_CATALOG is not None else None,
     })
 
 
@@ -9400,8 +9659,7 @@ def _numpy_to_list(obj):
     if isinstance(obj, np.ndarray):
         # Replace NaN with None for JSON serialization
         if obj.dtype.kind == 'f':  # float arrays
-            return [[None if np.isnan(v) else round(float(v), 4) for v in row]
-                    for row in obj] if obj.ndim == 2 else [None if np.isnan(v) else round(float(v), 4) for v in obj]
+            return _compact_list(obj, 4)
         return obj.tolist()
     if isinstance(obj, (np.float32, np.float64, np.float16)):
         return round(float(obj), 4)
@@ -9435,16 +9693,11 @@ _DATA_FIELD_MAP = {
 }
 
 
-@app.route('/api/v1/data')
-@rate_limit
-def api_v1_data():
-    """Return numerical cross-section data as JSON arrays.
+def _run_data_query():
+    """Shared request handling for /api/v1/data and /api/v1/data/binary.
 
-    Same coordinate params as /api/v1/cross-section but returns raw interpolated
-    values instead of a PNG image. This is the research powerhouse endpoint.
+    Returns (mgr, cycle_key, fhr, product, style, data) or a Flask error response.
     """
-    import numpy as np
-
     # Parse coordinates (same as cross-section endpoint)
     try:
         for p in ('start_lat', 'start_lon', 'end_lat', 'end_lon'):
@@ -9456,7 +9709,7 @@ def api_v1_data():
         return jsonify({
             'error': f'Missing required parameter: {e.args[0]}',
             'usage': 'Required: start_lat, start_lon, end_lat, end_lon',
-            'example': '/api/v1/data?start_lat=39.74&start_lon=-104.99&end_lat=41.88&end_lon=-87.63&product=temperature',
+            'example': f'{request.path}?start_lat=39.74&start_lon=-104.99&end_lat=41.88&end_lon=-87.63&product=temperature',
         }), 400
     except ValueError:
         return jsonify({'error': 'Coordinates must be numeric'}), 400
@@ -9467,18 +9720,6 @@ def api_v1_data():
         fhr = int(request.args.get('fhr', 0))
     except ValueError:
         fhr = 0
-    y_axis = request.args.get('y_axis', 'pressure')
-    if y_axis not in ('pressure', 'height', 'isentropic'):
-        y_axis = 'pressure'
-    try:
-        y_top = int(request.args.get('y_top', 100))
-    except ValueError:
-        y_top = 100
-    if y_top not in (100, 200, 300, 500, 700):
-        y_top = 100
-    units = request.args.get('units', 'km')
-    if units not in ('km', 'mi'):
-        units = 'km'
 
     # Map product name to internal style
     style = PRODUCT_TO_STYLE.get(product)
@@ -9501,52 +9742,391 @@ def api_v1_data():
     if data is None:
         return jsonify({'error': 'Failed to generate data. Data may not be loaded.'}), 500
 
+    touch_cycle_access(cycle_key)
+    return mgr, cycle_key, fhr, product, style, data
+
+
+def _data_fields(style, data):
+    """(output_key, array, units) for the style's fields, winds and surface pressure."""
+    fields = []
+    for out_key, data_key, field_units in _DATA_FIELD_MAP.get(style, []):
+        if data_key in data:
+            fields.append((out_key, data[data_key], field_units))
+    # Always include wind components if available (useful for all styles)
+    if 'u_wind' in data and style != 'wind_speed':
+        fields.append(('u_wind_ms', data['u_wind'], 'm/s'))
+        fields.append(('v_wind_ms', data['v_wind'], 'm/s'))
+    # Always include surface pressure for terrain context
+    if 'surface_pressure' in data:
+        fields.append(('surface_pressure_hpa', data['surface_pressure'], 'hPa'))
+    return fields
+
+
+def _data_metadata(mgr, cycle_key, fhr, product, style, data, fields_included):
+    from datetime import timedelta
+    cycle = mgr.get_cycle(cycle_key)
+    if not cycle:
+        return None
+    init_dt = cycle.get('init_dt')
+    valid_dt = init_dt + timedelta(hours=fhr) if init_dt else None
+    return {
+        'model': mgr.model_name,
+        'cycle': cycle_key,
+        'fhr': fhr,
+        'valid_time': valid_dt.strftime('%Y-%m-%dT%H:%MZ') if valid_dt else None,
+        'product': product,
+        'style': style,
+        'distance_km': round(float(data['distances'][-1]), 1) if 'distances' in data else None,
+        'n_points': len(data.get('lats', [])),
+        'n_levels': len(data.get('pressure_levels', [])),
+        'fields': fields_included,
+    }
+
+
+@app.route('/api/v1/data')
+@rate_limit
+def api_v1_data():
+    """Return numerical cross-section data as JSON arrays.
+
+    Same coordinate params as /api/v1/cross-section but returns raw interpolated
+    values instead of a PNG image. This is the research powerhouse endpoint.
+    /api/v1/data/binary returns the same fields as compact quantized planes.
+    """
+    result = _run_data_query()
+    if not isinstance(result[0], CrossSectionManager):
+        return result
+    mgr, cycle_key, fhr, product, style, data = result
+
     # Build JSON response
-    result = {
+    out = {
         'distances_km': _numpy_to_list(data.get('distances')),
         'pressure_levels_hpa': _numpy_to_list(data.get('pressure_levels')),
         'lats': _numpy_to_list(data.get('lats')),
         'lons': _numpy_to_list(data.get('lons')),
     }
 
-    # Add style-specific data fields
-    field_map = _DATA_FIELD_MAP.get(style, [])
+    # Style-specific data fields plus winds/surface pressure; 'fields' lists the style's own
+    style_keys = {out_key for out_key, _, _ in _DATA_FIELD_MAP.get(style, [])}
     fields_included = []
-    for out_key, data_key, field_units in field_map:
-        if data_key in data:
-            result[out_key] = _numpy_to_list(data[data_key])
+    for out_key, arr, field_units in _data_fields(style, data):
+        out[out_key] = _numpy_to_list(arr)
+        if out_key in style_keys:
             fields_included.append({'key': out_key, 'units': field_units})
 
-    # Always include wind components if available (useful for all styles)
-    if 'u_wind' in data and style != 'wind_speed':
-        result['u_wind_ms'] = _numpy_to_list(data['u_wind'])
-        result['v_wind_ms'] = _numpy_to_list(data['v_wind'])
+    metadata = _data_metadata(mgr, cycle_key, fhr, product, style, data, fields_included)
+    if metadata:
+        out['metadata'] = metadata
+    return jsonify(out)
 
-    # Always include surface pressure for terrain context
-    if 'surface_pressure' in data:
-        result['surface_pressure_hpa'] = _numpy_to_list(data['surface_pressure'])
 
-    # Metadata
-    cycle = next((c for c in mgr.available_cycles if c['cycle_key'] == cycle_key), None)
-    from datetime import timedelta
-    if cycle:
-        init_dt = cycle.get('init_dt')
-        valid_dt = init_dt + timedelta(hours=fhr) if init_dt else None
-        result['metadata'] = {
-            'model': mgr.model_name,
-            'cycle': cycle_key,
-            'fhr': fhr,
-            'valid_time': valid_dt.strftime('%Y-%m-%dT%H:%MZ') if valid_dt else None,
-            'product': product,
-            'style': style,
-            'distance_km': round(float(data['distances'][-1]), 1) if 'distances' in data else None,
-            'n_points': len(data.get('lats', [])),
-            'n_levels': len(data.get('pressure_levels', [])),
-            'fields': fields_included,
-        }
+DATA_NAN_U16 = 65535  # uint16 NaN sentinel (same as /api/v1/map-overlay/grid-sample)
+
+
+def _encode_plane(arr, dtype):
+    """One field as (bytes, header entry). uint16 planes carry the vmin/vmax to decode with."""
+    import numpy as np
+    arr = np.asarray(arr, dtype=np.float32)
+    entry = {'shape': list(arr.shape), 'dtype': dtype}
+    if dtype == 'float16':
+        return np.ascontiguousarray(arr, dtype='<f2').tobytes(), entry
+    finite = np.isfinite(arr)
+    if finite.any():
+        vmin, vmax = float(arr[finite].min()), float(arr[finite].max())
+    else:
+        vmin, vmax = 0.0, 0.0
+    scale = 65534.0 / (vmax - vmin) if vmax > vmin else 0.0
+    encoded = np.clip(np.round((np.where(finite, arr, vmin) - vmin) * scale), 0, 65534).astype('<u2')
+    encoded[~finite] = DATA_NAN_U16
+    entry.update(vmin=vmin, vmax=vmax)
+    return encoded.tobytes(), entry
+
+
+@app.route('/api/v1/data/binary')
+@rate_limit
+def api_v1_data_binary():
+    """Cross-section data as quantized binary planes, for client-side rendering.
+
+    Same query as /api/v1/data plus dtype=uint16 (default) | float16.
+
+    Format: [4B header_len_LE][JSON header, padded to 4 bytes][planes in header order]
+      - 'coords' planes (distances_km, pressure_levels_hpa, lats, lons) are float32
+      - 'fields' planes are (n_levels, n_points) or (n_points,) in the requested dtype;
+        uint16: value = vmin + encoded / 65534 * (vmax - vmin), 65535 = NaN
+    Every plane entry gives its 'offset' (bytes from the start of the payload)
+    and 'shape'. The body is brotli-compressed if the client accepts 'br' and
+    the brotli module is installed, gzip otherwise.
+    """
+    import gzip as gzip_mod
+    import struct
+    import numpy as np
+
+    dtype = request.args.get('dtype', 'uint16')
+    if dtype not in ('uint16', 'float16'):
+        return jsonify({'error': f"Invalid dtype: {dtype} (use 'uint16' or 'float16')"}), 400
+
+    result = _run_data_query()
+    if not isinstance(result[0], CrossSectionManager):
+        return result
+    mgr, cycle_key, fhr, product, style, data = result
+
+    chunks = []
+    offset = 0
+
+    def add(arr_bytes, entry):
+        nonlocal offset
+        entry['offset'] = offset
+        arr_bytes += b'\0' * (-len(arr_bytes) % 4)  # keep every plane 4-byte aligned
+        chunks.append(arr_bytes)
+        offset += len(arr_bytes)
+        return entry
+
+    coords = []
+    for name, key in (('distances_km', 'distances'), ('pressure_levels_hpa', 'pressure_levels'),
+                      ('lats', 'lats'), ('lons', 'lons')):
+        if data.get(key) is not None:
+            arr = np.ascontiguousarray(data[key], dtype='<f4')
+            coords.append(add(arr.tobytes(), {'name': name, 'shape': list(arr.shape), 'dtype': 'float32'}))
+
+    fields = []
+    for out_key, arr, field_units in _data_fields(style, data):
+        plane, entry = _encode_plane(arr, dtype)
+        entry.update(name=out_key, units=field_units)
+        fields.append(add(plane, entry))
+
+    header = {'coords': coords, 'fields': fields}
+    metadata = _data_metadata(mgr, cycle_key, fhr, product, style, data,
+                              [{'key': f['name'], 'units': f['units']} for f in fields])
+    if metadata:
+        header['metadata'] = metadata
+    header_bytes = json.dumps(header).encode('utf-8')
+    header_bytes += b' ' * (-len(header_bytes) % 4)
+    body = struct.pack('<I', len(header_bytes)) + header_bytes + b''.join(chunks)
+
+    encoding = 'gzip'
+    if 'br' in request.headers.get('Accept-Encoding', ''):
+        try:
+            import brotli
+            body = brotli.compress(body, quality=5)
+            encoding = 'br'
+        except ImportError:
+            pass
+    if encoding == 'gzip':
+        body = gzip_mod.compress(body, compresslevel=6)
+
+    return Response(body, mimetype='application/octet-stream',
+                    headers={'Content-Encoding': encoding, 'Cache-Control': 'no-store'})
+
+
+# =============================================================================
+# v1 API — Point profile / time series endpoints
+# =============================================================================
+
+# Fields a point query may request -> units as stored by the engine
+_POINT_FIELD_UNITS = {
+    'temperature': 'K', 'dew_point': 'K', 'rh': '%',
+    'u_wind': 'm/s', 'v_wind': 'm/s', 'geopotential_height': 'gpm',
+    'specific_humidity': 'kg/kg', 'omega': 'Pa/s',
+    'surface_pressure': 'hPa',
+    't2m': 'K', 'd2m': 'K', 'u10m': 'm/s', 'v10m': 'm/s', 'gust': 'm/s',
+}
+_POINT_DEFAULT_FIELDS = ['temperature', 'dew_point', 'rh', 'u_wind', 'v_wind']
+POINT_QUERY_MAX_POINTS = 1000
+POINT_QUERY_MAX_FHRS = 49
+
 
+def _parse_point_query(args):
+    """Parse points, fields and FHRs shared by /api/v1/profile and /api/v1/timeseries.
+
+    points=lat,lon;lat,lon (or lat=&lon=), fields=a,b, fhrs=0,3,6 or
+    fhr_start/fhr_end/fhr_step (or fhr=). Returns (points, fields, fhrs) or
+    raises ValueError with a client-facing message.
+    """
+    if 'points' in args:
+        points = []
+        for pair in args['points'].split(';'):
+            if pair.strip():
+                lat_s, lon_s = pair.split(',')
+                points.append((float(lat_s), float(lon_s)))
+    elif 'lat' in args and 'lon' in args:
+        points = [(float(args['lat']), float(args['lon']))]
+    else:
+        raise ValueError('Missing points (points=lat,lon;lat,lon or lat=&lon=)')
+    if not points:
+        raise ValueError('No points given')
+    if len(points) > POINT_QUERY_MAX_POINTS:
+        raise ValueError(f'Too many points (max {POINT_QUERY_MAX_POINTS})')
+
+    fields = [f for f in args.get('fields', '').split(',') if f] or list(_POINT_DEFAULT_FIELDS)
+    unknown = [f for f in fields if f not in _POINT_FIELD_UNITS]
+    if unknown:
+        raise ValueError(f'Unknown fields: {unknown}; available: {sorted(_POINT_FIELD_UNITS)}')
+
+    if 'fhrs' in args:
+        fhrs = [int(f) for f in args['fhrs'].split(',') if f.strip()]
+    elif 'fhr_start' in args or 'fhr_end' in args:
+        start = int(args.get('fhr_start', 0))
+        end = int(args.get('fhr_end', start))
+        step = max(1, int(args.get('fhr_step', 1)))
+        fhrs = list(range(start, end + 1, step))
+    else:
+        fhrs = [int(args.get('fhr', 0))]
+    if not fhrs:
+        raise ValueError('No forecast hours given')
+    if len(fhrs) > POINT_QUERY_MAX_FHRS:
+        raise ValueError(f'Too many forecast hours (max {POINT_QUERY_MAX_FHRS})')
+    return points, fields, sorted(set(fhrs))
+
+
+def _compact_list(arr, decimals=3):
+    """Nested lists with NaN -> None, rounded in one vectorized pass (unlike _numpy_to_list)."""
+    import numpy as np
+    arr = np.round(np.asarray(arr, dtype=np.float64), decimals)
+    out = arr.astype(object)
+    out[~np.isfinite(arr)] = None
+    return out.tolist()
+
+
+def _point_response(header: dict, arrays: dict, fmt: str):
+    """JSON, or binary: [4B header_len_LE][JSON header][float32 C-order arrays in header order]."""
+    import struct
+    import numpy as np
+    units = dict(_POINT_FIELD_UNITS, level_hpa='hPa')
+    if fmt != 'bin':
+        header['fields'] = {
+            name: {'units': units.get(name), 'values': _compact_list(arr)}
+            for name, arr in arrays.items()
+        }
+        return jsonify(header)
+    header['fields'] = [
+        {'name': name, 'units': units.get(name), 'shape': list(arr.shape)}
+        for name, arr in arrays.items()
+    ]
+    header_bytes = json.dumps(header).encode('utf-8')
+    # Pad header to a multiple of 4 so the float32 payload is aligned
+    header_bytes += b' ' * (-len(header_bytes) % 4)
+    body = b''.join(np.ascontiguousarray(arr, dtype='<f4').tobytes() for arr in arrays.values())
+    return Response(struct.pack('<I', len(header_bytes)) + header_bytes + body,
+                    mimetype='application/octet-stream',
+                    headers={'Cache-Control': 'no-store'})
+
+
+def _run_point_query(require_levels: bool):
+    """Shared request handling: (mgr, cycle_key, points, fields, data) or a Flask error response."""
+    try:
+        points, fields, fhrs = _parse_point_query(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    mgr = get_manager_from_request() or data_manager
+    if mgr is None:
+        return jsonify({'error': 'No data manager'}), 503
+    cycle_key = mgr.resolve_cycle(request.args.get('cycle', 'latest'), fhrs[0])
+    if not cycle_key:
+        return jsonify({'error': f'No data available with forecast hour F{fhrs[0]:02d}'}), 404
+
+    # The surface selection in /timeseries needs surface pressure alongside
+    query_fields = list(fields)
+    if require_levels and 'surface_pressure' not in query_fields:
+        query_fields.append('surface_pressure')
+    data = mgr.get_profiles(points, query_fields, cycle_key, fhrs)
+    if data is None or not data['fhrs']:
+        return jsonify({'error': f'No requested forecast hours available for {cycle_key}'}), 404
     touch_cycle_access(cycle_key)
-    return jsonify(result)
+    return mgr, cycle_key, points, fields, data
+
+
+def _point_header(mgr, cycle_key, points, data) -> dict:
+    from datetime import timedelta
+    cycle = mgr.get_cycle(cycle_key)
+    init_dt = cycle.get('init_dt') if cycle else None
+    return {
+        'model': mgr.model_name,
+        'cycle': cycle_key,
+        'fhrs': data['fhrs'],
+        'valid_times': [(init_dt + timedelta(hours=f)).strftime('%Y-%m-%dT%H:%MZ') if init_dt else None
+                        for f in data['fhrs']],
+        'points': [
+            {'lat': lat, 'lon': lon,
+             'grid_lat': round(float(glat), 4), 'grid_lon': round(float(glon), 4)}
+            for (lat, lon), glat, glon in zip(points, data['grid_lats'], data['grid_lons'])
+        ],
+    }
+
+
+@app.route('/api/v1/profile')
+@rate_limit
+def api_v1_profile():
+    """Vertical profiles at many points for one or more FHRs, without the cross-section path.
+
+    Query: points=lat,lon;lat,lon  fields=temperature,rh,...  fhr=N | fhrs=a,b | fhr_start/fhr_end
+           cycle, model, format=json|bin
+    3D fields are (n_fhrs, n_points, n_levels); 2D fields (n_fhrs, n_points).
+    Nearest grid column, raw model units (see 'units').
+    """
+    result = _run_point_query(require_levels=False)
+    if not isinstance(result[0], CrossSectionManager):
+        return result
+    mgr, cycle_key, points, fields, data = result
+    header = _point_header(mgr, cycle_key, points, data)
+    header['pressure_levels_hpa'] = _compact_list(data['pressure_levels'], 1)
+    arrays = {name: data['fields'][name] for name in fields if name in data['fields']}
+    return _point_response(header, arrays, request.args.get('format', 'json'))
+
+
+@app.route('/api/v1/timeseries')
+@rate_limit
+def api_v1_timeseries():
+    """Single-level values at many points across an FHR range.
+
+    Query: as /api/v1/profile plus level=surface (default) | <hPa>.
+    level=surface takes each column's lowest pressure level at or above
+    ground (within 5 hPa of surface pressure), the same rule the agent tools
+    apply to /api/v1/data. Every field is (n_fhrs, n_points); with
+    level=surface 'level_hpa' gives the level used.
+    """
+    import numpy as np
+
+    level = request.args.get('level', 'surface')
+    if level != 'surface':
+        try:
+            level = float(level)
+        except ValueError:
+            return jsonify({'error': "level must be 'surface' or a pressure in hPa"}), 400
+
+    result = _run_point_query(require_levels=True)
+    if not isinstance(result[0], CrossSectionManager):
+        return result
+    mgr, cycle_key, points, fields, data = result
+
+    plevs = np.asarray(data['pressure_levels'], dtype=np.float64)
+    if level == 'surface':
+        sp = data['fields'].get('surface_pressure')
+        if sp is None:
+            return jsonify({'error': 'Surface pressure unavailable for level=surface'}), 404
+        above_ground = plevs[None, None, :] <= sp[..., None] + 5
+        lvl_idx = np.where(above_ground, plevs[None, None, :], -np.inf).argmax(axis=-1)
+        has_level = above_ground.any(axis=-1)
+        level_hpa = np.where(has_level, plevs[lvl_idx], np.nan)
+    else:
+        lvl_idx = np.full((len(data['fhrs']), len(points)), int(np.argmin(np.abs(plevs - level))))
+        has_level = np.ones(lvl_idx.shape, dtype=bool)
+        level_hpa = None
+
+    arrays = {}
+    for name in fields:
+        arr = data['fields'].get(name)
+        if arr is None:
+            continue
+        if arr.ndim == 3:
+            arr = np.take_along_axis(arr, lvl_idx[..., None], axis=-1)[..., 0]
+            arr = np.where(has_level, arr, np.nan).astype(np.float32)
+        arrays[name] = arr
+    if level_hpa is not None:
+        arrays['level_hpa'] = level_hpa.astype(np.float32)
+
+    header = _point_header(mgr, cycle_key, points, data)
+    header['level'] = 'surface' if level_hpa is not None else float(plevs[lvl_idx.flat[0]])
+    return _point_response(header, arrays, request.args.get('format', 'json'))
 
 
 # =============================================================================
@@ -9629,11 +10209,11 @@ def api_v1_event_detail(cycle_key):
     available_fhrs = []
     has_data = False
     for _, mgr in model_registry.all_managers():
-        for c in mgr.available_cycles:
-            if c['cycle_key'] == cycle_key:
-                available_fhrs = c['available_fhrs']
-                has_data = True
-                break
+        c = mgr.get_cycle(cycle_key)
+        if c is not None:
+            available_fhrs = c['available_fhrs']
+            has_data = True
+            break
 
     # Get products available for the model (assume HRRR for events)
     model = 'hrrr'
@@ -10217,13 +10797,21 @@ def api_v1_map_overlay():
     cache_dir = str(mgr.xsect.cache_dir) if mgr.xsect and mgr.xsect.cache_dir else None
     engine = _get_overlay_engine(model, cache_dir)
 
+    # Concurrent identical requests share one render: the overlay cache key
+    # plus every other query param (format, bbox, cmap, contours, ...). The
+    # ':v1' tag keeps these results apart from /map-overlay/frame's WebP bytes.
+    extra = sorted((k, v) for k, v in request.args.items(multi=True)
+                   if k not in ('model', 'cycle', 'fhr', 'product', 'field', 'level'))
+    flight_key = overlay_cache_key(model, cycle_key, fhr, product_id or field_id, level_str or None) + \
+        ':v1' + ''.join(f':{k}={v}' for k, v in extra)
+
     # --- Product preset mode ---
     if product_id:
         if product_id not in PRODUCT_PRESETS:
             return jsonify({'error': f'Unknown product: {product_id}',
                             'available': list(PRODUCT_PRESETS.keys())}), 400
         composite_spec = PRODUCT_PRESETS[product_id]
-        result = engine.render_composite(fhr_data, composite_spec, bbox, opacity)
+        result = OVERLAY_FLIGHTS.do(flight_key, lambda: engine.render_composite(fhr_data, composite_spec, bbox, opacity))
         if result is None:
             return jsonify({'error': f'Product {product_id} not available (missing data fields)'}), 404
         resp = Response(result.data, content_type=result.content_type)
@@ -10282,7 +10870,7 @@ def api_v1_map_overlay():
             contours=contour_list or None, barbs=barbs_spec,
             level=level,
         )
-        result = engine.render_composite(fhr_data, adhoc, bbox, opacity)
+        result = OVERLAY_FLIGHTS.do(flight_key, lambda: engine.render_composite(fhr_data, adhoc, bbox, opacity))
         if result is None:
             return jsonify({'error': f'Ad-hoc composite not available (missing data)'}), 404
         resp = Response(result.data, content_type=result.content_type)
@@ -10295,9 +10883,9 @@ def api_v1_map_overlay():
         cmap = request.args.get('cmap')
         vmin = float(request.args.get('vmin')) if request.args.get('vmin') else None
         vmax = float(request.args.get('vmax')) if request.args.get('vmax') else None
-        result = engine.render_png(fhr_data, field_id, level, bbox, cmap, vmin, vmax, opacity)
+        result = OVERLAY_FLIGHTS.do(flight_key, lambda: engine.render_png(fhr_data, field_id, level, bbox, cmap, vmin, vmax, opacity))
     else:
-        result = engine.render_binary(fhr_data, field_id, level, bbox)
+        result = OVERLAY_FLIGHTS.do(flight_key, lambda: engine.render_binary(fhr_data, field_id, level, bbox))
 
     if result is None:
         return jsonify({'error': f'Field {field_id} not available in loaded data'}), 404
@@ -10453,24 +11041,32 @@ def _overlay_frame_inner():
     cache_dir = mgr.cache_dir if hasattr(mgr, 'cache_dir') else ''
     overlay_engine = _get_overlay_engine(model_name, cache_dir)
 
-    try:
+    if product:
+        from core.map_overlay import PRODUCT_PRESETS
+        spec = PRODUCT_PRESETS.get(product)
+        if not spec:
+            return jsonify({'error': f'Unknown product: {product}'}), 400
+
+    def render():
         if product:
-            from core.map_overlay import PRODUCT_PRESETS
-            spec = PRODUCT_PRESETS.get(product)
-            if not spec:
-                return jsonify({'error': f'Unknown product: {product}'}), 400
             result = overlay_engine.render_composite(fhr_data, spec, opacity=1.0)
         else:
             result = overlay_engine.render_png(fhr_data, field, level=int(level) if level else None, opacity=1.0)
+        if result is None:
+            return None
+        # Convert PNG → WebP for ~70-80% size reduction
+        webp = _png_to_webp(result.data)
+        overlay_cache_put(resolved_key, webp)
+        return webp
+
+    try:
+        webp_data = OVERLAY_FLIGHTS.do(resolved_key, render)
     except Exception as exc:
         return jsonify({'error': str(exc)}), 500
 
-    if result is None:
+    if webp_data is None:
         return jsonify({'error': f'Surface fields not available for {cycle_key} F{fhr:02d} (cache may need re-extraction)'}), 404
 
-    # Convert PNG → WebP for ~70-80% size reduction
-    webp_data = _png_to_webp(result.data)
-    overlay_cache_put(resolved_key, webp_data)
     resp = send_file(io.BytesIO(webp_data), mimetype='image/webp',
                      download_name=f'overlay_F{fhr:02d}.webp',
                      max_age=300)
@@ -10511,6 +11107,7 @@ def api_v1_overlay_prerender():
 
     # Render missing frames in a background thread
     session_id = f"overlay_prerender_{int(time.time())}"
+    client = request.remote_addr
 
     def _do_prerender():
         cache_dir = mgr.cache_dir if hasattr(mgr, 'cache_dir') else ''
@@ -10525,7 +11122,8 @@ def api_v1_overlay_prerender():
             if fhr_data is None:
                 continue
             try:
-                result = engine.render_composite(fhr_data, spec, opacity=1.0)
+                with RENDER_SCHEDULER.slot(PRERENDER, client=client, timeout=None):
+                    result = engine.render_composite(fhr_data, spec, opacity=1.0)
                 webp_data = _png_to_webp(result.data)
                 key = overlay_cache_key(model_name, cycle_key, fhr, product)
                 overlay_cache_put(key, webp_data)
@@ -10588,8 +11186,9 @@ def api_v1_overlay_value():
         lon_idx = int(np.argmin(np.abs(lons_arr - lng)))
         grid_idx = (lat_idx, lon_idx)
     elif lats_arr.ndim == 2:
-        dist = (lats_arr - lat)**2 + (lons_arr - lng)**2
-        grid_idx = np.unravel_index(np.argmin(dist), dist.shape)
+        from core import grid_registry
+        iy, ix = grid_registry.register(fhr_data.lats, fhr_data.lons).nearest([lat], [lng])
+        grid_idx = (int(iy[0]), int(ix[0]))
     else:
         return jsonify({'error': 'Unsupported grid'}), 500
 
@@ -10606,34 +11205,36 @@ def api_v1_overlay_value():
                     arr = getattr(fhr_data, comp_name, None)
                     if arr is None:
                         break
+                    # Read only the point's value, not the whole level
                     if arr.ndim == 3 and level is not None:
                         # Find pressure level index
                         plevs = getattr(fhr_data, 'pressure_levels', None)
                         if plevs is not None:
                             lvl_idx = int(np.argmin(np.abs(np.asarray(plevs) - int(level))))
-                            arr = arr[lvl_idx]
+                            components.append(np.float32(arr[(lvl_idx,) + tuple(grid_idx)]))
                         else:
                             break
                     elif arr.ndim == 3:
                         break
-                    components.append(np.asarray(arr, dtype=np.float32))
+                    else:
+                        components.append(np.float32(arr[grid_idx]))
                 if len(components) < len(fspec.derived_from):
                     continue
                 # Field-specific derivation (mirrors map_overlay.py)
                 if fid in ('wind_speed_10m', 'wind_speed') and len(components) == 2:
-                    val = float(np.sqrt(components[0][grid_idx]**2 + components[1][grid_idx]**2))
+                    val = float(np.sqrt(components[0]**2 + components[1]**2))
                 elif fid == 'rh_surface' and len(components) == 2:
-                    t_c = float(components[0][grid_idx]) - 273.15
-                    td_c = float(components[1][grid_idx]) - 273.15
+                    t_c = float(components[0]) - 273.15
+                    td_c = float(components[1]) - 273.15
                     val = min(100.0, max(0.0, 100.0 * np.exp(17.625 * td_c / (243.04 + td_c)) / np.exp(17.625 * t_c / (243.04 + t_c))))
                 elif fid == 'wind_chill' and len(components) == 3:
-                    t_f = (float(components[0][grid_idx]) - 273.15) * 9.0 / 5.0 + 32.0
-                    ws_mph = float(np.sqrt(components[1][grid_idx]**2 + components[2][grid_idx]**2)) * 2.23694
+                    t_f = (float(components[0]) - 273.15) * 9.0 / 5.0 + 32.0
+                    ws_mph = float(np.sqrt(components[1]**2 + components[2]**2)) * 2.23694
                     val = 35.74 + 0.6215 * t_f - 35.75 * max(ws_mph, 0.5)**0.16 + 0.4275 * t_f * max(ws_mph, 0.5)**0.16 if t_f <= 50 else t_f
                 elif fid == 'heat_index' and len(components) == 2:
-                    t_f = (float(components[0][grid_idx]) - 273.15) * 9.0 / 5.0 + 32.0
-                    td_c = float(components[1][grid_idx]) - 273.15
-                    rh = min(100.0, max(0.0, 100.0 * np.exp(17.625 * td_c / (243.04 + td_c)) / np.exp(17.625 * (float(components[0][grid_idx]) - 273.15) / (243.04 + (float(components[0][grid_idx]) - 273.15)))))
+                    t_f = (float(components[0]) - 273.15) * 9.0 / 5.0 + 32.0
+                    td_c = float(components[1]) - 273.15
+                    rh = min(100.0, max(0.0, 100.0 * np.exp(17.625 * td_c / (243.04 + td_c)) / np.exp(17.625 * (float(components[0]) - 273.15) / (243.04 + (float(components[0]) - 273.15)))))
                     val = (-42.379 + 2.04901523 * t_f + 10.14333127 * rh - 0.22475541 * t_f * rh - 0.00683783 * t_f**2 - 0.05481717 * rh**2 + 0.00122874 * t_f**2 * rh + 0.00085282 * t_f * rh**2 - 0.00000199 * t_f**2 * rh**2) if t_f >= 80 else t_f
                 elif fid in ('hdw', 'hdw_paired') and len(components) == 4:
                     # HDW: scan lowest 50 hPa AGL for max VPD and wind
@@ -10643,16 +11244,13 @@ def api_v1_overlay_value():
                     plevs = getattr(fhr_data, 'pressure_levels', None)
                     sp = getattr(fhr_data, 'surface_pressure', None)
                     t3d = getattr(fhr_data, 'temperature', None)
-                    td3d = getattr(fhr_data, 'dew_point', None)
-                    u3d = getattr(fhr_data, 'u_wind', None)
-                    v3d = getattr(fhr_data, 'v_wind', None)
                     # Surface values
-                    t_c = float(components[0][grid_idx]) - 273.15
-                    td_c = float(components[1][grid_idx]) - 273.15
+                    t_c = float(components[0]) - 273.15
+                    td_c = float(components[1]) - 273.15
                     es_s = 6.112 * math.exp(17.67 * t_c / (t_c + 243.5))
                     ea_s = 6.112 * math.exp(17.67 * td_c / (td_c + 243.5))
                     sfc_vpd = max(es_s - ea_s, 0.0)
-                    sfc_ws = math.sqrt(float(components[2][grid_idx])**2 + float(components[3][grid_idx])**2)
+                    sfc_ws = math.sqrt(float(components[2])**2 + float(components[3])**2)
                     if is_paired:
                         max_product = sfc_vpd * sfc_ws
                     else:
@@ -10660,16 +11258,21 @@ def api_v1_overlay_value():
                         max_ws = sfc_ws
                     if plevs is not None and sp is not None and t3d is not None and t3d.ndim == 3:
                         sp_val = float(sp[grid_idx])
+                        # Whole profiles in one read each (column cache when present)
+                        pt_iy, pt_ix = np.array([grid_idx[0]]), np.array([grid_idx[1]])
+                        t_col, td_col, u_col, v_col = (
+                            fhr_data.read_columns(name, pt_iy, pt_ix)[0]
+                            for name in ('temperature', 'dew_point', 'u_wind', 'v_wind'))
                         for li in range(len(plevs)):
                             p = float(plevs[li])
                             if p > sp_val or p < sp_val - DEPTH:
                                 continue
-                            tc = float(t3d[li][grid_idx]) - 273.15
-                            tdc = float(td3d[li][grid_idx]) - 273.15
+                            tc = float(t_col[li]) - 273.15
+                            tdc = float(td_col[li]) - 273.15
                             es_l = 6.112 * math.exp(17.67 * tc / (tc + 243.5))
                             ea_l = 6.112 * math.exp(17.67 * tdc / (tdc + 243.5))
                             vpd_l = max(es_l - ea_l, 0.0)
-                            ws_l = math.sqrt(float(u3d[li][grid_idx])**2 + float(v3d[li][grid_idx])**2)
+                            ws_l = math.sqrt(float(u_col[li])**2 + float(v_col[li])**2)
                             if is_paired:
                                 product_l = vpd_l * ws_l
                                 if product_l > max_product:
@@ -10681,9 +11284,9 @@ def api_v1_overlay_value():
                                     max_ws = ws_l
                     val = max_product if is_paired else max_vpd * max_ws
                 elif len(components) == 2:
-                    val = float(np.sqrt(components[0][grid_idx]**2 + components[1][grid_idx]**2))
+                    val = float(np.sqrt(components[0]**2 + components[1]**2))
                 elif len(components) == 3:
-                    val = float(components[0][grid_idx])
+                    val = float(components[0])
                 else:
                     continue
             else:
@@ -10694,10 +11297,11 @@ def api_v1_overlay_value():
                     plevs = getattr(fhr_data, 'pressure_levels', None)
                     if plevs is not None:
                         lvl_idx = int(np.argmin(np.abs(np.asarray(plevs) - int(level))))
-                        arr = arr[lvl_idx]
+                        val = float(arr[(lvl_idx,) + tuple(grid_idx)])
                     else:
                         continue
-                val = float(arr[grid_idx])
+                else:
+                    val = float(arr[grid_idx])
 
             if not np.isfinite(val):
                 continue
@@ -10786,8 +11390,8 @@ def api_v1_overlay_grid_sample():
         domain_mask_2d = None  # no masking for regular grids
     else:
         try:
-            from scipy.spatial import cKDTree
-            tree = cKDTree(np.column_stack([native_lats.ravel(), native_lons.ravel()]))
+            from core import grid_registry
+            tree = grid_registry.register(fhr_data.lats, fhr_data.lons).kdtree('latlon')
             out_mesh_lat, out_mesh_lon = np.meshgrid(out_lats, out_lons, indexing='ij')
             dists, flat_indices = tree.query(np.column_stack([out_mesh_lat.ravel(), out_mesh_lon.ravel()]))
             flat_indices = flat_indices.reshape(n_rows, n_cols)
@@ -11345,19 +11949,48 @@ def main():
         threading.Thread(target=_startup_preload, daemon=True).start()
 
     # Background re-scan thread: low-latency cycle detection for all models.
+    # New FHRs normally arrive as ingest events from auto_update; the full
+    # directory scan runs every XSECT_RESCAN_SECONDS until the first event is
+    # seen, then only every XSECT_RESCAN_FULL_SECONDS as a safety net.
+    global INGEST_TAIL
+    if journal_path():
+        INGEST_TAIL = IngestEventTail()
+        logger.info(f"Ingest events: {INGEST_TAIL.path}")
+
     def background_rescan():
-        rescan_seconds = max(1, int(os.environ.get("XSECT_RESCAN_SECONDS", "2")))
+        rescan_seconds = max(1, _env_int("XSECT_RESCAN_SECONDS", 2))
+        full_rescan_seconds = max(rescan_seconds, _env_int("XSECT_RESCAN_FULL_SECONDS", 300))
+        last_scan = last_evict = time.time()
         while True:
-            time.sleep(rescan_seconds)
-            for model_name, mgr in model_registry.managers.items():
-                try:
-                    mgr.scan_available_cycles()
-                    mgr.auto_load_latest()
-                except Exception as e:
-                    logger.warning(f"Background rescan failed for {model_name}: {e}")
+            time.sleep(INGEST_POLL_SECONDS if INGEST_TAIL is not None else rescan_seconds)
+            touched = set()
+            if INGEST_TAIL is not None:
+                for event in INGEST_TAIL.poll():
+                    mgr = model_registry.managers.get(event.get('model'))
+                    try:
+                        if mgr is not None and mgr.apply_ingest_event(event):
+                            touched.add(mgr.model_name)
+                            logger.info(f"Ingest event: {mgr.model_name.upper()} {event['cycle']} F{int(event['fhr']):02d} "
+                                        f"({time.time() - event.get('ts', time.time()):.1f}s after publish)")
+                    except Exception as e:
+                        logger.warning(f"Ingest event {event} failed: {e}")
+
+            interval = full_rescan_seconds if INGEST_TAIL is not None and INGEST_TAIL.events else rescan_seconds
+            if time.time() - last_scan >= interval:
+                last_scan = time.time()
+                for model_name, mgr in model_registry.managers.items():
+                    try:
+                        mgr.scan_available_cycles()
+                        touched.add(model_name)
+                    except Exception as e:
+                        logger.warning(f"Background rescan failed for {model_name}: {e}")
+
+            for model_name in touched:
+                model_registry.managers[model_name].request_auto_load()
 
             # Evict old NVMe cache + check GRIB disk usage every 10 minutes
-            if int(time.time()) % 600 < 60:
+            if time.time() - last_evict >= 600:
+                last_evict = time.time()
                 try:
                     cache_evict_old_cycles(model_registry.managers)
                 except Exception as e:
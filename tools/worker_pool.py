@@ -0,0 +1,180 @@
+"""Model-agnostic process pools with engine-key affinity.
+
+A pool is a fixed set of single-process lanes. Jobs carry the engine config
+they need (see CrossSectionManager.get_render_pool_config), and each worker
+keeps one engine per model (tools.render_worker), so one pool serves HRRR,
+GFS and RRFS without being torn down when the model changes.
+
+Jobs are routed to a lane by a stable hash of their affinity key, normally
+(model, engine_key): every frame of one forecast hour lands on the same
+worker, which keeps that hour's memmaps, path cache and grid trees warm
+instead of loading them in all workers.
+
+Jobs with no state to keep warm (render_multi_panel carries all its panel
+data) go to pool.any_lane() instead, which picks the least-loaded lane at
+submit time, so they never wait behind each other on a colliding hash.
+
+    pool = AffinityPool('render', 8, project_dir)
+    future = pool.submit(('hrrr', engine_key), render_frame, config, args)
+    lane = pool.lane('hrrr', engine_key)   # executor for RenderScheduler.submit
+    lane = pool.any_lane()                 # same, for non-affine jobs
+
+The pool counts jobs in flight per lane. Lane executors also offer claim(),
+which reserves an idle lane (None if there is none). RenderScheduler uses it
+to grant a render slot only when the job can start right away, instead of
+letting the granted job queue behind a busy worker.
+
+A lane whose process died is replaced on the next submit.
+"""
+import logging
+import threading
+import zlib
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _Lane:
+    """Executor view of one lane (what RenderScheduler.submit expects)."""
+
+    def __init__(self, pool: 'AffinityPool', index: int):
+        self._pool = pool
+        self.index = index
+
+    def submit(self, fn: Callable, *args) -> Future:
+        return self._pool._submit_lane(self.index, fn, *args)
+
+    def claim(self) -> Optional['_ClaimedLane']:
+        """Reserve this lane if it is idle."""
+        return _ClaimedLane(self._pool, self.index) if self._pool._claim(self.index) else None
+
+
+class _AnyLane:
+    """Executor view that sends each job to the least-loaded lane."""
+
+    def __init__(self, pool: 'AffinityPool'):
+        self._pool = pool
+
+    def submit(self, fn: Callable, *args) -> Future:
+        return self._pool._submit_lane(self._pool._least_loaded(), fn, *args)
+
+    def claim(self) -> Optional['_ClaimedLane']:
+        """Reserve an idle lane, if any."""
+        index = self._pool._least_loaded()
+        return _ClaimedLane(self._pool, index) if self._pool._claim(index) else None
+
+
+class _ClaimedLane:
+    """A lane reserved by claim(): submit() once, or unclaim() to give it back."""
+
+    def __init__(self, pool: 'AffinityPool', index: int):
+        self._pool = pool
+        self.index = index
+
+    def submit(self, fn: Callable, *args) -> Future:
+        return self._pool._submit_lane(self.index, fn, *args, claimed=True)
+
+    def unclaim(self):
+        self._pool._job_done(self.index)
+
+
+class AffinityPool:
+    """Fixed set of single-worker process lanes, jobs routed by affinity key."""
+
+    def __init__(self, name: str, n_workers: int, project_dir: str):
+        self.name = name
+        self.n_workers = max(1, n_workers)
+        self.project_dir = project_dir
+        self._lanes: List[Optional[ProcessPoolExecutor]] = [None] * self.n_workers
+        self._lock = threading.Lock()
+        self.submitted = [0] * self.n_workers
+        self._inflight = [0] * self.n_workers  # claimed or submitted, not yet finished
+        self.restarts = 0
+
+    def _index(self, affinity) -> int:
+        return zlib.crc32(repr(affinity).encode('utf-8')) % self.n_workers
+
+    def _executor(self, index: int, replace: bool = False) -> ProcessPoolExecutor:
+        with self._lock:
+            executor = self._lanes[index]
+            if executor is not None and replace:
+                logger.warning(f"{self.name} pool lane {index} died, restarting")
+                try:
+                    executor.shutdown(wait=False)
+                except Exception:
+                    pass
+                executor = None
+                self.restarts += 1
+            if executor is None:
+                from tools.render_worker import init_worker
+                executor = ProcessPoolExecutor(max_workers=1, initializer=init_worker,
+                                               initargs=(self.project_dir,))
+                self._lanes[index] = executor
+            return executor
+
+    def _claim(self, index: int) -> bool:
+        with self._lock:
+            if self._inflight[index]:
+                return False
+            self._inflight[index] = 1
+            return True
+
+    def _least_loaded(self) -> int:
+        with self._lock:
+            return min(range(self.n_workers), key=lambda i: (self._inflight[i], self.submitted[i]))
+
+    def _job_done(self, index: int):
+        with self._lock:
+            self._inflight[index] = max(0, self._inflight[index] - 1)
+
+    def _submit_lane(self, index: int, fn: Callable, *args, claimed: bool = False) -> Future:
+        if not claimed:
+            with self._lock:
+                self._inflight[index] += 1
+        try:
+            try:
+                future = self._executor(index).submit(fn, *args)
+            except BrokenProcessPool:
+                future = self._executor(index, replace=True).submit(fn, *args)
+        except BaseException:
+            self._job_done(index)
+            raise
+        with self._lock:
+            self.submitted[index] += 1
+        # Registered before the caller's callbacks, so a lane is idle again
+        # by the time RenderScheduler releases the job's slot
+        future.add_done_callback(lambda f, index=index: self._job_done(index))
+        return future
+
+    def lane(self, *affinity) -> _Lane:
+        """The executor the given affinity key routes to."""
+        return _Lane(self, self._index(affinity))
+
+    def any_lane(self) -> _AnyLane:
+        """Executor for jobs with no affinity: least-loaded lane at submit time."""
+        return _AnyLane(self)
+
+    def submit(self, affinity, fn: Callable, *args) -> Future:
+        return self._submit_lane(self._index(affinity), fn, *args)
+
+    def shutdown(self):
+        with self._lock:
+            lanes, self._lanes = self._lanes, [None] * self.n_workers
+        for executor in lanes:
+            if executor is not None:
+                try:
+                    executor.shutdown(wait=False)
+                except Exception:
+                    pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'workers': self.n_workers,
+                'started': sum(1 for e in self._lanes if e is not None),
+                'submitted_per_worker': list(self.submitted),
+                'inflight_per_worker': list(self._inflight),
+                'restarts': self.restarts,
+            }